@@ -0,0 +1,64 @@
+"""
+Benchmark TRON/EVM address conversions: uncached codec vs the LRU-cached codec
+
+The uncached column clears the parser/formatter caches before every call, which
+is what each conversion cost before addresses were memoized.
+
+Usage:
+    python benchmarks/bench_address.py [--iterations 20000]
+"""
+
+import argparse
+import time
+
+from bankofai.x402.utils.address import (
+    _base58check,
+    normalize_tron_address,
+    parse_address,
+    tron_address_to_evm,
+)
+
+# Buyer, caller, token, payTo, feeTo of a typical permit
+ADDRESSES = [
+    "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t",
+    "TLBaRhANhwgZyUk6Z1ynCn1Ld7BRH1jBjZ",
+    "TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf",
+    "TEkxiTehnzSmSe2XqrBj4w32RUN966rdz8",
+    "TNPeeaaFB7K9cmo4uQpcU32zGK8G1NYqeL",
+]
+EVM_ADDRESSES = [tron_address_to_evm(a) for a in ADDRESSES]
+
+
+def _clear() -> None:
+    parse_address.cache_clear()
+    _base58check.cache_clear()
+
+
+def _rate(fn, inputs: list[str], iterations: int, cold: bool) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        if cold:
+            _clear()
+        fn(inputs[i % len(inputs)])
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    cases = [
+        ("tron_address_to_evm", tron_address_to_evm, ADDRESSES),
+        ("normalize_tron_address(0x)", normalize_tron_address, EVM_ADDRESSES),
+    ]
+    print(f"{'conversion':<30}{'uncached':>14}{'cached':>14}{'speedup':>10}")
+    for name, fn, inputs in cases:
+        cold = _rate(fn, inputs, args.iterations, cold=True)
+        _clear()
+        warm = _rate(fn, inputs, args.iterations, cold=False)
+        print(f"{name:<30}{cold:>12.0f}/s{warm:>12.0f}/s{warm / cold:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
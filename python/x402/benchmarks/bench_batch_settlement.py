@@ -0,0 +1,110 @@
+"""
+Benchmark single vs batched exact_permit settlement on the in-memory local chain
+
+Usage:
+    python benchmarks/bench_batch_settlement.py [--payments 200] [--block-time 0.5]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bankofai.x402.config import NetworkConfig
+from bankofai.x402.mechanisms._exact_permit_base.batcher import PermitSettlementBatcher
+from bankofai.x402.mechanisms.evm.exact_permit import ExactPermitEvmFacilitatorMechanism
+from bankofai.x402.testing import LocalChain, LocalChainSigner
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import (
+    Fee,
+    Payment,
+    PaymentPayload,
+    PaymentPayloadData,
+    PaymentPermit,
+    PaymentRequirements,
+    PermitMeta,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+
+
+def _payloads(
+    mechanism: ExactPermitEvmFacilitatorMechanism, count: int, requirements: PaymentRequirements
+) -> list[PaymentPayload]:
+    payloads = []
+    for i in range(count):
+        permit = PaymentPermit(
+            meta=PermitMeta(
+                kind="PAYMENT_ONLY",
+                paymentId="0x" + "12" * 16,
+                nonce=str(i),
+                validAfter=0,
+                validBefore=int(time.time()) + 3600,
+            ),
+            buyer="0x" + "22" * 20,
+            caller=mechanism._get_caller(NETWORK),
+            payment=Payment(payToken=requirements.asset, payAmount="100", payTo=PAY_TO),
+            fee=Fee(feeTo=mechanism._fee_to, feeAmount="0"),
+        )
+        payloads.append(
+            PaymentPayload(
+                x402Version=2,
+                payload=PaymentPayloadData(paymentPermit=permit, signature="0x" + "ab" * 65),
+                accepted=requirements,
+            )
+        )
+    return payloads
+
+
+async def _run(args: argparse.Namespace, batched: bool) -> None:
+    chain = LocalChain(NETWORK, block_time=args.block_time, broadcast_latency=args.latency)
+    token = TokenRegistry.get_token(NETWORK, "USDT").address
+    chain.mint(token, "0x" + "22" * 20, 10**30)
+    signer = LocalChainSigner(chain)
+    batcher = (
+        PermitSettlementBatcher(signer, [NETWORK], args.batch_size, args.max_wait)
+        if batched
+        else None
+    )
+    mechanism = ExactPermitEvmFacilitatorMechanism(signer, base_fee={"USDT": 0}, batcher=batcher)
+    requirements = PaymentRequirements(
+        scheme="exact_permit", network=NETWORK, amount="100", asset=token, payTo=PAY_TO
+    )
+    payloads = _payloads(mechanism, args.payments, requirements)
+
+    # Single settlements are sent from one account, so they are serialized
+    semaphore = asyncio.Semaphore(args.payments if batched else 1)
+
+    async def settle(payload: PaymentPayload) -> bool:
+        async with semaphore:
+            return (await mechanism.settle(payload, requirements)).success
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(settle(p) for p in payloads))
+    elapsed = time.perf_counter() - start
+
+    label = "batched" if batched else "single"
+    print(
+        f"{label:8s} settled={sum(results):5d}/{len(results)} "
+        f"transactions={chain.stats['broadcasts']:5d} "
+        f"elapsed={elapsed:7.2f}s throughput={len(results) / elapsed:8.1f}/s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payments", type=int, default=200)
+    parser.add_argument("--block-time", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, default=0.02, help="broadcast RPC latency (s)")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--max-wait", type=float, default=0.05)
+    args = parser.parse_args()
+
+    if NetworkConfig.get_multicall_address(NETWORK) is None:
+        raise SystemExit(f"No Multicall3 address configured for {NETWORK}")
+    asyncio.run(_run(args, batched=False))
+    asyncio.run(_run(args, batched=True))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark exact_permit settle latency at each confirmation level on the local chain
+
+Defaults model TRON: 3 s blocks, solidification about 19 blocks later and a
+broadcast round trip of 80 ms.
+
+Usage:
+    python benchmarks/bench_confirmation_levels.py [--payments 20] [--block-time 3]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from bankofai.x402.mechanisms._base.confirmation import SettlementConfirmer
+from bankofai.x402.mechanisms.evm.exact_permit import ExactPermitEvmFacilitatorMechanism
+from bankofai.x402.testing import LocalChain, LocalChainSigner
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import (
+    CONFIRMATION_LEVELS,
+    Fee,
+    Payment,
+    PaymentPayload,
+    PaymentPayloadData,
+    PaymentPermit,
+    PaymentRequirements,
+    PaymentRequirementsExtra,
+    PermitMeta,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+BUYER = "0x" + "22" * 20
+
+
+def _payload(
+    mechanism: ExactPermitEvmFacilitatorMechanism, nonce: int, requirements: PaymentRequirements
+) -> PaymentPayload:
+    permit = PaymentPermit(
+        meta=PermitMeta(
+            kind="PAYMENT_ONLY",
+            paymentId="0x" + "12" * 16,
+            nonce=str(nonce),
+            validAfter=0,
+            validBefore=int(time.time()) + 3600,
+        ),
+        buyer=BUYER,
+        caller=mechanism._get_caller(NETWORK),
+        payment=Payment(payToken=requirements.asset, payAmount="100", payTo=PAY_TO),
+        fee=Fee(feeTo=mechanism._fee_to, feeAmount="0"),
+    )
+    return PaymentPayload(
+        x402Version=2,
+        payload=PaymentPayloadData(paymentPermit=permit, signature="0x" + "ab" * 65),
+        accepted=requirements,
+    )
+
+
+async def _run(args: argparse.Namespace, level: str) -> None:
+    chain = LocalChain(
+        NETWORK,
+        block_time=args.block_time,
+        broadcast_latency=args.latency,
+        finality_time=args.block_time * args.finality_blocks,
+    )
+    token = TokenRegistry.get_token(NETWORK, "USDT").address
+    chain.mint(token, BUYER, 10**30)
+    signer = LocalChainSigner(chain)
+    confirmer = SettlementConfirmer(signer, level)
+    mechanism = ExactPermitEvmFacilitatorMechanism(
+        signer, base_fee={"USDT": 0}, confirmer=confirmer
+    )
+    requirements = PaymentRequirements(
+        scheme="exact_permit",
+        network=NETWORK,
+        amount="100",
+        asset=token,
+        payTo=PAY_TO,
+        extra=PaymentRequirementsExtra(),
+    )
+
+    async def settle(nonce: int) -> float:
+        payload = _payload(mechanism, nonce, requirements)
+        start = time.perf_counter()
+        result = await mechanism.settle(payload, requirements)
+        assert result.success and result.confirmation == level
+        return time.perf_counter() - start
+
+    # Warm up lazy imports and caches outside the measurement
+    await settle(args.payments)
+    latencies = sorted(await asyncio.gather(*(settle(n) for n in range(args.payments))))
+    await confirmer.close()
+    print(
+        f"{level:10s} median={statistics.median(latencies) * 1000:9.1f} ms "
+        f"max={latencies[-1] * 1000:9.1f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payments", type=int, default=20)
+    parser.add_argument("--block-time", type=float, default=3.0)
+    parser.add_argument("--finality-blocks", type=int, default=19)
+    parser.add_argument("--latency", type=float, default=0.08, help="broadcast RPC latency (s)")
+    args = parser.parse_args()
+
+    for level in CONFIRMATION_LEVELS:
+        asyncio.run(_run(args, level))
+
+
+if __name__ == "__main__":
+    main()
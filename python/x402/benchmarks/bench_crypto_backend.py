@@ -0,0 +1,57 @@
+"""
+Benchmark secp256k1 signing and public-key recovery per backend (single core)
+
+Also times eth_account's generic path (key parsed from hex on every call) as
+the baseline the signers used before keys were pre-parsed.
+
+Usage:
+    python benchmarks/bench_crypto_backend.py [--iterations 2000]
+"""
+
+import argparse
+import time
+
+from eth_account import Account
+from eth_utils import keccak
+
+from bankofai.x402.utils.crypto_backend import _BACKENDS, SigningKey
+
+PRIVATE_KEY = bytes.fromhex("42" * 32)
+
+
+def _rate(fn, items: list) -> float:
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    digests = [keccak(i.to_bytes(8, "big")) for i in range(args.iterations)]
+    key_hex = "0x" + PRIVATE_KEY.hex()
+
+    print(f"{'backend':<16}{'sign/s':>12}{'recover/s':>12}")
+    baseline = [(d, bytes(Account.unsafe_sign_hash(d, key_hex).signature)) for d in digests]
+    sign = _rate(lambda d: Account.unsafe_sign_hash(d, key_hex), digests)
+    recover = _rate(lambda item: Account._recover_hash(item[0], signature=item[1]), baseline)
+    print(f"{'eth_account':<16}{sign:>12.0f}{recover:>12.0f}")
+
+    for name, backend_cls in _BACKENDS.items():
+        try:
+            backend = backend_cls()
+        except ImportError:
+            print(f"{name:<16}{'not installed':>24}")
+            continue
+        key = SigningKey(PRIVATE_KEY, backend)
+        signed = [(d, backend.sign_recoverable(key._key, d)) for d in digests]
+        sign = _rate(key.sign_hash, digests)
+        recover = _rate(lambda item: backend.recover(*item), signed)
+        print(f"{name:<16}{sign:>12.0f}{recover:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark event-loop lag while verifying a burst of EIP-712 signatures
+
+A ticker coroutine sleeps 1 ms in a loop and records how late it wakes up while
+the burst is verified inline, on the thread pool, on the process pool, and with
+verify_many. Lag is what every other coroutine (e.g. HTTP calls) experiences.
+
+Usage:
+    python benchmarks/bench_crypto_executor.py [--signatures 500] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import time
+
+from eth_account import Account
+
+from bankofai.x402.abi import get_payment_permit_eip712_types
+from bankofai.x402.utils.crypto_executor import CryptoExecutor, TypedDataCheck
+from bankofai.x402.utils.typed_data import hash_typed_data, sign_typed_data_hash
+
+PRIVATE_KEY = bytes.fromhex("42" * 32)
+ADDRESS = Account.from_key(PRIVATE_KEY).address
+DOMAIN = {
+    "name": "PaymentPermit",
+    "chainId": 97,
+    "verifyingContract": "0x1825bB32db3443dEc2cc7508b2D818fc13EaD878",
+}
+TYPES = get_payment_permit_eip712_types()
+
+
+def _checks(count: int) -> list[TypedDataCheck]:
+    checks = []
+    for nonce in range(count):
+        message = {
+            "meta": {
+                "kind": 0,
+                "paymentId": b"\x01" * 16,
+                "nonce": nonce,
+                "validAfter": 0,
+                "validBefore": 2_000_000_000,
+            },
+            "buyer": ADDRESS,
+            "caller": "0x" + "11" * 20,
+            "payment": {
+                "payToken": "0x" + "22" * 20,
+                "payAmount": 100,
+                "payTo": "0x" + "33" * 20,
+            },
+            "fee": {"feeTo": "0x" + "44" * 20, "feeAmount": 0},
+        }
+        signature = sign_typed_data_hash(hash_typed_data(DOMAIN, TYPES, message), PRIVATE_KEY)
+        checks.append(TypedDataCheck(ADDRESS, DOMAIN, TYPES, message, signature.hex()))
+    return checks
+
+
+async def _measure(name: str, verify, checks: list[TypedDataCheck]) -> None:
+    lags: list[float] = []
+    done = asyncio.Event()
+
+    async def ticker() -> None:
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    tick = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    results = await verify(checks)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await tick
+
+    assert all(results)
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    print(
+        f"{name:<22}{len(checks) / elapsed:>10.0f}/s"
+        f"{max(lags) * 1000:>12.1f} ms{p99 * 1000:>12.1f} ms"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--signatures", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    checks = _checks(args.signatures)
+    inline = CryptoExecutor.inline()
+    threads = CryptoExecutor.thread(args.workers)
+    processes = CryptoExecutor.process(args.workers)
+    # Start the worker processes before measuring
+    await processes.verify_many(checks[: args.workers])
+
+    def each(executor: CryptoExecutor):
+        async def verify(batch: list[TypedDataCheck]) -> list[bool]:
+            return list(await asyncio.gather(*(executor.verify_typed_data(*c) for c in batch)))
+
+        return verify
+
+    print(f"{'mode':<22}{'throughput':>12}{'max lag':>15}{'p99 lag':>15}")
+    await _measure("inline", each(inline), checks)
+    await _measure("thread pool", each(threads), checks)
+    await _measure("process pool", each(processes), checks)
+    await _measure("thread verify_many", threads.verify_many, checks)
+    await _measure("process verify_many", processes.verify_many, checks)
+
+    threads.shutdown()
+    processes.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
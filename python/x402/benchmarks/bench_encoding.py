@@ -0,0 +1,131 @@
+"""
+Benchmark PAYMENT-* header encode/decode for a realistic PaymentPayload
+
+Compares the previous dict + json path (model_dump -> json.dumps -> base64, and
+base64 -> str -> json.loads -> Model(**data)) with the model_dump_json /
+model_validate_json codec, and reports the size and speed of the compact
+(CBOR) header format.
+
+Usage:
+    python benchmarks/bench_encoding.py [--iterations 20000]
+"""
+
+import argparse
+import base64
+import json
+import time
+
+from bankofai.x402 import encoding
+from bankofai.x402.compact import COMPACT_ENCODINGS
+from bankofai.x402.encoding import decode_payment_payload, encode_payment_payload
+from bankofai.x402.types import (
+    Fee,
+    Payment,
+    PaymentPayload,
+    PaymentPayloadData,
+    PaymentPermit,
+    PaymentRequirements,
+    PermitMeta,
+    SettleResponse,
+)
+
+TOKEN = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+PAY_TO = "TLBaRhANhwgZyUk6Z1ynCn1Ld7BRH1jBjZ"
+
+
+def _payload() -> PaymentPayload:
+    requirements = PaymentRequirements(
+        scheme="exact_permit",
+        network="tron:mainnet",
+        amount="1000000",
+        asset=TOKEN,
+        payTo=PAY_TO,
+        maxTimeoutSeconds=3600,
+        extra={
+            "name": "Tether USD",
+            "version": "1",
+            "fee": {"feeTo": PAY_TO, "feeAmount": "10000"},
+        },
+    )
+    permit = PaymentPermit(
+        meta=PermitMeta(
+            kind="PAYMENT_ONLY",
+            paymentId="0x" + "12" * 16,
+            nonce="93847561029384756",
+            validAfter=1_700_000_000,
+            validBefore=1_700_003_600,
+        ),
+        buyer="TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf",
+        caller="TEkxiTehnzSmSe2XqrBj4w32RUN966rdz8",
+        payment=Payment(payToken=TOKEN, payAmount="1000000", payTo=PAY_TO),
+        fee=Fee(feeTo=PAY_TO, feeAmount="10000"),
+    )
+    return PaymentPayload(
+        x402Version=2,
+        payload=PaymentPayloadData(paymentPermit=permit, signature="0x" + "ab" * 65),
+        accepted=requirements,
+    )
+
+
+def _legacy_encode(payload) -> str:
+    data = payload.model_dump(by_alias=True) if hasattr(payload, "model_dump") else payload
+    return base64.b64encode(json.dumps(data).encode("utf-8")).decode("utf-8")
+
+
+def _legacy_decode(encoded: str, model_class):
+    return model_class(**json.loads(base64.b64decode(encoded).decode("utf-8")))
+
+
+def _rate(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    payload = _payload()
+    header = encode_payment_payload(payload)
+    assert decode_payment_payload(header, PaymentPayload) == payload
+    assert _legacy_decode(_legacy_encode(payload), PaymentPayload) == payload
+    response = {"success": True, "transaction": "0x" + "cd" * 32, "network": "tron:mainnet"}
+
+    print(f"PaymentPayload header: {len(header)} bytes, orjson: {encoding.orjson is not None}")
+    cases = [
+        (
+            "encode PaymentPayload",
+            lambda: _legacy_encode(payload),
+            lambda: encode_payment_payload(payload),
+        ),
+        (
+            "decode PaymentPayload",
+            lambda: _legacy_decode(header, PaymentPayload),
+            lambda: decode_payment_payload(header, PaymentPayload),
+        ),
+        (
+            "encode SettleResponse",
+            lambda: _legacy_encode(SettleResponse(**response)),
+            lambda: encode_payment_payload(SettleResponse(**response)),
+        ),
+    ]
+    print(f"{'operation':<24}{'legacy':>14}{'codec':>14}{'speedup':>10}")
+    for name, legacy, codec in cases:
+        before = _rate(legacy, args.iterations)
+        after = _rate(codec, args.iterations)
+        print(f"{name:<24}{before:>12.0f}/s{after:>12.0f}/s{after / before:>9.1f}x")
+
+    print(f"\n{'compact format':<24}{'size':>8}{'encode':>14}{'decode':>14}")
+    for name in COMPACT_ENCODINGS:
+        compact = encode_payment_payload(payload, encoding=name)
+        assert decode_payment_payload(compact, PaymentPayload) == payload
+        encode = _rate(lambda: encode_payment_payload(payload, encoding=name), args.iterations)
+        decode = _rate(lambda: decode_payment_payload(compact, PaymentPayload), args.iterations)
+        print(f"{name:<24}{len(compact):>8}{encode:>12.0f}/s{decode:>12.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
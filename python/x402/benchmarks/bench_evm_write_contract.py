@@ -0,0 +1,83 @@
+"""
+Benchmark EVM settlement sends: per-transaction nonce lookups vs the NonceManager
+
+Both flows send ERC20 approve transactions to a LocalEvmNode that counts
+requests and sleeps ``--latency`` ms per request. The lookup flow is what
+write_contract did before nonces were allocated locally (eth_getTransactionCount
+and eth_chainId per transaction, uncached); as concurrent sends would read the
+same nonce, it has to run one settlement at a time. The pipelined flow is the
+current write_contract with all settlements in flight at once.
+
+Usage:
+    python benchmarks/bench_evm_write_contract.py [--settlements 100] [--latency 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bankofai.x402.abi import ERC20_ABI
+from bankofai.x402.signers.facilitator import EvmFacilitatorSigner
+from bankofai.x402.signers.facilitator.evm_signer import CACHED_REQUESTS
+from bankofai.x402.testing.local_evm_node import LocalEvmNode
+
+NETWORK = "eip155:97"
+PRIVATE_KEY = "0x" + "01" * 32
+TOKEN = "0x55d398326f99059fF775485246999027B3197955"
+SPENDER = "0x1111111111111111111111111111111111111111"
+
+
+async def _lookup(signer: EvmFacilitatorSigner, w3, amount: int) -> str:
+    """The previous write_contract flow, without its logging"""
+    contract = w3.eth.contract(address=TOKEN, abi=ERC20_ABI)
+    address = signer.get_address()
+    tx = await contract.functions.approve(SPENDER, amount).build_transaction(
+        {
+            "from": address,
+            "nonce": await w3.eth.get_transaction_count(address),
+            "chainId": await w3.eth.chain_id,
+        }
+    )
+    signed = w3.eth.account.sign_transaction(tx, private_key=signer._private_key)
+    return (await w3.eth.send_raw_transaction(signed.raw_transaction)).hex()
+
+
+async def _pipelined(signer: EvmFacilitatorSigner, w3, amount: int) -> str:
+    return await signer.write_contract(TOKEN, ERC20_ABI, "approve", [SPENDER, amount], NETWORK)
+
+
+async def _run(settlements: int, latency: float, pipelined: bool) -> tuple[float, float]:
+    node = LocalEvmNode(latency=latency)
+    if pipelined:
+        for name, value in CACHED_REQUESTS.items():
+            setattr(node, name, value)
+    signer = EvmFacilitatorSigner.from_private_key(PRIVATE_KEY)
+    w3 = node.web3()
+    signer._async_web3_clients[NETWORK] = w3
+
+    start = time.perf_counter()
+    if pipelined:
+        await asyncio.gather(*(_pipelined(signer, w3, i) for i in range(settlements)))
+    else:
+        for i in range(settlements):
+            await _lookup(signer, w3, i)
+    elapsed = time.perf_counter() - start
+    assert len(node.transactions) == settlements
+    return node.rpc_count / settlements, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--settlements", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=20, help="ms per request")
+    args = parser.parse_args()
+
+    latency = args.latency / 1000
+    print(f"{'flow':<12}{'RPCs/settle':>13}{'seconds':>10}{'settles/s':>11}")
+    for name, pipelined in (("lookup", False), ("pipelined", True)):
+        rpcs, elapsed = asyncio.run(_run(args.settlements, latency, pipelined))
+        print(f"{name:<12}{rpcs:>13.2f}{elapsed:>10.2f}{args.settlements / elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark FacilitatorApp request handling in-process (no network, no chain)
+
+Usage:
+    python benchmarks/bench_facilitator_app.py [--requests 5000] [--concurrency 100]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from bankofai.x402.facilitator import FacilitatorApp, X402Facilitator
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentPayloadData,
+    PaymentRequirements,
+    SettleResponse,
+    VerifyResponse,
+)
+
+NETWORK = "eip155:97"
+
+
+class _InstantMechanism:
+    """Mechanism that answers immediately, so only the HTTP layer is measured"""
+
+    def scheme(self) -> str:
+        return "exact_permit"
+
+    async def fee_quote(self, accept, context=None):
+        return None
+
+    async def verify(self, payload, requirements) -> VerifyResponse:
+        return VerifyResponse(isValid=True)
+
+    async def settle(self, payload, requirements) -> SettleResponse:
+        return SettleResponse(success=True, transaction="0x" + "00" * 32, network=NETWORK)
+
+
+async def _run(args: argparse.Namespace) -> None:
+    facilitator = X402Facilitator(fee_to="0x" + "fe" * 20)
+    facilitator.register([NETWORK], _InstantMechanism())
+    app = FacilitatorApp(facilitator, verify_concurrency=args.concurrency)
+    app.start()
+
+    requirements = PaymentRequirements(
+        scheme="exact_permit",
+        network=NETWORK,
+        amount="100",
+        asset="0x55d398326f99059fF775485246999027B3197955",
+        payTo="0x" + "11" * 20,
+    )
+    payload = PaymentPayload(
+        x402Version=2,
+        payload=PaymentPayloadData(signature="0x" + "ab" * 65),
+        accepted=requirements,
+    )
+    body = (
+        '{"paymentPayload":%s,"paymentRequirements":%s}'
+        % (payload.model_dump_json(by_alias=True), requirements.model_dump_json(by_alias=True))
+    ).encode()
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one(path: str) -> None:
+            async with semaphore:
+                response = await client.post(path, content=body)
+                response.raise_for_status()
+
+        for path in ("/verify", "/settle"):
+            start = time.perf_counter()
+            await asyncio.gather(*(one(path) for _ in range(args.requests)))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{path:8s} {args.requests} requests in {elapsed:.2f}s "
+                f"({args.requests / elapsed:.0f} req/s)"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark receipt waiting: one polling loop per transaction vs the shared ReceiptWatcher
+
+N settlements are broadcast to a LocalTronNode producing a block every
+``--block-time`` seconds, then all wait for their receipts. The per-transaction
+flow is the loop TronFacilitatorSigner used before (gettransactioninfobyid,
+then sleep one block time). Only receipt requests are counted.
+
+Usage:
+    python benchmarks/bench_receipt_watcher.py [--settlements 200] [--block-time 0.1]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bankofai.x402.abi import PAYMENT_PERMIT_ABI
+from bankofai.x402.signers.facilitator import TronFacilitatorSigner
+from bankofai.x402.testing.local_tron_node import LocalTronNode
+from bankofai.x402.utils.receipt_watcher import ReceiptWatcher, TronReceiptSource
+
+NETWORK = "tron:nile"
+BUYER = "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7"
+PERMIT = "TFxDcGvS7zfQrS1YzcCMp673ta2NHHzsiH"
+
+
+async def _poll_each(client, txid: str, interval: float) -> None:
+    while True:
+        try:
+            if (await client.get_transaction_info(txid)).get("blockNumber"):
+                return
+        except Exception:
+            pass
+        await asyncio.sleep(interval)
+
+
+async def _run(settlements: int, block_time: float, shared: bool) -> tuple[int, float]:
+    node = LocalTronNode(block_time=block_time)
+    signer = TronFacilitatorSigner("01" * 32)
+    client = node.client()
+    signer._async_tron_clients[NETWORK] = client
+    watcher = ReceiptWatcher(TronReceiptSource(client), poll_interval=block_time)
+
+    txids = [
+        await signer.write_contract(PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, n], NETWORK)
+        for n in range(settlements)
+    ]
+    before = node.rpc_count
+    start = time.perf_counter()
+    if shared:
+        await asyncio.gather(*(watcher.wait(txid, timeout=60) for txid in txids))
+    else:
+        await asyncio.gather(*(_poll_each(client, txid, block_time) for txid in txids))
+    elapsed = time.perf_counter() - start
+    await signer.ref_blocks.close()
+    return node.rpc_count - before, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--settlements", type=int, default=200)
+    parser.add_argument("--block-time", type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{'waiting':<18}{'receipt RPCs':>14}{'seconds':>10}")
+    for name, shared in (("per transaction", False), ("ReceiptWatcher", True)):
+        rpcs, elapsed = asyncio.run(_run(args.settlements, args.block_time, shared))
+        print(f"{name:<18}{rpcs:>14}{elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
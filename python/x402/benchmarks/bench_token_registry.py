@@ -0,0 +1,86 @@
+"""
+Benchmark TokenRegistry.find_by_address with thousands of tokens per network
+
+Compares the address index against the previous linear scan (normalizing the
+address and comparing it with every token on the network).
+
+Usage:
+    python benchmarks/bench_token_registry.py [--tokens 10000] [--lookups 20000]
+"""
+
+import argparse
+import time
+
+from bankofai.x402.address import TronAddressConverter
+from bankofai.x402.tokens import TokenInfo, TokenRegistry
+from bankofai.x402.utils.address import normalize_tron_address
+
+EVM_NETWORK = "eip155:424242"
+TRON_NETWORK = "tron:bench"
+
+_converter = TronAddressConverter()
+
+
+def _scan(network: str, address: str) -> TokenInfo | None:
+    tokens = TokenRegistry.get_network_tokens(network)
+    if network.startswith("eip155:"):
+        lower = address.lower()
+        for info in tokens.values():
+            if info.address.lower() == lower:
+                return info
+        return None
+    normalized = _converter.normalize(address)
+    for info in tokens.values():
+        if info.address == normalized:
+            return info
+    return None
+
+
+def _rate(fn, network: str, addresses: list[str], lookups: int) -> float:
+    start = time.perf_counter()
+    for i in range(lookups):
+        fn(network, addresses[i % len(addresses)])
+    return lookups / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    evm_addresses = [f"0x{i + 1:040X}" for i in range(args.tokens)]
+    tron_addresses = [normalize_tron_address(f"0x{i + 1:040x}") for i in range(args.tokens)]
+
+    start = time.perf_counter()
+    TokenRegistry.load_tokens(
+        {
+            "tokens": [
+                {"network": network, "address": a, "decimals": 6, "name": "T", "symbol": f"T{i}"}
+                for network, addresses in (
+                    (EVM_NETWORK, evm_addresses),
+                    (TRON_NETWORK, tron_addresses),
+                )
+                for i, a in enumerate(addresses)
+            ]
+        }
+    )
+    print(f"load_tokens: {2 * args.tokens} tokens in {time.perf_counter() - start:.2f} s")
+
+    # Look up the most recently registered (worst case for a scan) tokens
+    hot_evm = [a.lower() for a in evm_addresses[-100:]]
+    hot_tron = tron_addresses[-100:]
+    scan_lookups = max(1, args.lookups // 100)
+
+    print(f"{'network':<12}{'linear scan':>16}{'index':>16}{'speedup':>10}")
+    for name, network, addresses in (
+        ("EVM", EVM_NETWORK, hot_evm),
+        ("TRON", TRON_NETWORK, hot_tron),
+    ):
+        scan = _rate(_scan, network, addresses, scan_lookups)
+        indexed = _rate(TokenRegistry.find_by_address, network, addresses, args.lookups)
+        print(f"{name:<12}{scan:>14.0f}/s{indexed:>14.0f}/s{indexed / scan:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark TRON settlement transactions: tronpy's online builder vs offline building
+
+Both flows send permitTransferFrom to a LocalTronNode that counts requests and
+sleeps ``--latency`` ms per request. The online flow is what write_contract
+did before transactions were built locally (account logging, getcontract,
+build() and its getnodeinfo/getsignweight round trips, broadcast).
+
+Usage:
+    python benchmarks/bench_tron_write_contract.py [--settlements 50] [--latency 20]
+"""
+
+import argparse
+import asyncio
+import time
+
+from bankofai.x402.abi import PAYMENT_PERMIT_ABI, get_abi_json
+from bankofai.x402.signers.facilitator import TronFacilitatorSigner
+from bankofai.x402.testing.local_tron_node import LocalTronNode
+
+NETWORK = "tron:nile"
+PRIVATE_KEY = "01" * 32
+BUYER = "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7"
+TOKEN = "TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf"
+PERMIT = "TFxDcGvS7zfQrS1YzcCMp673ta2NHHzsiH"
+ABI = get_abi_json(PAYMENT_PERMIT_ABI)
+
+
+def _args(nonce: int) -> list:
+    permit = (
+        (0, bytes.fromhex("12" * 16), nonce, 0, int(time.time()) + 3600),
+        BUYER,
+        PERMIT,
+        (TOKEN, 100, BUYER),
+        (PERMIT, 0),
+    )
+    return [permit, BUYER, b"\xab" * 65]
+
+
+async def _online(signer: TronFacilitatorSigner, client, nonce: int) -> str:
+    """The previous write_contract flow, without its logging"""
+    owner = signer.get_address()
+    await client.get_account(owner)
+    await client.get_account_resource(owner)
+    contract = await client.get_contract(PERMIT)
+    contract.abi = PAYMENT_PERMIT_ABI
+    builder = await contract.functions.permitTransferFrom(*_args(nonce))
+    txn = await builder.with_owner(owner).fee_limit(1_000_000_000).build()
+    result = await txn.sign(signer._get_tron_key()).broadcast()
+    return result["txid"]
+
+
+async def _offline(signer: TronFacilitatorSigner, client, nonce: int) -> str:
+    return await signer.write_contract(PERMIT, ABI, "permitTransferFrom", _args(nonce), NETWORK)
+
+
+async def _run(flow, settlements: int, latency: float) -> tuple[float, float]:
+    node = LocalTronNode(latency=latency)
+    signer = TronFacilitatorSigner(PRIVATE_KEY)
+    client = node.client()
+    signer._async_tron_clients[NETWORK] = client
+
+    start = time.perf_counter()
+    for nonce in range(settlements):
+        if not await flow(signer, client, nonce):
+            raise RuntimeError("settlement was not broadcast")
+    elapsed = time.perf_counter() - start
+    assert len(node.transactions) == settlements
+    return node.rpc_count / settlements, elapsed / settlements * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--settlements", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=20.0, help="ms per request")
+    args = parser.parse_args()
+
+    latency = args.latency / 1000
+    print(f"{'flow':<10}{'RPCs/settlement':>18}{'ms/settlement':>16}")
+    for name, flow in (("online", _online), ("offline", _offline)):
+        rpcs, ms = asyncio.run(_run(flow, args.settlements, latency))
+        print(f"{name:<10}{rpcs:>18.2f}{ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
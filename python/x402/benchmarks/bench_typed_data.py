@@ -0,0 +1,123 @@
+"""
+Benchmark EIP-712 digest computation: eth_account encode_typed_data vs precompiled encoders
+
+Usage:
+    python benchmarks/bench_typed_data.py [--iterations 5000]
+"""
+
+import argparse
+import time
+
+from eth_account.messages import encode_typed_data
+from eth_utils import keccak
+
+from bankofai.x402.abi import (
+    EIP712_DOMAIN_TYPE,
+    PAYMENT_PERMIT_PRIMARY_TYPE,
+    get_payment_permit_eip712_types,
+)
+from bankofai.x402.mechanisms._exact_base.types import (
+    TRANSFER_AUTH_EIP712_DOMAIN_TYPE,
+    TRANSFER_AUTH_EIP712_TYPES,
+    TRANSFER_AUTH_PRIMARY_TYPE,
+)
+from bankofai.x402.utils.typed_data import hash_typed_data
+
+PERMIT_DOMAIN = {
+    "name": "PaymentPermit",
+    "chainId": 97,
+    "verifyingContract": "0x1825bB32db3443dEc2cc7508b2D818fc13EaD878",
+}
+PERMIT_MESSAGE = {
+    "meta": {
+        "kind": 0,
+        "paymentId": b"\x12" * 16,
+        "nonce": 7,
+        "validAfter": 0,
+        "validBefore": 2_000_000_000,
+    },
+    "buyer": "0x" + "22" * 20,
+    "caller": "0x" + "33" * 20,
+    "payment": {"payToken": "0x" + "44" * 20, "payAmount": 10**18, "payTo": "0x" + "55" * 20},
+    "fee": {"feeTo": "0x" + "66" * 20, "feeAmount": 10**15},
+}
+AUTH_DOMAIN = {
+    "name": "Tether USD",
+    "version": "1",
+    "chainId": 97,
+    "verifyingContract": "0x337610d27c682E347C9cD60BD4b3b107C9d34dDd",
+}
+AUTH_MESSAGE = {
+    "from": "0x" + "22" * 20,
+    "to": "0x" + "55" * 20,
+    "value": 10**18,
+    "validAfter": 0,
+    "validBefore": 2_000_000_000,
+    "nonce": b"\x77" * 32,
+}
+
+
+def _generic(domain, domain_type, types, primary_type, message) -> bytes:
+    signable = encode_typed_data(
+        full_message={
+            "types": {"EIP712Domain": domain_type, **types},
+            "primaryType": primary_type,
+            "domain": domain,
+            "message": message,
+        }
+    )
+    return keccak(b"\x19" + signable.version + signable.header + signable.body)
+
+
+def _time(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    cases = [
+        (
+            "PaymentPermitDetails",
+            lambda: _generic(
+                PERMIT_DOMAIN,
+                EIP712_DOMAIN_TYPE,
+                get_payment_permit_eip712_types(),
+                PAYMENT_PERMIT_PRIMARY_TYPE,
+                PERMIT_MESSAGE,
+            ),
+            lambda: hash_typed_data(
+                PERMIT_DOMAIN, get_payment_permit_eip712_types(), PERMIT_MESSAGE
+            ),
+        ),
+        (
+            "TransferWithAuthorization",
+            lambda: _generic(
+                AUTH_DOMAIN,
+                TRANSFER_AUTH_EIP712_DOMAIN_TYPE,
+                TRANSFER_AUTH_EIP712_TYPES,
+                TRANSFER_AUTH_PRIMARY_TYPE,
+                AUTH_MESSAGE,
+            ),
+            lambda: hash_typed_data(AUTH_DOMAIN, TRANSFER_AUTH_EIP712_TYPES, AUTH_MESSAGE),
+        ),
+    ]
+
+    print(f"{'struct':<28}{'encode_typed_data':>20}{'precompiled':>14}{'speedup':>10}")
+    for name, generic, compiled in cases:
+        assert generic() == compiled()
+        generic_us = _time(generic, args.iterations)
+        compiled_us = _time(compiled, args.iterations)
+        print(
+            f"{name:<28}{generic_us:>17.1f} us{compiled_us:>11.1f} us"
+            f"{generic_us / compiled_us:>9.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -132,6 +132,41 @@ PAYMENT_PERMIT_ABI: List[dict[str, Any]] = [
 ]
 
 
+# keccak256("Transfer(address,address,uint256)")
+ERC20_TRANSFER_TOPIC = "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+
+# Multicall3 aggregate3: executes calls in order, each may be allowed to fail.
+# msg.sender of the inner calls is the Multicall3 contract.
+MULTICALL3_ABI: List[dict[str, Any]] = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"},
+                ],
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "stateMutability": "payable",
+        "type": "function",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"},
+                ],
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+    },
+]
+
+
 def get_abi_json(abi: List[dict[str, Any]]) -> str:
     """Convert ABI list to JSON string"""
     return json.dumps(abi)
@@ -275,6 +310,40 @@ def get_function_signature(abi: List[dict[str, Any]], method_name: str) -> str:
     return f"{method_name}({','.join(input_types)})"
 
 
+def get_function_input_types(abi: List[dict[str, Any]], method_name: str) -> list[str]:
+    """Get the ABI type strings of a function's inputs (for eth_abi encode/decode).
+
+    Example:
+        >>> get_function_input_types(PAYMENT_PERMIT_ABI, "permitTransferFrom")
+        ['((uint8,bytes16,uint256,uint256,uint256),address,address,...)', 'address', 'bytes']
+    """
+    signature = get_function_signature(abi, method_name)
+    return split_abi_types(signature[len(method_name) + 1 : -1])
+
+
+def split_abi_types(types: str) -> list[str]:
+    """Split a comma-separated ABI type list at its top-level commas.
+
+    Example:
+        >>> split_abi_types("(uint8,bytes16),address")
+        ['(uint8,bytes16)', 'address']
+    """
+    parts: list[str] = []
+    depth = 0
+    start = 0
+    for i, ch in enumerate(types):
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(types[start:i])
+            start = i + 1
+    if types:
+        parts.append(types[start:])
+    return parts
+
+
 def get_all_method_ids(abi: List[dict[str, Any]]) -> dict[str, str]:
     """Get Method IDs for all functions in ABI.
 
@@ -0,0 +1,7 @@
+"""
+ASGI middleware for x402 payment handling
+"""
+
+from bankofai.x402.asgi.middleware import PaymentRoute, X402ASGIMiddleware
+
+__all__ = ["X402ASGIMiddleware", "PaymentRoute"]
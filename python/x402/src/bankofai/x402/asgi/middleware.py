@@ -0,0 +1,267 @@
+"""
+ASGI middleware for x402 payment processing
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, MutableMapping, Sequence
+
+from bankofai.x402.compact import PAYMENT_ENCODING_HEADER
+from bankofai.x402.server import RoutePlan, SettlementPolicy, SettlementQueue, X402Server
+from bankofai.x402.server.payment_gate import (
+    PAYMENT_RESPONSE_HEADER,
+    PAYMENT_SIGNATURE_HEADER,
+    PaymentDecision,
+    PaymentGate,
+)
+from bankofai.x402.types import ConfirmationLevel
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+ASGIApp = Callable[[Scope, Receive, Send], Awaitable[None]]
+
+_SIGNATURE_HEADER_KEY = PAYMENT_SIGNATURE_HEADER.lower().encode("latin-1")
+_RESPONSE_HEADER_KEY = PAYMENT_RESPONSE_HEADER.lower().encode("latin-1")
+_ENCODING_HEADER_KEY = PAYMENT_ENCODING_HEADER.lower().encode("latin-1")
+_PARAM_PATTERN = re.compile(r"\{(\w+)(:path)?\}")
+
+
+def _compile_path(path: str) -> re.Pattern[str] | None:
+    """
+    Compile a path pattern into a regex, or None for a literal path.
+
+    Supported patterns:
+        ``/files/{name}``       one path segment
+        ``/files/{rest:path}``  the remainder of the path
+        ``/static/*``           any path below ``/static/``
+    """
+    if path.endswith("/*"):
+        return re.compile(re.escape(path[:-1]) + ".*")
+    if "{" not in path:
+        return None
+
+    regex = ""
+    pos = 0
+    for match in _PARAM_PATTERN.finditer(path):
+        regex += re.escape(path[pos : match.start()])
+        regex += ".*" if match.group(2) else "[^/]+"
+        pos = match.end()
+    regex += re.escape(path[pos:])
+    return re.compile(regex)
+
+
+@dataclass(frozen=True)
+class PaymentRoute:
+    """
+    A protected path pattern, the HTTP methods it applies to and its route plan.
+
+    ``methods=None`` protects every method. Listing ``GET`` also protects ``HEAD``.
+    """
+
+    path: str
+    plan: RoutePlan
+    methods: frozenset[str] | None = None
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        prices: list[str],
+        schemes: list[str],
+        network: str,
+        pay_to: str,
+        methods: Iterable[str] | None = None,
+        valid_for: int = 3600,
+        delivery_mode: str = "PAYMENT_ONLY",
+        settlement: SettlementPolicy | None = None,
+        confirmation: ConfirmationLevel | None = None,
+    ) -> "PaymentRoute":
+        """
+        Create a protected route.
+
+        Args:
+            path: Path pattern (e.g. "/downloads/{name}" or "/static/*")
+            prices: List of price strings (e.g. ["0.0001 USDT", "0.0001 DHLU"])
+            schemes: List of scheme strings matching *prices*
+            network: Network identifier (shared by all prices)
+            pay_to: Payment recipient address
+            methods: HTTP methods to protect (default: all)
+            valid_for: Payment validity period (seconds)
+            delivery_mode: Delivery mode
+            settlement: Settlement policy (see SettlementPolicy)
+            confirmation: Confirmation level settlement waits for (see ResourceConfig)
+
+        Returns:
+            PaymentRoute
+        """
+        plan = RoutePlan.from_prices(
+            prices, schemes, network, pay_to, valid_for, delivery_mode, settlement, confirmation
+        )
+        method_set = None
+        if methods is not None:
+            method_set = {m.upper() for m in methods}
+            if "GET" in method_set:
+                method_set.add("HEAD")
+        return cls(
+            path=path,
+            plan=plan,
+            methods=frozenset(method_set) if method_set is not None else None,
+        )
+
+    def allows(self, method: str) -> bool:
+        return self.methods is None or method in self.methods
+
+
+class _RouteTable:
+    """Literal paths are resolved with a dict lookup, patterns in declaration order."""
+
+    def __init__(self) -> None:
+        self._literal: dict[str, list[PaymentRoute]] = {}
+        self._patterns: list[tuple[re.Pattern[str], PaymentRoute]] = []
+
+    def add(self, route: PaymentRoute) -> None:
+        regex = _compile_path(route.path)
+        if regex is None:
+            self._literal.setdefault(route.path, []).append(route)
+        else:
+            self._patterns.append((regex, route))
+
+    def match(self, method: str, path: str) -> PaymentRoute | None:
+        for route in self._literal.get(path, ()):
+            if route.allows(method):
+                return route
+        for regex, route in self._patterns:
+            if route.allows(method) and regex.fullmatch(path):
+                return route
+        return None
+
+
+def _request_url(scope: Scope) -> str:
+    """Reconstruct the request URL from an HTTP scope."""
+    scheme = scope.get("scheme", "http")
+    host = None
+    for key, value in scope.get("headers", ()):
+        if key == b"host":
+            host = value.decode("latin-1")
+            break
+    if host is None:
+        server = scope.get("server")
+        if server:
+            name, port = server
+            default_port = {"http": 80, "https": 443}.get(scheme)
+            host = name if port == default_port else f"{name}:{port}"
+        else:
+            host = "localhost"
+
+    url = f"{scheme}://{host}{scope.get('root_path', '')}{scope['path']}"
+    query = scope.get("query_string", b"")
+    if query:
+        url += "?" + query.decode("latin-1")
+    return url
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            decoded: str = value.decode("latin-1")
+            return decoded
+    return None
+
+
+class X402ASGIMiddleware:
+    """
+    Pure ASGI middleware for automatic 402 payment handling.
+
+    Unlike the FastAPI decorator it works on raw ASGI messages: it protects any
+    path served by the wrapped app (static files, mounted sub-apps, streaming
+    responses), and passes response bodies through untouched. The
+    PAYMENT-RESPONSE header is added to the ``http.response.start`` message.
+
+    Usage:
+        app = FastAPI()
+        server = X402Server().set_facilitator(...)
+        app.add_middleware(
+            X402ASGIMiddleware,
+            server=server,
+            routes=[
+                PaymentRoute.create(
+                    "/downloads/{name}", prices=["1 USDT"], schemes=["exact_permit"],
+                    network="tron:nile", pay_to="T...", methods=["GET"],
+                ),
+            ],
+        )
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        server: X402Server,
+        routes: Sequence[PaymentRoute] = (),
+        settlement_queue: SettlementQueue | None = None,
+        compact: bool = False,
+    ) -> None:
+        """
+        Initialize middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            server: X402Server used to build requirements and settle payments
+            routes: Protected routes; the first matching route wins
+            settlement_queue: Queue for routes with an async SettlementPolicy
+            compact: Offer the compact wire format to clients (see PaymentGate)
+        """
+        self._app = app
+        self._gate = PaymentGate(server, settlement_queue, compact)
+        self._routes = _RouteTable()
+        for route in routes:
+            self.add_route(route)
+
+    def add_route(self, route: PaymentRoute) -> None:
+        """Protect another route."""
+        if route.plan.settlement.is_async and self._gate.settlement_queue is None:
+            raise ValueError(f"Async settlement on {route.path} requires a settlement_queue")
+        self._routes.add(route)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self._app(scope, receive, send)
+            return
+
+        route = self._routes.match(scope["method"], scope["path"])
+        if route is None:
+            await self._app(scope, receive, send)
+            return
+
+        decision = await self._gate.process(
+            route.plan,
+            _header(scope, _SIGNATURE_HEADER_KEY),
+            _request_url(scope),
+            _header(scope, _ENCODING_HEADER_KEY),
+        )
+        if not decision.allowed:
+            await self._send_decision(decision, send)
+            return
+
+        payment_response = (_RESPONSE_HEADER_KEY, decision.payment_response_header().encode())
+
+        async def send_with_payment_response(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = [*message.get("headers", ()), payment_response]
+            await send(message)
+
+        await self._app(scope, receive, send_with_payment_response)
+
+    @staticmethod
+    async def _send_decision(decision: PaymentDecision, send: Send) -> None:
+        headers = [
+            (key.lower().encode("latin-1"), value.encode("latin-1"))
+            for key, value in decision.headers.items()
+        ]
+        headers.append((b"content-length", str(len(decision.body)).encode("latin-1")))
+        await send(
+            {"type": "http.response.start", "status": decision.status_code, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": decision.body})
@@ -8,6 +8,11 @@ from typing import Any
 import httpx
 
 from bankofai.x402.clients.x402_client import PaymentRequirementsSelector, X402Client
+from bankofai.x402.compact import (
+    COMPACT_ENCODINGS,
+    PAYMENT_ENCODING_HEADER,
+    negotiate_encoding,
+)
 from bankofai.x402.encoding import decode_payment_payload, encode_payment_payload
 from bankofai.x402.types import PaymentPayload, PaymentRequired
 
@@ -31,6 +36,7 @@ class X402HttpClient:
         http_client: httpx.AsyncClient,
         x402_client: X402Client,
         selector: PaymentRequirementsSelector | None = None,
+        compact: bool = False,
     ) -> None:
         """
         Initialize HTTP client adapter.
@@ -39,10 +45,14 @@ class X402HttpClient:
             http_client: httpx.AsyncClient instance
             x402_client: X402Client instance
             selector: Custom payment requirements selector (optional)
+            compact: Ask servers for the compact wire format and send
+                PAYMENT-SIGNATURE compact to servers that advertise it;
+                falls back to JSON otherwise
         """
         self._http_client = http_client
         self._x402_client = x402_client
         self._selector = selector
+        self._compact = compact
 
     async def request_with_payment(
         self,
@@ -68,6 +78,10 @@ class X402HttpClient:
             4. Retry with PAYMENT-SIGNATURE header
         """
         logger.info(f"Making {method} request to {url}")
+        if self._compact:
+            headers = dict(kwargs.get("headers", {}))
+            headers[PAYMENT_ENCODING_HEADER] = ", ".join(COMPACT_ENCODINGS)
+            kwargs["headers"] = headers
         response = await self._http_client.request(method, url, **kwargs)
         logger.info(f"Received response: status={response.status_code}")
 
@@ -108,7 +122,15 @@ class X402HttpClient:
             logger.error(f"Failed to create payment payload: {e}", exc_info=True)
             raise
 
-        return await self._retry_with_payment(method, url, payment_payload, kwargs)
+        encoding = None
+        if self._compact:
+            encoding = negotiate_encoding(response.headers.get(PAYMENT_ENCODING_HEADER))
+        retry = await self._retry_with_payment(method, url, payment_payload, kwargs, encoding)
+        if encoding is not None and retry.status_code == 400:
+            # The server advertised the compact format but could not read it
+            logger.warning(f"Compact payment rejected ({encoding}), retrying with JSON")
+            retry = await self._retry_with_payment(method, url, payment_payload, kwargs)
+        return retry
 
     async def get(self, url: str, **kwargs: Any) -> httpx.Response:
         """GET request with payment handling"""
@@ -162,10 +184,11 @@ class X402HttpClient:
         url: str,
         payment_payload: PaymentPayload,
         kwargs: dict[str, Any],
+        encoding: str | None = None,
     ) -> httpx.Response:
-        """Retry request with payment payload"""
+        """Retry request with payment payload (compact if *encoding* is set)"""
         logger.info("Retrying request with payment signature")
-        encoded_payload = encode_payment_payload(payment_payload)
+        encoded_payload = encode_payment_payload(payment_payload, encoding=encoding)
         logger.debug(f"Encoded payment payload length: {len(encoded_payload)} chars")
 
         headers = dict(kwargs.get("headers", {}))
@@ -0,0 +1,458 @@
+"""
+Compact binary wire format for PAYMENT-* headers and facilitator requests
+
+An opt-in alternative to base64 JSON, negotiated with the PAYMENT-ENCODING
+header. Payloads are CBOR (RFC 8949) where:
+
+- known field names are replaced by small integers (``_FIELDS``),
+- lowercase 0x-hex strings (signatures, payment ids, addresses) are sent as
+  raw bytes,
+- TRON Base58Check and EIP-55 checksummed addresses are sent as their 20
+  address bytes under a tag that restores the exact original text,
+- canonical decimal strings (amounts, nonces) are sent as integers,
+
+optionally followed by raw deflate. Every value round-trips to the exact JSON
+data it was encoded from, so decoded payloads validate into the same models.
+
+A compact value starts with a marker byte (``0xC1`` CBOR, ``0xC2`` deflated
+CBOR). In headers it is base64url-encoded without padding, so it always
+starts with ``w`` while base64 JSON starts with ``e``; decoders tell the two
+apart without any negotiation.
+
+Usage:
+    header = encode_compact_header(payload.model_dump(by_alias=True), CBOR_DEFLATE)
+    data = decode_compact_header(header)
+"""
+
+import base64
+import struct
+import zlib
+from typing import Any, Iterable
+
+CBOR = "cbor"
+CBOR_DEFLATE = "cbor+deflate"
+# In order of preference
+COMPACT_ENCODINGS = (CBOR_DEFLATE, CBOR)
+
+PAYMENT_ENCODING_HEADER = "PAYMENT-ENCODING"
+COMPACT_CONTENT_TYPE = "application/x402-compact"
+
+MAX_DECODED_SIZE = 64 * 1024
+# Payment payloads nest a handful of levels; deeper input is rejected, not recursed into
+MAX_DEPTH = 32
+
+_MARKERS = {CBOR: 0xC1, CBOR_DEFLATE: 0xC2}
+_ENCODINGS = {marker: encoding for encoding, marker in _MARKERS.items()}
+_HEADER_PREFIX = "w"
+
+# Field names replaced by their index. Append only: indices are part of the format.
+_FIELDS = (
+    "x402Version",
+    "payload",
+    "accepted",
+    "accepts",
+    "resource",
+    "extensions",
+    "error",
+    "scheme",
+    "network",
+    "amount",
+    "asset",
+    "payTo",
+    "maxTimeoutSeconds",
+    "extra",
+    "name",
+    "version",
+    "fee",
+    "feeTo",
+    "feeAmount",
+    "signature",
+    "paymentPermit",
+    "meta",
+    "kind",
+    "paymentId",
+    "nonce",
+    "validAfter",
+    "validBefore",
+    "buyer",
+    "caller",
+    "payment",
+    "payToken",
+    "payAmount",
+    "url",
+    "description",
+    "mimeType",
+    "paymentPermitContext",
+    "success",
+    "transaction",
+    "errorReason",
+    "isValid",
+    "invalidReason",
+    "paymentPayload",
+    "paymentRequirements",
+    "merchantSignature",
+    "facilitatorId",
+    "pricing",
+    "expiresAt",
+    "receipt",
+    "blockNumber",
+    "status",
+    "kinds",
+    "data",
+    "hash",
+    "logs",
+    "topics",
+    "address",
+    "result",
+    "confirmation",
+)
+_FIELD_INDEX = {name: i for i, name in enumerate(_FIELDS)}
+
+# Tags from the first-come-first-served range
+TAG_TRON_ADDRESS = 40401
+TAG_CHECKSUM_ADDRESS = 40402
+TAG_DECIMAL = 40403
+
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+
+def _head(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes([major << 5 | value])
+    if value < 0x100:
+        return bytes([major << 5 | 24, value])
+    if value < 0x10000:
+        return bytes([major << 5 | 25]) + value.to_bytes(2, "big")
+    if value < 0x100000000:
+        return bytes([major << 5 | 26]) + value.to_bytes(4, "big")
+    return bytes([major << 5 | 27]) + value.to_bytes(8, "big")
+
+
+def _encode_int(value: int, out: bytearray) -> None:
+    major = 0 if value >= 0 else 1
+    magnitude = value if value >= 0 else -1 - value
+    if magnitude < 1 << 64:
+        out += _head(major, magnitude)
+        return
+    # Bignum (tag 2 / 3)
+    raw = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, "big")
+    out += _head(6, 2 + major) + _head(2, len(raw)) + raw
+
+
+def _address_bytes(text: str) -> tuple[int, bytes] | None:
+    """(tag, 20 bytes) for an address whose text form the tag restores exactly"""
+    if len(text) == 34 and text.startswith("T"):
+        from bankofai.x402.utils.address import parse_address
+
+        parsed = parse_address(text)
+        if parsed is not None and parsed.to_base58() == text:
+            return TAG_TRON_ADDRESS, parsed.raw
+        return None
+    if len(text) == 42 and text.startswith("0x"):
+        try:
+            from eth_utils.address import to_checksum_address
+        except ImportError:
+            return None
+        try:
+            if to_checksum_address(text) == text:
+                return TAG_CHECKSUM_ADDRESS, bytes.fromhex(text[2:])
+        except ValueError:
+            return None
+    return None
+
+
+def _encode_str(value: str, out: bytearray) -> None:
+    if value.startswith("0x") and len(value) > 2 and len(value) % 2 == 0:
+        body = value[2:]
+        if _HEX_DIGITS.issuperset(body):
+            out += _head(2, len(body) // 2) + bytes.fromhex(body)
+            return
+    if value.isdigit() and value.isascii() and (value == "0" or value[0] != "0"):
+        out += _head(6, TAG_DECIMAL)
+        _encode_int(int(value), out)
+        return
+    address = _address_bytes(value)
+    if address is not None:
+        tag, raw = address
+        out += _head(6, tag) + _head(2, len(raw)) + raw
+        return
+    raw = value.encode("utf-8")
+    out += _head(3, len(raw)) + raw
+
+
+def _encode_key(key: Any) -> bytes:
+    index = _FIELD_INDEX.get(key)
+    if index is not None:
+        return _head(0, index)
+    raw = str(key).encode("utf-8")
+    return _head(3, len(raw)) + raw
+
+
+def _encode(value: Any, out: bytearray) -> None:
+    if isinstance(value, str):
+        _encode_str(value, out)
+    elif value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif isinstance(value, int):
+        _encode_int(value, out)
+    elif isinstance(value, float):
+        out += b"\xfb" + struct.pack(">d", value)
+    elif isinstance(value, dict):
+        out += _head(5, len(value))
+        for key, item in value.items():
+            out += _encode_key(key)
+            _encode(item, out)
+    elif isinstance(value, (list, tuple)):
+        out += _head(4, len(value))
+        for item in value:
+            _encode(item, out)
+    else:
+        raise ValueError(f"Cannot encode {type(value).__name__} in the compact format")
+
+
+class _Decoder:
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+        self._depth = 0
+
+    def _take(self, size: int) -> bytes:
+        end = self._pos + size
+        if end > len(self._data):
+            raise ValueError("Truncated compact payload")
+        chunk = self._data[self._pos : end]
+        self._pos = end
+        return chunk
+
+    def _head(self) -> tuple[int, int]:
+        initial = self._take(1)[0]
+        major, info = initial >> 5, initial & 0x1F
+        if info < 24 or major == 7:
+            return major, info
+        if info > 27:
+            raise ValueError("Indefinite lengths are not supported")
+        return major, int.from_bytes(self._take(1 << (info - 24)), "big")
+
+    def decode(self) -> Any:
+        value = self._value()
+        if self._pos != len(self._data):
+            raise ValueError("Trailing data after compact payload")
+        return value
+
+    def _value(self) -> Any:
+        self._depth += 1
+        if self._depth > MAX_DEPTH:
+            raise ValueError("Compact payload nested too deeply")
+        try:
+            return self._item()
+        finally:
+            self._depth -= 1
+
+    def _item(self) -> Any:
+        major, arg = self._head()
+        if major == 0:
+            return arg
+        if major == 1:
+            return -1 - arg
+        if major == 2:
+            return "0x" + self._take(arg).hex()
+        if major == 3:
+            return self._take(arg).decode("utf-8")
+        if major == 4:
+            return [self._value() for _ in range(arg)]
+        if major == 5:
+            result = {}
+            for _ in range(arg):
+                key = self._value()
+                if isinstance(key, int) and not isinstance(key, bool):
+                    if not 0 <= key < len(_FIELDS):
+                        raise ValueError(f"Unknown field index {key}")
+                    key = _FIELDS[key]
+                elif not isinstance(key, str):
+                    raise ValueError("Map keys must be strings or field indexes")
+                result[key] = self._value()
+            return result
+        if major == 6:
+            return self._tagged(arg)
+        if arg == 20:
+            return False
+        if arg == 21:
+            return True
+        if arg == 22:
+            return None
+        if arg == 27:
+            return struct.unpack(">d", self._take(8))[0]
+        raise ValueError(f"Unsupported simple value {arg}")
+
+    def _raw_bytes(self) -> bytes:
+        major, size = self._head()
+        if major != 2:
+            raise ValueError("Expected a byte string")
+        return self._take(size)
+
+    def _address_bytes(self) -> bytes:
+        raw = self._raw_bytes()
+        if len(raw) != 20:
+            raise ValueError("Address tag must wrap 20 bytes")
+        return raw
+
+    def _tagged(self, tag: int) -> Any:
+        if tag in (2, 3):
+            magnitude = int.from_bytes(self._raw_bytes(), "big")
+            return magnitude if tag == 2 else -1 - magnitude
+        if tag == TAG_DECIMAL:
+            value = self._value()
+            if not isinstance(value, int):
+                raise ValueError("Decimal tag must wrap an integer")
+            return str(value)
+        if tag == TAG_TRON_ADDRESS:
+            from bankofai.x402.utils.address import CHAIN_TRON, CompactAddress
+
+            return CompactAddress(self._address_bytes(), CHAIN_TRON).to_base58()
+        if tag == TAG_CHECKSUM_ADDRESS:
+            from eth_utils.address import to_checksum_address
+
+            return to_checksum_address(self._address_bytes())
+        raise ValueError(f"Unsupported tag {tag}")
+
+
+def encode_compact(data: Any, encoding: str = CBOR) -> bytes:
+    """
+    Encode JSON-compatible data in the compact format.
+
+    Raises:
+        ValueError: If *encoding* is unknown or *data* holds non-JSON values
+    """
+    marker = _MARKERS.get(encoding)
+    if marker is None:
+        raise ValueError(f"Unknown compact encoding '{encoding}'")
+    out = bytearray()
+    _encode(data, out)
+    if encoding == CBOR_DEFLATE:
+        compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+        out = bytearray(compressor.compress(bytes(out)) + compressor.flush())
+    return bytes([marker]) + bytes(out)
+
+
+class CompactPrefix:
+    """
+    Compact encoding of maps whose leading fields are always the same.
+
+    The leading fields are encoded (and fed to the deflate compressor) once;
+    ``encode`` only encodes the remaining fields of each value.
+
+    Args:
+        fields: The leading fields, in order
+        size: Total number of fields of every encoded map
+        encoding: Compact encoding
+    """
+
+    def __init__(self, fields: dict[str, Any], size: int, encoding: str = CBOR) -> None:
+        marker = _MARKERS.get(encoding)
+        if marker is None:
+            raise ValueError(f"Unknown compact encoding '{encoding}'")
+        if size < len(fields):
+            raise ValueError("size must cover the leading fields")
+        self._marker = bytes([marker])
+        self._rest = size - len(fields)
+        prefix = bytearray(_head(5, size))
+        for key, item in fields.items():
+            prefix += _encode_key(key)
+            _encode(item, prefix)
+        self._prefix = bytes(prefix)
+        self._compressor: Any = None
+        if encoding == CBOR_DEFLATE:
+            self._compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+            self._prefix = self._compressor.compress(self._prefix)
+
+    def encode(self, rest: dict[str, Any]) -> bytes:
+        """Compact value of the map made of the leading fields followed by *rest*"""
+        if len(rest) != self._rest:
+            raise ValueError(f"Expected {self._rest} more fields, got {len(rest)}")
+        out = bytearray()
+        for key, item in rest.items():
+            out += _encode_key(key)
+            _encode(item, out)
+        if self._compressor is None:
+            return self._marker + self._prefix + bytes(out)
+        compressor = self._compressor.copy()
+        body: bytes = compressor.compress(bytes(out)) + compressor.flush()
+        return self._marker + self._prefix + body
+
+    def encode_header(self, rest: dict[str, Any]) -> str:
+        """``encode`` as a compact header value"""
+        return base64.urlsafe_b64encode(self.encode(rest)).rstrip(b"=").decode("ascii")
+
+
+def decode_compact(data: bytes) -> Any:
+    """
+    Decode a compact value back into JSON-compatible data.
+
+    Raises:
+        ValueError: If *data* is malformed or inflates beyond MAX_DECODED_SIZE
+    """
+    if not data:
+        raise ValueError("Empty compact payload")
+    encoding = _ENCODINGS.get(data[0])
+    if encoding is None:
+        raise ValueError("Not a compact payload")
+    body = data[1:]
+    if encoding == CBOR_DEFLATE:
+        decompressor = zlib.decompressobj(-15)
+        try:
+            body = decompressor.decompress(body, MAX_DECODED_SIZE)
+        except zlib.error as e:
+            raise ValueError(f"Invalid deflate stream: {e}")
+        if decompressor.unconsumed_tail:
+            raise ValueError("Compact payload too large")
+    try:
+        return _Decoder(body).decode()
+    except ValueError:
+        raise
+    except Exception as e:
+        # Callers handle malformed input as ValueError only
+        raise ValueError(f"Invalid compact payload: {e}") from e
+
+
+def is_compact_header(value: str) -> bool:
+    """True if a header value uses the compact format rather than base64 JSON."""
+    return value.startswith(_HEADER_PREFIX)
+
+
+def encode_compact_header(data: Any, encoding: str = CBOR) -> str:
+    """Encode data as a compact header value (base64url, no padding)."""
+    return base64.urlsafe_b64encode(encode_compact(data, encoding)).rstrip(b"=").decode("ascii")
+
+
+def decode_compact_header(value: str) -> Any:
+    """Decode a compact header value (see is_compact_header)."""
+    padded = value + "=" * (-len(value) % 4)
+    return decode_compact(base64.urlsafe_b64decode(padded))
+
+
+def parse_encodings(value: str | None) -> list[str]:
+    """Encodings listed in a PAYMENT-ENCODING header value, in order."""
+    if not value:
+        return []
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def negotiate_encoding(
+    offered: str | None, supported: Iterable[str] = COMPACT_ENCODINGS
+) -> str | None:
+    """
+    Pick the compact encoding to use from a peer's PAYMENT-ENCODING header.
+
+    Returns:
+        The first encoding listed by the peer that is also supported, or None
+        to use JSON
+    """
+    supported = set(supported)
+    for encoding in parse_encodings(offered):
+        if encoding in supported:
+            return encoding
+    return None
@@ -42,6 +42,15 @@ class NetworkConfig:
         "eip155:56": "0x1825bB32db3443dEc2cc7508b2D818fc13EaD878",
     }
 
+    # Multicall3 contracts used for batched settlement. Networks without an entry
+    # settle every payment in its own transaction.
+    MULTICALL_ADDRESSES: Dict[str, str] = {
+        "eip155:1": "0xcA11bde05977b3631167028862bE2a173976CA11",
+        "eip155:11155111": "0xcA11bde05977b3631167028862bE2a173976CA11",
+        "eip155:56": "0xcA11bde05977b3631167028862bE2a173976CA11",
+        "eip155:97": "0xcA11bde05977b3631167028862bE2a173976CA11",
+    }
+
     # RPC URLs for EVM networks
     RPC_URLS: Dict[str, str] = {
         "eip155:97": "https://data-seed-prebsc-1-s1.binance.org:8545/",
@@ -86,6 +95,18 @@ class NetworkConfig:
             raise UnsupportedNetworkError(f"Unsupported network: {network}")
         return chain_id
 
+    @classmethod
+    def get_multicall_address(cls, network: str) -> str | None:
+        """Get Multicall3 contract address for network
+
+        Args:
+            network: Network identifier (e.g., "eip155:97")
+
+        Returns:
+            Contract address, or None if batching is not available on the network
+        """
+        return cls.MULTICALL_ADDRESSES.get(network)
+
     @classmethod
     def get_payment_permit_address(cls, network: str) -> str:
         """Get PaymentPermit contract address for network
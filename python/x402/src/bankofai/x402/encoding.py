@@ -1,14 +1,52 @@
 """
 Encoding utilities for x402 protocol
+
+PAYMENT-* headers are base64-encoded JSON. Pydantic models are serialized with
+``model_dump_json`` and parsed straight from the decoded bytes with
+``model_validate_json``, skipping the intermediate dict and ``str``. Plain
+dicts use orjson when it is installed and the standard library otherwise.
 """
 
 import base64
 import json
-from typing import Any, TypeVar
+from types import ModuleType
+from typing import Any, Optional, TypeVar, cast, overload
+
+from pydantic import BaseModel
 
 T = TypeVar("T")
 
 
+def _import_orjson() -> Optional[ModuleType]:
+    try:
+        import orjson
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+    return orjson
+
+
+orjson = _import_orjson()
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serialize plain data to compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            encoded: bytes = orjson.dumps(data)
+            return encoded
+        except TypeError:
+            # e.g. integers beyond 64 bits (uint256 amounts)
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: str | bytes) -> Any:
+    """Parse JSON from text or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def encode_base64(data: str | bytes) -> str:
     """Encode data to base64"""
     if isinstance(data, str):
@@ -26,22 +64,56 @@ def decode_base64_bytes(data: str) -> bytes:
     return base64.b64decode(data)
 
 
-def encode_payment_payload(payload: Any) -> str:
-    """Encode payment payload to base64 for HTTP header"""
-    if hasattr(payload, "model_dump"):
-        json_str = json.dumps(payload.model_dump(by_alias=True))
+def encode_payment_payload(
+    payload: Any, exclude: set[str] | None = None, encoding: str | None = None
+) -> str:
+    """Encode payment payload to base64 for HTTP header
+
+    Args:
+        payload: Pydantic model or plain JSON-serializable data
+        exclude: Model fields to leave out (models only)
+        encoding: Compact encoding negotiated with the peer (see
+            bankofai.x402.compact); None for base64 JSON
+    """
+    if encoding is not None:
+        from bankofai.x402.compact import encode_compact_header
+
+        if hasattr(payload, "model_dump"):
+            payload = payload.model_dump(mode="json", by_alias=True, exclude=exclude)
+        return encode_compact_header(payload, encoding)
+    if hasattr(payload, "model_dump_json"):
+        data = payload.model_dump_json(by_alias=True, exclude=exclude).encode("utf-8")
     else:
-        json_str = json.dumps(payload)
-    return encode_base64(json_str)
+        data = json_dumps(payload)
+    return base64.b64encode(data).decode("ascii")
+
+
+@overload
+def decode_payment_payload(encoded: str, model_class: None = None) -> dict[str, Any]: ...
+
+
+@overload
+def decode_payment_payload(encoded: str, model_class: type[T]) -> T: ...
 
 
 def decode_payment_payload(encoded: str, model_class: type[T] | None = None) -> T | dict[str, Any]:
-    """Decode payment payload from base64 HTTP header"""
-    json_str = decode_base64(encoded)
-    data = json.loads(json_str)
+    """Decode payment payload from base64 HTTP header (JSON or compact format)"""
+    from bankofai.x402.compact import decode_compact_header, is_compact_header
+
+    if is_compact_header(encoded):
+        fields: dict[str, Any] = decode_compact_header(encoded)
+        if model_class is None:
+            return fields
+        if issubclass(model_class, BaseModel):
+            return cast(T, model_class.model_validate(fields))
+        return model_class(**fields)
+    data = base64.b64decode(encoded)
+    if model_class is not None and issubclass(model_class, BaseModel):
+        return cast(T, model_class.model_validate_json(data))
+    parsed: dict[str, Any] = json_loads(data)
     if model_class is not None:
-        return model_class(**data)
-    return data
+        return model_class(**parsed)
+    return parsed
 
 
 def bytes_to_hex(data: bytes, prefix: bool = True) -> str:
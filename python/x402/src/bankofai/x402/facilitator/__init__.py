@@ -2,7 +2,9 @@
 x402 Facilitator SDK
 """
 
+from bankofai.x402.facilitator.app import FacilitatorApp
 from bankofai.x402.facilitator.facilitator_client import FacilitatorClient
+from bankofai.x402.facilitator.local_client import LocalFacilitatorClient
 from bankofai.x402.facilitator.x402_facilitator import X402Facilitator
 
-__all__ = ["X402Facilitator", "FacilitatorClient"]
+__all__ = ["X402Facilitator", "FacilitatorClient", "LocalFacilitatorClient", "FacilitatorApp"]
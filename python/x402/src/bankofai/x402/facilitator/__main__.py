@@ -0,0 +1,210 @@
+"""
+Run a facilitator HTTP service
+
+Usage:
+    TRON_PRIVATE_KEY=... python -m bankofai.x402.facilitator --networks tron:nile --port 8001
+
+Signing keys are read from the environment: ``TRON_PRIVATE_KEY`` for ``tron:*``
+networks and ``BSC_PRIVATE_KEY`` for ``eip155:*`` networks. Requires uvicorn
+(``pip install bankofai-x402[facilitator]``).
+"""
+
+import argparse
+import json
+import logging
+import os
+from typing import Any
+
+from bankofai.x402.facilitator.app import (
+    DEFAULT_DRAIN_TIMEOUT,
+    DEFAULT_MAX_BODY_SIZE,
+    DEFAULT_QUEUE_TIMEOUT,
+    DEFAULT_SETTLE_CONCURRENCY,
+    DEFAULT_VERIFY_CONCURRENCY,
+    FacilitatorApp,
+)
+from bankofai.x402.facilitator.x402_facilitator import X402Facilitator
+
+# Options are handed to worker processes through this variable
+CONFIG_ENV = "X402_FACILITATOR_CONFIG"
+
+
+def create_facilitator(
+    networks: list[str],
+    base_fee: dict[str, int] | None = None,
+    env: dict[str, str] | None = None,
+) -> X402Facilitator:
+    """
+    Build a facilitator with the exact_permit and exact mechanisms for *networks*.
+
+    Args:
+        networks: Network identifiers (tron:* and/or eip155:*)
+        base_fee: Base fee per token symbol for exact_permit
+        env: Environment to read private keys from (default: os.environ)
+
+    Returns:
+        Configured X402Facilitator
+
+    Raises:
+        ValueError: If a network is unsupported or its private key is missing
+    """
+    env = dict(os.environ) if env is None else env
+    facilitator = X402Facilitator()
+    signers: dict[str, Any] = {}
+
+    for network in networks:
+        family = network.split(":", 1)[0]
+        if family == "tron":
+            from bankofai.x402.mechanisms.tron import (
+                ExactPermitTronFacilitatorMechanism,
+                ExactTronFacilitatorMechanism,
+            )
+            from bankofai.x402.signers.facilitator import TronFacilitatorSigner
+
+            key_name = "TRON_PRIVATE_KEY"
+            signer_cls: Any = TronFacilitatorSigner
+            mechanisms: tuple[Any, Any] = (
+                ExactPermitTronFacilitatorMechanism,
+                ExactTronFacilitatorMechanism,
+            )
+        elif family == "eip155":
+            from bankofai.x402.mechanisms.evm import (
+                ExactEvmFacilitatorMechanism,
+                ExactPermitEvmFacilitatorMechanism,
+            )
+            from bankofai.x402.signers.facilitator import EvmFacilitatorSigner
+
+            key_name, signer_cls = "BSC_PRIVATE_KEY", EvmFacilitatorSigner
+            mechanisms = (ExactPermitEvmFacilitatorMechanism, ExactEvmFacilitatorMechanism)
+        else:
+            raise ValueError(f"Unsupported network: {network}")
+
+        if family not in signers:
+            private_key = env.get(key_name)
+            if not private_key:
+                raise ValueError(f"{key_name} is required for {network}")
+            signers[family] = signer_cls.from_private_key(private_key)
+            if facilitator.fee_to is None:
+                # Mechanisms collect fees to their signer's address
+                facilitator.fee_to = signers[family].get_address()
+
+        permit_mechanism, exact_mechanism = mechanisms
+        facilitator.register([network], permit_mechanism(signers[family], base_fee=base_fee))
+        facilitator.register([network], exact_mechanism(signers[family]))
+
+    return facilitator
+
+
+def create_app(options: dict[str, Any]) -> FacilitatorApp:
+    """Build the facilitator app from parsed command-line options."""
+    return FacilitatorApp(
+        create_facilitator(options["networks"], options.get("base_fee") or None),
+        settle_concurrency=options["settle_concurrency"],
+        verify_concurrency=options["verify_concurrency"],
+        queue_timeout=options["queue_timeout"],
+        max_body_size=options["max_body_size"],
+        drain_timeout=options["drain_timeout"],
+    )
+
+
+def build_app() -> FacilitatorApp:
+    """App factory for worker processes; reads the options from CONFIG_ENV."""
+    return create_app(json.loads(os.environ[CONFIG_ENV]))
+
+
+def _parse_base_fee(values: list[str]) -> dict[str, int]:
+    base_fee: dict[str, int] = {}
+    for value in values:
+        symbol, sep, amount = value.partition("=")
+        if not sep or not amount.isdigit():
+            raise argparse.ArgumentTypeError(
+                f"Invalid --base-fee '{value}', expected SYMBOL=AMOUNT"
+            )
+        base_fee[symbol] = int(amount)
+    return base_fee
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m bankofai.x402.facilitator",
+        description="Run an x402 facilitator HTTP service",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--uds", help="Listen on this Unix domain socket instead of host/port")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument(
+        "--networks",
+        default="tron:nile",
+        help="Comma-separated network identifiers (default: tron:nile)",
+    )
+    parser.add_argument(
+        "--base-fee",
+        action="append",
+        default=[],
+        metavar="SYMBOL=AMOUNT",
+        help="exact_permit base fee in the token's smallest unit (repeatable)",
+    )
+    parser.add_argument("--settle-concurrency", type=int, default=DEFAULT_SETTLE_CONCURRENCY)
+    parser.add_argument("--verify-concurrency", type=int, default=DEFAULT_VERIFY_CONCURRENCY)
+    parser.add_argument("--queue-timeout", type=float, default=DEFAULT_QUEUE_TIMEOUT)
+    parser.add_argument("--max-body-size", type=int, default=DEFAULT_MAX_BODY_SIZE)
+    parser.add_argument("--drain-timeout", type=float, default=DEFAULT_DRAIN_TIMEOUT)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    args.networks = [n.strip() for n in args.networks.split(",") if n.strip()]
+    try:
+        args.base_fee = _parse_base_fee(args.base_fee)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn is required: pip install bankofai-x402[facilitator]")
+
+    logging.basicConfig(level=args.log_level.upper())
+    options = {
+        key: getattr(args, key)
+        for key in (
+            "networks",
+            "base_fee",
+            "settle_concurrency",
+            "verify_concurrency",
+            "queue_timeout",
+            "max_body_size",
+            "drain_timeout",
+        )
+    }
+    # Fail fast on bad configuration before any worker is started
+    app = create_app(options)
+
+    if args.workers > 1:
+        os.environ[CONFIG_ENV] = json.dumps(options)
+        uvicorn.run(
+            "bankofai.x402.facilitator.__main__:build_app",
+            factory=True,
+            host=args.host,
+            port=args.port,
+            uds=args.uds,
+            workers=args.workers,
+            log_level=args.log_level,
+            timeout_graceful_shutdown=int(args.drain_timeout),
+        )
+    else:
+        uvicorn.run(
+            app,
+            host=args.host,
+            port=args.port,
+            uds=args.uds,
+            log_level=args.log_level,
+            timeout_graceful_shutdown=int(args.drain_timeout),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,393 @@
+"""
+FacilitatorApp - ASGI application serving the facilitator HTTP API
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, MutableMapping, Sequence, TypeVar
+
+from pydantic import BaseModel, Field
+from pydantic import ValidationError as PydanticValidationError
+
+from bankofai.x402.compact import COMPACT_CONTENT_TYPE, decode_compact, encode_compact
+from bankofai.x402.facilitator.x402_facilitator import X402Facilitator
+from bankofai.x402.types import FeeQuoteResponse, PaymentPayload, PaymentRequirements
+
+Scope = MutableMapping[str, Any]
+Message = MutableMapping[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+M = TypeVar("M", bound=BaseModel)
+R = TypeVar("R")
+
+DEFAULT_SETTLE_CONCURRENCY = 16
+DEFAULT_VERIFY_CONCURRENCY = 64
+DEFAULT_QUEUE_TIMEOUT = 10.0
+DEFAULT_MAX_BODY_SIZE = 64 * 1024
+DEFAULT_DRAIN_TIMEOUT = 30.0
+
+_JSON_HEADERS = [(b"content-type", b"application/json")]
+_COMPACT_HEADERS = [(b"content-type", COMPACT_CONTENT_TYPE.encode("latin-1"))]
+_COMPACT_TYPE = COMPACT_CONTENT_TYPE.encode("latin-1")
+
+logger = logging.getLogger(__name__)
+
+
+class PaymentRequest(BaseModel):
+    """Body of POST /verify and POST /settle"""
+
+    payment_payload: PaymentPayload = Field(alias="paymentPayload")
+    payment_requirements: PaymentRequirements = Field(alias="paymentRequirements")
+
+    class Config:
+        populate_by_name = True
+
+
+class FeeQuoteRequest(BaseModel):
+    """Body of POST /fee/quote"""
+
+    accepts: list[PaymentRequirements]
+    payment_permit_context: dict[str, Any] | None = Field(
+        default=None, alias="paymentPermitContext"
+    )
+
+    class Config:
+        populate_by_name = True
+
+
+class _HTTPError(Exception):
+    def __init__(
+        self, status: int, error: str, headers: Sequence[tuple[bytes, bytes]] = ()
+    ) -> None:
+        super().__init__(error)
+        self.status = status
+        self.error = error
+        self.headers = headers
+
+
+class FacilitatorApp:
+    """
+    ASGI application exposing an X402Facilitator over HTTP.
+
+    Routes (the protocol spoken by FacilitatorClient):
+        GET  /supported   supported network/scheme combinations
+        POST /fee/quote   fee quotes for a list of payment requirements
+        POST /verify      verify a payment
+        POST /settle      settle a payment on-chain
+        GET  /health      liveness, 200 while the process is up
+        GET  /ready       readiness, 503 before startup and while draining
+
+    Request bodies are read incrementally up to ``max_body_size`` and validated
+    straight from bytes by pydantic's JSON parser. Bodies sent with the
+    compact content type (see bankofai.x402.compact) are accepted too, and
+    responses use it when the request's Accept header lists it. Verifications and
+    settlements are limited per network; a request that cannot get a slot
+    within ``queue_timeout`` seconds is answered with 503 and Retry-After.
+
+    On lifespan shutdown the app stops accepting payment requests and waits up
+    to ``drain_timeout`` seconds for in-flight ones (settlements in particular)
+    to finish.
+
+    Usage:
+        facilitator = X402Facilitator().register(["tron:nile"], mechanism)
+        app = FacilitatorApp(facilitator)
+        # uvicorn.run(app, port=8001)
+    """
+
+    def __init__(
+        self,
+        facilitator: X402Facilitator,
+        settle_concurrency: int = DEFAULT_SETTLE_CONCURRENCY,
+        verify_concurrency: int = DEFAULT_VERIFY_CONCURRENCY,
+        queue_timeout: float = DEFAULT_QUEUE_TIMEOUT,
+        max_body_size: int = DEFAULT_MAX_BODY_SIZE,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+    ) -> None:
+        """
+        Initialize facilitator app.
+
+        Args:
+            facilitator: Facilitator handling the requests
+            settle_concurrency: Maximum concurrent settlements per network
+            verify_concurrency: Maximum concurrent verifications per network
+            queue_timeout: Seconds a request may wait for a concurrency slot
+            max_body_size: Maximum request body size in bytes
+            drain_timeout: Seconds to wait for in-flight requests on shutdown
+        """
+        if settle_concurrency < 1 or verify_concurrency < 1:
+            raise ValueError("Concurrency limits must be at least 1")
+        self._facilitator = facilitator
+        self._settle_concurrency = settle_concurrency
+        self._verify_concurrency = verify_concurrency
+        self._queue_timeout = queue_timeout
+        self._max_body_size = max_body_size
+        self._drain_timeout = drain_timeout
+        self._semaphores: dict[tuple[str, str], asyncio.Semaphore] = {}
+        self._started = False
+        self._draining = False
+        self._inflight = 0
+        self._idle: asyncio.Event | None = None
+        self._routes: dict[str, tuple[str, Callable[[Scope, Receive], Awaitable[Any]]]] = {
+            "/supported": ("GET", self._supported),
+            "/fee/quote": ("POST", self._fee_quote),
+            "/verify": ("POST", self._verify),
+            "/settle": ("POST", self._settle),
+        }
+
+    @property
+    def facilitator(self) -> X402Facilitator:
+        return self._facilitator
+
+    @property
+    def ready(self) -> bool:
+        return self._started and not self._draining
+
+    @property
+    def inflight(self) -> int:
+        """Number of payment requests currently being processed"""
+        return self._inflight
+
+    def start(self) -> None:
+        """Mark the app as ready (called on lifespan startup)."""
+        self._started = True
+        self._draining = False
+
+    async def drain(self, timeout: float | None = None) -> bool:
+        """
+        Stop accepting payment requests and wait for in-flight ones.
+
+        Args:
+            timeout: Seconds to wait (default: drain_timeout)
+
+        Returns:
+            True if all in-flight requests finished in time
+        """
+        self._draining = True
+        if self._inflight == 0:
+            return True
+        logger.info("Draining %d in-flight requests", self._inflight)
+        try:
+            await asyncio.wait_for(
+                self._idle_event().wait(),
+                self._drain_timeout if timeout is None else timeout,
+            )
+            return True
+        except asyncio.TimeoutError:
+            logger.warning("Drain timed out with %d requests in flight", self._inflight)
+            return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        try:
+            await self._dispatch(scope, receive, send)
+        except _HTTPError as e:
+            await self._send_json(send, e.status, {"error": e.error}, e.headers)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.drain()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _dispatch(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope["path"].rstrip("/") or "/"
+        method = scope["method"]
+
+        if path == "/health":
+            await self._send_json(send, 200, {"status": "ok"})
+            return
+        if path == "/ready":
+            ready = self.ready
+            status = {"status": "ready" if ready else "unavailable", "inflight": self._inflight}
+            await self._send_json(send, 200 if ready else 503, status)
+            return
+
+        handler = self._routes.get(path)
+        if handler is None:
+            raise _HTTPError(404, "Not found")
+        expected_method, endpoint = handler
+        if method != expected_method:
+            raise _HTTPError(405, "Method not allowed", [(b"allow", expected_method.encode())])
+        if self._draining:
+            raise _HTTPError(503, "Facilitator is shutting down", [(b"connection", b"close")])
+
+        # A request stays in flight until its response is written
+        self._inflight += 1
+        try:
+            try:
+                result = await endpoint(scope, receive)
+            except _HTTPError as e:
+                await self._send_json(send, e.status, {"error": e.error}, e.headers)
+                return
+            await self._send_result(scope, send, result)
+        finally:
+            self._inflight -= 1
+            if self._inflight == 0 and self._idle is not None:
+                self._idle.set()
+
+    async def _send_result(self, scope: Scope, send: Send, result: Any) -> None:
+        if _header_has(scope, b"accept", _COMPACT_TYPE):
+            data = (
+                [item.model_dump(mode="json", by_alias=True) for item in result]
+                if isinstance(result, list)
+                else result.model_dump(mode="json", by_alias=True)
+            )
+            await self._send(send, 200, encode_compact(data), content_headers=_COMPACT_HEADERS)
+        elif isinstance(result, list):
+            body = b"[" + b",".join(r.model_dump_json(by_alias=True).encode() for r in result)
+            await self._send(send, 200, body + b"]")
+        else:
+            await self._send(send, 200, result.model_dump_json(by_alias=True).encode())
+
+    async def _supported(self, scope: Scope, receive: Receive) -> BaseModel:
+        try:
+            return self._facilitator.supported()
+        except ValueError as e:
+            logger.error("Cannot report supported capabilities: %s", e)
+            raise _HTTPError(500, str(e))
+
+    async def _fee_quote(self, scope: Scope, receive: Receive) -> list[FeeQuoteResponse]:
+        request = await self._read_model(scope, receive, FeeQuoteRequest)
+        return await self._call(
+            self._facilitator.fee_quote(request.accepts, request.payment_permit_context)
+        )
+
+    async def _verify(self, scope: Scope, receive: Receive) -> BaseModel:
+        request = await self._read_model(scope, receive, PaymentRequest)
+        requirements = request.payment_requirements
+        async with self._slot("verify", requirements.network, self._verify_concurrency):
+            result = await self._call(
+                self._facilitator.verify(request.payment_payload, requirements)
+            )
+        return result
+
+    async def _settle(self, scope: Scope, receive: Receive) -> BaseModel:
+        request = await self._read_model(scope, receive, PaymentRequest)
+        requirements = request.payment_requirements
+        async with self._slot("settle", requirements.network, self._settle_concurrency):
+            result = await self._call(
+                self._facilitator.settle(request.payment_payload, requirements)
+            )
+        return result
+
+    async def _read_model(self, scope: Scope, receive: Receive, model: type[M]) -> M:
+        for key, value in scope.get("headers", ()):
+            if key != b"content-length":
+                continue
+            try:
+                length = int(value)
+            except ValueError:
+                raise _HTTPError(400, "Invalid content-length")
+            if length > self._max_body_size:
+                raise _HTTPError(413, "Request body too large")
+
+        body = bytearray()
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                raise _HTTPError(400, "Client disconnected")
+            body += message.get("body", b"")
+            if len(body) > self._max_body_size:
+                raise _HTTPError(413, "Request body too large")
+            more_body = message.get("more_body", False)
+
+        try:
+            if _header_has(scope, b"content-type", _COMPACT_TYPE):
+                try:
+                    data = decode_compact(bytes(body))
+                except ValueError as e:
+                    # Clients fall back to JSON on 415
+                    raise _HTTPError(415, f"Cannot decode compact body: {e}")
+                return model.model_validate(data)
+            return model.model_validate_json(bytes(body))
+        except PydanticValidationError as e:
+            raise _HTTPError(400, f"Invalid request: {e.errors(include_url=False)[0]['msg']}")
+
+    def _slot(self, kind: str, network: str, limit: int) -> "_Slot":
+        semaphore = self._semaphores.get((kind, network))
+        if semaphore is None:
+            semaphore = self._semaphores.setdefault((kind, network), asyncio.Semaphore(limit))
+        return _Slot(semaphore, self._queue_timeout, network)
+
+    @staticmethod
+    async def _call(coro: Awaitable[R]) -> R:
+        try:
+            return await coro
+        except Exception as e:
+            logger.error("Facilitator request failed: %s", e, exc_info=True)
+            raise _HTTPError(500, "Internal facilitator error")
+
+    def _idle_event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+        if self._inflight > 0:
+            self._idle.clear()
+        else:
+            self._idle.set()
+        return self._idle
+
+    @staticmethod
+    async def _send(
+        send: Send,
+        status: int,
+        body: bytes,
+        headers: Sequence[tuple[bytes, bytes]] = (),
+        content_headers: Sequence[tuple[bytes, bytes]] = _JSON_HEADERS,
+    ) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    *content_headers,
+                    *headers,
+                    (b"content-length", str(len(body)).encode("latin-1")),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @classmethod
+    async def _send_json(
+        cls, send: Send, status: int, content: Any, headers: Sequence[tuple[bytes, bytes]] = ()
+    ) -> None:
+        await cls._send(send, status, json.dumps(content).encode("utf-8"), headers)
+
+
+def _header_has(scope: Scope, name: bytes, token: bytes) -> bool:
+    for key, value in scope.get("headers", ()):
+        if key == name and token in value:
+            return True
+    return False
+
+
+class _Slot:
+    """Async context manager acquiring a per-network concurrency slot with a timeout"""
+
+    def __init__(self, semaphore: asyncio.Semaphore, timeout: float, network: str) -> None:
+        self._semaphore = semaphore
+        self._timeout = timeout
+        self._network = network
+
+    async def __aenter__(self) -> None:
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self._timeout)
+        except asyncio.TimeoutError:
+            logger.warning("No capacity for %s within %ss", self._network, self._timeout)
+            raise _HTTPError(503, f"Facilitator busy on {self._network}", [(b"retry-after", b"1")])
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._semaphore.release()
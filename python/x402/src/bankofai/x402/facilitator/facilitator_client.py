@@ -2,10 +2,12 @@
 FacilitatorClient - Client for communicating with facilitator service
 """
 
+import logging
 from typing import Any
 
 import httpx
 
+from bankofai.x402.compact import COMPACT_CONTENT_TYPE, decode_compact, encode_compact
 from bankofai.x402.types import (
     FeeQuoteResponse,
     PaymentPayload,
@@ -15,6 +17,8 @@ from bankofai.x402.types import (
     VerifyResponse,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class FacilitatorClient:
     """
@@ -28,6 +32,9 @@ class FacilitatorClient:
         base_url: str,
         headers: dict[str, str] | None = None,
         facilitator_id: str | None = None,
+        uds: str | None = None,
+        compact: bool = False,
+        trust_receipts: bool = False,
     ) -> None:
         """
         Initialize facilitator client.
@@ -36,11 +43,25 @@ class FacilitatorClient:
             base_url: Facilitator service base URL
             headers: Custom HTTP headers (e.g., Authorization)
             facilitator_id: Unique identifier for this facilitator
+            uds: Unix domain socket path to connect through instead of TCP
+                (e.g. a sidecar facilitator); *base_url* then only sets the
+                Host header and path prefix
+            compact: Send requests in the compact wire format and ask for
+                compact responses; switches back to JSON for good if the
+                facilitator rejects it
+            trust_receipts: Verify settlements against the receipt the
+                facilitator returns instead of fetching it from the chain.
+                Only enable this for a facilitator you operate yourself: a
+                faulty or malicious facilitator can return a receipt for a
+                transfer that never happened
         """
         self._base_url = base_url.rstrip("/")
         self._headers = headers or {}
-        self.facilitator_id = facilitator_id or base_url
+        self._uds = uds
+        self.facilitator_id = facilitator_id or (f"unix:{uds}" if uds else base_url)
         self._http_client: httpx.AsyncClient | None = None
+        self._compact = compact
+        self.trust_receipts = trust_receipts
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client"""
@@ -49,6 +70,7 @@ class FacilitatorClient:
                 base_url=self._base_url,
                 headers=self._headers,
                 timeout=30.0,
+                transport=httpx.AsyncHTTPTransport(uds=self._uds) if self._uds else None,
             )
         return self._http_client
 
@@ -58,6 +80,36 @@ class FacilitatorClient:
             await self._http_client.aclose()
             self._http_client = None
 
+    async def _post(self, path: str, body: dict[str, Any]) -> Any:
+        """POST *body* and return the decoded response data"""
+        client = await self._get_client()
+        if self._compact:
+            response = await client.post(
+                path,
+                content=encode_compact(body),
+                headers={
+                    "content-type": COMPACT_CONTENT_TYPE,
+                    "accept": f"{COMPACT_CONTENT_TYPE}, application/json",
+                },
+            )
+            # Only an unsupported media type means the format itself was refused;
+            # other errors are about the request and would fail as JSON too
+            if response.status_code != 415:
+                return self._decode(response)
+            logger.warning(
+                f"Facilitator rejected the compact format ({response.status_code}), using JSON"
+            )
+            self._compact = False
+        response = await client.post(path, json=body)
+        return self._decode(response)
+
+    @staticmethod
+    def _decode(response: httpx.Response) -> Any:
+        response.raise_for_status()
+        if response.headers.get("content-type", "").startswith(COMPACT_CONTENT_TYPE):
+            return decode_compact(response.content)
+        return response.json()
+
     async def supported(self) -> SupportedResponse:
         """
         Query facilitator supported capabilities.
@@ -85,16 +137,14 @@ class FacilitatorClient:
         Returns:
             List of FeeQuoteResponse, one per input requirement
         """
-        client = await self._get_client()
         payload: dict[str, Any] = {
             "accepts": [a.model_dump(by_alias=True) for a in accepts],
         }
         if context:
             payload["paymentPermitContext"] = context
 
-        response = await client.post("/fee/quote", json=payload)
-        response.raise_for_status()
-        return [FeeQuoteResponse(**item) for item in response.json()]
+        data = await self._post("/fee/quote", payload)
+        return [FeeQuoteResponse(**item) for item in data]
 
     async def verify(
         self,
@@ -111,15 +161,12 @@ class FacilitatorClient:
         Returns:
             VerifyResponse
         """
-        client = await self._get_client()
         request_body = {
             "paymentPayload": payload.model_dump(by_alias=True),
             "paymentRequirements": requirements.model_dump(by_alias=True),
         }
 
-        response = await client.post("/verify", json=request_body)
-        response.raise_for_status()
-        return VerifyResponse(**response.json())
+        return VerifyResponse(**await self._post("/verify", request_body))
 
     async def settle(
         self,
@@ -136,12 +183,9 @@ class FacilitatorClient:
         Returns:
             SettleResponse with tx_hash
         """
-        client = await self._get_client()
         request_body = {
             "paymentPayload": payload.model_dump(by_alias=True),
             "paymentRequirements": requirements.model_dump(by_alias=True),
         }
 
-        response = await client.post("/settle", json=request_body)
-        response.raise_for_status()
-        return SettleResponse(**response.json())
+        return SettleResponse(**await self._post("/settle", request_body))
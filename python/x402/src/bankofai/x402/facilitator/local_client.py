@@ -0,0 +1,87 @@
+"""
+LocalFacilitatorClient - In-process client for a co-located X402Facilitator
+"""
+
+from typing import Any
+
+from bankofai.x402.facilitator.x402_facilitator import X402Facilitator
+from bankofai.x402.types import (
+    FeeQuoteResponse,
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+    SupportedResponse,
+    VerifyResponse,
+)
+
+
+class LocalFacilitatorClient:
+    """
+    Facilitator client that calls an X402Facilitator in the same process.
+
+    Drop-in replacement for FacilitatorClient when the resource server and the
+    facilitator share a process: calls are dispatched directly, and payloads,
+    requirements and responses are passed by reference instead of being
+    serialized to JSON and sent over HTTP.
+
+    The facilitator runs with this process's own signer and RPC access, so
+    the receipts it returns with settlements are trusted for on-chain
+    verification (see ``trust_receipts``).
+
+    Usage:
+        facilitator = X402Facilitator(fee_to=...).register(["tron:nile"], mechanism)
+        server = X402Server().set_facilitator(LocalFacilitatorClient(facilitator))
+    """
+
+    trust_receipts = True
+
+    def __init__(
+        self,
+        facilitator: X402Facilitator,
+        facilitator_id: str | None = None,
+    ) -> None:
+        """
+        Initialize local facilitator client.
+
+        Args:
+            facilitator: Facilitator to dispatch to
+            facilitator_id: Unique identifier for this facilitator (default: "local")
+        """
+        self._facilitator = facilitator
+        self.facilitator_id = facilitator_id or "local"
+
+    @property
+    def facilitator(self) -> X402Facilitator:
+        return self._facilitator
+
+    async def close(self) -> None:
+        """Nothing to release; present for interface compatibility"""
+        return None
+
+    async def supported(self) -> SupportedResponse:
+        """Query facilitator supported capabilities."""
+        return self._facilitator.supported()
+
+    async def fee_quote(
+        self,
+        accepts: list[PaymentRequirements],
+        context: dict[str, Any] | None = None,
+    ) -> list[FeeQuoteResponse]:
+        """Query fee quotes for a list of payment requirements."""
+        return await self._facilitator.fee_quote(accepts, context)
+
+    async def verify(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+    ) -> VerifyResponse:
+        """Verify payment signature (without executing on-chain transaction)."""
+        return await self._facilitator.verify(payload, requirements)
+
+    async def settle(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+    ) -> SettleResponse:
+        """Execute payment settlement (on-chain transaction)."""
+        return await self._facilitator.settle(payload, requirements)
@@ -2,17 +2,26 @@
 X402Facilitator - Core payment processor for x402 protocol
 """
 
-from typing import Any, Protocol
+import asyncio
+import time
+from typing import Any, Awaitable, Literal, Protocol
 
 from bankofai.x402.types import (
     FeeQuoteResponse,
     PaymentPayload,
     PaymentRequirements,
     SettleResponse,
+    SupportedFee,
     SupportedKind,
     SupportedResponse,
     VerifyResponse,
 )
+from bankofai.x402.utils.settlement_coalescer import SettlementCoalescer
+
+# Cached quotes are refreshed this many seconds before they expire
+FEE_QUOTE_REFRESH_MARGIN_SECONDS = 30
+
+QuoteKey = tuple[str, str, str]  # (network, scheme, asset)
 
 
 class FacilitatorMechanism(Protocol):
@@ -54,8 +63,41 @@ class X402Facilitator:
     Manages payment mechanisms and coordinates verification/settlement.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        fee_to: str | None = None,
+        cache_fee_quotes: bool = True,
+        settlements: SettlementCoalescer | None = None,
+    ) -> None:
+        """
+        Initialize facilitator.
+
+        Args:
+            fee_to: Fee recipient advertised by ``supported()``
+            cache_fee_quotes: Reuse fee quotes per (network, scheme, asset) until
+                shortly before they expire. Disable for mechanisms whose quotes
+                depend on the amount or the payment context.
+            settlements: Coalescer for duplicate settle calls (a default one is
+                created if None)
+        """
         self._mechanisms: dict[str, dict[str, FacilitatorMechanism]] = {}
+        self._fee_to = fee_to
+        self._cache_fee_quotes = cache_fee_quotes
+        self._quote_cache: dict[QuoteKey, FeeQuoteResponse] = {}
+        self._settlements = settlements or SettlementCoalescer()
+
+    @property
+    def settlements(self) -> SettlementCoalescer:
+        """Single-flight coalescer shared by all settle calls"""
+        return self._settlements
+
+    @property
+    def fee_to(self) -> str | None:
+        return self._fee_to
+
+    @fee_to.setter
+    def fee_to(self, value: str | None) -> None:
+        self._fee_to = value
 
     def register(
         self,
@@ -77,9 +119,14 @@ class X402Facilitator:
             if network not in self._mechanisms:
                 self._mechanisms[network] = {}
             self._mechanisms[network][scheme] = mechanism
+        self._quote_cache.clear()
         return self
 
-    def supported(self, pricing: str = "flat") -> SupportedResponse:
+    def clear_fee_quote_cache(self) -> None:
+        """Drop all cached fee quotes (e.g. after changing mechanism fees)."""
+        self._quote_cache.clear()
+
+    def supported(self, pricing: Literal["per_accept", "flat"] = "flat") -> SupportedResponse:
         """
         Return supported network/scheme combinations.
 
@@ -88,7 +135,13 @@ class X402Facilitator:
 
         Returns:
             SupportedResponse with all supported capabilities
+
+        Raises:
+            ValueError: If no fee recipient is configured
         """
+        if not self._fee_to:
+            raise ValueError("fee_to must be configured to report supported capabilities")
+
         kinds: list[SupportedKind] = []
         for network, schemes in self._mechanisms.items():
             for scheme in schemes:
@@ -100,7 +153,7 @@ class X402Facilitator:
                     )
                 )
 
-        return SupportedResponse(kinds=kinds)
+        return SupportedResponse(kinds=kinds, fee=SupportedFee(feeTo=self._fee_to, pricing=pricing))
 
     async def fee_quote(
         self,
@@ -113,6 +166,10 @@ class X402Facilitator:
         Unsupported scheme/token combinations are silently skipped,
         so the returned list may be shorter than accepts.
 
+        Accepts with the same (network, scheme, asset) are quoted once, distinct
+        ones concurrently, and quotes are reused until shortly before their
+        ``expiresAt``. Returned quotes may be shared; do not modify them.
+
         Args:
             accepts: List of payment requirements
             context: Optional payment context
@@ -120,15 +177,32 @@ class X402Facilitator:
         Returns:
             List of FeeQuoteResponse for supported requirements only
         """
-        results: list[FeeQuoteResponse] = []
-        for accept in accepts:
+        now = time.time()
+        keys = [(a.network, a.scheme, a.asset) for a in accepts]
+        quotes: dict[QuoteKey, FeeQuoteResponse | None] = {}
+        pending: dict[QuoteKey, Awaitable[FeeQuoteResponse | None]] = {}
+
+        for accept, key in zip(accepts, keys):
+            if key in quotes or key in pending:
+                continue
+            cached = self._quote_cache.get(key) if self._cache_fee_quotes else None
+            if cached is not None and _quote_fresh(cached, now):
+                quotes[key] = cached
+                continue
             mechanism = self._find_mechanism(accept.network, accept.scheme)
             if mechanism is None:
+                quotes[key] = None
                 continue
-            quote = await mechanism.fee_quote(accept, context)
-            if quote is not None:
-                results.append(quote)
-        return results
+            pending[key] = mechanism.fee_quote(accept, context)
+
+        if pending:
+            results = await asyncio.gather(*pending.values())
+            for key, quote in zip(pending, results):
+                quotes[key] = quote
+                if quote is not None and self._cache_fee_quotes and _quote_fresh(quote, now):
+                    self._quote_cache[key] = quote
+
+        return [q for q in (quotes[key] for key in keys) if q is not None]
 
     async def verify(
         self,
@@ -163,6 +237,9 @@ class X402Facilitator:
         """
         Execute payment settlement.
 
+        Duplicates of a payment that is settling await the same result, and
+        duplicates of a recently settled payment get the original response.
+
         Args:
             payload: Payment payload from client
             requirements: Payment requirements
@@ -178,7 +255,9 @@ class X402Facilitator:
                     f"unsupported_network_scheme: {requirements.network}/{requirements.scheme}"
                 ),
             )
-        return await mechanism.settle(payload, requirements)
+        return await self._settlements.settle(
+            payload, lambda: mechanism.settle(payload, requirements)
+        )
 
     def _find_mechanism(self, network: str, scheme: str) -> FacilitatorMechanism | None:
         """Find mechanism for network and scheme"""
@@ -186,3 +265,10 @@ class X402Facilitator:
         if network_mechanisms is None:
             return None
         return network_mechanisms.get(scheme)
+
+
+def _quote_fresh(quote: FeeQuoteResponse, now: float) -> bool:
+    """True if *quote* can still be handed out (not within the refresh margin of expiry)"""
+    if quote.expires_at is None:
+        return False
+    return quote.expires_at - FEE_QUOTE_REFRESH_MARGIN_SECONDS > now
@@ -3,21 +3,30 @@ FastAPI middleware for x402 payment processing
 """
 
 from functools import wraps
-from typing import TYPE_CHECKING, Any, Callable
+from typing import Any, Awaitable, Callable
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 
-from bankofai.x402.encoding import decode_payment_payload, encode_payment_payload
-from bankofai.x402.server import ResourceConfig, X402Server
-from bankofai.x402.types import PaymentPayload, PaymentRequirements
+from bankofai.x402.compact import PAYMENT_ENCODING_HEADER
+from bankofai.x402.server import RoutePlan, SettlementPolicy, SettlementQueue, X402Server
+from bankofai.x402.server.payment_gate import (
+    PAYMENT_REQUIRED_HEADER,
+    PAYMENT_RESPONSE_HEADER,
+    PAYMENT_SIGNATURE_HEADER,
+    PaymentGate,
+)
+from bankofai.x402.types import ConfirmationLevel
 
-if TYPE_CHECKING:
-    from bankofai.x402.utils.tx_verification import TransactionVerificationResult
+Endpoint = Callable[..., Awaitable[Any]]
 
-PAYMENT_SIGNATURE_HEADER = "PAYMENT-SIGNATURE"
-PAYMENT_REQUIRED_HEADER = "PAYMENT-REQUIRED"
-PAYMENT_RESPONSE_HEADER = "PAYMENT-RESPONSE"
+__all__ = [
+    "PAYMENT_REQUIRED_HEADER",
+    "PAYMENT_RESPONSE_HEADER",
+    "PAYMENT_SIGNATURE_HEADER",
+    "X402Middleware",
+    "x402_protected",
+]
 
 
 class X402Middleware:
@@ -38,8 +47,22 @@ class X402Middleware:
             return {"data": "secret"}
     """
 
-    def __init__(self, server: X402Server) -> None:
+    def __init__(
+        self,
+        server: X402Server,
+        settlement_queue: SettlementQueue | None = None,
+        compact: bool = False,
+    ) -> None:
+        """
+        Initialize middleware.
+
+        Args:
+            server: X402Server used to build requirements and settle payments
+            settlement_queue: Queue for routes protected with an async SettlementPolicy
+            compact: Offer the compact wire format to clients (see PaymentGate)
+        """
         self._server = server
+        self._gate = PaymentGate(server, settlement_queue, compact)
 
     def protect(
         self,
@@ -49,7 +72,9 @@ class X402Middleware:
         pay_to: str | None = None,
         valid_for: int = 3600,
         delivery_mode: str = "PAYMENT_ONLY",
-    ) -> Callable:
+        settlement: SettlementPolicy | None = None,
+        confirmation: ConfirmationLevel | None = None,
+    ) -> Callable[[Endpoint], Endpoint]:
         """
         Decorator to protect endpoints with payment requirements.
 
@@ -78,214 +103,48 @@ class X402Middleware:
             pay_to: Payment recipient address
             valid_for: Payment validity period (seconds)
             delivery_mode: Delivery mode
+            settlement: Settlement policy; ``SettlementPolicy(mode="async")`` serves
+                the request once the payment is verified and settles it in the
+                background (requires a settlement_queue)
+            confirmation: Confirmation level settlement waits for: ``"broadcast"``
+                (fastest), ``"included"`` or ``"final"`` (default: the
+                facilitator's)
 
         Returns:
             Decorated function
         """
-        if not prices or not schemes or not network or not pay_to:
-            raise ValueError("prices, schemes, network, and pay_to are required")
-        if len(schemes) != len(prices):
-            raise ValueError(
-                f"schemes length ({len(schemes)}) must match prices length ({len(prices)})"
-            )
-        price_list = prices
-        scheme_list = schemes
-
-        # Validate all token symbols at startup
-        from bankofai.x402.tokens import TokenRegistry
-
-        for p in price_list:
-            TokenRegistry.parse_price(p, network)
-
-        configs = [
-            ResourceConfig(
-                scheme=s,
-                network=network,
-                price=p,
-                pay_to=pay_to,
-                valid_for=valid_for,
-                delivery_mode=delivery_mode,
-            )
-            for p, s in zip(price_list, scheme_list)
-        ]
+        # Validates all token symbols at startup
+        plan = RoutePlan.from_prices(
+            prices, schemes, network, pay_to, valid_for, delivery_mode, settlement, confirmation
+        )
+        if plan.settlement.is_async and self._gate.settlement_queue is None:
+            raise ValueError("Async settlement requires a settlement_queue")
 
-        def decorator(func: Callable) -> Callable:
+        def decorator(func: Endpoint) -> Endpoint:
             @wraps(func)
             async def wrapper(request: Request, *args: Any, **kwargs: Any) -> Response:
-                payment_header = request.headers.get(PAYMENT_SIGNATURE_HEADER)
-
-                if not payment_header:
-                    return await self._return_payment_required(request, configs)
-
-                try:
-                    payload = decode_payment_payload(payment_header, PaymentPayload)
-                except Exception as e:
-                    import logging
-
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Failed to decode payment payload: {e}", exc_info=True)
-                    logger.error(
-                        f"Payment header content (first 200 chars): {payment_header[:200]}"
-                    )
-                    return JSONResponse(
-                        content={"error": f"Invalid payment payload: {str(e)}"}, status_code=400
-                    )
-
-                # Match payload to the correct config
-                config = self._match_config(
-                    configs, payload.accepted.network, payload.accepted.asset
+                decision = await self._gate.process(
+                    plan,
+                    request.headers.get(PAYMENT_SIGNATURE_HEADER),
+                    str(request.url),
+                    request.headers.get(PAYMENT_ENCODING_HEADER),
                 )
-                if config is None:
-                    return JSONResponse(
-                        content={"error": "Unsupported payment token or network"},
-                        status_code=400,
-                    )
-
-                requirements = (await self._server.build_payment_requirements([config]))[0]
-
-                settle_result = await self._server.settle_payment(payload, requirements)
-                if not settle_result.success:
-                    import logging
-
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Payment settlement failed: {settle_result.error_reason}")
-                    logger.error(f"Settlement result: {settle_result.model_dump(by_alias=True)}")
-                    error_content: dict[str, Any] = {
-                        "error": f"Settlement failed: {settle_result.error_reason}",
-                    }
-                    if settle_result.transaction:
-                        error_content["txHash"] = settle_result.transaction
-                    if settle_result.network:
-                        error_content["network"] = settle_result.network
-                    return JSONResponse(content=error_content, status_code=500)
-
-                # Verify transaction on-chain (required)
-                if settle_result.transaction:
-                    tx_verify_result = await self._verify_transaction_on_chain(
-                        tx_hash=settle_result.transaction,
-                        payload=payload,
-                        requirements=requirements,
-                        network=requirements.network,
-                    )
-                    if not tx_verify_result.success:
-                        return JSONResponse(
-                            content={
-                                "error": (
-                                    "Transaction verification failed: "
-                                    f"{tx_verify_result.error_reason}"
-                                ),
-                                "txHash": settle_result.transaction,
-                            },
-                            status_code=500,
-                        )
-
-                response = await func(request, *args, **kwargs)
-
-                if isinstance(response, Response):
-                    response.headers[PAYMENT_RESPONSE_HEADER] = encode_payment_payload(
-                        settle_result.model_dump(by_alias=True)
+                if not decision.allowed:
+                    return Response(
+                        content=decision.body,
+                        status_code=decision.status_code,
+                        headers=decision.headers,
                     )
-                    return response
 
-                json_response = JSONResponse(content=response)
-                json_response.headers[PAYMENT_RESPONSE_HEADER] = encode_payment_payload(
-                    settle_result.model_dump(by_alias=True)
-                )
-                return json_response
+                result = await func(request, *args, **kwargs)
+                response = result if isinstance(result, Response) else JSONResponse(content=result)
+                response.headers[PAYMENT_RESPONSE_HEADER] = decision.payment_response_header()
+                return response
 
             return wrapper
 
         return decorator
 
-    @staticmethod
-    def _match_config(
-        configs: list[ResourceConfig],
-        network: str,
-        asset: str,
-    ) -> ResourceConfig | None:
-        """Find the config matching the payment's network and asset."""
-        from bankofai.x402.tokens import TokenRegistry
-
-        for cfg in configs:
-            if cfg.network != network:
-                continue
-            # Parse the price to get the expected asset address
-            parts = cfg.price.strip().split()
-            if len(parts) != 2:
-                continue
-            symbol = parts[1]
-            token = TokenRegistry.get_token(cfg.network, symbol)
-            if token and token.address.lower() == asset.lower():
-                return cfg
-        return None
-
-    async def _verify_transaction_on_chain(
-        self,
-        tx_hash: str,
-        payload: PaymentPayload,
-        requirements: PaymentRequirements,
-        network: str,
-    ) -> "TransactionVerificationResult":
-        """
-        Verify transaction on-chain to ensure transfers match expectations.
-
-        Args:
-            tx_hash: Transaction hash to verify
-            payload: Payment payload
-            requirements: Payment requirements
-            network: Network identifier
-
-        Returns:
-            TransactionVerificationResult
-        """
-        from bankofai.x402.utils.tx_verification import (
-            TransactionVerificationResult,
-            get_verifier_for_network,
-        )
-
-        try:
-            verifier = get_verifier_for_network(network)
-            return await verifier.verify_transaction(tx_hash, payload, requirements)
-        except ValueError as e:
-            # No verifier available for this network, skip verification
-            import logging
-
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Transaction verification skipped: {e}")
-            return TransactionVerificationResult(
-                success=True,
-                tx_hash=tx_hash,
-                status_verified=True,
-            )
-
-    async def _return_payment_required(
-        self,
-        request: Request,
-        configs: list[ResourceConfig],
-        error: str | None = None,
-    ) -> JSONResponse:
-        """Return 402 payment required response"""
-        requirements_list = await self._server.build_payment_requirements(configs)
-        if not requirements_list:
-            return JSONResponse(
-                content={"error": "No supported payment options available"},
-                status_code=500,
-            )
-
-        payment_required = self._server.create_payment_required_response(
-            requirements=requirements_list,
-            resource_info={"url": str(request.url)},
-        )
-
-        response_data = payment_required.model_dump(by_alias=True)
-        if error:
-            response_data["error"] = error
-
-        response = JSONResponse(content=response_data, status_code=402)
-        response.headers[PAYMENT_REQUIRED_HEADER] = encode_payment_payload(response_data)
-
-        return response
-
 
 def x402_protected(
     server: X402Server,
@@ -294,7 +153,7 @@ def x402_protected(
     network: str,
     pay_to: str,
     **kwargs: Any,
-) -> Callable:
+) -> Callable[[Endpoint], Endpoint]:
     """
     Convenience decorator to protect endpoints.
 
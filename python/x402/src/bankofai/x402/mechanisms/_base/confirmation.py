@@ -0,0 +1,253 @@
+"""
+SettlementConfirmer - Progressive confirmation of settlement transactions
+
+A settlement can be answered at one of three confirmation levels:
+
+- ``broadcast``: as soon as the node accepted the transaction (one round trip),
+  while it may still revert or be dropped,
+- ``included``: once its receipt shows it succeeded in a block (the default),
+- ``final``: once that block can no longer be reverted, i.e. solidified on
+  TRON or ``finality_confirmations`` deep on EVM (see
+  ``FacilitatorSigner.wait_for_finality``).
+
+The level is taken from the route (``PaymentRequirements.extra.confirmation``)
+and falls back to the confirmer's default. Levels reached after settle has
+answered are followed in the background and reported to ``on_confirmation``,
+as is a transaction that fails after being answered at ``broadcast``.
+"""
+
+import asyncio
+import inspect
+import logging
+from collections import Counter
+from typing import TYPE_CHECKING, Awaitable, Callable
+
+from bankofai.x402.types import (
+    CONFIRMATION_BROADCAST,
+    CONFIRMATION_FINAL,
+    CONFIRMATION_INCLUDED,
+    CONFIRMATION_LEVELS,
+    PaymentRequirements,
+    SettleResponse,
+    TransactionReceipt,
+)
+
+if TYPE_CHECKING:
+    from bankofai.x402.signers.facilitator import FacilitatorSigner
+
+logger = logging.getLogger(__name__)
+
+ConfirmationCallback = Callable[[SettleResponse], Awaitable[None] | None]
+
+
+class SettlementConfirmer:
+    """
+    Waits for broadcast settlement transactions up to a confirmation level.
+
+    ``stats`` counts settle answers per level (``broadcast``, ``included``,
+    ``final``), later ``reports`` and follow-ups that ended in ``failures``.
+
+    Args:
+        signer: Facilitator signer that broadcast the transactions
+        level: Default confirmation level for routes that do not name one
+        on_confirmation: Called (sync or async) with a SettleResponse for every
+            level reached after settle answered, or with a failed one
+            (``transaction_failed_on_chain`` / ``confirmation_timeout`` /
+            ``confirmation_error``) if the transaction does not get there
+    """
+
+    def __init__(
+        self,
+        signer: "FacilitatorSigner",
+        level: str = CONFIRMATION_INCLUDED,
+        on_confirmation: ConfirmationCallback | None = None,
+    ) -> None:
+        if level not in CONFIRMATION_LEVELS:
+            raise ValueError(f"Unknown confirmation level: {level}")
+        self._signer = signer
+        self._level = level
+        self._on_confirmation = on_confirmation
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.stats: Counter[str] = Counter()
+
+    @property
+    def level(self) -> str:
+        return self._level
+
+    @property
+    def pending(self) -> int:
+        """Number of settlements still followed in the background"""
+        return len(self._tasks)
+
+    def level_for(self, requirements: PaymentRequirements) -> str:
+        """Confirmation level requested for *requirements*"""
+        extra = requirements.extra
+        if extra is not None and extra.confirmation is not None:
+            return extra.confirmation
+        return self._level
+
+    async def confirm(
+        self,
+        tx_hash: str,
+        requirements: PaymentRequirements,
+        on_included: Callable[[], None] | None = None,
+    ) -> SettleResponse:
+        """
+        Wait for a broadcast settlement transaction up to the requested level.
+
+        Args:
+            tx_hash: Hash of the broadcast transaction
+            requirements: Requirements being settled
+            on_included: Called once the transaction succeeded in a block, also
+                when that happens after answering
+
+        Returns:
+            SettleResponse at the reached level, or a failed one if the
+            transaction reverted
+        """
+        network = requirements.network
+        if self.level_for(requirements) == CONFIRMATION_BROADCAST:
+            self._follow(self._follow_broadcast(tx_hash, network, on_included))
+            return self._answer(
+                SettleResponse(
+                    success=True,
+                    transaction=tx_hash,
+                    network=network,
+                    confirmation=CONFIRMATION_BROADCAST,
+                )
+            )
+
+        response = await self._include(tx_hash, network)
+        if not response.success:
+            return response
+        if on_included is not None:
+            on_included()
+        return await self.finish(response, requirements)
+
+    async def finish(
+        self,
+        response: SettleResponse,
+        requirements: PaymentRequirements,
+    ) -> SettleResponse:
+        """
+        Take a settlement that is already included to the requested level.
+
+        Returns:
+            *response* at the reached level
+        """
+        if self.level_for(requirements) != CONFIRMATION_FINAL:
+            if self._on_confirmation is not None:
+                self._follow(self._follow_included(response))
+            return self._answer(response)
+
+        try:
+            return self._answer(await self._finalize(response))
+        except NotImplementedError as e:
+            logger.warning(f"Settlement answered at inclusion: {e}")
+            return self._answer(response)
+
+    async def close(self) -> None:
+        """Stop following settlements in the background"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _answer(self, response: SettleResponse) -> SettleResponse:
+        if response.confirmation is None:
+            response.confirmation = CONFIRMATION_INCLUDED
+        self.stats[response.confirmation] += 1
+        return response
+
+    async def _include(self, tx_hash: str, network: str) -> SettleResponse:
+        logger.info(f"Waiting for transaction receipt: txHash={tx_hash}")
+        receipt = await self._signer.wait_for_transaction_receipt(tx_hash, network=network)
+        tx_receipt = TransactionReceipt.from_signer_result(receipt)
+        if not tx_receipt.succeeded:
+            logger.error(f"Transaction failed on-chain: txHash={tx_hash}, receipt={receipt}")
+            return SettleResponse(
+                success=False,
+                errorReason="transaction_failed_on_chain",
+                transaction=tx_hash,
+                network=network,
+                receipt=tx_receipt,
+                confirmation=CONFIRMATION_INCLUDED,
+            )
+        logger.info(f"Transaction confirmed: {receipt}")
+        return SettleResponse(
+            success=True,
+            transaction=tx_hash,
+            network=network,
+            receipt=tx_receipt,
+            confirmation=CONFIRMATION_INCLUDED,
+        )
+
+    async def _finalize(self, response: SettleResponse) -> SettleResponse:
+        block_number = response.receipt.block_number if response.receipt else None
+        if block_number is None:
+            raise NotImplementedError("receipt has no block number")
+        await self._signer.wait_for_finality(int(block_number), network=response.network or "")
+        return response.model_copy(update={"confirmation": CONFIRMATION_FINAL})
+
+    def _follow(self, coro: Awaitable[None]) -> None:
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _follow_broadcast(
+        self,
+        tx_hash: str,
+        network: str,
+        on_included: Callable[[], None] | None,
+    ) -> None:
+        response = await self._guard(self._include(tx_hash, network), tx_hash, network)
+        await self._report(response)
+        if response.success:
+            if on_included is not None:
+                on_included()
+            if self._on_confirmation is not None:
+                await self._follow_included(response)
+
+    async def _follow_included(self, response: SettleResponse) -> None:
+        tx_hash = response.transaction or ""
+        network = response.network or ""
+        try:
+            final = await self._guard(self._finalize(response), tx_hash, network)
+        except NotImplementedError:
+            return
+        await self._report(final)
+
+    async def _guard(
+        self,
+        waiting: Awaitable[SettleResponse],
+        tx_hash: str,
+        network: str,
+    ) -> SettleResponse:
+        """Result of *waiting*, or a failed response if it times out or errors"""
+        try:
+            return await waiting
+        except NotImplementedError:
+            raise
+        except TimeoutError:
+            reason = "confirmation_timeout"
+        except Exception as e:
+            logger.warning(f"Following settlement {tx_hash} failed: {e}")
+            reason = "confirmation_error"
+        return SettleResponse(
+            success=False, errorReason=reason, transaction=tx_hash, network=network
+        )
+
+    async def _report(self, response: SettleResponse) -> None:
+        self.stats["reports" if response.success else "failures"] += 1
+        if self._on_confirmation is None:
+            return
+        try:
+            result = self._on_confirmation(response)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.warning(f"Confirmation callback failed: {e}")
@@ -0,0 +1,197 @@
+"""
+NonceStateService - On-chain replay pre-check before broadcasting a settlement
+
+A permit or authorization whose nonce is already consumed can only revert. It
+used to be discovered after broadcasting and waiting for the receipt. This
+service answers "is this nonce used?" before broadcasting:
+
+- PaymentPermit nonces are read through ``nonceBitmap(owner, word)``, which
+  covers 256 nonces per call (nonce ``n`` is bit ``n & 0xff`` of word
+  ``n >> 8``). Words are mirrored locally per (network, owner, word).
+- TransferWithAuthorization nonces are read through ``authorizationState``.
+
+Settlements this facilitator completes mark their nonce used locally, so a
+replay of one of them is rejected without any view call. Used bits never
+revert to unused on-chain, so set bits are trusted for as long as they are
+mirrored; unset bits are trusted for ``word_ttl`` seconds, after which the
+word is read again.
+
+The check is advisory: if the node cannot be reached, the nonce is reported
+as unknown and the settlement proceeds, leaving the contract to decide.
+"""
+
+import logging
+import time
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Hashable
+
+from bankofai.x402.abi import PAYMENT_PERMIT_ABI
+from bankofai.x402.mechanisms._exact_base.types import AUTHORIZATION_STATE_ABI
+from bankofai.x402.utils.address import parse_address
+
+if TYPE_CHECKING:
+    from bankofai.x402.signers.facilitator import FacilitatorSigner
+
+logger = logging.getLogger(__name__)
+
+# Seconds an unset bit of a mirrored word is trusted
+DEFAULT_WORD_TTL = 30.0
+DEFAULT_MAX_ENTRIES = 65536
+
+
+def _owner_key(address: str) -> Hashable:
+    parsed = parse_address(address)
+    return parsed.raw if parsed is not None else address.lower()
+
+
+class NonceStateService:
+    """
+    Tells whether permit and authorization nonces are already used on-chain.
+
+    ``stats`` counts ``view_calls``, answers served from the mirror
+    (``local_hits``) and failed reads (``errors``).
+
+    Args:
+        signer: Facilitator signer used for view calls (``read_contract``)
+        word_ttl: Seconds an unset bit of a mirrored bitmap word is trusted
+        max_entries: Maximum number of mirrored words and used authorizations;
+            the oldest is evicted first
+    """
+
+    def __init__(
+        self,
+        signer: "FacilitatorSigner",
+        word_ttl: float = DEFAULT_WORD_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._signer = signer
+        self._word_ttl = word_ttl
+        self._max_entries = max_entries
+        # (network, owner, word) -> (bitmap, monotonic time it was read; 0 if never)
+        self._words: OrderedDict[Hashable, tuple[int, float]] = OrderedDict()
+        self._authorizations: OrderedDict[Hashable, None] = OrderedDict()
+        self.stats: Counter[str] = Counter()
+
+    async def permit_nonce_used(
+        self,
+        network: str,
+        permit_contract: str,
+        owner: str,
+        nonce: int,
+        refresh: bool = False,
+    ) -> bool | None:
+        """
+        Check a PaymentPermit nonce.
+
+        Args:
+            network: Network identifier
+            permit_contract: PaymentPermit contract address
+            owner: Permit buyer
+            nonce: Permit nonce
+            refresh: Read the word from the contract even if an unset bit is
+                still trusted (e.g. right after a settlement was mined)
+
+        Returns:
+            True if used, False if unused, None if the state could not be read
+        """
+        word, bit = nonce >> 8, nonce & 0xFF
+        key = (network, _owner_key(owner), word)
+        entry = self._words.get(key)
+        if entry is not None:
+            bitmap, read_at = entry
+            fresh = not refresh and time.monotonic() - read_at < self._word_ttl
+            if bitmap >> bit & 1 or fresh:
+                self.stats["local_hits"] += 1
+                return bool(bitmap >> bit & 1)
+
+        try:
+            value = await self._signer.read_contract(
+                permit_contract, PAYMENT_PERMIT_ABI, "nonceBitmap", [owner, word], network
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"nonceBitmap unavailable on {network}: {e}")
+            return None
+        if not isinstance(value, int):
+            self.stats["errors"] += 1
+            return None
+        self.stats["view_calls"] += 1
+
+        # Keep optimistic marks the node may not have seen yet
+        bitmap = value | (self._words[key][0] if key in self._words else 0)
+        self._store_word(key, bitmap, time.monotonic())
+        return bool(bitmap >> bit & 1)
+
+    def mark_permit_nonce_used(self, network: str, owner: str, nonce: int) -> None:
+        """Record a permit nonce consumed by a settlement of this facilitator."""
+        key = (network, _owner_key(owner), nonce >> 8)
+        bitmap, read_at = self._words.get(key, (0, 0.0))
+        self._store_word(key, bitmap | 1 << (nonce & 0xFF), read_at)
+
+    async def authorization_used(
+        self,
+        network: str,
+        token: str,
+        authorizer: str,
+        nonce: bytes,
+    ) -> bool | None:
+        """
+        Check a TransferWithAuthorization nonce.
+
+        Args:
+            network: Network identifier
+            token: Token contract address
+            authorizer: Authorization sender
+            nonce: 32-byte authorization nonce
+
+        Returns:
+            True if used, False if unused, None if the state could not be read
+        """
+        key = (network, _owner_key(token), _owner_key(authorizer), bytes(nonce))
+        if key in self._authorizations:
+            self.stats["local_hits"] += 1
+            return True
+
+        try:
+            value = await self._signer.read_contract(
+                token, AUTHORIZATION_STATE_ABI, "authorizationState", [authorizer, nonce], network
+            )
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.debug(f"authorizationState unavailable on {network}: {e}")
+            return None
+        if not isinstance(value, bool):
+            self.stats["errors"] += 1
+            return None
+        self.stats["view_calls"] += 1
+
+        if value:
+            self._store_authorization(key)
+        return value
+
+    def mark_authorization_used(
+        self, network: str, token: str, authorizer: str, nonce: bytes
+    ) -> None:
+        """Record an authorization consumed by a settlement of this facilitator."""
+        self._store_authorization(
+            (network, _owner_key(token), _owner_key(authorizer), bytes(nonce))
+        )
+
+    def clear(self) -> None:
+        """Forget all mirrored state."""
+        self._words.clear()
+        self._authorizations.clear()
+
+    def _store_word(self, key: Hashable, bitmap: int, read_at: float) -> None:
+        self._words[key] = (bitmap, read_at)
+        self._words.move_to_end(key)
+        while len(self._words) > self._max_entries:
+            self._words.popitem(last=False)
+
+    def _store_authorization(self, key: Hashable) -> None:
+        self._authorizations[key] = None
+        self._authorizations.move_to_end(key)
+        while len(self._authorizations) > self._max_entries:
+            self._authorizations.popitem(last=False)
@@ -11,7 +11,9 @@ from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any
 
 from bankofai.x402.mechanisms._base.client import ClientMechanism
+from bankofai.x402.mechanisms._base.confirmation import SettlementConfirmer
 from bankofai.x402.mechanisms._base.facilitator import FacilitatorMechanism
+from bankofai.x402.mechanisms._base.nonce_state import NonceStateService
 from bankofai.x402.mechanisms._base.server import ServerMechanism
 from bankofai.x402.mechanisms._exact_base.types import (
     SCHEME_EXACT,
@@ -35,6 +37,7 @@ from bankofai.x402.types import (
     SettleResponse,
     VerifyResponse,
 )
+from bankofai.x402.utils.verification_cache import VerificationCache, verify_typed_data_cached
 
 if TYPE_CHECKING:
     from bankofai.x402.signers.client import ClientSigner
@@ -172,6 +175,17 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
     Note: exact only supports a single transfer per authorization,
     so the facilitator cannot collect fees from the payment itself.
     fee_quote always returns feeAmount=0.
+
+    Successful signature checks are remembered in *verification_cache* (a
+    private cache unless one is passed in), so settle after verify does not
+    recover the signer again. Within settle, the authorization parsed by the
+    verification step is used for the transfer.
+
+    Before broadcasting, *nonce_state* checks ``authorizationState`` so that an
+    authorization that was already used fails without a transaction.
+
+    After broadcasting, *confirmer* decides how long settle waits (see
+    SettlementConfirmer).
     """
 
     def __init__(
@@ -179,9 +193,17 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
         signer: "FacilitatorSigner",
         adapter: ChainAdapter,
         allowed_tokens: set[str] | None = None,
+        verification_cache: VerificationCache | None = None,
+        nonce_state: NonceStateService | None = None,
+        confirmer: SettlementConfirmer | None = None,
     ) -> None:
         self._signer = signer
         self._adapter = adapter
+        self._confirmer = confirmer or SettlementConfirmer(signer)
+        self._verification_cache = (
+            verification_cache if verification_cache is not None else VerificationCache()
+        )
+        self._nonce_state = nonce_state or NonceStateService(signer)
         self._allowed_tokens: set[str] | None = (
             {adapter.normalize_address(t) for t in allowed_tokens}
             if allowed_tokens is not None
@@ -218,6 +240,17 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
         payload: PaymentPayload,
         requirements: PaymentRequirements,
     ) -> VerifyResponse:
+        result = await self._verify_authorization(payload, requirements)
+        if isinstance(result, VerifyResponse):
+            return result
+        return VerifyResponse(isValid=True)
+
+    async def _verify_authorization(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+    ) -> VerifyResponse | TransferAuthorization:
+        """Return the verified authorization, or the failed VerifyResponse"""
         auth = self._extract_authorization(payload)
         if auth is None:
             return VerifyResponse(isValid=False, invalidReason="missing_transfer_authorization")
@@ -230,7 +263,7 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
         if not is_valid:
             return VerifyResponse(isValid=False, invalidReason="invalid_signature")
 
-        return VerifyResponse(isValid=True)
+        return auth
 
     # ------------------------------------------------------------------
     # settle
@@ -241,15 +274,14 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
         payload: PaymentPayload,
         requirements: PaymentRequirements,
     ) -> SettleResponse:
-        verify_result = await self.verify(payload, requirements)
-        if not verify_result.is_valid:
+        auth = await self._verify_authorization(payload, requirements)
+        if isinstance(auth, VerifyResponse):
             return SettleResponse(
                 success=False,
-                errorReason=verify_result.invalid_reason,
+                errorReason=auth.invalid_reason,
                 network=requirements.network,
             )
 
-        auth = self._extract_authorization(payload)
         signature = payload.payload.signature
 
         # Split signature into v, r, s
@@ -270,9 +302,21 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
 
         adapter = self._adapter
         token_address = requirements.asset
+        authorizer = adapter.to_signing_address(auth.from_address)
+
+        used = await self._nonce_state.authorization_used(
+            requirements.network, token_address, authorizer, nonce_bytes
+        )
+        if used:
+            logger.warning("[EXACT] Authorization nonce already used, not broadcasting")
+            return SettleResponse(
+                success=False,
+                errorReason="authorization_already_used",
+                network=requirements.network,
+            )
 
         args = [
-            adapter.to_signing_address(auth.from_address),
+            authorizer,
             adapter.to_signing_address(auth.to),
             int(auth.value),
             int(auth.valid_after),
@@ -303,23 +347,12 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
                 network=requirements.network,
             )
 
-        receipt = await self._signer.wait_for_transaction_receipt(
-            tx_hash, network=requirements.network
-        )
-        raw_status = receipt.get("status")
-        tx_status = raw_status.lower() if isinstance(raw_status, str) else raw_status
-        if tx_status == "failed" or tx_status == "0" or tx_status == 0:
-            return SettleResponse(
-                success=False,
-                errorReason="transaction_failed_on_chain",
-                transaction=tx_hash,
-                network=requirements.network,
-            )
-
-        return SettleResponse(
-            success=True,
-            transaction=tx_hash,
-            network=requirements.network,
+        return await self._confirmer.confirm(
+            tx_hash,
+            requirements,
+            on_included=lambda: self._nonce_state.mark_authorization_used(
+                requirements.network, token_address, authorizer, nonce_bytes
+            ),
         )
 
     # ------------------------------------------------------------------
@@ -387,7 +420,9 @@ class ExactBaseFacilitatorMechanism(FacilitatorMechanism):
         )
         message = build_eip712_message(auth)
 
-        return await self._signer.verify_typed_data(
+        return await verify_typed_data_cached(
+            self._signer,
+            self._verification_cache,
             address=adapter.to_signing_address(auth.from_address),
             domain=domain,
             types=TRANSFER_AUTH_EIP712_TYPES,
@@ -0,0 +1,351 @@
+"""
+PermitSettlementBatcher - Settles many PaymentPermits in one Multicall3 transaction
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from bankofai.x402.abi import ERC20_TRANSFER_TOPIC, MULTICALL3_ABI, get_abi_json
+from bankofai.x402.config import NetworkConfig
+from bankofai.x402.mechanisms._base.nonce_state import NonceStateService
+from bankofai.x402.types import SettleResponse, TransactionReceipt
+
+if TYPE_CHECKING:
+    from bankofai.x402.signers.facilitator import FacilitatorSigner
+
+# (token, from, to, amount) with addresses as lowercase 20-byte hex without 0x
+Transfer = tuple[str, str, str, int]
+
+DEFAULT_MAX_BATCH_SIZE = 50
+DEFAULT_MAX_WAIT_SECONDS = 0.25
+
+logger = logging.getLogger(__name__)
+
+
+def _hex(value: Any) -> str:
+    """Hex string without 0x prefix (accepts str, bytes and HexBytes)"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    text = str(value)
+    return text[2:] if text.startswith("0x") else text
+
+
+def _address_hex(value: Any) -> str:
+    """Last 20 bytes of an address, topic or TRON (41-prefixed) hex address"""
+    return _hex(value).lower()[-40:]
+
+
+def transfer_key(token: str, sender: str, recipient: str, amount: int) -> Transfer:
+    """Build a Transfer key from EVM-format (0x...) addresses."""
+    return (_address_hex(token), _address_hex(sender), _address_hex(recipient), int(amount))
+
+
+def extract_transfers(receipt: TransactionReceipt) -> Counter[Transfer]:
+    """Collect ERC20/TRC20 Transfer events from a transaction receipt."""
+    transfers: Counter[Transfer] = Counter()
+    for log in receipt.logs:
+        topics = log.topics
+        if len(topics) != 3 or topics[0][2:] != ERC20_TRANSFER_TOPIC:
+            continue
+        data = log.data[2:] or "0"
+        transfers[
+            (
+                _address_hex(log.address),
+                topics[1][-40:],
+                topics[2][-40:],
+                int(data, 16),
+            )
+        ] += 1
+    return transfers
+
+
+@dataclass
+class _BatchItem:
+    target: str
+    calldata: bytes
+    transfer: Transfer
+    future: "asyncio.Future[SettleResponse]" = field(repr=False)
+    # Permit buyer and nonce, to tell equal transfers apart
+    owner: str | None = None
+    nonce: int | None = None
+
+
+class PermitSettlementBatcher:
+    """
+    Collects permitTransferFrom calls and submits them together via Multicall3.
+
+    Calls are grouped per network and flushed when ``max_batch_size`` is reached
+    or ``max_wait`` seconds after the first call arrived. Each call is submitted
+    with ``allowFailure=True``, so one bad permit does not revert the batch;
+    the outcome of each call is read back from the Transfer events in the receipt.
+    Items whose transfer is missing from the receipt, or that share it with other
+    items, are resolved by reading their permit nonce through *nonce_state*: the
+    permit caller is the public Multicall3 contract, so anyone may have relayed
+    a permit before the batch did.
+
+    Inner calls are executed by the Multicall3 contract, so only permits whose
+    ``caller`` is the network's Multicall3 address can be batched (see
+    :meth:`caller_for`). Batching is opt-in per network through *networks*.
+
+    Security trade-off: a permit's ``caller`` is the only party allowed to
+    submit it. Batched permits name the public Multicall3 contract, which
+    executes calls for anyone, so any third party who sees the payload can
+    settle it before the facilitator does. The buyer still pays exactly the
+    signed amount to the signed recipient, but the facilitator loses control
+    over when (and in which transaction) the payment lands. Only enable
+    batching on networks where that is acceptable. Batching is EVM-only:
+    TRON has no Multicall3 deployment in :class:`NetworkConfig`.
+    """
+
+    def __init__(
+        self,
+        signer: "FacilitatorSigner",
+        networks: Iterable[str],
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait: float = DEFAULT_MAX_WAIT_SECONDS,
+        nonce_state: NonceStateService | None = None,
+    ) -> None:
+        """
+        Initialize batcher.
+
+        Args:
+            signer: Facilitator signer that sends the Multicall3 transactions
+            networks: Networks to batch on; each needs a Multicall3 address
+            max_batch_size: Maximum number of calls per transaction
+            max_wait: Seconds to wait for more calls before flushing a batch
+            nonce_state: Permit nonce reader used to resolve ambiguous items
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self._networks = frozenset(networks)
+        for network in self._networks:
+            if NetworkConfig.get_multicall_address(network) is None:
+                raise ValueError(f"No Multicall3 address configured for {network}")
+        self._signer = signer
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait
+        self._nonce_state = nonce_state or NonceStateService(signer)
+        self._pending: dict[str, list[_BatchItem]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def caller_for(self, network: str) -> str | None:
+        """Address that must be the permit caller for batching on *network*."""
+        if network not in self._networks:
+            return None
+        return NetworkConfig.get_multicall_address(network)
+
+    async def submit(
+        self,
+        network: str,
+        target: str,
+        calldata: bytes,
+        transfer: Transfer,
+        owner: str | None = None,
+        nonce: int | None = None,
+    ) -> SettleResponse:
+        """
+        Queue one call and wait for the batch containing it to be mined.
+
+        Args:
+            network: Network identifier
+            target: Contract the call is made to (PaymentPermit address)
+            calldata: ABI-encoded permitTransferFrom call
+            transfer: Transfer the call is expected to emit on success
+            owner: Permit buyer, in the network's address format
+            nonce: Permit nonce; with *owner*, resolves items the Transfer
+                events cannot tell apart
+
+        Returns:
+            SettleResponse for this call
+        """
+        loop = asyncio.get_running_loop()
+        item = _BatchItem(target, calldata, transfer, loop.create_future(), owner, nonce)
+        batch = self._pending.setdefault(network, [])
+        batch.append(item)
+
+        if len(batch) >= self._max_batch_size:
+            self._flush(network)
+        elif network not in self._timers:
+            self._timers[network] = loop.call_later(self._max_wait, self._flush, network)
+
+        return await item.future
+
+    async def flush_all(self) -> None:
+        """Submit all queued calls now and wait until their batches completed."""
+        for network in list(self._pending):
+            self._flush(network)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    def _flush(self, network: str) -> None:
+        timer = self._timers.pop(network, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(network, [])
+        if not items:
+            return
+        task = asyncio.get_running_loop().create_task(self._send_batch(network, items))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, network: str, items: list[_BatchItem]) -> None:
+        try:
+            try:
+                results = await self._execute(network, items)
+            except Exception as e:
+                logger.error("Batch settlement on %s failed: %s", network, e, exc_info=True)
+                results = [
+                    SettleResponse(success=False, errorReason="transaction_failed", network=network)
+                    for _ in items
+                ]
+
+            for item, result in zip(items, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+        finally:
+            # Cancelled (e.g. on shutdown): do not leave callers waiting forever
+            for item in items:
+                if not item.future.done():
+                    item.future.cancel()
+
+    async def _execute(self, network: str, items: list[_BatchItem]) -> list[SettleResponse]:
+        multicall = self.caller_for(network)
+        if multicall is None:
+            raise ValueError(f"Batched settlement is not available on {network}")
+
+        logger.info("Submitting batch of %d permits on %s", len(items), network)
+        tx_hash = await self._signer.write_contract(
+            contract_address=multicall,
+            abi=get_abi_json(MULTICALL3_ABI),
+            method="aggregate3",
+            args=[[(item.target, True, item.calldata) for item in items]],
+            network=network,
+        )
+        if tx_hash is None:
+            if len(items) > 1:
+                # The batch may be too large for the account's resources; settle one by one
+                logger.warning("Batch broadcast failed, settling %d permits singly", len(items))
+                results: list[SettleResponse] = []
+                for item in items:
+                    results.extend(await self._execute(network, [item]))
+                return results
+            return [
+                SettleResponse(success=False, errorReason="transaction_failed", network=network)
+            ]
+
+        try:
+            receipt = TransactionReceipt.from_signer_result(
+                await self._signer.wait_for_transaction_receipt(tx_hash, network=network)
+            )
+        except Exception as e:
+            # Broadcast but not confirmed; callers can still follow the transaction
+            logger.error("Waiting for batch %s on %s failed: %s", tx_hash, network, e)
+            return [
+                SettleResponse(
+                    success=False,
+                    errorReason="transaction_failed",
+                    transaction=tx_hash,
+                    network=network,
+                )
+                for _ in items
+            ]
+        if not receipt.succeeded:
+            logger.error("Batch transaction failed on-chain: txHash=%s", tx_hash)
+            return [
+                SettleResponse(
+                    success=False,
+                    errorReason="transaction_failed_on_chain",
+                    transaction=tx_hash,
+                    network=network,
+                    receipt=receipt,
+                )
+                for _ in items
+            ]
+
+        # Every item gets the whole receipt; verifiers look up their own transfers in it
+        outcomes = await self._settled_items(network, items, extract_transfers(receipt))
+        results = []
+        for outcome in outcomes:
+            if outcome is None:
+                results.append(
+                    SettleResponse(
+                        success=True, transaction=tx_hash, network=network, receipt=receipt
+                    )
+                )
+            elif outcome == "nonce_already_used":
+                # Consumed by another transaction; this batch's receipt proves nothing
+                results.append(SettleResponse(success=False, errorReason=outcome, network=network))
+            else:
+                results.append(
+                    SettleResponse(
+                        success=False,
+                        errorReason=outcome,
+                        transaction=tx_hash,
+                        network=network,
+                        receipt=receipt,
+                    )
+                )
+        succeeded = sum(1 for r in results if r.success)
+        logger.info("Batch %s settled %d/%d permits", tx_hash, succeeded, len(items))
+        return results
+
+    async def _settled_items(
+        self,
+        network: str,
+        items: list[_BatchItem],
+        transfers: Counter[Transfer],
+    ) -> list[str | None]:
+        """
+        Outcome of each item, from the receipt's Transfer events.
+
+        ``None`` means the item was settled by this batch. Otherwise the error
+        reason: ``nonce_already_used`` when the permit was consumed but this
+        batch's receipt has no transfer left to attribute to it, i.e. another
+        transaction settled it.
+        """
+        groups: dict[Transfer, list[int]] = {}
+        for index, item in enumerate(items):
+            groups.setdefault(item.transfer, []).append(index)
+
+        outcomes: list[str | None] = ["transaction_failed_on_chain"] * len(items)
+        for transfer, indexes in groups.items():
+            available = transfers[transfer]
+            if available >= len(indexes):
+                for index in indexes:
+                    outcomes[index] = None
+                continue
+
+            # Missing or shared transfer: ask the permit contract which nonces
+            # were consumed, by this batch or by whoever relayed a permit first
+            used = await asyncio.gather(*(self._nonce_used(network, items[i]) for i in indexes))
+            credited: set[tuple[str | None, int | None]] = set()
+            unknown: list[int] = []
+            for index, nonce_used in zip(indexes, used):
+                key = (items[index].owner, items[index].nonce)
+                if nonce_used is None:
+                    unknown.append(index)
+                elif nonce_used and key not in credited:
+                    # Duplicates of one permit are one payment. Equal transfers are
+                    # interchangeable, so the first consumed permits take them
+                    credited.add(key)
+                    if available > 0:
+                        available -= 1
+                        outcomes[index] = None
+                    else:
+                        outcomes[index] = "nonce_already_used"
+            # Without a nonce read, hand the remaining transfers out in order
+            for index in unknown[:available]:
+                outcomes[index] = None
+        return outcomes
+
+    async def _nonce_used(self, network: str, item: _BatchItem) -> bool | None:
+        if item.owner is None or item.nonce is None:
+            return None
+        return await self._nonce_state.permit_nonce_used(
+            network, item.target, item.owner, item.nonce, refresh=True
+        )
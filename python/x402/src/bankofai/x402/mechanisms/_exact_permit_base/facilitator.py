@@ -7,23 +7,37 @@ Extracts common logic from EVM and TRON implementations.
 import logging
 import time
 from abc import abstractmethod
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
-from bankofai.x402.abi import get_payment_permit_eip712_types
+from bankofai.x402.abi import (
+    PAYMENT_PERMIT_ABI,
+    calculate_method_id,
+    get_function_input_types,
+    get_payment_permit_eip712_types,
+)
 from bankofai.x402.address import AddressConverter
 from bankofai.x402.config import NetworkConfig
+from bankofai.x402.mechanisms._base.confirmation import SettlementConfirmer
 from bankofai.x402.mechanisms._base.facilitator import FacilitatorMechanism
+from bankofai.x402.mechanisms._base.nonce_state import NonceStateService
+from bankofai.x402.mechanisms._exact_permit_base.batcher import (
+    PermitSettlementBatcher,
+    transfer_key,
+)
 from bankofai.x402.tokens import TokenRegistry
 from bankofai.x402.types import (
     KIND_MAP,
     FeeInfo,
     FeeQuoteResponse,
     PaymentPayload,
+    PaymentPermit,
     PaymentRequirements,
     SettleResponse,
     VerifyResponse,
 )
 from bankofai.x402.utils import convert_permit_to_eip712_message, payment_id_to_bytes
+from bankofai.x402.utils.verification_cache import VerificationCache, verify_typed_data_cached
 
 if TYPE_CHECKING:
     from bankofai.x402.signers.facilitator import FacilitatorSigner
@@ -34,10 +48,58 @@ DEFAULT_BASE_FEE = 0
 FEE_QUOTE_EXPIRY_SECONDS = 300
 
 
+@dataclass(frozen=True)
+class VerifiedPermit:
+    """
+    Context of a permit whose signature was verified, consumed by settle.
+
+    *permit_tuple* holds the permit as passed to ``permitTransferFrom``, with
+    every address normalized once during verification.
+    """
+
+    permit: PaymentPermit
+    signature: str
+    permit_tuple: tuple[Any, ...]
+
+    @property
+    def buyer(self) -> str:
+        return str(self.permit_tuple[1])
+
+    @property
+    def pay_token(self) -> str:
+        return str(self.permit_tuple[3][0])
+
+    @property
+    def pay_to(self) -> str:
+        return str(self.permit_tuple[3][2])
+
+    @property
+    def fee_to(self) -> str:
+        return str(self.permit_tuple[4][0])
+
+
 class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
     """Base class for exact_permit payment scheme facilitator mechanisms.
 
     Subclasses only need to implement _get_address_converter() method.
+
+    With a *batcher*, fee quotes on the networks it was enabled for name the
+    public Multicall3 contract as permit caller, and such permits are settled
+    together with others in one transaction (anyone may relay them first; see
+    PermitSettlementBatcher). All other permits are settled one by one.
+
+    Successful verifications are remembered in *verification_cache* (a private
+    cache unless one is passed in) as a VerifiedPermit. ``settle`` after
+    ``verify`` consumes it and only re-runs the checks against the requirements;
+    it neither rebuilds the EIP-712 message nor recovers the signer again.
+
+    Before broadcasting, *nonce_state* checks the permit nonce against the
+    contract's ``nonceBitmap`` (mirrored locally), so that a replayed or
+    already-consumed permit fails without a transaction.
+
+    After broadcasting, *confirmer* decides how long settle waits: until the
+    node accepted the transaction, until it is included (the default) or until
+    it is final, per route or as the confirmer's default.
     """
 
     def __init__(
@@ -46,8 +108,18 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
         fee_to: str | None = None,
         base_fee: dict[str, int] | None = None,
         allowed_tokens: set[str] | None = None,
+        batcher: PermitSettlementBatcher | None = None,
+        verification_cache: VerificationCache | None = None,
+        nonce_state: NonceStateService | None = None,
+        confirmer: SettlementConfirmer | None = None,
     ) -> None:
         self._signer = signer
+        self._batcher = batcher
+        self._confirmer = confirmer or SettlementConfirmer(signer)
+        self._verification_cache = (
+            verification_cache if verification_cache is not None else VerificationCache()
+        )
+        self._nonce_state = nonce_state or NonceStateService(signer)
         self._fee_to = fee_to or signer.get_address()
         self._caller = signer.get_address()
         self._address_converter = self._get_address_converter()
@@ -122,7 +194,7 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
             fee=FeeInfo(
                 feeTo=self._fee_to,
                 feeAmount=fee_amount,
-                caller=self._caller,
+                caller=self._get_caller(accept.network),
             ),
             pricing="flat",
             scheme=accept.scheme,
@@ -131,38 +203,72 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
             expiresAt=int(time.time()) + FEE_QUOTE_EXPIRY_SECONDS,
         )
 
+    def _get_caller(self, network: str) -> str:
+        """Address permits must name as caller on *network*"""
+        if self._batcher is not None:
+            batch_caller = self._batcher.caller_for(network)
+            if batch_caller is not None:
+                return self._address_converter.normalize(batch_caller)
+        return self._caller
+
+    def _can_batch(self, permit: Any, network: str) -> bool:
+        if self._batcher is None:
+            return False
+        batch_caller = self._batcher.caller_for(network)
+        if batch_caller is None:
+            return False
+        norm = self._address_converter.to_evm_format
+        return norm(permit.caller).lower() == norm(batch_caller).lower()
+
     async def verify(
         self,
         payload: PaymentPayload,
         requirements: PaymentRequirements,
     ) -> VerifyResponse:
         """Verify payment signature"""
+        result = await self._verify_permit(payload, requirements)
+        if isinstance(result, VerifyResponse):
+            return result
+        return VerifyResponse(isValid=True)
+
+    async def _verify_permit(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+    ) -> VerifyResponse | VerifiedPermit:
+        """Return the verified permit context, or the failed VerifyResponse"""
         permit = payload.payload.payment_permit
+        signature = payload.payload.signature
+        if permit is None:
+            return VerifyResponse(isValid=False, invalidReason="missing_payment_permit")
         self._logger.info(
             f"Verifying payment: paymentId={permit.meta.payment_id}, "
             f"buyer={permit.buyer}, amount={permit.payment.pay_amount}"
         )
 
+        # The signed domain depends on the network, the message on the raw permit
+        key = (requirements.network, signature, permit.model_dump_json())
+        verified = self._verification_cache.get(key)
+        cached = verified is not None
+        if verified is None:
+            verified = VerifiedPermit(permit, signature, self._build_permit_tuple(permit))
+
         # Validate permit matches requirements
-        validation_error = self._validate_permit(permit, requirements)
+        validation_error = self._validate_permit(verified, requirements)
         if validation_error:
             self._logger.warning(f"Validation failed: {validation_error}")
             return VerifyResponse(isValid=False, invalidReason=validation_error)
 
-        # Verify EIP-712 signature
-        self._logger.info("Verifying EIP-712 signature...")
-        is_valid = await self._verify_signature(
-            permit,
-            payload.payload.signature,
-            requirements.network,
-        )
-
-        if not is_valid:
-            self._logger.warning("Invalid signature")
-            return VerifyResponse(isValid=False, invalidReason="invalid_signature")
+        if not cached:
+            # Verify EIP-712 signature
+            self._logger.info("Verifying EIP-712 signature...")
+            if not await self._verify_signature(permit, signature, requirements.network):
+                self._logger.warning("Invalid signature")
+                return VerifyResponse(isValid=False, invalidReason="invalid_signature")
+            self._verification_cache.put(key, verified)
 
         self._logger.info("Payment verification successful")
-        return VerifyResponse(isValid=True)
+        return verified
 
     async def settle(
         self,
@@ -170,25 +276,42 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
         requirements: PaymentRequirements,
     ) -> SettleResponse:
         """Execute payment settlement"""
-        permit = payload.payload.payment_permit
+        # Verify first
+        verified = await self._verify_permit(payload, requirements)
+        if isinstance(verified, VerifyResponse):
+            self._logger.error(
+                f"Settlement failed: verification failed - {verified.invalid_reason}"
+            )
+            return SettleResponse(
+                success=False,
+                errorReason=verified.invalid_reason,
+                network=requirements.network,
+            )
+
+        permit, signature = verified.permit, verified.signature
         self._logger.info(
             f"Starting settlement: paymentId={permit.meta.payment_id}, "
             f"kind={permit.meta.kind}, network={requirements.network}"
         )
 
-        # Verify first
-        verify_result = await self.verify(payload, requirements)
-        if not verify_result.is_valid:
-            self._logger.error(
-                f"Settlement failed: verification failed - {verify_result.invalid_reason}"
+        if await self._nonce_used(permit, requirements.network):
+            self._logger.warning(
+                f"Settlement skipped: nonce {permit.meta.nonce} of {permit.buyer} already used"
             )
             return SettleResponse(
                 success=False,
-                errorReason=verify_result.invalid_reason,
+                errorReason="nonce_already_used",
                 network=requirements.network,
             )
 
-        signature = payload.payload.signature
+        if self._can_batch(permit, requirements.network):
+            self._logger.info("Queueing permit for batched settlement")
+            result = await self._settle_batched(permit, signature, requirements)
+            if not result.success:
+                return result
+            self._mark_nonce_used(permit, requirements.network)
+            # The batch is answered once included, so broadcast is upgraded to included
+            return await self._confirmer.finish(result, requirements)
 
         # Always use payment only settlement
         self._logger.info("Settling payment only via PaymentPermit contract...")
@@ -200,7 +323,7 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
         self._logger.info(f"  - feeTo: {permit.fee.fee_to}")
         self._logger.info(f"  - feeAmount: {permit.fee.fee_amount}")
 
-        tx_hash = await self._settle_payment_only(permit, signature, requirements)
+        tx_hash = await self._settle_payment_only(verified, requirements)
 
         if tx_hash is None:
             self._logger.error("Settlement transaction failed: no transaction hash returned")
@@ -216,36 +339,36 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
             )
 
         self._logger.info(f"Transaction broadcast successful: txHash={tx_hash}")
-        self._logger.info("Waiting for transaction receipt...")
-        receipt = await self._signer.wait_for_transaction_receipt(
-            tx_hash, network=requirements.network
+        return await self._confirmer.confirm(
+            tx_hash,
+            requirements,
+            on_included=lambda: self._mark_nonce_used(permit, requirements.network),
         )
-        self._logger.info(f"Transaction confirmed: {receipt}")
-
-        # Validate transaction status
-        tx_status = receipt.get("status", "").lower()
-        if tx_status == "failed" or tx_status == "0" or tx_status == 0:
-            self._logger.error(f"Transaction failed on-chain: txHash={tx_hash}, receipt={receipt}")
-            return SettleResponse(
-                success=False,
-                errorReason="transaction_failed_on_chain",
-                transaction=tx_hash,
-                network=requirements.network,
-            )
 
-        return SettleResponse(
-            success=True,
-            transaction=tx_hash,
-            network=requirements.network,
+    async def _nonce_used(self, permit: Any, network: str) -> bool:
+        """True only if the permit nonce is known to be used (unknown counts as unused)"""
+        converter = self._address_converter
+        used = await self._nonce_state.permit_nonce_used(
+            network,
+            converter.normalize(NetworkConfig.get_payment_permit_address(network)),
+            converter.normalize(permit.buyer),
+            int(permit.meta.nonce),
         )
+        return bool(used)
 
-    def _validate_permit(self, permit: Any, requirements: PaymentRequirements) -> str | None:
+    def _mark_nonce_used(self, permit: Any, network: str) -> None:
+        self._nonce_state.mark_permit_nonce_used(network, permit.buyer, int(permit.meta.nonce))
+
+    def _validate_permit(
+        self, verified: VerifiedPermit, requirements: PaymentRequirements
+    ) -> str | None:
         """Validate permit matches requirements, returns error reason or None"""
         norm = self._address_converter.normalize
+        permit = verified.permit
 
         # Token whitelist check - reject unsupported tokens before any other validation
         if self._allowed_tokens is not None:
-            if norm(permit.payment.pay_token) not in self._allowed_tokens:
+            if verified.pay_token not in self._allowed_tokens:
                 self._logger.warning(
                     f"Token not allowed: {permit.payment.pay_token} not in {self._allowed_tokens}"
                 )
@@ -258,20 +381,20 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
             return "amount_mismatch"
 
         # Address comparison (normalize to handle hex/Base58 mixed inputs)
-        if norm(permit.payment.pay_to) != norm(requirements.pay_to):
+        if verified.pay_to != norm(requirements.pay_to):
             self._logger.warning(
                 f"PayTo mismatch: {permit.payment.pay_to} != {requirements.pay_to}"
             )
             return "payto_mismatch"
 
-        if norm(permit.payment.pay_token) != norm(requirements.asset):
+        if verified.pay_token != norm(requirements.asset):
             self._logger.warning(
                 f"Token mismatch: {permit.payment.pay_token} != {requirements.asset}"
             )
             return "token_mismatch"
 
         # Fee validation: compare against facilitator's own configured fee
-        if norm(permit.fee.fee_to) != norm(self._fee_to):
+        if verified.fee_to != norm(self._fee_to):
             self._logger.warning(f"FeeTo mismatch: {permit.fee.fee_to} != {self._fee_to}")
             return "fee_to_mismatch"
         expected_fee = self._get_base_fee(permit.payment.pay_token, requirements.network)
@@ -333,7 +456,9 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
         logger.info(f"[VERIFY] Signature: {signature}")
         logger.info(f"[VERIFY] Buyer address: {permit.buyer}")
 
-        return await self._signer.verify_typed_data(
+        return await verify_typed_data_cached(
+            self._signer,
+            self._verification_cache,
             address=permit.buyer,
             domain={
                 "name": "PaymentPermit",
@@ -348,26 +473,63 @@ class BaseExactPermitFacilitatorMechanism(FacilitatorMechanism):
     @abstractmethod
     async def _settle_payment_only(
         self,
-        permit: Any,
-        signature: str,
+        verified: VerifiedPermit,
         requirements: PaymentRequirements,
     ) -> str | None:
         """Payment only settlement (no on-chain delivery), implemented by subclasses"""
         pass
 
-    def _build_permit_tuple(self, permit: Any) -> tuple:
-        """Build permit tuple for contract call"""
+    async def _settle_batched(
+        self,
+        permit: Any,
+        signature: str,
+        requirements: PaymentRequirements,
+    ) -> SettleResponse:
+        """Settle through the batcher; the permit caller is the Multicall3 contract"""
+        if self._batcher is None:
+            raise ValueError("Batched settlement requires a batcher")
+        target = NetworkConfig.get_payment_permit_address(requirements.network)
+        to_evm = self._address_converter.to_evm_format
+        return await self._batcher.submit(
+            network=requirements.network,
+            target=self._address_converter.normalize(target),
+            calldata=self._encode_permit_transfer(permit, signature),
+            transfer=transfer_key(
+                to_evm(permit.payment.pay_token),
+                to_evm(permit.buyer),
+                to_evm(permit.payment.pay_to),
+                int(permit.payment.pay_amount),
+            ),
+            owner=self._address_converter.normalize(permit.buyer),
+            nonce=int(permit.meta.nonce),
+        )
+
+    def _encode_permit_transfer(self, permit: Any, signature: str) -> bytes:
+        """ABI-encode a permitTransferFrom call (selector + arguments)"""
+        from eth_abi.abi import encode
+
+        arg_types = get_function_input_types(PAYMENT_PERMIT_ABI, "permitTransferFrom")
+        selector = bytes.fromhex(calculate_method_id(PAYMENT_PERMIT_ABI, "permitTransferFrom"))
+        sig_bytes = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
+        owner = self._address_converter.to_evm_format(permit.buyer)
+        return selector + encode(
+            arg_types, [self._build_permit_tuple(permit, evm_format=True), owner, sig_bytes]
+        )
+
+    def _build_permit_tuple(self, permit: Any, evm_format: bool = False) -> tuple[Any, ...]:
+        """Build permit tuple for contract call (addresses as 0x-hex if *evm_format*)"""
         converter = self._address_converter
 
         payment_id = permit.meta.payment_id
         if isinstance(payment_id, str):
             payment_id = payment_id_to_bytes(payment_id)
 
-        buyer = converter.normalize(permit.buyer)
-        caller = converter.normalize(permit.caller)
-        pay_token = converter.normalize(permit.payment.pay_token)
-        pay_to = converter.normalize(permit.payment.pay_to)
-        fee_to = converter.normalize(permit.fee.fee_to)
+        fmt = converter.to_evm_format if evm_format else converter.normalize
+        buyer = fmt(permit.buyer)
+        caller = fmt(permit.caller)
+        pay_token = fmt(permit.payment.pay_token)
+        pay_to = fmt(permit.payment.pay_to)
+        fee_to = fmt(permit.fee.fee_to)
 
         return (
             (  # meta tuple
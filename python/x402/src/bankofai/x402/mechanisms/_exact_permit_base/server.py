@@ -8,25 +8,31 @@ import logging
 from abc import abstractmethod
 from typing import Any
 
-from bankofai.x402.abi import (
-    EIP712_DOMAIN_TYPE,
-    PAYMENT_PERMIT_PRIMARY_TYPE,
-    get_payment_permit_eip712_types,
-)
+from bankofai.x402.abi import get_payment_permit_eip712_types
 from bankofai.x402.config import NetworkConfig
 from bankofai.x402.mechanisms._base.server import ServerMechanism
 from bankofai.x402.tokens import TokenRegistry
 from bankofai.x402.types import KIND_MAP, PaymentRequirements, PaymentRequirementsExtra
+from bankofai.x402.utils.crypto_executor import get_crypto_executor
+from bankofai.x402.utils.typed_data import recover_typed_data_signer
+from bankofai.x402.utils.verification_cache import VerificationCache, typed_data_digest
 
 
 class BaseExactPermitServerMechanism(ServerMechanism):
     """Base class for exact_permit payment scheme server mechanisms.
 
     Subclasses only need to implement network prefix and address format validation.
+
+    Verified signatures are recorded in *verification_cache*, a private cache
+    unless one is passed in. Passing the same cache to a co-located facilitator
+    lets it trust this server's checks; that is never done implicitly.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, verification_cache: VerificationCache | None = None) -> None:
         self._logger = logging.getLogger(self.__class__.__name__)
+        self._verification_cache = (
+            verification_cache if verification_cache is not None else VerificationCache()
+        )
 
     @abstractmethod
     def _get_network_prefix(self) -> str:
@@ -115,9 +121,6 @@ class BaseExactPermitServerMechanism(ServerMechanism):
             True if signature is valid
         """
         try:
-            from eth_account import Account
-            from eth_account.messages import encode_typed_data
-
             permit_address = NetworkConfig.get_payment_permit_address(network)
             chain_id = NetworkConfig.get_chain_id(network)
 
@@ -134,12 +137,6 @@ class BaseExactPermitServerMechanism(ServerMechanism):
                 f"[SERVER VERIFY] PaymentId: {message.get('meta', {}).get('paymentId', 'N/A')}"
             )
 
-            # Build EIP-712 typed data
-            full_types = {
-                "EIP712Domain": EIP712_DOMAIN_TYPE,
-                **get_payment_permit_eip712_types(),
-            }
-
             verifying_contract = self._get_verifying_contract(permit_address)
             domain = {
                 "name": "PaymentPermit",
@@ -149,27 +146,28 @@ class BaseExactPermitServerMechanism(ServerMechanism):
 
             self._logger.info(f"[SERVER VERIFY] Verifying contract: {verifying_contract}")
 
-            typed_data = {
-                "types": full_types,
-                "primaryType": PAYMENT_PERMIT_PRIMARY_TYPE,
-                "domain": domain,
-                "message": message,
-            }
+            # Hash and verify signature
+            digest = await typed_data_digest(domain, get_payment_permit_eip712_types(), message)
+            if self._verification_cache.is_verified(digest, signature):
+                self._logger.info("[SERVER VERIFY] Signature already verified")
+                return True
 
-            # Encode and verify signature
-            signable = encode_typed_data(full_message=typed_data)
-            sig_bytes = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
-            recovered = Account.recover_message(signable, signature=sig_bytes)
+            recovered = await get_crypto_executor().run(
+                recover_typed_data_signer, digest, signature
+            )
 
             # Get expected signer address
             expected_address = self._get_expected_signer(permit.buyer)
+            is_valid = recovered.lower() == expected_address.lower()
 
             self._logger.info(
                 f"[SERVER VERIFY] Expected signer: {expected_address}, "
-                f"Recovered: {recovered}, Match: {recovered.lower() == expected_address.lower()}"
+                f"Recovered: {recovered}, Match: {is_valid}"
             )
 
-            return recovered.lower() == expected_address.lower()
+            if is_valid:
+                self._verification_cache.mark_verified(digest, signature)
+            return is_valid
         except Exception as e:
             self._logger.error(f"[SERVER VERIFY] Signature verification failed: {e}", exc_info=True)
             return False
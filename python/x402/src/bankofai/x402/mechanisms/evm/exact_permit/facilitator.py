@@ -2,13 +2,12 @@
 ExactPermitEvmFacilitatorMechanism - "exact_permit" payment scheme EVM facilitator mechanism
 """
 
-from typing import Any
-
 from bankofai.x402.abi import PAYMENT_PERMIT_ABI, get_abi_json
 from bankofai.x402.address import AddressConverter, EvmAddressConverter
 from bankofai.x402.config import NetworkConfig
 from bankofai.x402.mechanisms._exact_permit_base.facilitator import (
     BaseExactPermitFacilitatorMechanism,
+    VerifiedPermit,
 )
 from bankofai.x402.types import PaymentRequirements
 
@@ -21,19 +20,17 @@ class ExactPermitEvmFacilitatorMechanism(BaseExactPermitFacilitatorMechanism):
 
     async def _settle_payment_only(
         self,
-        permit: Any,
-        signature: str,
+        verified: VerifiedPermit,
         requirements: PaymentRequirements,
     ) -> str | None:
         """Payment only settlement (no on-chain delivery)"""
         contract_address = NetworkConfig.get_payment_permit_address(requirements.network)
         self._logger.info(f"Calling permitTransferFrom on contract={contract_address}")
 
-        permit_tuple = self._build_permit_tuple(permit)
+        signature = verified.signature
         sig_bytes = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
-        buyer = self._address_converter.normalize(permit.buyer)
 
-        args = [permit_tuple, buyer, sig_bytes]
+        args = [verified.permit_tuple, verified.buyer, sig_bytes]
         self._logger.info(
             f"Calling permitTransferFrom with {len(args)} arguments (PAYMENT_ONLY mode)"
         )
@@ -8,7 +8,10 @@ from bankofai.x402.mechanisms._exact_base.base import ExactBaseFacilitatorMechan
 from bankofai.x402.mechanisms.tron.exact.adapter import TronChainAdapter
 
 if TYPE_CHECKING:
+    from bankofai.x402.mechanisms._base.confirmation import SettlementConfirmer
+    from bankofai.x402.mechanisms._base.nonce_state import NonceStateService
     from bankofai.x402.signers.facilitator import FacilitatorSigner
+    from bankofai.x402.utils.verification_cache import VerificationCache
 
 
 class ExactTronFacilitatorMechanism(ExactBaseFacilitatorMechanism):
@@ -18,5 +21,10 @@ class ExactTronFacilitatorMechanism(ExactBaseFacilitatorMechanism):
         self,
         signer: "FacilitatorSigner",
         allowed_tokens: set[str] | None = None,
+        verification_cache: "VerificationCache | None" = None,
+        nonce_state: "NonceStateService | None" = None,
+        confirmer: "SettlementConfirmer | None" = None,
     ) -> None:
-        super().__init__(signer, TronChainAdapter(), allowed_tokens)
+        super().__init__(
+            signer, TronChainAdapter(), allowed_tokens, verification_cache, nonce_state, confirmer
+        )
@@ -1,12 +1,12 @@
-from typing import Any
-
 from bankofai.x402.abi import PAYMENT_PERMIT_ABI, get_abi_json, get_payment_permit_eip712_types
 from bankofai.x402.address import AddressConverter, TronAddressConverter
 from bankofai.x402.config import NetworkConfig
 from bankofai.x402.mechanisms._exact_permit_base.facilitator import (
     BaseExactPermitFacilitatorMechanism,
+    VerifiedPermit,
 )
 from bankofai.x402.types import KIND_MAP, PaymentPermit, PaymentRequirements
+from bankofai.x402.utils.verification_cache import verify_typed_data_cached
 
 
 class ExactPermitTronFacilitatorMechanism(BaseExactPermitFacilitatorMechanism):
@@ -57,7 +57,9 @@ class ExactPermitTronFacilitatorMechanism(BaseExactPermitFacilitatorMechanism):
         logger.info(f"[VERIFY TRON] Signature: {signature}")
         logger.info(f"[VERIFY TRON] Buyer address: {permit.buyer}")
 
-        return await self._signer.verify_typed_data(
+        return await verify_typed_data_cached(
+            self._signer,
+            self._verification_cache,
             address=permit.buyer,
             domain={
                 "name": "PaymentPermit",
@@ -71,19 +73,17 @@ class ExactPermitTronFacilitatorMechanism(BaseExactPermitFacilitatorMechanism):
 
     async def _settle_payment_only(
         self,
-        permit: Any,
-        signature: str,
+        verified: VerifiedPermit,
         requirements: PaymentRequirements,
     ) -> str | None:
         """Payment only settlement (no on-chain delivery)"""
         contract_address = NetworkConfig.get_payment_permit_address(requirements.network)
         self._logger.info(f"Calling permitTransferFrom on contract={contract_address}")
 
-        permit_tuple = self._build_permit_tuple(permit)
+        signature = verified.signature
         sig_bytes = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
-        buyer = self._address_converter.normalize(permit.buyer)
 
-        args = [permit_tuple, buyer, sig_bytes]
+        args = [verified.permit_tuple, verified.buyer, sig_bytes]
         self._logger.info(
             f"Calling permitTransferFrom with {len(args)} arguments (PAYMENT_ONLY mode)"
         )
@@ -2,6 +2,30 @@
 x402 Server SDK
 """
 
+from bankofai.x402.server.payment_gate import PaymentDecision, PaymentGate
+from bankofai.x402.server.payment_validation import (
+    PaymentValidator,
+    SeenPayments,
+    ValidationResult,
+)
+from bankofai.x402.server.requirements_cache import RequirementsCache
+from bankofai.x402.server.route_plan import PaymentRequiredTemplate, RoutePlan
+from bankofai.x402.server.settlement_outbox import SettlementOutbox
+from bankofai.x402.server.settlement_queue import SettlementPolicy, SettlementQueue
 from bankofai.x402.server.x402_server import ResourceConfig, X402Server
 
-__all__ = ["X402Server", "ResourceConfig"]
+__all__ = [
+    "X402Server",
+    "ResourceConfig",
+    "RequirementsCache",
+    "RoutePlan",
+    "PaymentRequiredTemplate",
+    "PaymentGate",
+    "PaymentDecision",
+    "PaymentValidator",
+    "SeenPayments",
+    "ValidationResult",
+    "SettlementPolicy",
+    "SettlementQueue",
+    "SettlementOutbox",
+]
@@ -0,0 +1,385 @@
+"""
+PaymentGate - Framework-independent payment check for a protected route
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from bankofai.x402.compact import (
+    COMPACT_ENCODINGS,
+    PAYMENT_ENCODING_HEADER,
+    negotiate_encoding,
+)
+from bankofai.x402.encoding import (
+    encode_payment_payload,
+    json_dumps,
+)
+from bankofai.x402.server.payment_validation import (
+    STAGE_FACILITATOR,
+    STAGE_HEADER_SIZE,
+    STAGE_REPLAY,
+    STAGE_SIGNATURE,
+)
+from bankofai.x402.server.route_plan import RoutePlan
+from bankofai.x402.server.settlement_outbox import (
+    OUTBOX_FAILED,
+    OUTBOX_SETTLED,
+    settlement_id,
+)
+from bankofai.x402.server.x402_server import ResourceConfig, X402Server
+from bankofai.x402.types import (
+    CONFIRMATION_BROADCAST,
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+    TransactionReceipt,
+)
+
+if TYPE_CHECKING:
+    from bankofai.x402.server.settlement_queue import SettlementQueue
+    from bankofai.x402.utils.tx_verification import TransactionVerificationResult
+
+PAYMENT_SIGNATURE_HEADER = "PAYMENT-SIGNATURE"
+PAYMENT_REQUIRED_HEADER = "PAYMENT-REQUIRED"
+PAYMENT_RESPONSE_HEADER = "PAYMENT-RESPONSE"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PaymentDecision:
+    """
+    Outcome of a payment check.
+
+    If ``settle_response`` is set the request is paid and may be served, with
+    ``payment_response_header()`` attached to the response. Otherwise the
+    request must be answered with ``status_code``, ``body`` and ``headers``.
+    """
+
+    settle_response: SettleResponse | None = None
+    status_code: int = 200
+    body: bytes = b""
+    headers: dict[str, str] = field(default_factory=dict)
+    response_encoding: str | None = None
+    _response_header: str | None = field(default=None, init=False, repr=False)
+
+    @property
+    def allowed(self) -> bool:
+        return self.settle_response is not None
+
+    def payment_response_header(self) -> str:
+        """Encoded PAYMENT-RESPONSE header value for a paid request (encoded once)"""
+        if self.settle_response is None:
+            raise ValueError("Request was not paid")
+        if self._response_header is None:
+            # The receipt is for on-chain verification only and stays out of the header
+            self._response_header = encode_payment_payload(
+                self.settle_response, exclude={"receipt"}, encoding=self.response_encoding
+            )
+        return self._response_header
+
+    @classmethod
+    def reject(cls, status_code: int, content: dict[str, Any]) -> "PaymentDecision":
+        return cls(
+            status_code=status_code,
+            body=json_dumps(content),
+            headers={"content-type": "application/json"},
+        )
+
+
+class PaymentGate:
+    """
+    Runs the payment flow of a protected route independently of the web framework.
+
+    Screens the PAYMENT-SIGNATURE header with the server's validation pipeline
+    (size, structure, route, replay, signature), settles the payment and
+    verifies the transaction on-chain. Used by both the FastAPI decorator and
+    the raw ASGI middleware.
+
+    Routes with an async SettlementPolicy are served as soon as the payment is
+    verified; settlement is handed to *settlement_queue*.
+
+    With *compact* enabled, 402 responses advertise the compact wire format in
+    a PAYMENT-ENCODING header, and PAYMENT-REQUIRED / PAYMENT-RESPONSE are sent
+    compact to clients that list it in their own PAYMENT-ENCODING header.
+    PAYMENT-SIGNATURE is accepted in either format regardless.
+    """
+
+    def __init__(
+        self,
+        server: X402Server,
+        settlement_queue: "SettlementQueue | None" = None,
+        compact: bool = False,
+    ) -> None:
+        self._server = server
+        self._settlement_queue = settlement_queue
+        self._compact = compact
+
+    @property
+    def server(self) -> X402Server:
+        return self._server
+
+    @property
+    def settlement_queue(self) -> "SettlementQueue | None":
+        return self._settlement_queue
+
+    async def process(
+        self,
+        plan: RoutePlan,
+        payment_header: str | None,
+        resource_url: str,
+        payment_encoding: str | None = None,
+    ) -> PaymentDecision:
+        """
+        Check the payment of one request.
+
+        Args:
+            plan: Compiled plan of the protected route
+            payment_header: Value of the PAYMENT-SIGNATURE header, if any
+            resource_url: Full URL of the requested resource
+            payment_encoding: Value of the request's PAYMENT-ENCODING header, if any
+
+        Returns:
+            PaymentDecision
+        """
+        encoding = negotiate_encoding(payment_encoding) if self._compact else None
+        if not payment_header:
+            return await self.payment_required(plan, resource_url, encoding=encoding)
+        decision = await self._process_payment(plan, payment_header, resource_url, encoding)
+        if decision.allowed:
+            decision.response_encoding = encoding
+        return decision
+
+    async def _process_payment(
+        self,
+        plan: RoutePlan,
+        payment_header: str,
+        resource_url: str,
+        encoding: str | None,
+    ) -> PaymentDecision:
+        # Cheap checks first: nothing below runs for malformed, mismatched or replayed payments
+        validation = await self._server.validate_payment(payment_header, plan)
+        if not validation.ok:
+            if validation.stage == STAGE_REPLAY and validation.payload is not None:
+                queued = await self._queued_decision(plan, validation.payload)
+                if queued is not None:
+                    return queued
+            if validation.stage in (STAGE_REPLAY, STAGE_SIGNATURE):
+                return await self.payment_required(
+                    plan, resource_url, error=validation.reason, encoding=encoding
+                )
+            status_code = 431 if validation.stage == STAGE_HEADER_SIZE else 400
+            return PaymentDecision.reject(status_code, {"error": validation.reason})
+
+        payload, config = validation.payload, validation.config
+        if payload is None or config is None:
+            return PaymentDecision.reject(400, {"error": validation.reason})
+        try:
+            decision = await self._settle(plan, payload, config, resource_url, encoding)
+        except BaseException:
+            self._server.release_payment(payload)
+            raise
+        return decision
+
+    async def _settle(
+        self,
+        plan: RoutePlan,
+        payload: PaymentPayload,
+        config: ResourceConfig,
+        resource_url: str,
+        encoding: str | None,
+    ) -> PaymentDecision:
+        requirements = (await self._server.build_payment_requirements([config]))[0]
+
+        queue = self._settlement_queue
+        if plan.settlement.is_async and queue is not None:
+            decision = await self._verify_then_queue(
+                queue, plan, payload, requirements, resource_url, encoding
+            )
+            if decision is not None:
+                return decision
+
+        settle_result = await self._server.settle_payment(payload, requirements)
+        if not settle_result.success:
+            self._server.release_payment(payload, STAGE_FACILITATOR)
+            logger.error(f"Payment settlement failed: {settle_result.error_reason}")
+            logger.error(f"Settlement result: {settle_result.model_dump(by_alias=True)}")
+            error_content: dict[str, Any] = {
+                "error": f"Settlement failed: {settle_result.error_reason}",
+            }
+            if settle_result.transaction:
+                error_content["txHash"] = settle_result.transaction
+            if settle_result.network:
+                error_content["network"] = settle_result.network
+            return PaymentDecision.reject(500, error_content)
+
+        # Verify transaction on-chain (required). A settlement answered at broadcast
+        # has no block to check yet; the facilitator follows it up.
+        if settle_result.transaction and settle_result.confirmation != CONFIRMATION_BROADCAST:
+            tx_verify_result = await self.verify_transaction_on_chain(
+                tx_hash=settle_result.transaction,
+                payload=payload,
+                requirements=requirements,
+                network=requirements.network,
+                receipt=self._server.trusted_receipt(settle_result),
+            )
+            if not tx_verify_result.success:
+                return PaymentDecision.reject(
+                    500,
+                    {
+                        "error": (
+                            f"Transaction verification failed: {tx_verify_result.error_reason}"
+                        ),
+                        "txHash": settle_result.transaction,
+                    },
+                )
+
+        return PaymentDecision(settle_response=settle_result)
+
+    async def _verify_then_queue(
+        self,
+        queue: "SettlementQueue",
+        plan: RoutePlan,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+        resource_url: str,
+        encoding: str | None = None,
+    ) -> PaymentDecision | None:
+        """
+        Verify the payment and queue its settlement.
+
+        Returns:
+            The decision, or None if the payment has to be settled synchronously
+            because it exceeds the buyer's unsettled limit
+        """
+        max_unsettled = None
+        if plan.unsettled_limits:
+            max_unsettled = plan.unsettled_limit(requirements.network, requirements.asset)
+            if max_unsettled is None:
+                return None
+
+        # validate_payment already checked the signature
+        verify_result = await self._server.verify_payment(
+            payload, requirements, signature_verified=True
+        )
+        if not verify_result.is_valid:
+            self._server.release_payment(payload, STAGE_FACILITATOR)
+            return await self.payment_required(
+                plan,
+                resource_url,
+                error=f"Payment verification failed: {verify_result.invalid_reason}",
+                encoding=encoding,
+            )
+
+        result = await queue.submit(payload, requirements, max_unsettled)
+        if result == "duplicate":
+            queued = await self._queued_decision(plan, payload)
+            if queued is not None:
+                return queued
+            return await self.payment_required(
+                plan, resource_url, error="Payment already used", encoding=encoding
+            )
+        if result == "limit_exceeded":
+            logger.info("Unsettled limit reached, settling synchronously")
+            return None
+
+        return PaymentDecision(
+            settle_response=SettleResponse(success=True, network=requirements.network)
+        )
+
+    async def _queued_decision(
+        self, plan: RoutePlan, payload: PaymentPayload
+    ) -> PaymentDecision | None:
+        """
+        Answer a retry of a payment already accepted for background settlement.
+
+        Returns:
+            The queued settlement's status, or None if the payment is not in
+            the outbox, differs from the stored one or failed to settle
+        """
+        queue = self._settlement_queue
+        if queue is None or not plan.settlement.is_async:
+            return None
+        entry = await queue.outbox.get(settlement_id(payload))
+        if entry is None or entry.status == OUTBOX_FAILED or entry.payload != payload:
+            return None
+        # A tx hash of a pending row may be from a failed attempt; report it once settled
+        tx_hash = entry.tx_hash if entry.status == OUTBOX_SETTLED else None
+        return PaymentDecision(
+            settle_response=SettleResponse(success=True, transaction=tx_hash, network=entry.network)
+        )
+
+    async def payment_required(
+        self,
+        plan: RoutePlan,
+        resource_url: str,
+        error: str | None = None,
+        encoding: str | None = None,
+    ) -> PaymentDecision:
+        """Build the 402 payment required response for a route
+
+        Args:
+            encoding: Compact encoding for the PAYMENT-REQUIRED header, None for JSON
+        """
+        requirements_list = await self._server.build_payment_requirements(list(plan.configs))
+        if not requirements_list:
+            return PaymentDecision.reject(500, {"error": "No supported payment options available"})
+
+        template = plan.payment_required_template(self._server, requirements_list)
+        body, header = template.render(
+            resource_url, error=error or "Payment required", encoding=encoding
+        )
+        headers = {"content-type": "application/json", PAYMENT_REQUIRED_HEADER: header}
+        if self._compact:
+            headers[PAYMENT_ENCODING_HEADER] = ", ".join(COMPACT_ENCODINGS)
+        return PaymentDecision(status_code=402, body=body, headers=headers)
+
+    async def verify_transaction_on_chain(
+        self,
+        tx_hash: str,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+        network: str,
+        receipt: TransactionReceipt | None = None,
+    ) -> "TransactionVerificationResult":
+        """Verify transaction on-chain to ensure transfers match expectations."""
+        return await verify_transaction_on_chain(tx_hash, payload, requirements, network, receipt)
+
+
+async def verify_transaction_on_chain(
+    tx_hash: str,
+    payload: PaymentPayload,
+    requirements: PaymentRequirements,
+    network: str | None = None,
+    receipt: TransactionReceipt | None = None,
+) -> "TransactionVerificationResult":
+    """
+    Verify transaction on-chain to ensure transfers match expectations.
+
+    Args:
+        tx_hash: Transaction hash to verify
+        payload: Payment payload
+        requirements: Payment requirements
+        network: Network identifier (default: requirements.network)
+        receipt: Receipt returned with the settlement; saves refetching it
+
+    Returns:
+        TransactionVerificationResult
+    """
+    from bankofai.x402.utils.tx_verification import (
+        TransactionVerificationResult,
+        get_verifier_for_network,
+    )
+
+    try:
+        verifier = get_verifier_for_network(network or requirements.network)
+        return await verifier.verify_transaction(tx_hash, payload, requirements, receipt)
+    except ValueError as e:
+        # No verifier available for this network, skip verification
+        logger.warning(f"Transaction verification skipped: {e}")
+        return TransactionVerificationResult(
+            success=True,
+            tx_hash=tx_hash,
+            status_verified=True,
+        )
@@ -0,0 +1,283 @@
+"""
+PaymentValidator - Cheap-first screening of PAYMENT-SIGNATURE headers
+
+Every payment header is screened by stages ordered from cheapest to most
+expensive, and the first failing stage rejects it:
+
+1. header size: the raw header is bounded before anything is decoded,
+2. structure: base64/compact decoding and model validation,
+3. route: network, asset, payTo, amount and validity window against the
+   compiled RoutePlan (pure comparisons, no I/O),
+4. replay: (network, buyer, paymentId, nonce) against a local seen-set,
+5. signature: public-key recovery by the server mechanism (X402Server).
+
+Only payments that pass all five reach the facilitator. Rejections are counted
+per stage in ``PaymentValidator.rejections``, so an operator can tell which
+kind of garbage a route is receiving.
+
+A payment that passes the replay stage holds a reservation in the seen-set.
+Callers release it when the payment later fails (signature, facilitator or
+settlement), so that a buyer can retry the same signed payment.
+"""
+
+import logging
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Hashable
+
+from bankofai.x402.encoding import decode_payment_payload
+from bankofai.x402.server.settlement_outbox import payment_amount, payment_buyer
+from bankofai.x402.types import PaymentPayload
+from bankofai.x402.utils.address import parse_address
+
+if TYPE_CHECKING:
+    from bankofai.x402.server.route_plan import RoutePlan
+    from bankofai.x402.server.x402_server import ResourceConfig
+
+logger = logging.getLogger(__name__)
+
+STAGE_HEADER_SIZE = "header_size"
+STAGE_STRUCTURE = "structure"
+STAGE_ROUTE = "route"
+STAGE_REPLAY = "replay"
+STAGE_SIGNATURE = "signature"
+STAGE_FACILITATOR = "facilitator"
+# In the order they run
+STAGES = (
+    STAGE_HEADER_SIZE,
+    STAGE_STRUCTURE,
+    STAGE_ROUTE,
+    STAGE_REPLAY,
+    STAGE_SIGNATURE,
+    STAGE_FACILITATOR,
+)
+
+# A PAYMENT-SIGNATURE header is about 1.4 KB as base64 JSON
+DEFAULT_MAX_HEADER_SIZE = 8 * 1024
+DEFAULT_MAX_SEEN = 100_000
+
+
+@dataclass
+class ValidationResult:
+    """
+    Outcome of screening one payment header.
+
+    On success ``payload`` and ``config`` are set. On rejection ``stage`` names
+    the stage that rejected the payment and ``reason`` says why; a replay
+    rejection keeps the decoded ``payload`` so callers can look up its outcome.
+    """
+
+    payload: PaymentPayload | None = None
+    config: "ResourceConfig | None" = None
+    stage: str | None = None
+    reason: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.stage is None
+
+
+def _same_address(a: str, b: str) -> bool:
+    parsed_a = parse_address(a)
+    parsed_b = parse_address(b)
+    if parsed_a is None or parsed_b is None:
+        return a.lower() == b.lower()
+    return parsed_a.raw == parsed_b.raw
+
+
+def _address_key(address: str) -> Hashable:
+    parsed = parse_address(address)
+    return parsed.raw if parsed is not None else address.lower()
+
+
+class SeenPayments:
+    """
+    Bounded set of payments already accepted, each kept until it expires.
+
+    A payment is only replayable while its validity window is open, so an
+    entry lives until the payment's validBefore. When full, the oldest entry
+    is evicted first.
+
+    Args:
+        max_entries: Maximum number of remembered payments
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_SEEN) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[Hashable, float] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        expires_at = self._entries.get(key)
+        return expires_at is not None and expires_at > time.time()
+
+    def add(self, key: Hashable, expires_at: float) -> bool:
+        """
+        Remember a payment.
+
+        Returns:
+            False if the payment is already remembered and has not expired
+        """
+        if key in self:
+            return False
+        self._entries[key] = expires_at
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    def discard(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class PaymentValidator:
+    """
+    Runs the cheap screening stages (1-4) for payment headers.
+
+    The signature stage needs the server's mechanisms and is run by
+    ``X402Server.validate_payment``; facilitator rejections are recorded there
+    too, so ``rejections`` covers the whole pipeline.
+
+    Args:
+        max_header_size: Maximum length of a PAYMENT-SIGNATURE header value
+        seen: Seen-set used for replay detection (a bounded one is created if None)
+    """
+
+    def __init__(
+        self,
+        max_header_size: int = DEFAULT_MAX_HEADER_SIZE,
+        seen: SeenPayments | None = None,
+    ) -> None:
+        if max_header_size <= 0:
+            raise ValueError("max_header_size must be positive")
+        self.max_header_size = max_header_size
+        self.seen = seen or SeenPayments()
+        self.rejections: Counter[str] = Counter()
+        self.passed = 0
+
+    def reject(self, stage: str, reason: str) -> ValidationResult:
+        """Count a rejection and build its result."""
+        self.rejections[stage] += 1
+        logger.info(f"Payment rejected at {stage} stage: {reason}")
+        return ValidationResult(stage=stage, reason=reason)
+
+    def screen(
+        self,
+        header: str,
+        plan: "RoutePlan",
+        settling: Callable[[PaymentPayload], bool] | None = None,
+    ) -> ValidationResult:
+        """
+        Run the header size, structure, route and replay stages.
+
+        A payment that passes holds a replay reservation (see ``release``).
+
+        Args:
+            header: PAYMENT-SIGNATURE header value
+            plan: Compiled plan of the protected route
+            settling: Tells whether a payment is settling or was just settled;
+                such a retry passes the replay stage so it can join that settlement
+        """
+        if len(header) > self.max_header_size:
+            return self.reject(
+                STAGE_HEADER_SIZE, f"Payment header exceeds {self.max_header_size} bytes"
+            )
+
+        try:
+            payload = decode_payment_payload(header, PaymentPayload)
+        except Exception as e:
+            return self.reject(STAGE_STRUCTURE, f"Invalid payment payload: {e}")
+
+        config = plan.match(payload.accepted.network, payload.accepted.asset)
+        if config is None:
+            return self.reject(STAGE_ROUTE, "Unsupported payment token or network")
+        reason = self._check_route(payload, config, plan)
+        if reason is not None:
+            return self.reject(STAGE_ROUTE, reason)
+
+        key = self.replay_key(payload)
+        if not self.seen.add(key, self._valid_before(payload)):
+            if settling is None or not settling(payload):
+                result = self.reject(STAGE_REPLAY, "Payment already used")
+                result.payload = payload
+                return result
+
+        self.passed += 1
+        return ValidationResult(payload=payload, config=config)
+
+    def release(self, payload: PaymentPayload) -> None:
+        """Drop the replay reservation of a payment that did not go through."""
+        self.seen.discard(self.replay_key(payload))
+
+    @staticmethod
+    def replay_key(payload: PaymentPayload) -> Hashable:
+        """Identity of a payment: (network, buyer, paymentId, nonce)"""
+        permit = payload.payload.payment_permit
+        if permit is not None:
+            payment_id, nonce = permit.meta.payment_id, permit.meta.nonce
+        else:
+            auth = (payload.extensions or {}).get("transferAuthorization") or {}
+            payment_id, nonce = None, str(auth.get("nonce", ""))
+        return (
+            payload.accepted.network,
+            _address_key(payment_buyer(payload)),
+            payment_id,
+            nonce,
+        )
+
+    @staticmethod
+    def _validity_window(payload: PaymentPayload) -> tuple[int, int]:
+        permit = payload.payload.payment_permit
+        if permit is not None:
+            return permit.meta.valid_after, permit.meta.valid_before
+        auth = (payload.extensions or {}).get("transferAuthorization") or {}
+        return int(auth.get("validAfter", 0)), int(auth.get("validBefore", 0))
+
+    def _valid_before(self, payload: PaymentPayload) -> float:
+        return float(self._validity_window(payload)[1])
+
+    def _check_route(
+        self,
+        payload: PaymentPayload,
+        config: "ResourceConfig",
+        plan: "RoutePlan",
+    ) -> str | None:
+        """Reason the payment does not fit the route, None if it does"""
+        permit = payload.payload.payment_permit
+        if permit is not None:
+            pay_to = permit.payment.pay_to
+            if not _same_address(permit.payment.pay_token, payload.accepted.asset):
+                return "Payment token does not match the accepted asset"
+        else:
+            auth = (payload.extensions or {}).get("transferAuthorization")
+            if not isinstance(auth, dict):
+                return "Missing transfer authorization"
+            pay_to = str(auth.get("to", ""))
+
+        if not _same_address(pay_to, config.pay_to):
+            return "Payment recipient does not match"
+
+        try:
+            valid_after, valid_before = self._validity_window(payload)
+            amount = payment_amount(payload, payload.accepted)
+        except (TypeError, ValueError):
+            return "Malformed amount or validity window"
+
+        now = int(time.time())
+        if valid_before < now:
+            return "Payment expired"
+        if valid_after > now:
+            return "Payment not yet valid"
+
+        min_amount = plan.min_amount(payload.accepted.network, payload.accepted.asset)
+        if min_amount is not None and amount < min_amount:
+            return "Payment amount is below the price"
+        return None
@@ -0,0 +1,174 @@
+"""
+RequirementsCache - Fee-quote-aware cache for built PaymentRequirements
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from bankofai.x402.types import PaymentRequirements
+
+# Lifetime of entries whose fee quote carries no expiresAt (or that need no quote)
+DEFAULT_REQUIREMENTS_TTL = 300
+# Entries closer than this to expiry are refreshed in the background
+DEFAULT_REFRESH_AHEAD = 30
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedRequirements:
+    """A built requirement together with the moment its fee quote expires.
+
+    ``requirements`` is None when the facilitator does not support the config,
+    so unsupported tokens are not re-quoted on every request either.
+    """
+
+    requirements: PaymentRequirements | None
+    expires_at: float
+
+
+RequirementsBuilder = Callable[[list[Any]], Awaitable[list[CachedRequirements]]]
+
+
+class RequirementsCache:
+    """
+    Cache of PaymentRequirements keyed by resource configuration.
+
+    Entries live until the facilitator's ``expiresAt``. Entries that are about to
+    expire are rebuilt in the background while the current value keeps being
+    served, and concurrent misses for the same key share one in-flight build
+    (single-flight), so a cold-cache burst results in a single fee quote.
+
+    Cached requirements are shared between callers and must be treated as read-only;
+    ``X402Server.build_payment_requirements`` hands out copies of them.
+    """
+
+    def __init__(
+        self,
+        refresh_ahead: int = DEFAULT_REFRESH_AHEAD,
+        default_ttl: int = DEFAULT_REQUIREMENTS_TTL,
+    ) -> None:
+        """
+        Initialize RequirementsCache.
+
+        Args:
+            refresh_ahead: Seconds before expiry at which a background refresh starts
+            default_ttl: Lifetime in seconds for entries without a quote expiry
+        """
+        self._refresh_ahead = refresh_ahead
+        self._default_ttl = default_ttl
+        self._entries: dict[Hashable, CachedRequirements] = {}
+        self._inflight: dict[Hashable, asyncio.Future[CachedRequirements]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._generation = 0
+
+    @property
+    def default_ttl(self) -> int:
+        """Lifetime in seconds for entries without a quote expiry"""
+        return self._default_ttl
+
+    def clear(self) -> None:
+        """Drop all cached entries.
+
+        In-flight builds still resolve for their waiters but are not stored.
+        """
+        self._entries.clear()
+        self._inflight.clear()
+        self._generation += 1
+
+    async def get_many(
+        self,
+        items: list[tuple[Hashable, Any]],
+        build: RequirementsBuilder,
+    ) -> list[CachedRequirements]:
+        """
+        Resolve cache entries for a list of (key, config) pairs.
+
+        Args:
+            items: Cache keys paired with the config needed to build them
+            build: Builds entries for a list of configs, aligned with its input
+
+        Returns:
+            One CachedRequirements per item, in input order
+        """
+        now = time.time()
+        results: list[CachedRequirements | None] = [None] * len(items)
+        waiting: dict[int, asyncio.Future[CachedRequirements]] = {}
+        missing: dict[Hashable, Any] = {}
+        refresh: dict[Hashable, Any] = {}
+
+        for i, (key, config) in enumerate(items):
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                results[i] = entry
+                if entry.expires_at - now <= self._refresh_ahead and key not in self._inflight:
+                    refresh[key] = config
+                continue
+            if key not in self._inflight:
+                missing[key] = config
+
+        if refresh:
+            logger.debug("Refreshing %d requirements entries in background", len(refresh))
+            self._start_build(refresh, build)
+        if missing:
+            self._start_build(missing, build)
+
+        for i, (key, _config) in enumerate(items):
+            if results[i] is None:
+                waiting[i] = self._inflight[key]
+
+        for i, future in waiting.items():
+            # shield: one cancelled waiter must not cancel the build shared by others
+            results[i] = await asyncio.shield(future)
+
+        return [entry for entry in results if entry is not None]
+
+    def _start_build(self, configs: dict[Hashable, Any], build: RequirementsBuilder) -> None:
+        """Start one build for all *configs* and register its per-key futures."""
+        loop = asyncio.get_running_loop()
+        futures = {key: loop.create_future() for key in configs}
+        self._inflight.update(futures)
+        task = loop.create_task(
+            self._run_build(list(configs.values()), futures, build, self._generation)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_build(
+        self,
+        configs: list[Any],
+        futures: dict[Hashable, asyncio.Future[CachedRequirements]],
+        build: RequirementsBuilder,
+        generation: int,
+    ) -> None:
+        try:
+            entries = await build(configs)
+        except asyncio.CancelledError:
+            for key, future in futures.items():
+                self._forget(key, future)
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.warning("Failed to build payment requirements: %s", e)
+            for key, future in futures.items():
+                self._forget(key, future)
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved: background refreshes may have no waiter
+                    future.exception()
+            return
+
+        for (key, future), entry in zip(futures.items(), entries):
+            if generation == self._generation:
+                self._entries[key] = entry
+            self._forget(key, future)
+            if not future.done():
+                future.set_result(entry)
+
+    def _forget(self, key: Hashable, future: asyncio.Future[CachedRequirements]) -> None:
+        """Unregister *future* unless a newer build has replaced it."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
@@ -0,0 +1,316 @@
+"""
+RoutePlan - Precompiled payment configuration for a protected route
+"""
+
+import base64
+import copy
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from bankofai.x402.compact import CompactPrefix
+from bankofai.x402.exceptions import UnknownTokenError
+from bankofai.x402.server.settlement_queue import SettlementPolicy
+from bankofai.x402.server.x402_server import PAYMENT_REQUIRED_VALIDITY_SECONDS, ResourceConfig
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import ConfirmationLevel, PaymentRequirements
+from bankofai.x402.utils.address import address_key
+from bankofai.x402.utils.payment_id import generate_payment_id
+
+if TYPE_CHECKING:
+    from bankofai.x402.server.x402_server import X402Server
+
+_SLOT_PATTERN = re.compile(r'"__x402_slot_(\w+)__"')
+_SLOT_VALUE = re.compile(r"__x402_slot_(\w+)__")
+
+
+def _slot(name: str) -> str:
+    return f"__x402_slot_{name}__"
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"))
+
+
+def _fill(data: Any, values: Mapping[str, Any]) -> Any:
+    """Copy of *data* with slot markers replaced by *values*"""
+    if isinstance(data, dict):
+        return {key: _fill(item, values) for key, item in data.items()}
+    if isinstance(data, list):
+        return [_fill(item, values) for item in data]
+    if isinstance(data, str):
+        match = _SLOT_VALUE.fullmatch(data)
+        return values[match.group(1)] if match else data
+    return data
+
+
+class PaymentRequiredTemplate:
+    """
+    Pre-serialized 402 body and PAYMENT-REQUIRED header for one set of requirements.
+
+    The ``accepts`` list is serialized (and base64-encoded) once. Rendering only
+    splices the resource URL, error, paymentId, nonce and validity window into a
+    short JSON tail. Keys are emitted with ``accepts`` first so that the static
+    part forms a prefix of the document. Compact headers are built the same way,
+    from an ``accepts`` prefix encoded once per compact encoding.
+    """
+
+    def __init__(
+        self,
+        requirements: Sequence[PaymentRequirements],
+        sample: dict[str, Any],
+    ) -> None:
+        """
+        Initialize template.
+
+        Args:
+            requirements: Requirements the template was built from (compared by value)
+            sample: ``PaymentRequired.model_dump(by_alias=True)`` for these requirements
+        """
+        # Copies: the caller may modify its requirements after building the template
+        self._requirements = tuple(r.model_copy(deep=True) for r in requirements)
+        # Slots are written into a copy; the caller's dict is left as it was
+        sample = copy.deepcopy(sample)
+
+        meta = sample["extensions"]["paymentPermitContext"]["meta"]
+        meta["paymentId"] = _slot("payment_id")
+        meta["nonce"] = _slot("nonce")
+        meta["validAfter"] = _slot("valid_after")
+        meta["validBefore"] = _slot("valid_before")
+        sample["error"] = _slot("error")
+        sample["resource"]["url"] = _slot("url")
+
+        static = {"x402Version": sample.pop("x402Version"), "accepts": sample.pop("accepts")}
+        head = _dumps(static)
+        tail = _dumps(sample)
+        self._static = static
+        self._tail = sample
+        self._compact: dict[str, CompactPrefix] = {}
+        # Splice "<head without '}'>,<tail without '{'>"
+        prefix = (head[:-1] + ",").encode("utf-8")
+        parts = _SLOT_PATTERN.split(tail[1:])
+
+        # Base64 works on 3-byte groups, so the aligned part of the prefix is encoded once
+        aligned = len(prefix) - len(prefix) % 3
+        self._prefix = prefix
+        self._prefix_b64 = base64.b64encode(prefix[:aligned])
+        self._prefix_rest = prefix[aligned:]
+        self._literals = [p.encode("utf-8") for p in parts[0::2]]
+        self._slots = parts[1::2]
+
+    def matches(self, requirements: Sequence[PaymentRequirements]) -> bool:
+        """Return True if *requirements* equal the ones this template was built from."""
+        if len(requirements) != len(self._requirements):
+            return False
+        return all(a == b for a, b in zip(requirements, self._requirements))
+
+    def render(
+        self,
+        resource_url: str,
+        error: str = "Payment required",
+        payment_id: str | None = None,
+        nonce: str | None = None,
+        valid_after: int | None = None,
+        valid_before: int | None = None,
+        encoding: str | None = None,
+    ) -> tuple[bytes, str]:
+        """
+        Render the 402 response for one request.
+
+        Args:
+            encoding: Compact encoding for the header, None for base64 JSON
+
+        Returns:
+            (JSON body, PAYMENT-REQUIRED header value)
+        """
+        now = int(time.time())
+        values = {
+            "url": resource_url,
+            "error": error,
+            "payment_id": payment_id or generate_payment_id(),
+            "nonce": nonce or str(uuid.uuid4().int),
+            "valid_after": valid_after or now,
+            "valid_before": valid_before or (now + PAYMENT_REQUIRED_VALIDITY_SECONDS),
+        }
+
+        chunks = [self._literals[0]]
+        for slot, literal in zip(self._slots, self._literals[1:]):
+            chunks.append(_dumps(values[slot]).encode("utf-8"))
+            chunks.append(literal)
+        tail = b"".join(chunks)
+
+        body = self._prefix + tail
+        if encoding is not None:
+            return body, self._compact_prefix(encoding).encode_header(_fill(self._tail, values))
+        header = self._prefix_b64 + base64.b64encode(self._prefix_rest + tail)
+        return body, header.decode("ascii")
+
+    def _compact_prefix(self, encoding: str) -> CompactPrefix:
+        prefix = self._compact.get(encoding)
+        if prefix is None:
+            size = len(self._static) + len(self._tail)
+            prefix = self._compact[encoding] = CompactPrefix(self._static, size, encoding)
+        return prefix
+
+
+class _TemplateSlot:
+    """Holds the most recent template of a plan (replaced when requirements change)."""
+
+    __slots__ = ("template",)
+
+    def __init__(self) -> None:
+        self.template: PaymentRequiredTemplate | None = None
+
+
+@dataclass(frozen=True)
+class RoutePlan:
+    """
+    Immutable, precompiled view of the resource configs protecting one route.
+
+    Built once when a route is declared. Holds a (network, asset) index so that a
+    payment can be matched to its config with a single dict lookup, the price of
+    each token in base units for screening payment amounts, the route's
+    settlement policy with its per-token unsettled limits resolved to base units,
+    and the pre-serialized 402 template for the route's current requirements.
+    """
+
+    configs: tuple[ResourceConfig, ...]
+    config_index: Mapping[tuple[str, str], ResourceConfig]
+    min_amounts: Mapping[tuple[str, str], int] = field(default_factory=lambda: MappingProxyType({}))
+    settlement: SettlementPolicy = field(default_factory=SettlementPolicy)
+    unsettled_limits: Mapping[tuple[str, str], int] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    _template: _TemplateSlot = field(default_factory=_TemplateSlot, repr=False, compare=False)
+
+    @classmethod
+    def compile(
+        cls,
+        configs: Sequence[ResourceConfig],
+        settlement: SettlementPolicy | None = None,
+    ) -> "RoutePlan":
+        """
+        Compile resource configs into a route plan.
+
+        Raises:
+            ValueError: If a price string is malformed
+            UnknownTokenError: If a price names a token unknown on its network
+        """
+        index: dict[tuple[str, str], ResourceConfig] = {}
+        min_amounts: dict[tuple[str, str], int] = {}
+        for config in configs:
+            parsed = TokenRegistry.parse_price(config.price, config.network)
+            key = cls._index_key(config.network, parsed["asset"])
+            # First config wins, matching the order the configs were declared in
+            if key not in index:
+                index[key] = config
+                min_amounts[key] = parsed["amount"]
+
+        settlement = settlement or SettlementPolicy()
+        networks = list(dict.fromkeys(config.network for config in configs))
+        limits: dict[tuple[str, str], int] = {}
+        for limit in settlement.max_unsettled:
+            resolved = False
+            for network in networks:
+                try:
+                    parsed = TokenRegistry.parse_price(limit, network)
+                except UnknownTokenError:
+                    continue
+                limits[cls._index_key(network, parsed["asset"])] = parsed["amount"]
+                resolved = True
+            if not resolved:
+                raise UnknownTokenError(f"Unsettled limit {limit!r} names an unknown token")
+
+        return cls(
+            configs=tuple(configs),
+            config_index=MappingProxyType(index),
+            min_amounts=MappingProxyType(min_amounts),
+            settlement=settlement,
+            unsettled_limits=MappingProxyType(limits),
+        )
+
+    @classmethod
+    def from_prices(
+        cls,
+        prices: Sequence[str],
+        schemes: Sequence[str],
+        network: str | None,
+        pay_to: str | None,
+        valid_for: int = 3600,
+        delivery_mode: str = "PAYMENT_ONLY",
+        settlement: SettlementPolicy | None = None,
+        confirmation: ConfirmationLevel | None = None,
+    ) -> "RoutePlan":
+        """
+        Compile a plan from parallel price and scheme lists sharing one network.
+
+        ``prices[i]`` uses ``schemes[i]``. *confirmation* is the settlement
+        confirmation level of every config (see ResourceConfig).
+
+        Raises:
+            ValueError: If arguments are missing or the lists differ in length
+            UnknownTokenError: If a price names a token unknown on the network
+        """
+        if not prices or not schemes or not network or not pay_to:
+            raise ValueError("prices, schemes, network, and pay_to are required")
+        if len(schemes) != len(prices):
+            raise ValueError(
+                f"schemes length ({len(schemes)}) must match prices length ({len(prices)})"
+            )
+        return cls.compile(
+            [
+                ResourceConfig(
+                    scheme=s,
+                    network=network,
+                    price=p,
+                    pay_to=pay_to,
+                    valid_for=valid_for,
+                    delivery_mode=delivery_mode,
+                    confirmation=confirmation,
+                )
+                for p, s in zip(prices, schemes)
+            ],
+            settlement,
+        )
+
+    @staticmethod
+    def _index_key(network: str, asset: str) -> tuple[str, str]:
+        # TRON base58 addresses are case-sensitive; only 0x-hex is lowercased
+        return (network, address_key(asset))
+
+    def match(self, network: str, asset: str) -> ResourceConfig | None:
+        """Find the config matching a payment's network and asset."""
+        return self.config_index.get(self._index_key(network, asset))
+
+    def min_amount(self, network: str, asset: str) -> int | None:
+        """Price of the config matching a token in base units, None if no config matches."""
+        return self.min_amounts.get(self._index_key(network, asset))
+
+    def unsettled_limit(self, network: str, asset: str) -> int | None:
+        """Maximum unsettled amount per buyer for a token, None if it has no limit."""
+        return self.unsettled_limits.get(self._index_key(network, asset))
+
+    def payment_required_template(
+        self,
+        server: "X402Server",
+        requirements: Sequence[PaymentRequirements],
+    ) -> PaymentRequiredTemplate:
+        """
+        Get the 402 template for *requirements*, building it only when they changed.
+
+        Requirements served from the server's requirements cache stay equal until
+        the fee quote is refreshed, so the template is rebuilt once per quote.
+        """
+        template = self._template.template
+        if template is None or not template.matches(requirements):
+            sample = server.create_payment_required_response(
+                requirements=list(requirements),
+                resource_info={"url": ""},
+            )
+            template = PaymentRequiredTemplate(requirements, sample.model_dump(by_alias=True))
+            self._template.template = template
+        return template
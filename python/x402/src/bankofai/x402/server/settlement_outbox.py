@@ -0,0 +1,350 @@
+"""
+SettlementOutbox - Durable SQLite queue of payments waiting to be settled
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+from bankofai.x402.types import PaymentPayload, PaymentRequirements
+from bankofai.x402.utils.address import address_key
+
+OUTBOX_PENDING = "pending"
+OUTBOX_SETTLING = "settling"
+OUTBOX_SETTLED = "settled"
+OUTBOX_FAILED = "failed"
+
+EnqueueResult = Literal["enqueued", "duplicate", "limit_exceeded"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS settlements (
+    id TEXT PRIMARY KEY,
+    network TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    buyer TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    requirements TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    lease_until REAL NOT NULL DEFAULT 0,
+    tx_hash TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS settlements_due ON settlements (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS settlements_buyer ON settlements (network, asset, buyer, status);
+"""
+
+
+@dataclass
+class OutboxEntry:
+    """A payment stored in the outbox"""
+
+    id: str
+    network: str
+    asset: str
+    buyer: str
+    amount: int
+    payload: PaymentPayload
+    requirements: PaymentRequirements
+    status: str
+    attempts: int
+    tx_hash: str | None = None
+    error: str | None = None
+    # Claimed again after another worker's lease ran out mid-settlement
+    reclaimed: bool = False
+
+
+def payment_buyer(payload: PaymentPayload) -> str:
+    """Address of the paying account (permit buyer or authorization sender)"""
+    permit = payload.payload.payment_permit
+    if permit is not None:
+        return permit.buyer
+    auth = (payload.extensions or {}).get("transferAuthorization") or {}
+    return str(auth.get("from", ""))
+
+
+def payment_amount(payload: PaymentPayload, requirements: PaymentRequirements) -> int:
+    """Amount the payment transfers, in the token's smallest unit"""
+    permit = payload.payload.payment_permit
+    if permit is not None:
+        return int(permit.payment.pay_amount)
+    auth = (payload.extensions or {}).get("transferAuthorization") or {}
+    return int(auth.get("value", requirements.amount))
+
+
+def settlement_id(payload: PaymentPayload) -> str:
+    """
+    Idempotency key of a payment.
+
+    Derived from network and signature: a signature authorizes exactly one
+    transfer, so re-submitting the same payment maps to the same row.
+    """
+    data = f"{payload.accepted.network}:{payload.payload.signature}".encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+class SettlementOutbox:
+    """
+    Durable store of accepted-but-unsettled payments.
+
+    Backed by SQLite in WAL mode so that rows survive restarts and several worker
+    processes can share one file. Rows move ``pending -> settling -> settled``
+    (or ``failed`` after the last attempt). A ``settling`` row whose lease ran out
+    (e.g. the process died mid-settlement) is picked up again; the on-chain nonce
+    of the permit/authorization makes such a retry settle at most once.
+
+    All methods are coroutines; the SQLite calls run in a worker thread.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 120.0) -> None:
+        """
+        Initialize outbox.
+
+        Args:
+            path: SQLite database file (":memory:" for a process-local outbox)
+            lease_seconds: How long a claimed row is reserved for one worker
+        """
+        self._path = path
+        self._lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def enqueue(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+        max_unsettled: int | None = None,
+    ) -> EnqueueResult:
+        """
+        Store a payment for background settlement.
+
+        Args:
+            payload: Verified payment payload
+            requirements: Requirements the payment was verified against
+            max_unsettled: Maximum total unsettled amount of the buyer for this
+                asset, including this payment (None: unlimited)
+
+        Returns:
+            "enqueued", "duplicate" if the payment is already stored, or
+            "limit_exceeded" if it would exceed *max_unsettled*
+        """
+        return await asyncio.to_thread(self._enqueue, payload, requirements, max_unsettled)
+
+    def _enqueue(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+        max_unsettled: int | None,
+    ) -> EnqueueResult:
+        entry_id = settlement_id(payload)
+        network = requirements.network
+        asset = address_key(requirements.asset)
+        buyer = address_key(payment_buyer(payload))
+        amount = payment_amount(payload, requirements)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self._conn.execute(
+                    "SELECT 1 FROM settlements WHERE id = ?", (entry_id,)
+                ).fetchone():
+                    self._conn.execute("ROLLBACK")
+                    return "duplicate"
+
+                if max_unsettled is not None:
+                    unsettled = self._unsettled_amount(network, asset, buyer)
+                    if unsettled + amount > max_unsettled:
+                        self._conn.execute("ROLLBACK")
+                        return "limit_exceeded"
+
+                self._conn.execute(
+                    "INSERT INTO settlements (id, network, asset, buyer, amount, payload,"
+                    " requirements, status, next_attempt_at, created_at, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        entry_id,
+                        network,
+                        asset,
+                        buyer,
+                        str(amount),
+                        payload.model_dump_json(by_alias=True),
+                        requirements.model_dump_json(by_alias=True),
+                        OUTBOX_PENDING,
+                        now,
+                        now,
+                        now,
+                    ),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return "enqueued"
+
+    async def unsettled_amount(self, network: str, asset: str, buyer: str) -> int:
+        """Total amount of the buyer's payments that are not settled yet"""
+
+        def run() -> int:
+            with self._lock:
+                return self._unsettled_amount(network, address_key(asset), address_key(buyer))
+
+        return await asyncio.to_thread(run)
+
+    def _unsettled_amount(self, network: str, asset: str, buyer: str) -> int:
+        # Amounts are uint256 strings, so they are summed in Python
+        rows = self._conn.execute(
+            "SELECT amount FROM settlements WHERE network = ? AND asset = ? AND buyer = ?"
+            " AND status IN (?, ?)",
+            (network, asset, buyer, OUTBOX_PENDING, OUTBOX_SETTLING),
+        ).fetchall()
+        return sum(int(row[0]) for row in rows)
+
+    async def claim_due(self, limit: int) -> list[OutboxEntry]:
+        """
+        Claim up to *limit* rows that are due for a settlement attempt.
+
+        Claimed rows are leased to the caller and not handed out again until
+        the lease expires or the row is marked.
+        """
+        return await asyncio.to_thread(self._claim_due, limit)
+
+    def _claim_due(self, limit: int) -> list[OutboxEntry]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, network, asset, buyer, amount, payload, requirements, attempts,"
+                    " tx_hash, status FROM settlements"
+                    " WHERE (status = ? AND next_attempt_at <= ?)"
+                    " OR (status = ? AND lease_until <= ?)"
+                    " ORDER BY next_attempt_at LIMIT ?",
+                    (OUTBOX_PENDING, now, OUTBOX_SETTLING, now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE settlements SET status = ?, lease_until = ?, attempts = attempts + 1,"
+                    " updated_at = ? WHERE id = ?",
+                    [(OUTBOX_SETTLING, now + self._lease_seconds, now, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [
+            OutboxEntry(
+                id=row[0],
+                network=row[1],
+                asset=row[2],
+                buyer=row[3],
+                amount=int(row[4]),
+                payload=PaymentPayload.model_validate_json(row[5]),
+                requirements=PaymentRequirements.model_validate_json(row[6]),
+                status=OUTBOX_SETTLING,
+                attempts=row[7] + 1,
+                tx_hash=row[8],
+                reclaimed=row[9] == OUTBOX_SETTLING,
+            )
+            for row in rows
+        ]
+
+    async def mark_settled(self, entry_id: str, tx_hash: str | None) -> None:
+        await self._update(entry_id, OUTBOX_SETTLED, tx_hash=tx_hash)
+
+    async def mark_failed(self, entry_id: str, error: str, tx_hash: str | None = None) -> None:
+        await self._update(entry_id, OUTBOX_FAILED, error=error, tx_hash=tx_hash)
+
+    async def mark_retry(
+        self, entry_id: str, error: str, delay: float, tx_hash: str | None = None
+    ) -> None:
+        """
+        Return a claimed row to the queue, due again after *delay* seconds.
+
+        *tx_hash* records a transaction the failed attempt broadcast, so that a
+        later attempt can tell it landed.
+        """
+        await self._update(
+            entry_id,
+            OUTBOX_PENDING,
+            error=error,
+            tx_hash=tx_hash,
+            next_attempt_at=time.time() + delay,
+        )
+
+    async def _update(
+        self,
+        entry_id: str,
+        status: str,
+        error: str | None = None,
+        tx_hash: str | None = None,
+        next_attempt_at: float | None = None,
+    ) -> None:
+        def run() -> None:
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "UPDATE settlements SET status = ?, error = ?,"
+                    " tx_hash = COALESCE(?, tx_hash),"
+                    " next_attempt_at = COALESCE(?, next_attempt_at),"
+                    " lease_until = 0, updated_at = ? WHERE id = ?",
+                    (status, error, tx_hash, next_attempt_at, now, entry_id),
+                )
+
+        await asyncio.to_thread(run)
+
+    async def get(self, entry_id: str) -> OutboxEntry | None:
+        """Look up a row by its idempotency key."""
+
+        def run() -> OutboxEntry | None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT id, network, asset, buyer, amount, payload, requirements, status,"
+                    " attempts, tx_hash, error FROM settlements WHERE id = ?",
+                    (entry_id,),
+                ).fetchone()
+            if row is None:
+                return None
+            return OutboxEntry(
+                id=row[0],
+                network=row[1],
+                asset=row[2],
+                buyer=row[3],
+                amount=int(row[4]),
+                payload=PaymentPayload.model_validate_json(row[5]),
+                requirements=PaymentRequirements.model_validate_json(row[6]),
+                status=row[7],
+                attempts=row[8],
+                tx_hash=row[9],
+                error=row[10],
+            )
+
+        return await asyncio.to_thread(run)
+
+    async def purge(self, older_than: float) -> int:
+        """Delete settled rows last updated more than *older_than* seconds ago."""
+
+        def run() -> int:
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM settlements WHERE status = ? AND updated_at < ?",
+                    (OUTBOX_SETTLED, time.time() - older_than),
+                )
+                return cursor.rowcount
+
+        return await asyncio.to_thread(run)
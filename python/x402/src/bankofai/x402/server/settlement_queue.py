@@ -0,0 +1,247 @@
+"""
+SettlementQueue - Background settlement of verified payments ("verify-then-serve")
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Final, Literal
+
+from bankofai.x402.server.settlement_outbox import (
+    EnqueueResult,
+    OutboxEntry,
+    SettlementOutbox,
+)
+from bankofai.x402.server.x402_server import X402Server
+from bankofai.x402.types import CONFIRMATION_BROADCAST, PaymentPayload, PaymentRequirements
+
+SETTLEMENT_SYNC: Final = "sync"
+SETTLEMENT_ASYNC: Final = "async"
+
+# Facilitator error reasons meaning the payment's nonce is consumed on-chain
+_NONCE_CONSUMED = frozenset({"nonce_already_used", "authorization_already_used"})
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SettlementPolicy:
+    """
+    Per-route settlement policy.
+
+    In ``"async"`` mode a payment is only verified before the resource is served;
+    settlement happens in the background through a SettlementQueue.
+
+    ``max_unsettled`` bounds the exposure per buyer, as price strings per token
+    (e.g. ``("5 USDT",)``). A payment that would push the buyer's unsettled total
+    for its token above the limit, or whose token has no limit while others do,
+    is settled synchronously instead. An empty tuple means no limit.
+    """
+
+    mode: Literal["sync", "async"] = SETTLEMENT_SYNC
+    max_unsettled: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.mode not in (SETTLEMENT_SYNC, SETTLEMENT_ASYNC):
+            raise ValueError(f"Unknown settlement mode: {self.mode}")
+
+    @property
+    def is_async(self) -> bool:
+        return self.mode == SETTLEMENT_ASYNC
+
+
+class SettlementQueue:
+    """
+    Worker pool settling payments stored in a SettlementOutbox.
+
+    Failed attempts are retried with exponential backoff up to ``max_attempts``.
+    A retry that finds the payment's nonce already consumed means an earlier
+    attempt landed (e.g. one whose worker died after broadcasting, leaving its
+    row to be re-claimed), so the row is marked settled instead of failed.
+    Workers start on first use or with :meth:`start`; call :meth:`stop` on
+    shutdown. Rows left over from a previous run are picked up automatically.
+    """
+
+    def __init__(
+        self,
+        server: X402Server,
+        outbox: SettlementOutbox,
+        workers: int = 4,
+        max_attempts: int = 5,
+        retry_delay: float = 2.0,
+        max_retry_delay: float = 300.0,
+        poll_interval: float = 5.0,
+        verify_on_chain: bool = True,
+    ) -> None:
+        """
+        Initialize queue.
+
+        Args:
+            server: X402Server used to settle payments
+            outbox: Durable store of pending settlements
+            workers: Number of concurrent settlement workers
+            max_attempts: Attempts before a settlement is marked failed
+            retry_delay: Delay before the first retry (doubled on each attempt)
+            max_retry_delay: Upper bound of the retry delay
+            poll_interval: How often idle workers look for due rows
+            verify_on_chain: Verify the settled transaction like the synchronous path
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self._server = server
+        self._outbox = outbox
+        self._workers = workers
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._max_retry_delay = max_retry_delay
+        self._poll_interval = poll_interval
+        self._verify_on_chain = verify_on_chain
+        self._tasks: list[asyncio.Task[None]] = []
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def outbox(self) -> SettlementOutbox:
+        return self._outbox
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(self._wakeup), name=f"x402-settlement-{i}")
+            for i in range(self._workers)
+        ]
+
+    async def stop(self) -> None:
+        """Stop the workers. Rows being settled are retried after their lease expires."""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(
+        self,
+        payload: PaymentPayload,
+        requirements: PaymentRequirements,
+        max_unsettled: int | None = None,
+    ) -> EnqueueResult:
+        """
+        Durably enqueue a verified payment and wake a worker.
+
+        Returns:
+            Result of SettlementOutbox.enqueue
+        """
+        result = await self._outbox.enqueue(payload, requirements, max_unsettled)
+        if result == "enqueued":
+            self.start()
+            if self._wakeup is not None:
+                self._wakeup.set()
+        return result
+
+    async def run_once(self, limit: int = 100) -> int:
+        """
+        Settle the rows that are currently due, without the worker pool.
+
+        Returns:
+            Number of rows attempted
+        """
+        entries = await self._outbox.claim_due(limit)
+        for entry in entries:
+            await self._settle(entry)
+        return len(entries)
+
+    async def _worker(self, wakeup: asyncio.Event) -> None:
+        while True:
+            # Errors are logged and the worker keeps going; an unclaimed or
+            # unrecorded row is handed out again once its lease expires
+            try:
+                entries = await self._outbox.claim_due(1)
+                if entries:
+                    await self._settle(entries[0])
+                    continue
+            except Exception as e:
+                logger.error("Settlement worker iteration failed: %s", e, exc_info=True)
+
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _settle(self, entry: OutboxEntry) -> None:
+        try:
+            result = await self._server.settle_payment(entry.payload, entry.requirements)
+        except Exception as e:
+            logger.warning("Settlement attempt %d of %s raised: %s", entry.attempts, entry.id, e)
+            await self._retry_or_fail(entry, str(e))
+            return
+
+        if not result.success:
+            # Only an attempt that may have broadcast can have consumed the nonce
+            maybe_broadcast = entry.reclaimed or entry.tx_hash is not None
+            if maybe_broadcast and result.error_reason in _NONCE_CONSUMED:
+                logger.info(
+                    "Nonce of %s consumed by an earlier attempt (tx %s)", entry.id, entry.tx_hash
+                )
+                await self._outbox.mark_settled(entry.id, entry.tx_hash)
+                return
+            await self._retry_or_fail(
+                entry, result.error_reason or "settlement_failed", tx_hash=result.transaction
+            )
+            return
+
+        # A settlement answered at broadcast has no block to check yet; the
+        # facilitator follows it up
+        if (
+            result.transaction
+            and self._verify_on_chain
+            and result.confirmation != CONFIRMATION_BROADCAST
+        ):
+            from bankofai.x402.server.payment_gate import verify_transaction_on_chain
+
+            verification = await verify_transaction_on_chain(
+                result.transaction,
+                entry.payload,
+                entry.requirements,
+                receipt=self._server.trusted_receipt(result),
+            )
+            if not verification.success:
+                logger.error(
+                    "Transaction verification failed for %s: %s",
+                    entry.id,
+                    verification.error_reason,
+                )
+                await self._outbox.mark_failed(
+                    entry.id,
+                    f"verification_failed: {verification.error_reason}",
+                    tx_hash=result.transaction,
+                )
+                return
+
+        logger.info("Settled %s in tx %s", entry.id, result.transaction)
+        await self._outbox.mark_settled(entry.id, result.transaction)
+
+    async def _retry_or_fail(
+        self, entry: OutboxEntry, error: str, tx_hash: str | None = None
+    ) -> None:
+        if entry.attempts >= self._max_attempts:
+            logger.error(
+                "Settlement of %s failed after %d attempts: %s", entry.id, entry.attempts, error
+            )
+            await self._outbox.mark_failed(entry.id, error, tx_hash=tx_hash)
+            return
+
+        delay = min(self._retry_delay * 2 ** (entry.attempts - 1), self._max_retry_delay)
+        logger.warning(
+            "Settlement attempt %d of %s failed (%s), retrying in %.1fs",
+            entry.attempts,
+            entry.id,
+            error,
+            delay,
+        )
+        await self._outbox.mark_retry(entry.id, error, delay, tx_hash=tx_hash)
@@ -3,12 +3,25 @@ X402Server - Core payment server for x402 protocol
 """
 
 import logging
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Protocol
 
 from bankofai.x402.config import NetworkConfig
+from bankofai.x402.server.payment_validation import (
+    STAGE_SIGNATURE,
+    PaymentValidator,
+    ValidationResult,
+)
+from bankofai.x402.server.requirements_cache import (
+    DEFAULT_REQUIREMENTS_TTL,
+    CachedRequirements,
+    RequirementsCache,
+)
 from bankofai.x402.types import (
+    CONFIRMATION_LEVELS,
     PAYMENT_ONLY,
+    ConfirmationLevel,
     FeeQuoteResponse,
     PaymentPayload,
     PaymentPermitContext,
@@ -16,12 +29,20 @@ from bankofai.x402.types import (
     PaymentRequired,
     PaymentRequiredExtensions,
     PaymentRequirements,
+    PaymentRequirementsExtra,
     SettleResponse,
+    TransactionReceipt,
     VerifyResponse,
 )
+from bankofai.x402.utils.settlement_coalescer import SettlementCoalescer
 
 if TYPE_CHECKING:
     from bankofai.x402.facilitator.facilitator_client import FacilitatorClient
+    from bankofai.x402.facilitator.local_client import LocalFacilitatorClient
+    from bankofai.x402.server.route_plan import RoutePlan
+
+# Default validity window of the paymentPermitContext issued with a 402
+PAYMENT_REQUIRED_VALIDITY_SECONDS = 3600
 
 
 class ServerMechanism(Protocol):
@@ -47,10 +68,20 @@ class ServerMechanism(Protocol):
         """Validate payment requirements"""
         ...
 
+    async def verify_signature(self, permit: Any, signature: str, network: str) -> bool:
+        """Verify payment permit signature"""
+        ...
+
 
 @dataclass
 class ResourceConfig:
-    """Resource payment configuration"""
+    """
+    Resource payment configuration.
+
+    ``confirmation`` is the level the facilitator waits for before answering
+    settle (``"broadcast"``, ``"included"`` or ``"final"``); None leaves it to
+    the facilitator.
+    """
 
     scheme: str
     network: str
@@ -58,6 +89,11 @@ class ResourceConfig:
     pay_to: str
     valid_for: int = 3600
     delivery_mode: str = PAYMENT_ONLY
+    confirmation: ConfirmationLevel | None = None
+
+    def __post_init__(self) -> None:
+        if self.confirmation is not None and self.confirmation not in CONFIRMATION_LEVELS:
+            raise ValueError(f"Unknown confirmation level: {self.confirmation}")
 
 
 class X402Server:
@@ -67,16 +103,38 @@ class X402Server:
     Manages payment mechanisms and facilitator clients, coordinates payment flow.
     """
 
-    def __init__(self, auto_register_tron: bool = True) -> None:
+    def __init__(
+        self,
+        auto_register_tron: bool = True,
+        requirements_cache: RequirementsCache | None = None,
+        cache_requirements: bool = True,
+        validator: PaymentValidator | None = None,
+        settlements: SettlementCoalescer | None = None,
+    ) -> None:
         """
         Initialize X402Server.
 
         Args:
             auto_register_tron: If True, automatically register TRON mechanisms for all networks
+            requirements_cache: Custom requirements cache (a default one is created if None)
+            cache_requirements: If False, every build_payment_requirements call asks the
+                facilitator for a fresh fee quote
+            validator: Custom payment header validator (a default one is created if None)
+            settlements: Coalescer for duplicate settlements (a default one is created if None)
         """
         self._logger = logging.getLogger(self.__class__.__name__)
         self._mechanisms: dict[str, dict[str, ServerMechanism]] = {}
-        self._facilitator: "FacilitatorClient | None" = None
+        self._facilitator: "FacilitatorClient | LocalFacilitatorClient | None" = None
+        self._requirements_cache: RequirementsCache | None = None
+        self._validator = validator or PaymentValidator()
+        self._settlements = settlements or SettlementCoalescer()
+        if cache_requirements:
+            self._requirements_cache = requirements_cache or RequirementsCache()
+        self._default_requirements_ttl = (
+            self._requirements_cache.default_ttl
+            if self._requirements_cache is not None
+            else DEFAULT_REQUIREMENTS_TTL
+        )
 
         if auto_register_tron:
             self._register_default_tron_mechanisms()
@@ -96,6 +154,7 @@ class X402Server:
         if network not in self._mechanisms:
             self._mechanisms[network] = {}
         self._mechanisms[network][scheme] = mechanism
+        self.clear_requirements_cache()
         return self
 
     def _register_default_tron_mechanisms(self) -> None:
@@ -107,30 +166,92 @@ class X402Server:
         self.register(NetworkConfig.TRON_SHASTA, tron_mechanism)
         self.register(NetworkConfig.TRON_NILE, tron_mechanism)
 
-    def set_facilitator(self, client: "FacilitatorClient") -> "X402Server":
+    def set_facilitator(self, client: "FacilitatorClient | LocalFacilitatorClient") -> "X402Server":
         """Set the facilitator client.
 
         Args:
-            client: FacilitatorClient instance
+            client: FacilitatorClient, or LocalFacilitatorClient for a facilitator
+                running in the same process
 
         Returns:
             self for method chaining
         """
         self._facilitator = client
+        self.clear_requirements_cache()
         return self
 
+    @property
+    def validator(self) -> PaymentValidator:
+        """Screening pipeline for payment headers, with its per-stage rejection counters"""
+        return self._validator
+
+    @property
+    def settlements(self) -> SettlementCoalescer:
+        """Single-flight coalescer shared by all settle_payment calls"""
+        return self._settlements
+
+    def clear_requirements_cache(self) -> None:
+        """Drop cached payment requirements so the next build re-quotes fees."""
+        if self._requirements_cache is not None:
+            self._requirements_cache.clear()
+
     async def build_payment_requirements(
         self,
         configs: list[ResourceConfig],
     ) -> list[PaymentRequirements]:
         """Build payment requirements from resource configurations.
 
+        Results are served from the requirements cache when it is enabled, so the
+        facilitator is only asked for a fee quote when a cached quote expires.
+        Each call returns fresh copies, so callers may modify them.
+
         Args:
             configs: List of resource configurations
 
         Returns:
             List of PaymentRequirements with fee info attached
         """
+        if self._requirements_cache is None:
+            entries = await self._build_requirements_entries(configs)
+            supported = [e.requirements for e in entries if e.requirements is not None]
+        else:
+            entries = await self._requirements_cache.get_many(
+                [(self._requirements_cache_key(c), c) for c in configs],
+                self._build_requirements_entries,
+            )
+            # Cached models are shared; callers get their own copies to modify
+            supported = [
+                e.requirements.model_copy(deep=True) for e in entries if e.requirements is not None
+            ]
+
+        # exact requirements are listed first, followed by quoted ones
+        return sorted(supported, key=lambda r: r.scheme != "exact")
+
+    @staticmethod
+    def _requirements_cache_key(
+        config: ResourceConfig,
+    ) -> tuple[str, str, str, str, str, int, str | None]:
+        """Cache key for a config (the price string already names the asset)"""
+        return (
+            config.scheme,
+            config.network,
+            config.price,
+            config.pay_to,
+            config.delivery_mode,
+            config.valid_for,
+            config.confirmation,
+        )
+
+    async def _build_requirements_entries(
+        self,
+        configs: list[ResourceConfig],
+    ) -> list[CachedRequirements]:
+        """Build payment requirements without caching.
+
+        Returns:
+            One entry per config, in input order. Entries for configs the
+            facilitator does not support carry ``requirements=None``.
+        """
         requirements_list: list[PaymentRequirements] = []
         for config in configs:
             mechanism = self._find_mechanism(config.network, config.scheme)
@@ -153,50 +274,61 @@ class X402Server:
             requirements = await mechanism.enhance_payment_requirements(
                 requirements, config.delivery_mode
             )
+            if config.confirmation is not None:
+                if requirements.extra is None:
+                    requirements.extra = PaymentRequirementsExtra()
+                requirements.extra.confirmation = config.confirmation
             requirements_list.append(requirements)
 
-        if self._facilitator:
-            facilitator = self._facilitator
+        if self._facilitator is None:
+            raise ValueError("Facilitator is not set")
+        facilitator = self._facilitator
 
-            # Split: exact doesn't need fee_quote
-            permit_reqs = [r for r in requirements_list if r.scheme != "exact"]
-            exact_reqs = [r for r in requirements_list if r.scheme == "exact"]
+        default_expiry = time.time() + self._default_requirements_ttl
+        entries = [
+            CachedRequirements(requirements=r, expires_at=default_expiry) for r in requirements_list
+        ]
 
-            supported: list[PaymentRequirements] = list(exact_reqs)
+        # Split: exact doesn't need fee_quote
+        permit_reqs = [r for r in requirements_list if r.scheme != "exact"]
+        if not permit_reqs:
+            return entries
 
-            if permit_reqs:
-                self._logger.info(
-                    "fee_quote input: %s",
-                    [(r.scheme, r.network, r.asset) for r in permit_reqs],
-                )
-                fee_quotes = await facilitator.fee_quote(permit_reqs)
-                self._logger.info(
-                    "fee_quotes: %s",
-                    [q.model_dump(by_alias=True) for q in fee_quotes],
+        self._logger.info(
+            "fee_quote input: %s",
+            [(r.scheme, r.network, r.asset) for r in permit_reqs],
+        )
+        fee_quotes = await facilitator.fee_quote(permit_reqs)
+        self._logger.info(
+            "fee_quotes: %s",
+            [q.model_dump(by_alias=True) for q in fee_quotes],
+        )
+        quote_map: dict[tuple[str, str, str], FeeQuoteResponse] = {
+            (q.scheme, q.network, q.asset): q for q in fee_quotes
+        }
+        self._logger.info("fee_quote result: %s", list(quote_map.keys()))
+        for entry in entries:
+            req = entry.requirements
+            if req is None or req.scheme == "exact":
+                continue
+            fee_quote = quote_map.get((req.scheme, req.network, req.asset))
+            if fee_quote is None:
+                self._logger.warning(
+                    f"Unsupported scheme/token: network={req.network}, "
+                    f"scheme={req.scheme}, asset={req.asset} (skipped)"
                 )
-                quote_map: dict[tuple[str, str, str], FeeQuoteResponse] = {
-                    (q.scheme, q.network, q.asset): q for q in fee_quotes
-                }
-                self._logger.info("fee_quote result: %s", list(quote_map.keys()))
-                for req in permit_reqs:
-                    fee_quote = quote_map.get((req.scheme, req.network, req.asset))
-                    if fee_quote is None:
-                        self._logger.warning(
-                            f"Unsupported scheme/token: network={req.network}, "
-                            f"scheme={req.scheme}, asset={req.asset} (skipped)"
-                        )
-                        continue
-                    if req.extra is None:
-                        from bankofai.x402.types import PaymentRequirementsExtra
-
-                        req.extra = PaymentRequirementsExtra()
-                    fee_quote.fee.facilitator_id = facilitator.facilitator_id
-                    req.extra.fee = fee_quote.fee
-                    supported.append(req)
-        else:
-            raise ValueError("Facilitator is not set")
+                entry.requirements = None
+                continue
+            if req.extra is None:
+                req.extra = PaymentRequirementsExtra()
+            # Quotes may be shared with the facilitator's cache, so copy before tagging
+            req.extra.fee = fee_quote.fee.model_copy(
+                update={"facilitator_id": facilitator.facilitator_id}
+            )
+            if fee_quote.expires_at is not None:
+                entry.expires_at = fee_quote.expires_at
 
-        return supported
+        return entries
 
     def create_payment_required_response(
         self,
@@ -234,7 +366,7 @@ class X402Server:
                     paymentId=payment_id or generate_payment_id(),
                     nonce=nonce or str(uuid.uuid4().int),
                     validAfter=valid_after or now,
-                    validBefore=valid_before or (now + 3600),
+                    validBefore=valid_before or (now + PAYMENT_REQUIRED_VALIDITY_SECONDS),
                 ),
             )
         )
@@ -247,10 +379,54 @@ class X402Server:
             extensions=extensions,
         )
 
+    async def validate_payment(self, header: str, plan: "RoutePlan") -> ValidationResult:
+        """
+        Screen a PAYMENT-SIGNATURE header before any facilitator work.
+
+        Runs the validator's cheap stages (size, structure, route, replay) and
+        then the mechanism's signature check. A payment that passes holds a
+        replay reservation; call ``release_payment`` if it later fails.
+
+        Args:
+            header: PAYMENT-SIGNATURE header value
+            plan: Compiled plan of the protected route
+
+        Returns:
+            ValidationResult with the decoded payload and matched config
+        """
+        # A retry of a payment that is settling joins that settlement instead
+        result = self._validator.screen(header, plan, self._settlements.has)
+        payload, config = result.payload, result.config
+        if not result.ok or payload is None or config is None:
+            return result
+
+        mechanism = self._find_mechanism(config.network, config.scheme)
+        if mechanism is not None:
+            is_valid = await mechanism.verify_signature(
+                payload.payload.payment_permit, payload.payload.signature, config.network
+            )
+            if not is_valid:
+                self._validator.release(payload)
+                return self._validator.reject(STAGE_SIGNATURE, "invalid_signature_server")
+        return result
+
+    def release_payment(self, payload: PaymentPayload, stage: str | None = None) -> None:
+        """
+        Release the replay reservation of a screened payment that did not go through.
+
+        Args:
+            payload: Payment returned by ``validate_payment``
+            stage: Stage that rejected it, counted in the validator's rejections
+        """
+        self._validator.release(payload)
+        if stage is not None:
+            self._validator.rejections[stage] += 1
+
     async def verify_payment(
         self,
         payload: PaymentPayload,
         requirements: PaymentRequirements,
+        signature_verified: bool = False,
     ) -> VerifyResponse:
         """
         Verify payment signature and validity.
@@ -258,6 +434,8 @@ class X402Server:
         Args:
             payload: Client payment payload
             requirements: Original payment requirements
+            signature_verified: The payment passed ``validate_payment``, whose
+                signature stage already ran; skip the server-side check
 
         Returns:
             VerifyResponse
@@ -267,7 +445,7 @@ class X402Server:
 
         # Server-side signature verification to prevent incorrect signatures from frontend
         mechanism = self._find_mechanism(requirements.network, requirements.scheme)
-        if mechanism is not None:
+        if mechanism is not None and not signature_verified:
             permit = payload.payload.payment_permit
             signature = payload.payload.signature
 
@@ -288,6 +466,9 @@ class X402Server:
         """
         Execute payment settlement.
 
+        Duplicates of a payment that is settling await the same result, and
+        duplicates of a recently settled payment get the original response.
+
         Args:
             payload: Client payment payload
             requirements: Payment requirements
@@ -295,10 +476,25 @@ class X402Server:
         Returns:
             SettleResponse with tx_hash
         """
-        if self._facilitator is None:
+        facilitator = self._facilitator
+        if facilitator is None:
             return SettleResponse(success=False, errorReason="no_facilitator")
 
-        return await self._facilitator.settle(payload, requirements)
+        return await self._settlements.settle(
+            payload, lambda: facilitator.settle(payload, requirements)
+        )
+
+    def trusted_receipt(self, result: SettleResponse) -> TransactionReceipt | None:
+        """
+        Receipt of a settlement that on-chain verification may rely on.
+
+        Only receipts from an in-process facilitator, or one the client was
+        explicitly told to trust (``trust_receipts``), are used; otherwise the
+        receipt is fetched from the chain by transaction hash.
+        """
+        if getattr(self._facilitator, "trust_receipts", False) is True:
+            return result.receipt
+        return None
 
     def _find_mechanism(self, network: str, scheme: str) -> ServerMechanism | None:
         """Find mechanism for network and scheme"""
@@ -9,7 +9,9 @@ from bankofai.x402.abi import ERC20_ABI, PAYMENT_PERMIT_PRIMARY_TYPE
 from bankofai.x402.config import NetworkConfig
 from bankofai.x402.exceptions import InsufficientAllowanceError, SignatureCreationError
 from bankofai.x402.signers.client.base import ClientSigner
-from bankofai.x402.signers.utils import _eip712_domain_type_from_keys, resolve_provider_uri
+from bankofai.x402.signers.utils import resolve_provider_uri
+from bankofai.x402.utils.crypto_backend import load_signing_key
+from bankofai.x402.utils.crypto_executor import get_crypto_executor
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +23,9 @@ class EvmClientSigner(ClientSigner):
         if not private_key.startswith("0x"):
             private_key = "0x" + private_key
         self._private_key = private_key
-        self._address = self._derive_address(private_key)
+        # Parsed once and reused for every signature
+        self._signing_key = load_signing_key(private_key)
+        self._address = self._signing_key.address
         self._async_web3_clients: dict[str, Any] = {}
         logger.debug("EvmClientSigner initialized", extra={"address": self._address})
 
@@ -30,13 +34,6 @@ class EvmClientSigner(ClientSigner):
         """Create signer from private key."""
         return cls(private_key)
 
-    @staticmethod
-    def _derive_address(private_key: str) -> str:
-        """Derive EVM address from private key"""
-        from eth_account import Account
-
-        return Account.from_key(private_key).address
-
     def get_address(self) -> str:
         return self._address
 
@@ -56,12 +53,13 @@ class EvmClientSigner(ClientSigner):
     async def sign_message(self, message: bytes) -> str:
         """Sign raw message using ECDSA (EIP-191)"""
         try:
-            from eth_account import Account
             from eth_account.messages import encode_defunct
+            from eth_utils.crypto import keccak
 
             signable = encode_defunct(primitive=message)
-            signed = Account.sign_message(signable, private_key=self._private_key)
-            return signed.signature.hex()
+            digest = keccak(b"\x19" + signable.version + signable.header + signable.body)
+            signature = await get_crypto_executor().run(self._signing_key.sign_hash, digest)
+            return signature.hex()
         except Exception as e:
             raise SignatureCreationError(f"Failed to sign message: {e}")
 
@@ -73,9 +71,6 @@ class EvmClientSigner(ClientSigner):
     ) -> str:
         """Sign EIP-712 typed data."""
         try:
-            from eth_account import Account
-            from eth_account.messages import encode_typed_data
-
             # TODO: Refactor ClientSigner interface to accept primary_type explicitly
             primary_type = (
                 PAYMENT_PERMIT_PRIMARY_TYPE
@@ -83,20 +78,12 @@ class EvmClientSigner(ClientSigner):
                 else list(types.keys())[-1]
             )
 
-            # Build EIP712Domain type dynamically from domain keys
-            # so it works for both exact_permit (no version) and exact (with version)
-            domain_type = _eip712_domain_type_from_keys(domain)
-
-            full_data = {
-                "types": {"EIP712Domain": domain_type, **types},
-                "domain": domain,
-                "primaryType": primary_type,
-                "message": message,
-            }
-
-            encoded = encode_typed_data(full_message=full_data)
-            signed = Account.sign_message(encoded, private_key=self._private_key)
-            return signed.signature.hex()
+            # EIP712Domain type is derived from the domain keys so it works for
+            # both exact_permit (no version) and exact (with version)
+            signature = await get_crypto_executor().sign_typed_data(
+                self._signing_key, domain, types, message, primary_type
+            )
+            return signature.hex()
         except Exception as e:
             raise SignatureCreationError(f"Failed to sign typed data: {e}")
 
@@ -10,20 +10,49 @@ from bankofai.x402.abi import EIP712_DOMAIN_TYPE, ERC20_ABI, PAYMENT_PERMIT_PRIM
 from bankofai.x402.config import NetworkConfig
 from bankofai.x402.exceptions import InsufficientAllowanceError, SignatureCreationError
 from bankofai.x402.signers.client.base import ClientSigner
+from bankofai.x402.utils.tron_ref_block import RefBlockCache
 
 logger = logging.getLogger(__name__)
 
 
 class TronClientSigner(ClientSigner):
-    """TRON client signer implementation"""
+    """TRON client signer implementation
 
-    def __init__(self, private_key: str) -> None:
+    Args:
+        private_key: TRON private key (hex string)
+        ref_blocks: Reference block cache for approval transactions
+    """
+
+    def __init__(self, private_key: str, ref_blocks: RefBlockCache | None = None) -> None:
         clean_key = private_key[2:] if private_key.startswith("0x") else private_key
         self._private_key = clean_key
         self._address = self._derive_address(clean_key)
+        self._signing_key: Any = None
+        self._tron_key: Any = None
         self._async_tron_clients: dict[str, Any] = {}
+        self._ref_blocks = ref_blocks or RefBlockCache()
         logger.info(f"TronClientSigner initialized: address={self._address}")
 
+    @property
+    def ref_blocks(self) -> RefBlockCache:
+        return self._ref_blocks
+
+    def _get_signing_key(self) -> Any:
+        """Backend key used for EIP-712 signatures, parsed on first use"""
+        if self._signing_key is None:
+            from bankofai.x402.utils.crypto_backend import load_signing_key
+
+            self._signing_key = load_signing_key(self._private_key)
+        return self._signing_key
+
+    def _get_tron_key(self) -> Any:
+        """tronpy key used for transactions, parsed on first use"""
+        if self._tron_key is None:
+            from tronpy.keys import PrivateKey
+
+            self._tron_key = PrivateKey(bytes.fromhex(self._private_key))
+        return self._tron_key
+
     @classmethod
     def from_private_key(cls, private_key: str) -> "TronClientSigner":
         """Create signer from private key.
@@ -71,10 +100,11 @@ class TronClientSigner(ClientSigner):
     async def sign_message(self, message: bytes) -> str:
         """Sign raw message using ECDSA"""
         try:
-            from tronpy.keys import PrivateKey
+            from bankofai.x402.utils.crypto_executor import get_crypto_executor
 
-            pk = PrivateKey(bytes.fromhex(self._private_key))
-            signature = pk.sign_msg(message)
+            signature = await get_crypto_executor().run_in_thread(
+                self._get_tron_key().sign_msg, message
+            )
             return signature.hex()
         except ImportError:
             raise SignatureCreationError("tronpy is required for signing")
@@ -103,27 +133,11 @@ class TronClientSigner(ClientSigner):
             f"Signing EIP-712 typed data: domain={domain.get('name')}, primaryType={primary_type}"
         )
         try:
-            from eth_account import Account
-            from eth_account.messages import encode_typed_data
-
-            # Note: PaymentPermit contract uses EIP712Domain WITHOUT version field
-            # Contract:
-            # keccak256("EIP712Domain(string name,uint256 chainId,address verifyingContract)")
-            full_types = {
-                "EIP712Domain": EIP712_DOMAIN_TYPE,
-                **types,
-            }
-
-            typed_data = {
-                "types": full_types,
-                "primaryType": primary_type,
-                "domain": domain,
-                "message": message,
-            }
-
             # Log domain and message in same format as TypeScript client
             import json as json_module
 
+            from bankofai.x402.utils.crypto_executor import get_crypto_executor
+
             # Convert bytes to hex for logging
             message_for_log = dict(message)
             if "meta" in message_for_log and "paymentId" in message_for_log["meta"]:
@@ -135,12 +149,19 @@ class TronClientSigner(ClientSigner):
             logger.info(f"[SIGN] Domain: {json_module.dumps(domain)}")
             logger.info(f"[SIGN] Message: {json_module.dumps(message_for_log)}")
 
-            signable = encode_typed_data(full_message=typed_data)
-            # Convert hex private key to bytes for eth_account
-            private_key_bytes = bytes.fromhex(self._private_key)
-            signed_message = Account.sign_message(signable, private_key_bytes)
-
-            signature = signed_message.signature.hex()
+            # Note: PaymentPermit contract uses EIP712Domain WITHOUT version field
+            # Contract:
+            # keccak256("EIP712Domain(string name,uint256 chainId,address verifyingContract)")
+            signature = (
+                await get_crypto_executor().sign_typed_data(
+                    self._get_signing_key(),
+                    domain,
+                    types,
+                    message,
+                    primary_type,
+                    EIP712_DOMAIN_TYPE,
+                )
+            ).hex()
             logger.info(f"[SIGN] Signature: 0x{signature}")
             return signature
         except ImportError:
@@ -248,21 +269,26 @@ class TronClientSigner(ClientSigner):
             raise InsufficientAllowanceError("AsyncTron client required for approval")
 
         try:
-            from tronpy.keys import PrivateKey
+            from bankofai.x402.utils.tron_transaction import (
+                compile_function,
+                send_trigger_transaction,
+            )
 
             spender = self._get_spender_address(network)
             # Use maxUint160 (2^160 - 1) to avoid repeated approvals
             max_uint160 = (2**160) - 1
             logger.info(f"Approving spender={spender} for amount={max_uint160} (maxUint160)")
-            contract = await client.get_contract(token)
-            contract.abi = ERC20_ABI
-            # AsyncTron: contract.functions.approve() returns a coroutine, need to await it first
-            txn_builder = await contract.functions.approve(spender, max_uint160)
-            txn_builder = txn_builder.with_owner(self._address).fee_limit(100_000_000)
-            txn = await txn_builder.build()
-            txn = txn.sign(PrivateKey(bytes.fromhex(self._private_key)))
             logger.info("Broadcasting approval transaction...")
-            result = await txn.broadcast()
+            result = await send_trigger_transaction(
+                client,
+                self._ref_blocks,
+                network,
+                self._get_tron_key(),
+                self._address,
+                token,
+                compile_function(ERC20_ABI, "approve").encode([spender, max_uint160]),
+                fee_limit=100_000_000,
+            )
             result = await result.wait()
             # Check receipt.result for success (TRON returns "SUCCESS" in receipt)
             receipt = result.get("receipt", {})
@@ -66,6 +66,35 @@ class FacilitatorSigner(ABC):
         """
         pass
 
+    async def read_contract(
+        self,
+        contract_address: str,
+        abi: Any,
+        method: str,
+        args: list[Any],
+        network: str,
+    ) -> Any:
+        """
+        Call a view function.
+
+        Signers that cannot read contract state leave this unimplemented;
+        callers treat that like an unavailable node.
+
+        Args:
+            contract_address: Contract address
+            abi: Contract ABI (JSON string or list)
+            method: Method name
+            args: Method arguments
+            network: Network identifier (e.g. "tron:nile")
+
+        Returns:
+            The decoded return value (a tuple for multiple outputs)
+
+        Raises:
+            NotImplementedError: If the signer cannot read contract state
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot read contract state")
+
     @abstractmethod
     async def wait_for_transaction_receipt(
         self,
@@ -85,3 +114,27 @@ class FacilitatorSigner(ABC):
             Transaction receipt
         """
         pass
+
+    async def wait_for_finality(
+        self,
+        block_number: int,
+        timeout: int = 120,
+        network: str = "",
+    ) -> None:
+        """
+        Wait until a block can no longer be reverted.
+
+        What counts as final is chain specific: solidification on TRON, a
+        number of confirmations on EVM. Signers without a notion of finality
+        leave this unimplemented; callers then stop at inclusion.
+
+        Args:
+            block_number: Number of the block holding the transaction
+            timeout: Timeout in seconds
+            network: Network identifier (e.g. "tron:nile")
+
+        Raises:
+            NotImplementedError: If the signer cannot tell finality
+            TimeoutError: If the block is not final within *timeout*
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot wait for finality")
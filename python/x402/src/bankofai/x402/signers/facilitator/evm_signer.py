@@ -2,27 +2,77 @@
 EvmFacilitatorSigner - EVM facilitator signer implementation
 """
 
+import asyncio
 import logging
+import time
 from typing import Any
 
 from bankofai.x402.abi import PAYMENT_PERMIT_PRIMARY_TYPE
 from bankofai.x402.signers.facilitator.base import FacilitatorSigner
-from bankofai.x402.signers.utils import _eip712_domain_type_from_keys, resolve_provider_uri
+from bankofai.x402.signers.utils import resolve_provider_uri
+from bankofai.x402.utils.crypto_executor import get_crypto_executor
+from bankofai.x402.utils.evm_nonce import NonceManager, is_nonce_too_low
+from bankofai.x402.utils.receipt_watcher import EvmReceiptSource, ReceiptWatcher
 
 logger = logging.getLogger(__name__)
 
+# Receipt poll interval while blocks keep coming; backs off on slower chains
+RECEIPT_POLL_INTERVAL = 1.0
+# Provider settings answering eth_chainId from web3's request cache for the
+# provider's lifetime (no block-based revalidation, which would itself query it)
+CACHED_REQUESTS: dict[str, Any] = {
+    "cache_allowed_requests": True,
+    "cacheable_requests": {"eth_chainId"},
+    "request_cache_validation_threshold": None,
+}
+# Seconds a fee quote is reused for concurrent and back-to-back sends (about
+# one block on BSC). Gas limits are still estimated per transaction: they
+# depend on the calldata and on-chain state, and a stale limit reverts.
+FEE_CACHE_SECONDS = 3.0
+# Confirmations after which a block is treated as final
+DEFAULT_FINALITY_CONFIRMATIONS = 12
+
 
 class EvmFacilitatorSigner(FacilitatorSigner):
-    """EVM facilitator signer implementation using web3.py"""
+    """EVM facilitator signer implementation using web3.py
+
+    Transaction nonces are allocated locally by *nonces*, so settlements are
+    pipelined instead of each reading the account's transaction count. Fee
+    fields are fetched once per FEE_CACHE_SECONDS and network, not per send.
+
+    Args:
+        private_key: EVM private key (hex string)
+        finality_confirmations: Confirmations (the including block counts as
+            one) after which ``wait_for_finality`` treats a block as final
+        nonces: Nonce manager for the signer's account
+    """
 
-    def __init__(self, private_key: str) -> None:
+    def __init__(
+        self,
+        private_key: str,
+        finality_confirmations: int = DEFAULT_FINALITY_CONFIRMATIONS,
+        nonces: NonceManager | None = None,
+    ) -> None:
+        if finality_confirmations <= 0:
+            raise ValueError("finality_confirmations must be positive")
         if not private_key.startswith("0x"):
             private_key = "0x" + private_key
         self._private_key = private_key
+        self._finality_confirmations = finality_confirmations
         self._address = self._derive_address(private_key)
         self._async_web3_clients: dict[str, Any] = {}
+        self._receipt_watchers: dict[str, ReceiptWatcher] = {}
+        self._nonces = nonces or NonceManager()
+        # Network -> chain id lookup; shared by concurrent first transactions
+        self._chain_ids: dict[str, asyncio.Future[int]] = {}
+        # Network -> (expiry, fee fields lookup)
+        self._fees: dict[str, tuple[float, asyncio.Future[dict[str, int]]]] = {}
         logger.debug("EvmFacilitatorSigner initialized", extra={"address": self._address})
 
+    @property
+    def nonces(self) -> NonceManager:
+        return self._nonces
+
     @classmethod
     def from_private_key(cls, private_key: str) -> "EvmFacilitatorSigner":
         """Create signer from private key"""
@@ -45,12 +95,53 @@ class EvmFacilitatorSigner(FacilitatorSigner):
             from web3.middleware import ExtraDataToPOAMiddleware
 
             provider_uri = resolve_provider_uri(network)
-            w3 = AsyncWeb3(AsyncHTTPProvider(provider_uri))
+            # web3 also asks for the chain id before every eth_estimateGas to
+            # validate the transaction; answer that from its request cache
+            provider = AsyncHTTPProvider(provider_uri, **CACHED_REQUESTS)
+            w3 = AsyncWeb3(provider)
             w3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
             self._async_web3_clients[network] = w3
 
         return self._async_web3_clients[network]
 
+    async def _chain_id(self, w3: Any, network: str) -> int:
+        """Chain id of *network*, looked up once per process"""
+        lookup = self._chain_ids.get(network)
+        if lookup is None:
+            lookup = self._chain_ids[network] = asyncio.ensure_future(w3.eth.chain_id)
+        try:
+            return await asyncio.shield(lookup)
+        except Exception:
+            if self._chain_ids.get(network) is lookup:
+                del self._chain_ids[network]
+            raise
+
+    async def _fee_fields(self, w3: Any, network: str) -> dict[str, int]:
+        """Fee fields for transactions on *network*, shared for FEE_CACHE_SECONDS"""
+        now = time.monotonic()
+        cached = self._fees.get(network)
+        if cached is None or cached[0] <= now:
+            cached = (now + FEE_CACHE_SECONDS, asyncio.ensure_future(self._fetch_fees(w3)))
+            self._fees[network] = cached
+        try:
+            return await asyncio.shield(cached[1])
+        except Exception:
+            if self._fees.get(network) is cached:
+                del self._fees[network]
+            raise
+
+    @staticmethod
+    async def _fetch_fees(w3: Any) -> dict[str, int]:
+        # The same defaults web3's build_transaction would fill in
+        priority, block = await asyncio.gather(w3.eth.max_priority_fee, w3.eth.get_block("latest"))
+        base_fee = block.get("baseFeePerGas")
+        if base_fee is None:
+            return {"gasPrice": int(await w3.eth.gas_price)}
+        return {
+            "maxPriorityFeePerGas": int(priority),
+            "maxFeePerGas": int(priority) + 2 * int(base_fee),
+        }
+
     async def verify_typed_data(
         self,
         address: str,
@@ -61,9 +152,6 @@ class EvmFacilitatorSigner(FacilitatorSigner):
     ) -> bool:
         """Verify EIP-712 signature"""
         try:
-            from eth_account import Account
-            from eth_account.messages import encode_typed_data
-
             # TODO: Refactor FacilitatorSigner interface to accept primary_type explicitly
             primary_type = (
                 PAYMENT_PERMIT_PRIMARY_TYPE
@@ -79,21 +167,10 @@ class EvmFacilitatorSigner(FacilitatorSigner):
                     message_copy["meta"] = dict(message_copy["meta"])
                     message_copy["meta"]["paymentId"] = bytes.fromhex(payment_id[2:])
 
-            # Build EIP712Domain type dynamically from domain keys
-            domain_type = _eip712_domain_type_from_keys(domain)
-
-            typed_data = {
-                "types": {"EIP712Domain": domain_type, **types},
-                "primaryType": primary_type,
-                "domain": domain,
-                "message": message_copy,
-            }
-
-            signable = encode_typed_data(full_message=typed_data)
-            sig_bytes = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
-            recovered = Account.recover_message(signable, signature=sig_bytes)
-
-            return recovered.lower() == address.lower()
+            # EIP712Domain type is derived from the domain keys
+            return await get_crypto_executor().verify_typed_data(
+                address, domain, types, message_copy, signature, primary_type
+            )
         except Exception as e:
             logger.error("Signature verification failed", extra={"error": str(e)})
             return False
@@ -106,7 +183,11 @@ class EvmFacilitatorSigner(FacilitatorSigner):
         args: list[Any],
         network: str,
     ) -> str | None:
-        """Execute contract transaction on EVM (async)."""
+        """Execute contract transaction on EVM (async).
+
+        A send rejected for a used nonce is retried once after resyncing the
+        account's nonce.
+        """
         w3 = self._ensure_async_web3_client(network)
         if w3 is None:
             return None
@@ -116,19 +197,35 @@ class EvmFacilitatorSigner(FacilitatorSigner):
 
             abi_list = json.loads(abi) if isinstance(abi, str) else abi
             contract = w3.eth.contract(address=contract_address, abi=abi_list)
-            func = getattr(contract.functions, method)
-
-            tx = await func(*args).build_transaction(
-                {
-                    "from": self._address,
-                    "nonce": await w3.eth.get_transaction_count(self._address),
-                    "chainId": await w3.eth.chain_id,
-                }
-            )
+            call = getattr(contract.functions, method)(*args)
+            chain_id = await self._chain_id(w3, network)
+            fees = await self._fee_fields(w3, network)
 
-            signed_tx = w3.eth.account.sign_transaction(tx, private_key=self._private_key)
-            tx_hash = await w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            return tx_hash.hex()
+            for attempt in range(2):
+                nonce = await self._nonces.allocate(w3, network, self._address)
+                try:
+                    tx = await call.build_transaction(
+                        {"from": self._address, "nonce": nonce, "chainId": chain_id, **fees}
+                    )
+                    signed_tx = w3.eth.account.sign_transaction(tx, private_key=self._private_key)
+                except Exception:
+                    # Nothing was sent, so the nonce can be handed out again
+                    self._nonces.release(network, self._address, nonce)
+                    raise
+                try:
+                    tx_hash = await w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+                except Exception as e:
+                    # The node may have accepted the transaction anyway (e.g. a
+                    # timeout), so read the account's nonce from it again
+                    self._nonces.sent(network, self._address, nonce)
+                    self._nonces.resync(network, self._address)
+                    if attempt or not is_nonce_too_low(e):
+                        raise
+                    logger.warning(f"Nonce {nonce} already used, resyncing: {e}")
+                    continue
+                self._nonces.sent(network, self._address, nonce)
+                return tx_hash.hex()
+            return None
         except Exception as e:
             logger.error(
                 "Contract write failed: %s",
@@ -138,21 +235,64 @@ class EvmFacilitatorSigner(FacilitatorSigner):
             )
             return None
 
+    async def read_contract(
+        self,
+        contract_address: str,
+        abi: Any,
+        method: str,
+        args: list[Any],
+        network: str,
+    ) -> Any:
+        """Call a view function on EVM (async)."""
+        import json
+
+        w3 = self._ensure_async_web3_client(network)
+        abi_list = json.loads(abi) if isinstance(abi, str) else abi
+        contract = w3.eth.contract(address=contract_address, abi=abi_list)
+        return await getattr(contract.functions, method)(*args).call()
+
     async def wait_for_transaction_receipt(
         self,
         tx_hash: str,
         timeout: int = 120,
         network: str = "",
     ) -> dict[str, Any]:
-        """Wait for EVM transaction confirmation"""
-        w3 = self._ensure_async_web3_client(network)
-        if w3 is None:
-            raise RuntimeError("Web3 provider not configured")
+        """Wait for EVM transaction confirmation
 
-        receipt = await w3.eth.wait_for_transaction_receipt(tx_hash, timeout=timeout)
+        Waits are served by the network's shared ReceiptWatcher, which polls
+        once per block for all pending transactions. A transaction that is not
+        mined in time may have been dropped, leaving a nonce gap, so the
+        account's nonce is resynced.
+        """
+        try:
+            receipt = await self.receipt_watcher(network).wait(tx_hash, timeout)
+        except TimeoutError:
+            self._nonces.resync(network, self._address)
+            raise
         return {
             "hash": tx_hash,
             "blockNumber": str(receipt["blockNumber"]),
             "status": "confirmed" if receipt["status"] == 1 else "failed",
             "receipt": receipt,
         }
+
+    async def wait_for_finality(
+        self,
+        block_number: int,
+        timeout: int = 120,
+        network: str = "",
+    ) -> None:
+        """Wait until *block_number* has ``finality_confirmations`` confirmations"""
+        await self.receipt_watcher(network).wait_final(block_number, timeout)
+
+    def receipt_watcher(self, network: str) -> ReceiptWatcher:
+        """Shared receipt watcher of *network*, created on first use"""
+        if network not in self._receipt_watchers:
+            w3 = self._ensure_async_web3_client(network)
+            if w3 is None:
+                raise RuntimeError("Web3 provider not configured")
+            self._receipt_watchers[network] = ReceiptWatcher(
+                EvmReceiptSource(w3, self._finality_confirmations),
+                poll_interval=RECEIPT_POLL_INTERVAL,
+            )
+        return self._receipt_watchers[network]
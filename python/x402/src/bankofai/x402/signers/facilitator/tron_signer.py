@@ -2,22 +2,54 @@
 TronFacilitatorSigner - TRON facilitator signer implementation
 """
 
-import asyncio
-import time
 from typing import Any
 
 from bankofai.x402.abi import EIP712_DOMAIN_TYPE, PAYMENT_PERMIT_PRIMARY_TYPE
 from bankofai.x402.signers.facilitator.base import FacilitatorSigner
+from bankofai.x402.utils.receipt_watcher import ReceiptWatcher, TronReceiptSource
+from bankofai.x402.utils.tron_ref_block import RefBlockCache
+
+FEE_LIMIT = 1_000_000_000
+BLOCK_TIME = 3.0
 
 
 class TronFacilitatorSigner(FacilitatorSigner):
-    """TRON facilitator signer implementation"""
+    """TRON facilitator signer implementation
+
+    Args:
+        private_key: TRON private key (hex string)
+        ref_blocks: Reference block cache for transaction construction
+    """
 
-    def __init__(self, private_key: str) -> None:
+    def __init__(self, private_key: str, ref_blocks: RefBlockCache | None = None) -> None:
         clean_key = private_key[2:] if private_key.startswith("0x") else private_key
         self._private_key = clean_key
         self._address = self._derive_address(clean_key)
+        self._signing_key: Any = None
+        self._tron_key: Any = None
         self._async_tron_clients: dict[str, Any] = {}
+        self._ref_blocks = ref_blocks or RefBlockCache()
+        self._receipt_watchers: dict[str, ReceiptWatcher] = {}
+
+    @property
+    def ref_blocks(self) -> RefBlockCache:
+        return self._ref_blocks
+
+    def _get_signing_key(self) -> Any:
+        """Backend key used for EIP-712 signatures, parsed on first use"""
+        if self._signing_key is None:
+            from bankofai.x402.utils.crypto_backend import load_signing_key
+
+            self._signing_key = load_signing_key(self._private_key)
+        return self._signing_key
+
+    def _get_tron_key(self) -> Any:
+        """tronpy key used for transactions, parsed on first use"""
+        if self._tron_key is None:
+            from tronpy.keys import PrivateKey
+
+            self._tron_key = PrivateKey(bytes.fromhex(self._private_key))
+        return self._tron_key
 
     @classmethod
     def from_private_key(cls, private_key: str) -> "TronFacilitatorSigner":
@@ -67,18 +99,8 @@ class TronFacilitatorSigner(FacilitatorSigner):
 
             logger = logging.getLogger(__name__)
 
-            from eth_account import Account
-            from eth_account.messages import encode_typed_data
-
             from bankofai.x402.utils.address import tron_address_to_evm
-
-            # Note: PaymentPermit contract uses EIP712Domain WITHOUT version field
-            # Contract:
-            # keccak256("EIP712Domain(string name,uint256 chainId,address verifyingContract)")
-            full_types = {
-                "EIP712Domain": EIP712_DOMAIN_TYPE,
-                **types,
-            }
+            from bankofai.x402.utils.crypto_executor import get_crypto_executor
 
             primary_type = PAYMENT_PERMIT_PRIMARY_TYPE
 
@@ -91,29 +113,30 @@ class TronFacilitatorSigner(FacilitatorSigner):
                     message_copy["meta"] = dict(message_copy["meta"])
                     message_copy["meta"]["paymentId"] = bytes.fromhex(payment_id[2:])
 
-            typed_data = {
-                "types": full_types,
-                "primaryType": primary_type,
-                "domain": domain,
-                "message": message_copy,
-            }
-
-            signable = encode_typed_data(full_message=typed_data)
-
-            sig_bytes = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
-            recovered = Account.recover_message(signable, signature=sig_bytes)
-
+            # Note: PaymentPermit contract uses EIP712Domain WITHOUT version field
+            # Contract:
+            # keccak256("EIP712Domain(string name,uint256 chainId,address verifyingContract)")
             # Convert expected TRON address to EVM format for comparison
             expected_evm = tron_address_to_evm(address)
 
+            is_valid = await get_crypto_executor().verify_typed_data(
+                expected_evm,
+                domain,
+                types,
+                message_copy,
+                signature,
+                primary_type,
+                EIP712_DOMAIN_TYPE,
+            )
+
             logger.info(
-                "Signature verification: expected_tron=%s, expected_evm=%s, recovered=%s",
+                "Signature verification: expected_tron=%s, expected_evm=%s, valid=%s",
                 address,
                 expected_evm,
-                recovered,
+                is_valid,
             )
 
-            return recovered.lower() == expected_evm.lower()
+            return is_valid
         except Exception as e:
             import logging
 
@@ -123,32 +146,15 @@ class TronFacilitatorSigner(FacilitatorSigner):
 
     def _evm_to_tron_address(self, evm_address: str) -> str:
         """Convert EVM address to TRON address"""
-        try:
-            from tronpy.keys import to_base58check_address
+        from bankofai.x402.utils.address import normalize_tron_address
 
-            hex_addr = "41" + evm_address[2:].lower()
-            return to_base58check_address(hex_addr)
-        except ImportError:
-            return evm_address
+        return normalize_tron_address(evm_address)
 
     def _normalize_tron_address(self, address: str) -> str:
         """Normalize TRON address to valid Base58Check format"""
-        try:
-            from tronpy.keys import to_base58check_address
-
-            # If it's a hex address (0x...), convert to TRON address
-            if address.startswith("0x") and len(address) == 42:
-                hex_addr = "41" + address[2:].lower()
-                return to_base58check_address(hex_addr)
-
-            # If it starts with T, assume it's already a valid TRON address
-            if address.startswith("T"):
-                return address
+        from bankofai.x402.utils.address import normalize_tron_address
 
-            # Otherwise return as-is
-            return address
-        except Exception:
-            return address
+        return normalize_tron_address(address)
 
     async def write_contract(
         self,
@@ -160,12 +166,16 @@ class TronFacilitatorSigner(FacilitatorSigner):
     ) -> str | None:
         """Execute contract transaction on TRON (async).
 
-        Uses AsyncTron for non-blocking operations.
+        Calldata is encoded from a cached compiled ABI and the transaction is
+        assembled, hashed and signed locally against a cached reference block,
+        so a settlement costs a single broadcasttransaction request.
         """
-        import json as json_module
         import logging
 
-        from tronpy.keys import PrivateKey
+        from bankofai.x402.utils.tron_transaction import (
+            compile_function,
+            send_trigger_transaction,
+        )
 
         logger = logging.getLogger(__name__)
 
@@ -178,66 +188,28 @@ class TronFacilitatorSigner(FacilitatorSigner):
             normalized_address = self._normalize_tron_address(contract_address)
             logger.info(f"Normalized contract address: {contract_address} -> {normalized_address}")
 
-            # Log account resources before transaction
-            try:
-                account_info = await client.get_account(self._address)
-                account_resource = await client.get_account_resource(self._address)
-                logger.info(f"Account address: {self._address}")
-                logger.info(
-                    f"Account balance: {account_info.get('balance', 0) / 1_000_000:.6f} TRX"
-                )
-                logger.info("Account resources:")
-                logger.info(f"  - freeNetLimit: {account_resource.get('freeNetLimit', 0)}")
-                logger.info(f"  - freeNetUsed: {account_resource.get('freeNetUsed', 0)}")
-                logger.info(f"  - NetLimit: {account_resource.get('NetLimit', 0)}")
-                logger.info(f"  - NetUsed: {account_resource.get('NetUsed', 0)}")
-                logger.info(f"  - EnergyLimit: {account_resource.get('EnergyLimit', 0)}")
-                logger.info(f"  - EnergyUsed: {account_resource.get('EnergyUsed', 0)}")
-                logger.info(f"  - TotalEnergyLimit: {account_resource.get('TotalEnergyLimit', 0)}")
-                logger.info(
-                    f"  - TotalEnergyWeight: {account_resource.get('TotalEnergyWeight', 0)}"
-                )
-            except Exception as resource_err:
-                logger.warning(f"Failed to fetch account resources: {resource_err}")
+            if logger.isEnabledFor(logging.DEBUG):
+                await self._log_account_resources(client, logger)
 
             # Log contract call parameters in detail
             self._log_contract_parameters(method, args, logger)
 
-            # Use AsyncTron standard approach - let tronpy calculate Method ID
-            abi_list = json_module.loads(abi) if isinstance(abi, str) else abi
-            contract = await client.get_contract(normalized_address)
-            contract.abi = abi_list
-
-            # Get function object
-            func = getattr(contract.functions, method)
-
-            # Log tronpy calculated Method ID
+            function = compile_function(abi, method)
             logger.info(f"Function: {method}")
-            logger.info(f"  Signature: {func.function_signature}")
-            logger.info(f"  Method ID: {func.function_signature_hash}")
-
-            # Build and sign transaction
-            logger.info("Building transaction with fee_limit=1,000,000,000 SUN (1000 TRX)")
-            # AsyncTron: func(*args) returns a coroutine, need to await it first
-            txn_builder = await func(*args)
-            txn_builder = txn_builder.with_owner(self._address).fee_limit(1_000_000_000)
-            txn = await txn_builder.build()
-            txn = txn.sign(PrivateKey(bytes.fromhex(self._private_key)))
-
-            # Log transaction details before broadcast
-            try:
-                txn_dict = txn.to_json()
-                logger.info("Transaction built successfully:")
-                logger.info(f"  - txID: {txn_dict.get('txID', 'N/A')}")
-                logger.info(f"  - raw_data_hex length: {len(txn_dict.get('raw_data_hex', ''))}")
-                logger.info(
-                    f"  - fee_limit: {txn_dict.get('raw_data', {}).get('fee_limit', 'N/A')}"
-                )
-            except Exception as log_err:
-                logger.warning(f"Failed to log transaction details: {log_err}")
+            logger.info(f"  Signature: {function.signature}")
+            logger.info(f"  Method ID: {function.selector.hex()}")
 
             logger.info("Broadcasting transaction...")
-            result = await txn.broadcast()
+            result = await send_trigger_transaction(
+                client,
+                self._ref_blocks,
+                network,
+                self._get_tron_key(),
+                self._address,
+                normalized_address,
+                function.encode(args),
+                fee_limit=FEE_LIMIT,
+            )
             logger.info(f"Transaction broadcast successful: {result}")
             return result.get("txid")
         except Exception as e:
@@ -273,6 +245,70 @@ class TronFacilitatorSigner(FacilitatorSigner):
             logger.error("Full exception details:", exc_info=True)
             return None
 
+    async def read_contract(
+        self,
+        contract_address: str,
+        abi: Any,
+        method: str,
+        args: list[Any],
+        network: str,
+    ) -> Any:
+        """Call a view function on TRON (async).
+
+        Arguments are ABI-encoded locally, so the call is a single
+        triggerconstantcontract request (no getcontract round trip).
+        Address arguments may be in any TRON or EVM format.
+        """
+        import json as json_module
+
+        from eth_abi.abi import decode, encode
+
+        from bankofai.x402.abi import get_function_input_types, get_function_signature
+        from bankofai.x402.utils.address import tron_address_to_evm
+
+        client = self._ensure_async_tron_client(network)
+        if client is None:
+            raise RuntimeError("AsyncTron client required for contract calls")
+
+        abi_list = json_module.loads(abi) if isinstance(abi, str) else abi
+        input_types = get_function_input_types(abi_list, method)
+        values = [
+            tron_address_to_evm(arg) if arg_type == "address" else arg
+            for arg_type, arg in zip(input_types, args)
+        ]
+        entry = next(item for item in abi_list if item.get("name") == method)
+        output_types = [output["type"] for output in entry.get("outputs", [])]
+
+        result = await client.trigger_const_smart_contract_function(
+            self._address,
+            self._normalize_tron_address(contract_address),
+            get_function_signature(abi_list, method),
+            encode(input_types, values).hex(),
+        )
+        decoded = decode(output_types, bytes.fromhex(result))
+        return decoded[0] if len(decoded) == 1 else decoded
+
+    async def _log_account_resources(self, client: Any, logger: Any) -> None:
+        """Log balance and resources of the facilitator account (two extra requests)"""
+        try:
+            account_info = await client.get_account(self._address)
+            account_resource = await client.get_account_resource(self._address)
+            logger.debug(f"Account address: {self._address}")
+            logger.debug(f"Account balance: {account_info.get('balance', 0) / 1_000_000:.6f} TRX")
+            for key in (
+                "freeNetLimit",
+                "freeNetUsed",
+                "NetLimit",
+                "NetUsed",
+                "EnergyLimit",
+                "EnergyUsed",
+                "TotalEnergyLimit",
+                "TotalEnergyWeight",
+            ):
+                logger.debug(f"  - {key}: {account_resource.get(key, 0)}")
+        except Exception as resource_err:
+            logger.warning(f"Failed to fetch account resources: {resource_err}")
+
     def _log_contract_parameters(self, method: str, args: list[Any], logger: Any) -> None:
         """Log contract call parameters as a complete JSON"""
         try:
@@ -311,26 +347,37 @@ class TronFacilitatorSigner(FacilitatorSigner):
         timeout: int = 60,
         network: str = "",
     ) -> dict[str, Any]:
-        """Wait for TRON transaction confirmation (async with 60s default timeout)"""
-        client = self._ensure_async_tron_client(network)
-        if client is None:
-            raise RuntimeError("AsyncTron client required")
+        """Wait for TRON transaction confirmation (async with 60s default timeout)
 
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                # Use AsyncTron's get_transaction_info
-                info = await client.get_transaction_info(tx_hash)
-                if info and info.get("blockNumber"):
-                    return {
-                        "hash": tx_hash,
-                        "blockNumber": str(info.get("blockNumber")),
-                        "status": "confirmed"
-                        if info.get("receipt", {}).get("result") == "SUCCESS"
-                        else "failed",
-                    }
-            except Exception:
-                pass
-            await asyncio.sleep(3)
-
-        raise TimeoutError(f"Transaction {tx_hash} not confirmed within {timeout}s")
+        Waits are served by the network's shared ReceiptWatcher, which polls
+        once per block for all pending transactions.
+        """
+        info = await self.receipt_watcher(network).wait(tx_hash, timeout)
+        return {
+            "hash": tx_hash,
+            "blockNumber": str(info.get("blockNumber")),
+            "status": "confirmed"
+            if info.get("receipt", {}).get("result") == "SUCCESS"
+            else "failed",
+            "receipt": info,
+        }
+
+    async def wait_for_finality(
+        self,
+        block_number: int,
+        timeout: int = 120,
+        network: str = "",
+    ) -> None:
+        """Wait until *block_number* is solidified (about 19 blocks on TRON)"""
+        await self.receipt_watcher(network).wait_final(block_number, timeout)
+
+    def receipt_watcher(self, network: str) -> ReceiptWatcher:
+        """Shared receipt watcher of *network*, created on first use"""
+        if network not in self._receipt_watchers:
+            client = self._ensure_async_tron_client(network)
+            if client is None:
+                raise RuntimeError("AsyncTron client required")
+            self._receipt_watchers[network] = ReceiptWatcher(
+                TronReceiptSource(client), poll_interval=BLOCK_TIME
+            )
+        return self._receipt_watchers[network]
@@ -0,0 +1,7 @@
+"""
+Offline stand-ins for tests and benchmarks
+"""
+
+from bankofai.x402.testing.local_chain import LocalChain, LocalChainRevert, LocalChainSigner
+
+__all__ = ["LocalChain", "LocalChainRevert", "LocalChainSigner"]
@@ -0,0 +1,353 @@
+"""
+LocalChain - In-memory chain stand-in with PaymentPermit and Multicall3 semantics
+
+Used to exercise and benchmark settlement offline. It mirrors the contract rules
+the facilitator depends on (caller check, nonce replay protection, validity
+window, balances, Transfer events) but does not check signatures.
+"""
+
+import asyncio
+import itertools
+import secrets
+import time
+from collections import Counter
+from typing import Any
+
+from bankofai.x402.abi import (
+    ERC20_TRANSFER_TOPIC,
+    PAYMENT_PERMIT_ABI,
+    calculate_method_id,
+    get_function_input_types,
+)
+from bankofai.x402.signers.facilitator.base import FacilitatorSigner
+from bankofai.x402.utils.address import tron_address_to_evm
+
+_PERMIT_SELECTOR = bytes.fromhex(calculate_method_id(PAYMENT_PERMIT_ABI, "permitTransferFrom"))
+
+
+def _addr(value: Any) -> str:
+    """Canonical form used by the ledger: lowercase 20-byte hex without 0x"""
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()[-40:]
+    text = str(value)
+    if text.startswith("T"):
+        text = tron_address_to_evm(text)
+    return (text[2:] if text.startswith("0x") else text).lower()[-40:]
+
+
+class LocalChainRevert(Exception):
+    """A call reverted on the local chain"""
+
+    pass
+
+
+class LocalChain:
+    """
+    In-memory ledger that executes permitTransferFrom and Multicall3 aggregate3.
+
+    State changes are applied when a transaction is broadcast; its receipt becomes
+    available after ``block_time`` seconds and its block is final another
+    ``finality_time`` seconds later. ``stats`` counts broadcasts, receipt and
+    finality requests, view calls and executed permit transfers.
+    """
+
+    def __init__(
+        self,
+        network: str = "eip155:97",
+        block_time: float = 0.0,
+        broadcast_latency: float = 0.0,
+        multicall_address: str | None = None,
+        finality_time: float = 0.0,
+    ) -> None:
+        """
+        Initialize local chain.
+
+        Args:
+            network: Network identifier reported in receipts
+            block_time: Seconds until a broadcast transaction is mined
+            broadcast_latency: Simulated RPC latency of a broadcast
+            multicall_address: Address executing aggregate3 inner calls
+                (default: NetworkConfig's Multicall3 address for *network*)
+            finality_time: Seconds from mining until a block is final
+        """
+        from bankofai.x402.config import NetworkConfig
+
+        self.network = network
+        self.block_time = block_time
+        self.broadcast_latency = broadcast_latency
+        self.finality_time = finality_time
+        multicall = multicall_address or NetworkConfig.get_multicall_address(network)
+        self.multicall_address = _addr(multicall) if multicall else None
+        self.block_number = 0
+        self.stats: Counter[str] = Counter()
+        self._balances: dict[tuple[str, str], int] = {}
+        self._used_nonces: set[tuple[str, int]] = set()
+        self._receipts: dict[str, tuple[float, dict[str, Any]]] = {}
+        # Block number -> monotonic time it is mined
+        self._mined_at: dict[int, float] = {}
+        self._block_counter = itertools.count(1)
+        self._permit_arg_types = get_function_input_types(PAYMENT_PERMIT_ABI, "permitTransferFrom")
+
+    def mint(self, token: str, holder: str, amount: int) -> None:
+        key = (_addr(token), _addr(holder))
+        self._balances[key] = self._balances.get(key, 0) + amount
+
+    def balance_of(self, token: str, holder: str) -> int:
+        return self._balances.get((_addr(token), _addr(holder)), 0)
+
+    def nonce_used(self, owner: str, nonce: int) -> bool:
+        return (_addr(owner), int(nonce)) in self._used_nonces
+
+    def nonce_bitmap(self, owner: str, word: int) -> int:
+        """Bitmap of used nonces ``word * 256 .. word * 256 + 255`` of *owner*"""
+        owner = _addr(owner)
+        bitmap = 0
+        for used_owner, nonce in self._used_nonces:
+            if used_owner == owner and nonce >> 8 == word:
+                bitmap |= 1 << (nonce & 0xFF)
+        return bitmap
+
+    async def call(self, contract: str, method: str, args: list[Any]) -> Any:
+        """Execute a PaymentPermit view function."""
+        self.stats["calls"] += 1
+        if method == "nonceBitmap":
+            return self.nonce_bitmap(*args)
+        if method == "nonceUsed":
+            return self.nonce_used(*args)
+        raise LocalChainRevert(f"unsupported view {method}")
+
+    async def send_transaction(
+        self,
+        sender: str,
+        contract: str,
+        method: str,
+        args: list[Any],
+    ) -> str:
+        """Execute a contract call and return its transaction hash."""
+        if self.broadcast_latency:
+            await asyncio.sleep(self.broadcast_latency)
+        self.stats["broadcasts"] += 1
+
+        journal: list[tuple[str, Any, Any]] = []
+        logs: list[dict[str, Any]] = []
+        try:
+            if method == "permitTransferFrom":
+                permit, owner, signature = args
+                logs.extend(self._permit_transfer(_addr(sender), permit, owner, signature, journal))
+            elif method == "aggregate3":
+                if self.multicall_address is None or _addr(contract) != self.multicall_address:
+                    raise LocalChainRevert("not a multicall contract")
+                logs.extend(self._aggregate3(args[0], journal))
+            else:
+                raise LocalChainRevert(f"unsupported method {method}")
+            status = 1
+        except LocalChainRevert:
+            self._rollback(journal)
+            logs = []
+            status = 0
+
+        tx_hash = "0x" + secrets.token_hex(32)
+        self.block_number = next(self._block_counter)
+        receipt = {
+            "transactionHash": tx_hash,
+            "blockNumber": self.block_number,
+            "status": status,
+            "logs": logs,
+        }
+        self._receipts[tx_hash] = (time.monotonic() + self.block_time, receipt)
+        self._mined_at[self.block_number] = time.monotonic() + self.block_time
+        return tx_hash
+
+    async def get_receipt(self, tx_hash: str, timeout: float = 120) -> dict[str, Any]:
+        """Wait until the transaction is mined and return its receipt."""
+        self.stats["receipt_requests"] += 1
+        entry = self._receipts.get(tx_hash)
+        if entry is None:
+            raise TimeoutError(f"Transaction {tx_hash} not found")
+        mined_at, receipt = entry
+        delay = mined_at - time.monotonic()
+        if delay > timeout:
+            raise TimeoutError(f"Transaction {tx_hash} not confirmed within {timeout}s")
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return receipt
+
+    async def wait_final(self, block_number: int, timeout: float = 120) -> None:
+        """Wait until block *block_number* is final."""
+        self.stats["finality_requests"] += 1
+        mined_at = self._mined_at.get(block_number)
+        if mined_at is None:
+            raise TimeoutError(f"Block {block_number} not found")
+        delay = mined_at + self.finality_time - time.monotonic()
+        if delay > timeout:
+            raise TimeoutError(f"Block {block_number} not final within {timeout}s")
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _aggregate3(
+        self, calls: list[Any], journal: list[tuple[str, Any, Any]]
+    ) -> list[dict[str, Any]]:
+        from eth_abi.abi import decode
+
+        logs: list[dict[str, Any]] = []
+        for target, allow_failure, calldata in calls:
+            call_journal: list[tuple[str, Any, Any]] = []
+            try:
+                if bytes(calldata[:4]) != _PERMIT_SELECTOR:
+                    raise LocalChainRevert("unknown selector")
+                permit, owner, signature = decode(self._permit_arg_types, bytes(calldata[4:]))
+                logs.extend(
+                    self._permit_transfer(
+                        self.multicall_address or "",
+                        permit,
+                        owner,
+                        signature,
+                        journal=call_journal,
+                    )
+                )
+                journal.extend(call_journal)
+            except LocalChainRevert:
+                self._rollback(call_journal)
+                if not allow_failure:
+                    raise
+        return logs
+
+    def _permit_transfer(
+        self,
+        sender: str,
+        permit: Any,
+        owner: Any,
+        signature: Any,
+        journal: list[tuple[str, Any, Any]],
+    ) -> list[dict[str, Any]]:
+        meta, buyer, caller, payment, fee = permit
+        _kind, _payment_id, nonce, valid_after, valid_before = meta
+        pay_token, pay_amount, pay_to = payment
+        fee_to, fee_amount = fee
+
+        if _addr(caller) != sender:
+            raise LocalChainRevert("invalid caller")
+        if _addr(owner) != _addr(buyer):
+            raise LocalChainRevert("invalid owner")
+        now = int(time.time())
+        if now < int(valid_after) or now > int(valid_before):
+            raise LocalChainRevert("permit not valid now")
+        nonce_key = (_addr(buyer), int(nonce))
+        if nonce_key in self._used_nonces:
+            raise LocalChainRevert("nonce already used")
+
+        self._used_nonces.add(nonce_key)
+        journal.append(("nonce", nonce_key, None))
+        logs = [self._transfer(pay_token, buyer, pay_to, int(pay_amount), journal)]
+        if int(fee_amount) > 0:
+            logs.append(self._transfer(pay_token, buyer, fee_to, int(fee_amount), journal))
+        self.stats["permit_transfers"] += 1
+        return logs
+
+    def _transfer(
+        self,
+        token: Any,
+        sender: Any,
+        recipient: Any,
+        amount: int,
+        journal: list[tuple[str, Any, Any]],
+    ) -> dict[str, Any]:
+        src = (_addr(token), _addr(sender))
+        dst = (_addr(token), _addr(recipient))
+        if self._balances.get(src, 0) < amount:
+            raise LocalChainRevert("insufficient balance")
+        for key, delta in ((src, -amount), (dst, amount)):
+            journal.append(("balance", key, self._balances.get(key, 0)))
+            self._balances[key] = self._balances.get(key, 0) + delta
+        return {
+            "address": "0x" + src[0],
+            "topics": [
+                "0x" + ERC20_TRANSFER_TOPIC,
+                "0x" + src[1].rjust(64, "0"),
+                "0x" + dst[1].rjust(64, "0"),
+            ],
+            "data": "0x" + format(amount, "064x"),
+        }
+
+    def _rollback(self, journal: list[tuple[str, Any, Any]]) -> None:
+        for kind, key, previous in reversed(journal):
+            if kind == "nonce":
+                self._used_nonces.discard(key)
+            else:
+                self._balances[key] = previous
+        journal.clear()
+
+
+class LocalChainSigner(FacilitatorSigner):
+    """
+    Facilitator signer backed by a LocalChain.
+
+    Signatures are accepted without verification.
+    """
+
+    def __init__(
+        self,
+        chain: LocalChain,
+        address: str = "0x00000000000000000000000000000000000fac11",
+    ) -> None:
+        self._chain = chain
+        self._address = address
+
+    @property
+    def chain(self) -> LocalChain:
+        return self._chain
+
+    def get_address(self) -> str:
+        return self._address
+
+    async def verify_typed_data(
+        self,
+        address: str,
+        domain: dict[str, Any],
+        types: dict[str, Any],
+        message: dict[str, Any],
+        signature: str,
+    ) -> bool:
+        return True
+
+    async def write_contract(
+        self,
+        contract_address: str,
+        abi: str,
+        method: str,
+        args: list[Any],
+        network: str,
+    ) -> str | None:
+        return await self._chain.send_transaction(self._address, contract_address, method, args)
+
+    async def read_contract(
+        self,
+        contract_address: str,
+        abi: Any,
+        method: str,
+        args: list[Any],
+        network: str,
+    ) -> Any:
+        return await self._chain.call(contract_address, method, args)
+
+    async def wait_for_transaction_receipt(
+        self,
+        tx_hash: str,
+        timeout: int = 120,
+        network: str = "",
+    ) -> dict[str, Any]:
+        receipt = await self._chain.get_receipt(tx_hash, timeout)
+        return {
+            "hash": tx_hash,
+            "blockNumber": str(receipt["blockNumber"]),
+            "status": "confirmed" if receipt["status"] == 1 else "failed",
+            "receipt": receipt,
+        }
+
+    async def wait_for_finality(
+        self,
+        block_number: int,
+        timeout: int = 120,
+        network: str = "",
+    ) -> None:
+        await self._chain.wait_final(block_number, timeout)
@@ -0,0 +1,227 @@
+"""
+LocalEvmNode - In-memory EVM JSON-RPC stand-in
+
+Plugs into web3 as an async provider, so requests go through web3's real
+request and result formatting. Every request is counted per method in
+``stats``. Transactions are recorded with ``include``; like a dev node, with
+``block_time=0`` each one is mined at once into a new block, otherwise blocks
+are produced with time (or ``advance``).
+
+Signed transactions sent with ``eth_sendRawTransaction`` are checked against
+the sender's account nonce like a node would: a used nonce is rejected as
+"nonce too low", a nonce past a gap waits until the gap is filled.
+
+Relies on web3's private request caching, so it is left out of the wheel and
+only available to the tests and benchmarks of a source checkout.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import Any
+
+from eth_utils.crypto import keccak
+from web3._utils.caching.caching_utils import async_handle_request_caching
+from web3.providers.async_base import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+GAS_ESTIMATE = 100_000
+BASE_FEE = 10**9
+
+
+def block_hash(number: int) -> str:
+    return "0x" + f"{number:064x}"
+
+
+class LocalEvmNode(AsyncBaseProvider):
+    """
+    Counting EVM node stand-in for web3's AsyncWeb3.
+
+    Args:
+        chain_id: Chain id reported by eth_chainId
+        latency: Simulated seconds per request
+        block_number: Height of the current head block
+        block_time: Seconds per block; 0 mines every transaction at once
+        block_receipts: Whether eth_getBlockReceipts is available
+
+    Set ``revert_estimates`` to fail gas estimation as a reverting call would,
+    and ``drop_transactions`` to accept sent transactions without ever mining
+    them (as if evicted from the mempool).
+    """
+
+    def __init__(
+        self,
+        chain_id: int = 97,
+        latency: float = 0.0,
+        block_number: int = 1000,
+        block_time: float = 0.0,
+        block_receipts: bool = True,
+    ) -> None:
+        super().__init__()
+        self.chain_id = chain_id
+        self.latency = latency
+        self.block_time = block_time
+        self.block_receipts = block_receipts
+        self.stats: Counter[str] = Counter()
+        self.transactions: dict[str, dict[str, Any]] = {}
+        self.revert_estimates = False
+        self.drop_transactions = False
+        # Account -> next nonce; transactions past a gap wait in _queued
+        self.nonces: dict[str, int] = {}
+        self._queued: dict[str, dict[int, str]] = {}
+        self._blocks: dict[int, list[str]] = {}
+        self._head = block_number
+        self._started = time.monotonic()
+        self._ids = itertools.count()
+
+    def web3(self) -> Any:
+        """AsyncWeb3 client backed by this node"""
+        from web3 import AsyncWeb3
+
+        return AsyncWeb3(self)
+
+    @property
+    def block_number(self) -> int:
+        """Height of the current head block"""
+        if self.block_time > 0:
+            return self._head + int((time.monotonic() - self._started) / self.block_time)
+        return self._head
+
+    def advance(self, blocks: int = 1) -> None:
+        """Produce *blocks* new blocks"""
+        self._head += blocks
+
+    @property
+    def rpc_count(self) -> int:
+        return sum(self.stats.values())
+
+    def include(
+        self,
+        tx_hash: str,
+        status: int = 1,
+        sender: str | None = None,
+        nonce: int | None = None,
+    ) -> int:
+        """
+        Record a transaction in the next block.
+
+        Returns:
+            Number of the block holding it
+        """
+        block = self.block_number + 1
+        if self.block_time <= 0:
+            self._head = block
+        key = "0x" + tx_hash.lower().removeprefix("0x")
+        self.transactions[key] = {"block": block, "status": status, "from": sender, "nonce": nonce}
+        self._blocks.setdefault(block, []).append(key)
+        return block
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+    # Honours cache_allowed_requests like web3's own providers
+    @async_handle_request_caching
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.stats[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        response: RPCResponse = {"jsonrpc": "2.0", "id": next(self._ids)}
+        handler = getattr(self, "_" + method, None)
+        if handler is None or (method == "eth_getBlockReceipts" and not self.block_receipts):
+            response["error"] = {"code": -32601, "message": f"the method {method} does not exist"}
+            return response
+        try:
+            response["result"] = handler(*params)
+        except ValueError as e:
+            response["error"] = {"code": -32000, "message": str(e)}
+        return response
+
+    # ------------------------------------------------------------------
+    # Methods
+    # ------------------------------------------------------------------
+
+    def _eth_chainId(self) -> str:
+        return hex(self.chain_id)
+
+    def _eth_blockNumber(self) -> str:
+        return hex(self.block_number)
+
+    def _eth_getTransactionCount(self, address: str, block: str = "latest") -> str:
+        return hex(self.nonces.get(address.lower(), 0))
+
+    def _eth_estimateGas(self, tx: dict[str, Any], *args: Any) -> str:
+        if self.revert_estimates:
+            raise ValueError("execution reverted")
+        return hex(GAS_ESTIMATE)
+
+    def _eth_maxPriorityFeePerGas(self) -> str:
+        return hex(10**9)
+
+    def _eth_getBlockByNumber(self, block: str, full: bool = False) -> dict[str, Any]:
+        number = self.block_number if block in ("latest", "pending") else int(block, 16)
+        return {
+            "number": hex(number),
+            "hash": block_hash(number),
+            "parentHash": block_hash(number - 1),
+            "timestamp": hex(int(time.time())),
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(0),
+            "baseFeePerGas": hex(BASE_FEE),
+            "transactions": list(self._blocks.get(number, [])),
+        }
+
+    def _eth_sendRawTransaction(self, raw: str) -> str:
+        import rlp
+        from eth_account import Account
+
+        data = bytes.fromhex(raw.removeprefix("0x"))
+        # Typed transactions start with their type byte, then [chainId, nonce, ...]
+        fields = rlp.decode(data[1:])[1:] if data[0] < 0x7F else rlp.decode(data)
+        nonce = int.from_bytes(fields[0], "big")
+        sender = Account.recover_transaction(data).lower()
+        tx_hash = "0x" + keccak(data).hex()
+
+        expected = self.nonces.get(sender, 0)
+        if nonce < expected:
+            raise ValueError("nonce too low")
+        if self.drop_transactions:
+            return tx_hash
+        self._queued.setdefault(sender, {})[nonce] = tx_hash
+        queued = self._queued[sender]
+        while expected in queued:
+            self.include(queued.pop(expected), sender=sender, nonce=expected)
+            expected += 1
+        self.nonces[sender] = expected
+        return tx_hash
+
+    def _eth_getTransactionReceipt(self, tx_hash: str) -> dict[str, Any] | None:
+        tx = self.transactions.get(tx_hash.lower())
+        if tx is None or tx["block"] > self.block_number:
+            return None
+        return self._receipt(tx_hash.lower())
+
+    def _eth_getBlockReceipts(self, block: str) -> list[dict[str, Any]] | None:
+        number = int(block, 16)
+        if number > self.block_number:
+            return None
+        return [self._receipt(tx_hash) for tx_hash in self._blocks.get(number, [])]
+
+    def _receipt(self, tx_hash: str) -> dict[str, Any]:
+        tx = self.transactions[tx_hash]
+        return {
+            "transactionHash": tx_hash,
+            "transactionIndex": hex(self._blocks[tx["block"]].index(tx_hash)),
+            "blockHash": block_hash(tx["block"]),
+            "blockNumber": hex(tx["block"]),
+            "from": tx["from"],
+            "to": None,
+            "cumulativeGasUsed": hex(21000),
+            "gasUsed": hex(21000),
+            "effectiveGasPrice": hex(10**9),
+            "contractAddress": None,
+            "logs": [],
+            "logsBloom": "0x" + "00" * 256,
+            "status": hex(tx["status"]),
+            "type": "0x2",
+        }
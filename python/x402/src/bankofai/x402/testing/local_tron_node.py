@@ -0,0 +1,170 @@
+"""
+LocalTronNode - In-memory TRON full node HTTP API stand-in
+
+Plugs into tronpy as an ``AsyncHTTPProvider`` and answers the wallet endpoints
+the TRON signers use. Every request is counted per endpoint in ``stats`` so
+tests and benchmarks can assert how many round trips an operation costs.
+
+Broadcasts are checked like a node would: the txID must be the SHA-256 of the
+transaction's raw data and the reference block must be one of the last
+``tapos_window`` blocks (otherwise a ``TAPOS_ERROR`` is returned).
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import Counter
+from typing import Any
+
+from tronpy import AsyncTron
+from tronpy.providers.async_http import AsyncHTTPProvider
+
+from bankofai.x402.utils.tron_transaction import calculate_txid
+
+# TRON only accepts references to one of the last 65536 blocks
+DEFAULT_TAPOS_WINDOW = 65536
+
+
+def block_id(number: int) -> str:
+    """Deterministic 32-byte block id; like TRON's, it starts with the block number"""
+    return f"{number:016x}" + hashlib.sha256(str(number).encode()).hexdigest()[16:]
+
+
+class LocalTronNode(AsyncHTTPProvider):
+    """
+    Counting TRON node stand-in for tronpy's AsyncTron.
+
+    Args:
+        latency: Simulated seconds per request
+        block_number: Height of the current head block
+        tapos_window: Number of recent blocks accepted as transaction references
+        block_time: Seconds per block; blocks are then produced with time. With
+            0 every broadcast is mined at once into a new block
+        solid_lag: Number of blocks the solidified block trails the head
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        block_number: int = 1000,
+        tapos_window: int = DEFAULT_TAPOS_WINDOW,
+        block_time: float = 0.0,
+        solid_lag: int = 0,
+    ) -> None:
+        # AsyncHTTPProvider.__init__ would open an HTTP client; nothing to connect to here
+        self.latency = latency
+        self.block_time = block_time
+        self.tapos_window = tapos_window
+        self.solid_lag = solid_lag
+        self.stats: Counter[str] = Counter()
+        self.transactions: dict[str, dict[str, Any]] = {}
+        self._blocks: dict[int, list[str]] = {}
+        self._head = block_number
+        self._started = time.monotonic()
+
+    def client(self) -> AsyncTron:
+        """AsyncTron client backed by this node"""
+        return AsyncTron(provider=self)
+
+    @property
+    def block_number(self) -> int:
+        """Height of the current head block"""
+        if self.block_time > 0:
+            return self._head + int((time.monotonic() - self._started) / self.block_time)
+        return self._head
+
+    def advance(self, blocks: int = 1) -> None:
+        """Produce *blocks* new blocks"""
+        self._head += blocks
+
+    @property
+    def rpc_count(self) -> int:
+        return sum(self.stats.values())
+
+    async def make_request(self, method: str, params: Any = None) -> Any:
+        self.stats[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        handler = getattr(self, "_" + method.split("/", 1)[-1], None)
+        if handler is None:
+            return {"Error": f"LocalTronNode does not implement {method}"}
+        return handler(params or {})
+
+    async def close(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    def _getnodeinfo(self, params: dict[str, Any]) -> dict[str, Any]:
+        solid = self.block_number - self.solid_lag
+        return {
+            "block": f"Num:{self.block_number},ID:{block_id(self.block_number)}",
+            "solidityBlock": f"Num:{solid},ID:{block_id(solid)}",
+        }
+
+    def _getnowblock(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "blockID": block_id(self.block_number),
+            "block_header": {"raw_data": {"number": self.block_number}},
+        }
+
+    def _getaccount(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {"address": params.get("address"), "balance": 10**9}
+
+    def _getaccountresource(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {"freeNetLimit": 600, "EnergyLimit": 10**6}
+
+    def _getcontract(self, params: dict[str, Any]) -> dict[str, Any]:
+        return {"contract_address": params.get("value"), "abi": {"entrys": []}}
+
+    def _getsignweight(self, params: dict[str, Any]) -> dict[str, Any]:
+        raw_data = params["raw_data"]
+        return {
+            "transaction": {"transaction": {"txID": calculate_txid(raw_data), "raw_data": raw_data}}
+        }
+
+    def _broadcasttransaction(self, params: dict[str, Any]) -> dict[str, Any]:
+        raw_data = params["raw_data"]
+        if params.get("txID") != calculate_txid(raw_data) or not params.get("signature"):
+            return {"code": "SIGERROR", "message": b"Validate signature error".hex()}
+        if not self._is_recent_reference(raw_data["ref_block_bytes"], raw_data["ref_block_hash"]):
+            return {"code": "TAPOS_ERROR", "message": b"Tapos check error".hex()}
+        block = self.block_number + 1
+        if self.block_time <= 0:
+            self._head = block
+        self.transactions[params["txID"]] = {
+            "raw_data": raw_data,
+            "signature": params["signature"],
+            "block": block,
+            "result": "SUCCESS",
+        }
+        self._blocks.setdefault(block, []).append(params["txID"])
+        return {"result": True, "txid": params["txID"]}
+
+    def _gettransactioninfobyid(self, params: dict[str, Any]) -> dict[str, Any]:
+        txid = params.get("value", "")
+        tx = self.transactions.get(txid)
+        if tx is None or tx["block"] > self.block_number:
+            return {}
+        return self._info(txid)
+
+    def _gettransactioninfobyblocknum(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        number = params.get("num", 0)
+        if number > self.block_number:
+            return []
+        return [self._info(txid) for txid in self._blocks.get(number, [])]
+
+    def _info(self, txid: str) -> dict[str, Any]:
+        tx = self.transactions[txid]
+        return {"id": txid, "blockNumber": tx["block"], "receipt": {"result": tx["result"]}}
+
+    def _is_recent_reference(self, ref_block_bytes: str, ref_block_hash: str) -> bool:
+        # ref_block_bytes are the low 16 bits of the block number
+        number = (self.block_number & ~0xFFFF) | int(ref_block_bytes, 16)
+        for candidate in (number, number - 0x10000):
+            if 0 <= self.block_number - candidate < self.tapos_window:
+                if block_id(candidate)[16:32] == ref_block_hash:
+                    return True
+        return False
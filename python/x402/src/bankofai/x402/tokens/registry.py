@@ -2,15 +2,44 @@
 Token registry - Centralized management of token configurations for all networks
 """
 
+import json
+import sys
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 
 from bankofai.x402.address.converter import TronAddressConverter
 from bankofai.x402.exceptions import UnknownTokenError
+from bankofai.x402.utils.address import parse_address
 
 _converter = TronAddressConverter()
 
 
+def _address_key(network: str, address: str) -> bytes | str:
+    """Index key for a token address: its 20 raw bytes, whatever the text format"""
+    parsed = parse_address(address)
+    if parsed is not None:
+        return parsed.raw
+    # Unparseable addresses are only found by exact (EVM: case-insensitive) match
+    return address.lower() if network.startswith("eip155:") else address
+
+
+def _read_token_list(path: Path) -> Any:
+    if path.suffix == ".toml":
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ImportError("Loading TOML token lists requires Python 3.11+ or tomli")
+        with path.open("rb") as f:
+            return tomllib.load(f)
+    with path.open() as f:
+        return json.load(f)
+
+
 @dataclass
 class TokenInfo:
     """Token information"""
@@ -107,6 +136,12 @@ class TokenRegistry:
         },
     }
 
+    # Per-network address index: network -> (indexed token count, key -> token).
+    # Rebuilt when the token count no longer matches (tokens added or removed
+    # without register_token); hits are checked against _tokens so entries of
+    # removed tokens are never returned.
+    _index: dict[str, tuple[int, dict[bytes | str, TokenInfo]]] = {}
+
     @classmethod
     def register_token(cls, network: str, token: TokenInfo) -> None:
         """Register a custom token for specified network
@@ -115,12 +150,94 @@ class TokenRegistry:
             network: Network identifier (e.g. "tron:nile", "eip155:97")
             token: TokenInfo to register
         """
-        if network not in cls._tokens:
-            cls._tokens[network] = {}
+        index = cls._network_index(network)
+        tokens = cls._tokens.setdefault(network, {})
         # Only normalize TRON addresses; EVM addresses stay as-is
         if not network.startswith("eip155:"):
             token.address = _converter.normalize(token.address)
-        cls._tokens[network][token.symbol.upper()] = token
+        symbol = token.symbol.upper()
+        previous = tokens.get(symbol)
+        if previous is not None:
+            index.pop(_address_key(network, previous.address), None)
+        tokens[symbol] = token
+        index[_address_key(network, token.address)] = token
+        cls._index[network] = (len(tokens), index)
+
+    @classmethod
+    def register_tokens(cls, network: str, tokens: Iterable[TokenInfo]) -> int:
+        """Register many tokens for specified network
+
+        Returns:
+            Number of tokens registered
+        """
+        count = 0
+        for token in tokens:
+            cls.register_token(network, token)
+            count += 1
+        return count
+
+    @classmethod
+    def load_tokens(cls, source: str | Path | Mapping[str, Any]) -> int:
+        """Bulk-register tokens from a JSON or TOML token list
+
+        The list is either a mapping of network to token entries, or a
+        ``tokens`` array whose entries carry their own ``network``::
+
+            {"tron:nile": [{"address": "T...", "decimals": 6, "name": "...", "symbol": "..."}]}
+
+            [[tokens]]
+            network = "eip155:97"
+            address = "0x..."
+            decimals = 18
+            name = "Tether USD"
+            symbol = "USDT"
+
+        Args:
+            source: Path to a .json/.toml file, or the already-parsed list
+
+        Returns:
+            Number of tokens registered
+
+        Raises:
+            ValueError: If an entry is missing a field or has no network
+        """
+        data = source if isinstance(source, Mapping) else _read_token_list(Path(source))
+        if "tokens" in data:
+            by_network: dict[str, list[Any]] = {}
+            for entry in data["tokens"]:
+                if "network" not in entry:
+                    raise ValueError(f"Token entry has no network: {entry}")
+                by_network.setdefault(entry["network"], []).append(entry)
+        else:
+            by_network = dict(data)
+
+        count = 0
+        for network, entries in by_network.items():
+            try:
+                tokens = [
+                    TokenInfo(
+                        address=entry["address"],
+                        decimals=int(entry["decimals"]),
+                        name=entry["name"],
+                        symbol=entry["symbol"],
+                        version=str(entry.get("version", "1")),
+                    )
+                    for entry in entries
+                ]
+            except KeyError as e:
+                raise ValueError(f"Token entry on {network} is missing {e}")
+            count += cls.register_tokens(network, tokens)
+        return count
+
+    @classmethod
+    def _network_index(cls, network: str) -> dict[bytes | str, TokenInfo]:
+        tokens = cls._tokens.get(network, {})
+        cached = cls._index.get(network)
+        if cached is not None and cached[0] == len(tokens):
+            return cached[1]
+        index = {_address_key(network, info.address): info for info in tokens.values()}
+        cls._index[network] = (len(tokens), index)
+        return index
 
     @classmethod
     def get_token(cls, network: str, symbol: str) -> TokenInfo:
@@ -137,20 +254,11 @@ class TokenRegistry:
 
     @classmethod
     def find_by_address(cls, network: str, address: str) -> TokenInfo | None:
-        """Find token information by address"""
-        tokens = cls._tokens.get(network, {})
-        # Use case-insensitive comparison for EVM addresses
-        if network.startswith("eip155:"):
-            lower = address.lower()
-            for info in tokens.values():
-                if info.address.lower() == lower:
-                    return info
+        """Find token information by address (any format, EVM case-insensitive)"""
+        info = cls._network_index(network).get(_address_key(network, address))
+        if info is None or cls._tokens.get(network, {}).get(info.symbol.upper()) is not info:
             return None
-        normalized = _converter.normalize(address)
-        for info in tokens.values():
-            if info.address == normalized:
-                return info
-        return None
+        return info
 
     @classmethod
     def get_network_tokens(cls, network: str) -> dict[str, TokenInfo]:
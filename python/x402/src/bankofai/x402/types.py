@@ -2,7 +2,7 @@
 Type definitions for x402 protocol
 """
 
-from typing import Any, Literal, Optional
+from typing import Any, Final, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,14 @@ KIND_MAP = {
     PAYMENT_ONLY: 0,
 }
 
+# Confirmation levels a settlement can wait for, weakest first
+CONFIRMATION_BROADCAST: Final = "broadcast"
+CONFIRMATION_INCLUDED: Final = "included"
+CONFIRMATION_FINAL: Final = "final"
+CONFIRMATION_LEVELS = (CONFIRMATION_BROADCAST, CONFIRMATION_INCLUDED, CONFIRMATION_FINAL)
+
+ConfirmationLevel = Literal["broadcast", "included", "final"]
+
 
 class PermitMeta(BaseModel):
     """Payment permit metadata"""
@@ -64,7 +72,7 @@ class PaymentPermit(BaseModel):
 class FeeInfo(BaseModel):
     """Fee information in payment requirements"""
 
-    facilitator_id: Optional[str] = Field(None, alias="facilitatorId")
+    facilitator_id: Optional[str] = Field(default=None, alias="facilitatorId")
     fee_to: str = Field(alias="feeTo")
     fee_amount: str = Field(alias="feeAmount")
     caller: Optional[str] = None
@@ -79,6 +87,8 @@ class PaymentRequirementsExtra(BaseModel):
     name: Optional[str] = None
     version: Optional[str] = None
     fee: Optional[FeeInfo] = None
+    # Level the facilitator waits for before answering settle (its default if None)
+    confirmation: Optional[ConfirmationLevel] = None
 
 
 class PaymentRequirements(BaseModel):
@@ -89,7 +99,7 @@ class PaymentRequirements(BaseModel):
     amount: str
     asset: str
     pay_to: str = Field(alias="payTo")
-    max_timeout_seconds: Optional[int] = Field(None, alias="maxTimeoutSeconds")
+    max_timeout_seconds: Optional[int] = Field(default=None, alias="maxTimeoutSeconds")
     extra: Optional[PaymentRequirementsExtra] = None
 
     class Config:
@@ -120,7 +130,7 @@ class ResourceInfo(BaseModel):
 
     url: Optional[str] = None
     description: Optional[str] = None
-    mime_type: Optional[str] = Field(None, alias="mimeType")
+    mime_type: Optional[str] = Field(default=None, alias="mimeType")
 
     class Config:
         populate_by_name = True
@@ -155,8 +165,8 @@ class PaymentPayloadData(BaseModel):
     """Payment payload data"""
 
     signature: str
-    merchant_signature: Optional[str] = Field(None, alias="merchantSignature")
-    payment_permit: Optional[PaymentPermit] = Field(None, alias="paymentPermit")
+    merchant_signature: Optional[str] = Field(default=None, alias="merchantSignature")
+    payment_permit: Optional[PaymentPermit] = Field(default=None, alias="paymentPermit")
 
     class Config:
         populate_by_name = True
@@ -179,7 +189,7 @@ class VerifyResponse(BaseModel):
     """Verification response from facilitator"""
 
     is_valid: bool = Field(alias="isValid")
-    invalid_reason: Optional[str] = Field(None, alias="invalidReason")
+    invalid_reason: Optional[str] = Field(default=None, alias="invalidReason")
 
     class Config:
         populate_by_name = True
@@ -189,17 +199,81 @@ class TransactionInfo(BaseModel):
     """Transaction information"""
 
     hash: str
-    block_number: Optional[str] = Field(None, alias="blockNumber")
+    block_number: Optional[str] = Field(default=None, alias="blockNumber")
     status: Optional[str] = None
 
 
+def _hex_string(value: Any) -> str:
+    """0x-prefixed lowercase hex from str, bytes or HexBytes"""
+    if isinstance(value, (bytes, bytearray)):
+        return "0x" + bytes(value).hex()
+    text = str(value).lower()
+    return text if text.startswith("0x") else "0x" + text
+
+
+class TransactionLog(BaseModel):
+    """Event log emitted by a settlement transaction"""
+
+    address: str
+    topics: list[str] = Field(default_factory=list)
+    data: str = "0x"
+
+
+class TransactionReceipt(BaseModel):
+    """
+    Receipt of a settlement transaction.
+
+    Addresses, topics and data are 0x-prefixed lowercase hex on every chain; a
+    TRON log address is the 20-byte account without the 0x41 prefix.
+    """
+
+    block_number: Optional[str] = Field(default=None, alias="blockNumber")
+    result: str  # "SUCCESS" or "FAILED"
+    logs: list[TransactionLog] = Field(default_factory=list)
+
+    class Config:
+        populate_by_name = True
+
+    @property
+    def succeeded(self) -> bool:
+        return self.result == "SUCCESS"
+
+    @classmethod
+    def from_signer_result(cls, result: dict[str, Any]) -> "TransactionReceipt":
+        """
+        Build from the dict returned by ``FacilitatorSigner.wait_for_transaction_receipt``.
+
+        Accepts an EVM receipt or a TRON transaction info under its ``receipt`` key.
+        """
+        raw = result.get("receipt") or {}
+        status = str(result.get("status", "")).lower()
+        logs = raw.get("logs") or raw.get("log") or []
+        block_number = result.get("blockNumber") or raw.get("blockNumber")
+        return cls(
+            blockNumber=str(block_number) if block_number is not None else None,
+            result="FAILED" if status in ("failed", "0") else "SUCCESS",
+            logs=[
+                TransactionLog(
+                    address="0x" + _hex_string(log.get("address", ""))[2:][-40:],
+                    topics=[_hex_string(t) for t in log.get("topics", [])],
+                    data=_hex_string(log.get("data", "")),
+                )
+                for log in logs
+            ],
+        )
+
+
 class SettleResponse(BaseModel):
     """Settlement response from facilitator"""
 
     success: bool
     transaction: Optional[str] = None
     network: Optional[str] = None
-    error_reason: Optional[str] = Field(None, alias="errorReason")
+    error_reason: Optional[str] = Field(default=None, alias="errorReason")
+    # Receipt of the settlement transaction, when the facilitator waited for it
+    receipt: Optional[TransactionReceipt] = None
+    # Confirmation level the transaction had reached when this response was made
+    confirmation: Optional[ConfirmationLevel] = None
 
     class Config:
         populate_by_name = True
@@ -244,7 +318,7 @@ class FeeQuoteResponse(BaseModel):
     scheme: str
     network: str
     asset: str
-    expires_at: Optional[int] = Field(None, alias="expiresAt")
+    expires_at: Optional[int] = Field(default=None, alias="expiresAt")
 
     class Config:
         populate_by_name = True
@@ -2,7 +2,27 @@
 X402 Utility Functions
 """
 
-from bankofai.x402.utils.address import normalize_tron_address, tron_address_to_evm
+from bankofai.x402.utils.address import (
+    CompactAddress,
+    address_key,
+    normalize_tron_address,
+    parse_address,
+    tron_address_to_evm,
+)
+from bankofai.x402.utils.crypto_backend import (
+    CryptoBackend,
+    SigningKey,
+    available_backends,
+    get_crypto_backend,
+    load_signing_key,
+    set_crypto_backend,
+)
+from bankofai.x402.utils.crypto_executor import (
+    CryptoExecutor,
+    TypedDataCheck,
+    get_crypto_executor,
+    set_crypto_executor,
+)
 from bankofai.x402.utils.eip712 import (
     EVM_ZERO_ADDRESS,
     TRON_ZERO_ADDRESS,
@@ -10,7 +30,16 @@ from bankofai.x402.utils.eip712 import (
     convert_tron_addresses_to_evm,
     payment_id_to_bytes,
 )
+from bankofai.x402.utils.evm_nonce import NonceManager
 from bankofai.x402.utils.payment_id import generate_payment_id
+from bankofai.x402.utils.receipt_watcher import (
+    EvmReceiptSource,
+    ReceiptSource,
+    ReceiptWatcher,
+    TronReceiptSource,
+)
+from bankofai.x402.utils.settlement_coalescer import SettlementCoalescer, settlement_key
+from bankofai.x402.utils.tron_ref_block import RefBlockCache
 from bankofai.x402.utils.tron_verification import TronTransactionVerifier
 from bankofai.x402.utils.tx_verification import (
     BaseTransactionVerifier,
@@ -19,10 +48,14 @@ from bankofai.x402.utils.tx_verification import (
     TransferEvent,
     get_verifier_for_network,
 )
+from bankofai.x402.utils.verification_cache import VerificationCache
 
 __all__ = [
     "normalize_tron_address",
     "tron_address_to_evm",
+    "CompactAddress",
+    "address_key",
+    "parse_address",
     "generate_payment_id",
     "EVM_ZERO_ADDRESS",
     "TRON_ZERO_ADDRESS",
@@ -36,4 +69,30 @@ __all__ = [
     "BaseTransactionVerifier",
     "TronTransactionVerifier",
     "get_verifier_for_network",
+    # secp256k1 backend
+    "CryptoBackend",
+    "SigningKey",
+    "available_backends",
+    "get_crypto_backend",
+    "set_crypto_backend",
+    "load_signing_key",
+    # Crypto executor
+    "CryptoExecutor",
+    "TypedDataCheck",
+    "get_crypto_executor",
+    "set_crypto_executor",
+    # Signature verification cache
+    "VerificationCache",
+    # Settlement coalescing
+    "SettlementCoalescer",
+    "settlement_key",
+    # TRON transaction construction
+    "RefBlockCache",
+    # Receipt watching
+    "ReceiptSource",
+    "ReceiptWatcher",
+    "TronReceiptSource",
+    "EvmReceiptSource",
+    # EVM nonce allocation
+    "NonceManager",
 ]
@@ -1,29 +1,120 @@
 """
 Address utility functions for TRON and EVM address conversion
+
+Addresses are parsed once into a ``CompactAddress`` (20 raw bytes plus a chain
+tag) by an LRU-cached parser, and formatted through an LRU-cached Base58Check
+encoder. Conversions repeat for the same handful of addresses on every payment
+(buyer, caller, token, payTo, feeTo, contracts), so after the first payment
+they are dictionary lookups instead of base58/SHA-256 work.
 """
 
+import hashlib
 import logging
+from functools import lru_cache
+from typing import NamedTuple
 
 import base58
 
 logger = logging.getLogger(__name__)
 
+CHAIN_TRON = "tron"
+CHAIN_EVM = "evm"
 
-def _hex_to_base58check(hex_addr: str) -> str:
-    """Convert a 42-char TRON hex address (41...) to Base58Check.
+ADDRESS_CACHE_SIZE = 4096
+
+TRON_ADDRESS_PREFIX = 0x41
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+_ZERO_BYTES = bytes(20)
+
+
+class CompactAddress(NamedTuple):
+    """Canonical address value: 20 raw bytes and the chain it belongs to"""
+
+    raw: bytes
+    chain: str
+
+    def to_evm(self) -> str:
+        """Lowercase 0x-hex form."""
+        return "0x" + self.raw.hex()
+
+    def to_tron_hex(self) -> str:
+        """TRON hex form (41 + 40 hex chars)."""
+        return "41" + self.raw.hex()
+
+    def to_base58(self) -> str:
+        """TRON Base58Check form (T...)."""
+        return _base58check(self.raw)
 
-    Uses tronpy if available, otherwise falls back to manual encoding.
+    def __str__(self) -> str:
+        return self.to_base58() if self.chain == CHAIN_TRON else self.to_evm()
+
+
+def _is_hex(text: str) -> bool:
+    return _HEX_DIGITS.issuperset(text)
+
+
+def _is_zero_placeholder(address: str) -> bool:
+    # T0000... placeholders used for "no address" in requirements
+    return address.startswith("T") and not address.strip("0T")
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def _base58check(raw: bytes) -> str:
+    payload = bytes([TRON_ADDRESS_PREFIX]) + raw
+    checksum = hashlib.sha256(hashlib.sha256(payload).digest()).digest()[:4]
+    return base58.b58encode(payload + checksum).decode()
+
+
+@lru_cache(maxsize=ADDRESS_CACHE_SIZE)
+def parse_address(address: str, chain: str | None = None) -> CompactAddress | None:
     """
+    Parse an address in any supported format (cached).
+
+    Accepts TRON Base58Check (T...), TRON hex (41...), 0x-hex and bare
+    40-char hex. T0000... placeholders parse as the zero address. The
+    Base58Check checksum is not verified, matching the converters' leniency.
+
+    Args:
+        address: Address text
+        chain: Chain tag for the result; inferred from the format when None
+            (T... and 41... are TRON, hex is EVM)
+
+    Returns:
+        The parsed address, or None if *address* is not in a known format
+    """
+    if len(address) == 42 and address.startswith(("0x", "41")):
+        body = address[2:]
+        if _is_hex(body):
+            inferred = CHAIN_EVM if address.startswith("0x") else CHAIN_TRON
+            return CompactAddress(bytes.fromhex(body), chain or inferred)
+        return None
+    if len(address) == 40 and _is_hex(address):
+        return CompactAddress(bytes.fromhex(address), chain or CHAIN_EVM)
+    if _is_zero_placeholder(address):
+        return CompactAddress(_ZERO_BYTES, chain or CHAIN_TRON)
     try:
-        from tronpy.keys import to_base58check_address
+        decoded = base58.b58decode(address)
+    except ValueError:
+        return None
+    # 1 byte version + 20 bytes address + 4 bytes checksum
+    if len(decoded) != 25:
+        return None
+    return CompactAddress(decoded[1:21], chain or CHAIN_TRON)
+
+
+def _hex_to_base58check(hex_addr: str) -> str:
+    """Convert a 42-char TRON hex address (41...) to Base58Check."""
+    return _base58check(bytes.fromhex(hex_addr[2:]))
 
-        return to_base58check_address(hex_addr)
-    except ImportError:
-        import hashlib
 
-        addr_bytes = bytes.fromhex(hex_addr)
-        checksum = hashlib.sha256(hashlib.sha256(addr_bytes).digest()).digest()[:4]
-        return base58.b58encode(addr_bytes + checksum).decode()
+def address_key(address: str) -> str:
+    """Comparable form of an address.
+
+    EVM hex (0x...) is case-insensitive and lowercased; TRON Base58Check is
+    case-sensitive and returned unchanged.
+    """
+    return address.lower() if address[:2] in ("0x", "0X") else address
 
 
 def normalize_tron_address(tron_addr: str) -> str:
@@ -41,24 +132,15 @@ def normalize_tron_address(tron_addr: str) -> str:
     Returns:
         Normalized TRON address in Base58Check format
     """
-    # Handle zero address placeholder (T0000... or similar)
-    if tron_addr.startswith("T") and all(c in "0T" for c in tron_addr):
-        return "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
-
-    # EVM hex format (0x + 40 hex chars) → prepend 41 and convert
-    if tron_addr.startswith("0x") and len(tron_addr) == 42:
-        hex_body = tron_addr[2:]
-        if all(c in "0123456789abcdefABCDEF" for c in hex_body):
-            return _hex_to_base58check("41" + hex_body.lower())
-
-    # TRON hex format (41 + 40 hex chars)
-    if tron_addr.startswith("41") and len(tron_addr) == 42:
-        hex_body = tron_addr[2:]
-        if all(c in "0123456789abcdefABCDEF" for c in hex_body):
-            return _hex_to_base58check(tron_addr.lower())
-
-    # Already Base58Check or unknown format — return as-is
-    return tron_addr
+    if tron_addr.startswith("T"):
+        if _is_zero_placeholder(tron_addr):
+            return _base58check(_ZERO_BYTES)
+        return tron_addr
+    if len(tron_addr) != 42:
+        return tron_addr
+    parsed = parse_address(tron_addr, CHAIN_TRON)
+    # Unknown format — return as-is
+    return parsed.to_base58() if parsed is not None else tron_addr
 
 
 def tron_address_to_evm(tron_addr: str) -> str:
@@ -70,32 +152,10 @@ def tron_address_to_evm(tron_addr: str) -> str:
     Returns:
         EVM address in hex format (0x...)
     """
-    # Normalize address first
-    tron_addr = normalize_tron_address(tron_addr)
-
-    # If already in EVM format, return as-is
+    parsed = parse_address(tron_addr, CHAIN_TRON)
+    if parsed is not None:
+        return parsed.to_evm()
     if tron_addr.startswith("0x"):
         return tron_addr
-
-    # If it's a hex string (with or without 0x prefix), normalize to 0x format
-    # Check if it looks like a hex address (40 or 42 chars of hex digits, possibly with
-    # 0x or 41 prefix)
-    hex_str = tron_addr
-    if tron_addr.startswith("41"):
-        # Remove TRON version prefix
-        hex_str = tron_addr[2:]
-
-    if len(hex_str) == 40 and all(c in "0123456789abcdefABCDEF" for c in hex_str):
-        return "0x" + hex_str
-
-    try:
-        # Decode Base58Check (for TRON addresses like TLBaRhANhwgZyUk6Z1ynCn1Ld7BRH1jBjZ)
-        decoded = base58.b58decode(tron_addr)
-        # TRON address is 25 bytes: 1 byte version + 20 bytes address + 4 bytes checksum
-        # Extract the 20-byte address (skip first byte, take next 20)
-        address_bytes = decoded[1:21]
-        # Convert to hex with 0x prefix
-        return "0x" + address_bytes.hex()
-    except Exception as e:
-        logger.warning(f"Failed to convert TRON address {tron_addr}: {e}, using as-is")
-        return tron_addr
+    logger.warning(f"Failed to convert TRON address {tron_addr}, using as-is")
+    return tron_addr
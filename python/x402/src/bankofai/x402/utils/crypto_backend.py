@@ -0,0 +1,215 @@
+"""
+Pluggable secp256k1 backends for signing and public-key recovery
+
+The native ``coincurve`` backend (libsecp256k1) is used when it is installed,
+with automatic fallback to the pure-Python eth-keys implementation. Signers
+parse their private key once into a ``SigningKey`` and reuse it for every
+signature instead of re-parsing it from hex on each call.
+
+Usage:
+    key = load_signing_key(bytes.fromhex(private_key_hex))
+    signature = key.sign_hash(digest)
+    assert recover_address(digest, signature) == key.address
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class CryptoBackend(ABC):
+    """secp256k1 primitives needed by x402"""
+
+    name: str
+
+    @abstractmethod
+    def parse_private_key(self, secret: bytes) -> Any:
+        """Parse a 32-byte secret into the backend's key object."""
+
+    @abstractmethod
+    def public_key(self, key: Any) -> bytes:
+        """64-byte uncompressed public key (without the 0x04 prefix)."""
+
+    @abstractmethod
+    def sign_recoverable(self, key: Any, digest: bytes) -> bytes:
+        """Sign a 32-byte digest; returns r || s || recovery id (0/1)."""
+
+    @abstractmethod
+    def recover(self, digest: bytes, signature: bytes) -> bytes:
+        """Recover the 64-byte public key from an r || s || recovery id signature."""
+
+
+class CoincurveBackend(CryptoBackend):
+    """libsecp256k1 through coincurve"""
+
+    name = "coincurve"
+
+    def __init__(self) -> None:
+        import coincurve
+
+        self._coincurve = coincurve
+
+    def parse_private_key(self, secret: bytes) -> Any:
+        return self._coincurve.PrivateKey(secret)
+
+    def public_key(self, key: Any) -> bytes:
+        return bytes(key.public_key.format(compressed=False)[1:])
+
+    def sign_recoverable(self, key: Any, digest: bytes) -> bytes:
+        return bytes(key.sign_recoverable(digest, hasher=None))
+
+    def recover(self, digest: bytes, signature: bytes) -> bytes:
+        public_key = self._coincurve.PublicKey.from_signature_and_message(
+            signature, digest, hasher=None
+        )
+        return public_key.format(compressed=False)[1:]
+
+
+class EthKeysBackend(CryptoBackend):
+    """Pure-Python implementation from eth-keys"""
+
+    name = "eth-keys"
+
+    def __init__(self) -> None:
+        from eth_keys.backends.native.main import NativeECCBackend
+        from eth_keys.datatypes import PrivateKey, Signature
+
+        self._private_key = PrivateKey
+        self._signature = Signature
+        self._backend = NativeECCBackend()
+
+    def parse_private_key(self, secret: bytes) -> Any:
+        return self._private_key(secret, backend=self._backend)
+
+    def public_key(self, key: Any) -> bytes:
+        return bytes(key.public_key.to_bytes())
+
+    def sign_recoverable(self, key: Any, digest: bytes) -> bytes:
+        return self._backend.ecdsa_sign(digest, key).to_bytes()
+
+    def recover(self, digest: bytes, signature: bytes) -> bytes:
+        parsed = self._signature(signature_bytes=signature, backend=self._backend)
+        return self._backend.ecdsa_recover(digest, parsed).to_bytes()
+
+
+_BACKENDS: dict[str, type[CryptoBackend]] = {
+    CoincurveBackend.name: CoincurveBackend,
+    EthKeysBackend.name: EthKeysBackend,
+}
+
+_backend: CryptoBackend | None = None
+
+
+def available_backends() -> list[str]:
+    """Names of the backends that can be loaded in this environment."""
+    names = []
+    for name, backend_cls in _BACKENDS.items():
+        try:
+            backend_cls()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_crypto_backend() -> CryptoBackend:
+    """Return the active backend: coincurve when installed, eth-keys otherwise."""
+    global _backend
+    if _backend is None:
+        try:
+            _backend = CoincurveBackend()
+        except ImportError:
+            logger.debug("coincurve not installed, using the eth-keys secp256k1 backend")
+            _backend = EthKeysBackend()
+    return _backend
+
+
+def set_crypto_backend(backend: CryptoBackend | str | None) -> None:
+    """
+    Select the secp256k1 backend by instance or name; None restores automatic selection.
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    global _backend
+    if isinstance(backend, str):
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown crypto backend '{backend}'. Available: {list(_BACKENDS)}")
+        backend = _BACKENDS[backend]()
+    _backend = backend
+
+
+def _to_address(public_key: bytes) -> str:
+    from eth_utils.address import to_checksum_address
+    from eth_utils.crypto import keccak
+
+    return to_checksum_address(keccak(public_key)[-20:])
+
+
+class SigningKey:
+    """
+    Private key parsed once by a backend.
+
+    Pickles as its secret, so it can be sent to process-pool workers, which
+    parse it with their own backend.
+    """
+
+    __slots__ = ("_backend", "_key", "_secret", "public_key", "address")
+
+    def __init__(self, secret: bytes, backend: CryptoBackend | None = None) -> None:
+        self._backend = backend or get_crypto_backend()
+        self._secret = secret
+        self._key = self._backend.parse_private_key(secret)
+        self.public_key = self._backend.public_key(self._key)
+        self.address = _to_address(self.public_key)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (SigningKey, (self._secret,))
+
+    def __repr__(self) -> str:
+        return f"SigningKey(address={self.address}, backend={self._backend.name})"
+
+    @property
+    def backend(self) -> CryptoBackend:
+        return self._backend
+
+    def sign_hash(self, digest: bytes) -> bytes:
+        """Sign a 32-byte digest; returns the 65-byte r || s || v signature (v = 27/28)."""
+        signature = self._backend.sign_recoverable(self._key, digest)
+        return signature[:64] + bytes([signature[64] + 27])
+
+
+def load_signing_key(private_key: bytes | str) -> SigningKey:
+    """Parse a private key (32 bytes or hex, with or without 0x) with the active backend."""
+    if isinstance(private_key, str):
+        private_key = private_key[2:] if private_key.startswith("0x") else private_key
+        private_key = bytes.fromhex(private_key)
+    return SigningKey(private_key)
+
+
+def recover_public_key(digest: bytes, signature: bytes) -> bytes:
+    """
+    Recover the 64-byte public key that signed *digest*.
+
+    Args:
+        digest: 32-byte message hash
+        signature: 65-byte r || s || v signature, v in {0, 1, 27, 28}
+
+    Raises:
+        ValueError: If the signature is malformed
+    """
+    if len(signature) != 65:
+        raise ValueError(f"Invalid signature length: {len(signature)}")
+    v = signature[64]
+    if v in (27, 28):
+        v -= 27
+    elif v not in (0, 1):
+        raise ValueError(f"Invalid signature v: {v}")
+    return get_crypto_backend().recover(digest, signature[:64] + bytes([v]))
+
+
+def recover_address(digest: bytes, signature: bytes) -> str:
+    """Recover the checksummed address that signed *digest* (see recover_public_key)."""
+    return _to_address(recover_public_key(digest, signature))
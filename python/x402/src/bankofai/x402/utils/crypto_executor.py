@@ -0,0 +1,228 @@
+"""
+CryptoExecutor - Runs signing and signature recovery off the event loop
+
+Signers and mechanisms are async, but secp256k1 signing/recovery and keccak are
+CPU-bound and would otherwise run on the event loop, stalling every other
+coroutine (including HTTP calls to the facilitator) during a burst of payments.
+They are dispatched to a pluggable executor instead:
+
+- ``CryptoExecutor.thread()`` (default): a small thread pool. The native parts
+  (coincurve, keccak) release the GIL, and the interpreter switches threads
+  regularly, so the loop keeps running.
+- ``CryptoExecutor.process()``: a process pool with pre-imported workers, for
+  sustained load where the Python-level encoding also needs to leave the GIL.
+- ``CryptoExecutor.inline()``: run on the calling thread (no dispatch).
+
+Usage:
+    set_crypto_executor(CryptoExecutor.process(max_workers=4))
+"""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple, TypeVar
+
+from bankofai.x402.utils.crypto_backend import SigningKey
+from bankofai.x402.utils.typed_data import (
+    hash_typed_data,
+    recover_typed_data_signer,
+    sign_typed_data_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+
+class TypedDataCheck(NamedTuple):
+    """One EIP-712 signature to verify against an expected (0x hex) signer address"""
+
+    address: str
+    domain: dict[str, Any]
+    types: dict[str, Any]
+    message: dict[str, Any]
+    signature: str
+    primary_type: str | None = None
+    domain_type: list[dict[str, str]] | None = None
+
+
+def _sign_typed_data(
+    private_key: bytes | SigningKey,
+    domain: dict[str, Any],
+    types: dict[str, Any],
+    message: dict[str, Any],
+    primary_type: str | None,
+    domain_type: list[dict[str, str]] | None,
+) -> bytes:
+    digest = hash_typed_data(domain, types, message, primary_type, domain_type)
+    return sign_typed_data_hash(digest, private_key)
+
+
+def _check(check: TypedDataCheck) -> bool:
+    try:
+        digest = hash_typed_data(
+            check.domain, check.types, check.message, check.primary_type, check.domain_type
+        )
+        recovered = recover_typed_data_signer(digest, check.signature)
+    except Exception as e:
+        logger.debug(f"Signature check failed: {e}")
+        return False
+    return recovered.lower() == check.address.lower()
+
+
+def _check_many(checks: list[TypedDataCheck]) -> list[bool]:
+    return [_check(check) for check in checks]
+
+
+def _warm_up() -> None:
+    """Process pool initializer: import the crypto stack once per worker"""
+    import eth_keys  # noqa: F401
+    import eth_utils  # noqa: F401
+
+    _check(
+        TypedDataCheck(
+            address="0x" + "00" * 20,
+            domain={"name": "warmup"},
+            types={"Warmup": [{"name": "value", "type": "uint256"}]},
+            message={"value": 0},
+            signature="00" * 65,
+        )
+    )
+
+
+def _running_asyncio_loop() -> asyncio.AbstractEventLoop | None:
+    # Work runs inline under other async frameworks (e.g. trio)
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class CryptoExecutor:
+    """
+    Dispatches CPU-bound crypto work to an executor.
+
+    Args:
+        executor: Executor to use; None runs work inline on the calling thread
+        max_workers: Number of workers, used to split ``verify_many`` batches
+    """
+
+    def __init__(self, executor: Executor | None = None, max_workers: int = 1) -> None:
+        self._executor = executor
+        self._max_workers = max(1, max_workers)
+
+    @classmethod
+    def thread(cls, max_workers: int = DEFAULT_MAX_WORKERS) -> "CryptoExecutor":
+        """Executor backed by a thread pool."""
+        return cls(
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="x402-crypto"),
+            max_workers,
+        )
+
+    @classmethod
+    def process(cls, max_workers: int = DEFAULT_MAX_WORKERS) -> "CryptoExecutor":
+        """
+        Executor backed by a process pool whose workers pre-import the crypto stack.
+
+        Note that ``sign_typed_data`` sends the private key to the worker processes,
+        where it is parsed again on every call.
+        """
+        return cls(ProcessPoolExecutor(max_workers=max_workers, initializer=_warm_up), max_workers)
+
+    @classmethod
+    def inline(cls) -> "CryptoExecutor":
+        """Executor that runs work on the calling thread."""
+        return cls(None)
+
+    @property
+    def is_process_pool(self) -> bool:
+        return isinstance(self._executor, ProcessPoolExecutor)
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the executor; *fn* must be picklable for process pools."""
+        loop = _running_asyncio_loop()
+        if self._executor is None or loop is None:
+            return fn(*args)
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def run_in_thread(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run ``fn(*args)`` off the loop for callables that cannot cross processes
+        (e.g. bound methods that mutate their object).
+        """
+        if self._executor is None or _running_asyncio_loop() is None:
+            return fn(*args)
+        if self.is_process_pool:
+            return await asyncio.to_thread(fn, *args)
+        return await self.run(fn, *args)
+
+    async def sign_typed_data(
+        self,
+        private_key: bytes | SigningKey,
+        domain: dict[str, Any],
+        types: dict[str, Any],
+        message: dict[str, Any],
+        primary_type: str | None = None,
+        domain_type: list[dict[str, str]] | None = None,
+    ) -> bytes:
+        """Sign EIP-712 typed data; returns the 65-byte signature."""
+        return await self.run(
+            _sign_typed_data, private_key, domain, types, message, primary_type, domain_type
+        )
+
+    async def verify_typed_data(
+        self,
+        address: str,
+        domain: dict[str, Any],
+        types: dict[str, Any],
+        message: dict[str, Any],
+        signature: str,
+        primary_type: str | None = None,
+        domain_type: list[dict[str, str]] | None = None,
+    ) -> bool:
+        """Check that *signature* over the typed data was made by *address* (0x hex)."""
+        check = TypedDataCheck(
+            address, domain, types, message, signature, primary_type, domain_type
+        )
+        return await self.run(_check, check)
+
+    async def verify_many(self, checks: list[TypedDataCheck]) -> list[bool]:
+        """
+        Verify a burst of signatures, one executor job per worker.
+
+        Returns:
+            One result per check, in order
+        """
+        if not checks:
+            return []
+        if self._executor is None or _running_asyncio_loop() is None:
+            return _check_many(checks)
+        size = -(-len(checks) // self._max_workers)
+        chunks = [checks[i : i + size] for i in range(0, len(checks), size)]
+        results = await asyncio.gather(*(self.run(_check_many, chunk) for chunk in chunks))
+        return [result for chunk in results for result in chunk]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the executor's workers."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+
+
+_crypto_executor: CryptoExecutor | None = None
+
+
+def get_crypto_executor() -> CryptoExecutor:
+    """Return the process-wide crypto executor (a thread pool unless configured)."""
+    global _crypto_executor
+    if _crypto_executor is None:
+        _crypto_executor = CryptoExecutor.thread()
+    return _crypto_executor
+
+
+def set_crypto_executor(executor: CryptoExecutor | None) -> None:
+    """Replace the process-wide crypto executor; None restores the default thread pool."""
+    global _crypto_executor
+    _crypto_executor = executor
@@ -0,0 +1,143 @@
+"""
+NonceManager - Local nonce allocation for EVM accounts
+
+Reading ``eth_getTransactionCount`` before every transaction costs a round trip
+and hands the same nonce to concurrent settlements, one of which the node then
+rejects. A NonceManager reads the pending transaction count of each
+(network, address) once and allocates the following nonces locally, so any
+number of transactions of the account can be in flight at once:
+
+- concurrent first allocations of an account share one request,
+- a nonce whose transaction was never sent (e.g. gas estimation reverted) is
+  ``release``-d and handed out again before any new one, so no gap is left
+  that would hold back later transactions,
+- ``resync`` marks the account stale after the node rejected a nonce as too
+  low or a transaction was dropped, so the next allocation reads the pending
+  count again. Nonces still being sent (allocated, but neither ``sent`` nor
+  ``release``-d) stay reserved: the account moves to the node's pending count
+  if that is ahead, and otherwise only the nonces below the local counter that
+  the node has not seen and nobody is sending are handed out again.
+"""
+
+import asyncio
+import heapq
+import logging
+from collections import Counter
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Node error messages meaning the nonce was already used (geth, erigon, besu, nethermind)
+NONCE_TOO_LOW_ERRORS = (
+    "nonce too low",
+    "nonce is too low",
+    "already been used",
+    "replacement transaction underpriced",
+)
+
+
+def is_nonce_too_low(error: BaseException) -> bool:
+    """Whether a send error means the transaction's nonce was already used"""
+    message = str(error).lower()
+    return any(text in message for text in NONCE_TOO_LOW_ERRORS)
+
+
+class _Account:
+    __slots__ = ("next_nonce", "released", "sending", "stale", "lock")
+
+    def __init__(self) -> None:
+        # None until read from the node
+        self.next_nonce: int | None = None
+        # Min-heap of allocated nonces that were not used
+        self.released: list[int] = []
+        # Allocated nonces whose transactions are not sent yet
+        self.sending: set[int] = set()
+        # Read the pending count again before the next allocation
+        self.stale = False
+        self.lock = asyncio.Lock()
+
+    def sync(self, pending: int) -> None:
+        if self.next_nonce is None or pending >= self.next_nonce:
+            self.next_nonce = pending
+            self.released = []
+        else:
+            # Below the local counter, nonces the node has not seen and nobody
+            # is sending belong to dropped transactions
+            self.released = [n for n in range(pending, self.next_nonce) if n not in self.sending]
+            heapq.heapify(self.released)
+        self.stale = False
+
+
+class NonceManager:
+    """
+    Allocates transaction nonces per (network, address).
+
+    ``stats`` counts ``allocated`` nonces, ``syncs`` with the node,
+    ``released`` nonces that were handed out again and ``resyncs``.
+    """
+
+    def __init__(self) -> None:
+        self._accounts: dict[tuple[str, str], _Account] = {}
+        self.stats: Counter[str] = Counter()
+
+    async def allocate(self, w3: Any, network: str, address: str) -> int:
+        """
+        Next nonce of *address* on *network*.
+
+        Args:
+            w3: AsyncWeb3 client of the network, used to sync the account
+            network: Network identifier
+            address: Sending account
+
+        Returns:
+            A nonce no other caller holds
+        """
+        account = self._account(network, address)
+        if account.next_nonce is None or account.stale:
+            async with account.lock:
+                if account.next_nonce is None or account.stale:
+                    pending = await w3.eth.get_transaction_count(address, "pending")
+                    self.stats["syncs"] += 1
+                    account.sync(pending)
+                    logger.debug(f"Nonce of {address} on {network} synced at {pending}")
+
+        self.stats["allocated"] += 1
+        if account.released:
+            nonce = heapq.heappop(account.released)
+        else:
+            assert account.next_nonce is not None  # synced above
+            nonce = account.next_nonce
+            account.next_nonce = nonce + 1
+        account.sending.add(nonce)
+        return nonce
+
+    def sent(self, network: str, address: str, nonce: int) -> None:
+        """Record that the transaction using *nonce* was handed to the node"""
+        self._account(network, address).sending.discard(nonce)
+
+    def release(self, network: str, address: str, nonce: int) -> None:
+        """Give back a nonce whose transaction was not sent"""
+        account = self._account(network, address)
+        account.sending.discard(nonce)
+        if account.next_nonce is None or nonce >= account.next_nonce:
+            return
+        self.stats["released"] += 1
+        if nonce == account.next_nonce - 1:
+            account.next_nonce = nonce
+        else:
+            heapq.heappush(account.released, nonce)
+
+    def resync(self, network: str, address: str) -> None:
+        """Read the account's nonce from the node again on its next allocation"""
+        account = self._account(network, address)
+        if account.next_nonce is not None and not account.stale:
+            self.stats["resyncs"] += 1
+            logger.info(f"Resyncing nonce of {address} on {network}")
+            account.stale = True
+
+    def _account(self, network: str, address: str) -> _Account:
+        key = (network, address.lower())
+        account = self._accounts.get(key)
+        if account is None:
+            account = self._accounts[key] = _Account()
+        return account
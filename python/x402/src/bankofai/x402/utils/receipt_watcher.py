@@ -0,0 +1,363 @@
+"""
+ReceiptWatcher - One block-driven receipt poller per network
+
+Waiting for each settlement with its own polling loop makes RPC volume grow
+with the number of transactions in flight. A ReceiptWatcher tracks every
+pending transaction hash of a network in one task that:
+
+- reads the head block number once per poll,
+- fetches the receipts of each new block in one request
+  (``gettransactioninfobyblocknum`` / ``eth_getBlockReceipts``) and resolves
+  all waiters whose transaction is in it,
+- backs off while no new block appears and returns to ``poll_interval``
+  once one does.
+
+When it starts, it also scans the last ``backfill_blocks`` blocks, and it
+remembers the receipts of recently scanned blocks, so a transaction mined just
+before anyone waits for it is still found. As a safety net, a transaction still
+pending after ``lookup_after`` seconds is looked up directly once. Transactions
+are only looked up on every poll when the node has no per-block receipts
+endpoint or the watcher fell more than ``max_blocks_per_poll`` blocks behind.
+
+RPC volume therefore scales with blocks, not with pending transactions.
+
+``wait_final`` waits until a block is final (solidified on TRON, a number of
+confirmations deep on EVM). All such waits share the same polls, adding at
+most one request per poll.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_INTERVAL = 10.0
+DEFAULT_BACKOFF = 1.5
+# Blocks scanned per poll; further behind, pending transactions are looked up directly
+DEFAULT_MAX_BLOCKS_PER_POLL = 20
+DEFAULT_BACKFILL_BLOCKS = 2
+DEFAULT_RECENT_RECEIPTS = 10_000
+
+
+def _hash_key(tx_hash: Any) -> str:
+    text = tx_hash.hex() if isinstance(tx_hash, (bytes, bytearray)) else str(tx_hash)
+    return text.lower().removeprefix("0x")
+
+
+class ReceiptSource(ABC):
+    """Chain access used by a ReceiptWatcher"""
+
+    @abstractmethod
+    async def block_number(self) -> int:
+        """Current head block number"""
+
+    async def block_receipts(self, number: int) -> list[tuple[str, Any]]:
+        """
+        Receipts of every transaction in block *number* as (hash, receipt) pairs.
+
+        Raises:
+            NotImplementedError: If the node cannot list receipts per block
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def receipt(self, tx_hash: str) -> Any | None:
+        """Receipt of one transaction, None while it is not mined"""
+
+    async def final_block_number(self, head: int) -> int:
+        """Number of the latest final block, given the current *head*"""
+        return head
+
+
+class TronReceiptSource(ReceiptSource):
+    """TRON receipts through a tronpy AsyncTron client"""
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    async def block_number(self) -> int:
+        return int(await self._client.get_latest_block_number())
+
+    async def block_receipts(self, number: int) -> list[tuple[str, Any]]:
+        infos = await self._client.provider.make_request(
+            "wallet/gettransactioninfobyblocknum", {"num": number}
+        )
+        # An empty block is reported as {}
+        return [(info["id"], info) for info in infos] if isinstance(infos, list) else []
+
+    async def receipt(self, tx_hash: str) -> Any | None:
+        from tronpy.exceptions import TransactionNotFound
+
+        try:
+            return await self._client.get_transaction_info(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    async def final_block_number(self, head: int) -> int:
+        # Solidified blocks are irreversible
+        return int(await self._client.get_latest_solid_block_number())
+
+
+class EvmReceiptSource(ReceiptSource):
+    """
+    EVM receipts through a web3 AsyncWeb3 client.
+
+    Args:
+        w3: AsyncWeb3 client
+        confirmations: Confirmations (the including block counts as one) after
+            which a block is treated as final
+    """
+
+    def __init__(self, w3: Any, confirmations: int = 1) -> None:
+        if confirmations <= 0:
+            raise ValueError("confirmations must be positive")
+        self._w3 = w3
+        self._confirmations = confirmations
+
+    async def block_number(self) -> int:
+        return int(await self._w3.eth.block_number)
+
+    async def block_receipts(self, number: int) -> list[tuple[str, Any]]:
+        from web3.exceptions import MethodUnavailable
+
+        try:
+            receipts = await self._w3.eth.get_block_receipts(number)
+        except MethodUnavailable as e:
+            raise NotImplementedError("eth_getBlockReceipts is not available") from e
+        return [(receipt["transactionHash"], receipt) for receipt in receipts]
+
+    async def receipt(self, tx_hash: str) -> Any | None:
+        from web3.exceptions import TransactionNotFound
+
+        try:
+            return await self._w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            return None
+
+    async def final_block_number(self, head: int) -> int:
+        return head - self._confirmations + 1
+
+
+class ReceiptWatcher:
+    """
+    Resolves receipt waits of one network from a shared polling task.
+
+    ``stats`` counts ``polls``, ``blocks`` scanned, direct ``lookups``,
+    ``resolved`` transactions, ``finalized`` block waits and poll ``errors``.
+
+    Args:
+        source: Chain access
+        poll_interval: Seconds between polls while blocks keep coming
+            (about the block time)
+        max_interval: Upper bound of the backed-off poll interval
+        max_blocks_per_poll: Maximum number of blocks scanned in one poll
+        backfill_blocks: Blocks up to the head scanned when polling starts
+        lookup_after: Seconds after which a pending transaction is looked up
+            directly once (default: 5 poll intervals)
+    """
+
+    def __init__(
+        self,
+        source: ReceiptSource,
+        poll_interval: float,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        max_blocks_per_poll: int = DEFAULT_MAX_BLOCKS_PER_POLL,
+        backfill_blocks: int = DEFAULT_BACKFILL_BLOCKS,
+        lookup_after: float | None = None,
+    ) -> None:
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be positive")
+        if max_blocks_per_poll <= 0:
+            raise ValueError("max_blocks_per_poll must be positive")
+        self._source = source
+        self._poll_interval = poll_interval
+        self._max_interval = max(max_interval, poll_interval)
+        self._max_blocks = max_blocks_per_poll
+        self._backfill = max(1, min(backfill_blocks, max_blocks_per_poll))
+        self._lookup_after = lookup_after if lookup_after is not None else 5 * poll_interval
+        self._pending: dict[str, asyncio.Future[Any]] = {}
+        self._waiters: Counter[str] = Counter()
+        # Pending hash -> monotonic time it was registered; removed once looked up
+        self._unchecked: dict[str, float] = {}
+        self._recent: OrderedDict[str, Any] = OrderedDict()
+        # Heap of (block number, sequence, future) waiting for finality
+        self._final_waits: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._final_block: int | None = None
+        self._sequence = itertools.count()
+        self._last_block: int | None = None
+        self._block_receipts = True
+        self._task: asyncio.Task[None] | None = None
+        self.stats: Counter[str] = Counter()
+
+    @property
+    def pending(self) -> int:
+        """Number of transactions being watched"""
+        return len(self._pending)
+
+    async def wait(self, tx_hash: str, timeout: float) -> Any:
+        """
+        Wait until *tx_hash* is mined.
+
+        Args:
+            tx_hash: Transaction hash (with or without 0x)
+            timeout: Seconds to wait
+
+        Returns:
+            The chain's receipt (TRON transaction info / EVM receipt)
+
+        Raises:
+            TimeoutError: If the transaction is not mined within *timeout*
+        """
+        key = _hash_key(tx_hash)
+        if key in self._recent:
+            return self._recent[key]
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            self._unchecked[key] = time.monotonic()
+        self._waiters[key] += 1
+        self._ensure_running()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Transaction {tx_hash} not confirmed within {timeout}s") from None
+        finally:
+            self._waiters[key] -= 1
+            if self._waiters[key] <= 0:
+                del self._waiters[key]
+                if not future.done():
+                    self._pending.pop(key, None)
+                    self._unchecked.pop(key, None)
+
+    async def wait_final(self, block_number: int, timeout: float) -> None:
+        """
+        Wait until block *block_number* is final.
+
+        Args:
+            block_number: Number of the block holding the transaction
+            timeout: Seconds to wait
+
+        Raises:
+            TimeoutError: If the block is not final within *timeout*
+        """
+        if self._final_block is not None and block_number <= self._final_block:
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._final_waits, (block_number, next(self._sequence), future))
+        self._ensure_running()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Block {block_number} not final within {timeout}s") from None
+        finally:
+            if not future.done():
+                future.cancel()
+
+    async def close(self) -> None:
+        """Stop polling; waiters time out."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        interval = self._poll_interval
+        try:
+            while self._active():
+                try:
+                    new_blocks = await self._poll()
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    logger.warning(f"Receipt poll failed: {e}")
+                    new_blocks = 0
+                if not self._active():
+                    break
+                if new_blocks == 0:
+                    interval = min(interval * DEFAULT_BACKOFF, self._max_interval)
+                else:
+                    interval = self._poll_interval
+                await asyncio.sleep(interval)
+        finally:
+            # Blocks mined while idle are not scanned; backfill again on restart
+            self._last_block = None
+
+    def _active(self) -> bool:
+        # Waits that timed out leave cancelled futures behind
+        while self._final_waits and self._final_waits[0][2].done():
+            heapq.heappop(self._final_waits)
+        return bool(self._pending or self._final_waits)
+
+    async def _poll(self) -> int:
+        """Scan new blocks and look up overdue transactions; returns the new block count"""
+        self.stats["polls"] += 1
+        head = await self._source.block_number()
+        last = self._last_block
+        start = head - self._backfill + 1 if last is None else last + 1
+        lookup_all = not self._block_receipts
+        if head - start >= self._max_blocks:
+            start = head - self._max_blocks + 1
+            lookup_all = True
+
+        for number in range(start, head + 1) if self._block_receipts else ():
+            try:
+                receipts = await self._source.block_receipts(number)
+            except NotImplementedError:
+                logger.info("Node has no per-block receipts, looking transactions up")
+                self._block_receipts = False
+                lookup_all = True
+                break
+            self.stats["blocks"] += 1
+            for tx_hash, receipt in receipts:
+                self._found(_hash_key(tx_hash), receipt)
+
+        if lookup_all:
+            lookups = list(self._pending)
+        else:
+            due = time.monotonic() - self._lookup_after
+            lookups = [key for key, since in self._unchecked.items() if since <= due]
+        if lookups:
+            self.stats["lookups"] += len(lookups)
+            results = await asyncio.gather(*(self._source.receipt(key) for key in lookups))
+            for key, receipt in zip(lookups, results):
+                self._unchecked.pop(key, None)
+                if receipt is not None:
+                    self._found(key, receipt)
+
+        if self._final_waits:
+            self._finalize(await self._source.final_block_number(head))
+
+        self._last_block = head
+        return head - last if last is not None else 1
+
+    def _finalize(self, final_block: int) -> None:
+        self._final_block = max(final_block, self._final_block or final_block)
+        waits = self._final_waits
+        while waits and waits[0][0] <= self._final_block:
+            future = heapq.heappop(waits)[2]
+            if not future.done():
+                self.stats["finalized"] += 1
+                future.set_result(None)
+
+    def _found(self, key: str, receipt: Any) -> None:
+        self._recent[key] = receipt
+        while len(self._recent) > DEFAULT_RECENT_RECEIPTS:
+            self._recent.popitem(last=False)
+        future = self._pending.pop(key, None)
+        if future is not None:
+            self._unchecked.pop(key, None)
+            self.stats["resolved"] += 1
+            if not future.done():
+                future.set_result(receipt)
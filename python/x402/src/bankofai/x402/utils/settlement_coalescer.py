@@ -0,0 +1,139 @@
+"""
+SettlementCoalescer - Single-flight settlement of identical payments
+
+Clients retry on timeouts, and a settlement takes seconds, so the same signed
+payment often arrives again while its first settlement is still running. A
+second settlement would broadcast a transaction that can only fail on-chain.
+
+Settlements are keyed by (network, paymentId or authorization nonce,
+signature). A duplicate that arrives while the first is in flight awaits the
+same result; a duplicate that arrives shortly after gets the original
+SettleResponse from a TTL cache.
+
+Only successful settlements are cached. A failure may stem from a transient
+error and a retry settles again.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable
+
+from bankofai.x402.types import PaymentPayload, SettleResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESULT_TTL = 60.0
+DEFAULT_MAX_RESULTS = 4096
+
+
+def settlement_key(payload: PaymentPayload) -> Hashable:
+    """Identity of a settlement: (network, paymentId or authorization nonce, signature)"""
+    permit = payload.payload.payment_permit
+    if permit is not None:
+        payment_ref = permit.meta.payment_id
+    else:
+        auth = (payload.extensions or {}).get("transferAuthorization") or {}
+        payment_ref = str(auth.get("nonce", ""))
+    return (payload.accepted.network, payment_ref.lower(), payload.payload.signature.lower())
+
+
+class SettlementCoalescer:
+    """
+    Runs at most one settlement per payment and remembers successful results.
+
+    The settlement runs in its own task, so a client that disconnects does not
+    cancel the settlement other waiters (or its own retry) are relying on.
+
+    Args:
+        ttl: Seconds a successful SettleResponse is returned to late duplicates
+        max_entries: Maximum number of remembered results; oldest evicted first
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_RESULT_TTL,
+        max_entries: int = DEFAULT_MAX_RESULTS,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._results: OrderedDict[Hashable, tuple[SettleResponse, float]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task[SettleResponse]] = {}
+        self.coalesced = 0
+
+    def has(self, payload: PaymentPayload) -> bool:
+        """True if the payment is settling or has a remembered result."""
+        key = settlement_key(payload)
+        return key in self._inflight or self._cached(key) is not None
+
+    def clear(self) -> None:
+        """Forget remembered results. In-flight settlements still resolve for their waiters."""
+        self._results.clear()
+        self._inflight.clear()
+
+    async def settle(
+        self,
+        payload: PaymentPayload,
+        settle: Callable[[], Awaitable[SettleResponse]],
+    ) -> SettleResponse:
+        """
+        Settle a payment unless the same payment is already settling or settled.
+
+        Args:
+            payload: Payment to settle
+            settle: Performs the settlement; called at most once per in-flight key
+
+        Returns:
+            The SettleResponse of the one settlement shared by all duplicates
+        """
+        key = settlement_key(payload)
+        cached = self._cached(key)
+        if cached is not None:
+            self.coalesced += 1
+            logger.info("Returning remembered settlement for a duplicate payment")
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._run(key, settle))
+            self._inflight[key] = task
+            # Mark failures retrieved: every waiter may have been cancelled
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        else:
+            self.coalesced += 1
+            logger.info("Joining in-flight settlement for a duplicate payment")
+        # shield: one cancelled waiter must not cancel the settlement shared by others
+        return await asyncio.shield(task)
+
+    async def _run(
+        self,
+        key: Hashable,
+        settle: Callable[[], Awaitable[SettleResponse]],
+    ) -> SettleResponse:
+        try:
+            result = await settle()
+        finally:
+            # Unless clear() dropped it and a newer settlement took its place
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if result.success:
+            self._results[key] = (result, time.monotonic() + self._ttl)
+            self._results.move_to_end(key)
+            while len(self._results) > self._max_entries:
+                self._results.popitem(last=False)
+        return result
+
+    def _cached(self, key: Hashable) -> SettleResponse | None:
+        entry = self._results.get(key)
+        if entry is None:
+            return None
+        result, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._results[key]
+            return None
+        return result
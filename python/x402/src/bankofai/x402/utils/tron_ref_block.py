@@ -0,0 +1,146 @@
+"""
+RefBlockCache - Recent block references for TRON transaction construction
+
+Every TRON transaction names a recent block (``ref_block_bytes`` /
+``ref_block_hash``, TaPoS). Fetching it per transaction puts a node round trip
+in front of every settlement and approval. This cache keeps one reference per
+network and a background task refreshes it every ``refresh_interval`` seconds
+while the network is in use:
+
+- references older than ``max_age`` are not handed out; the caller waits for
+  a fresh one instead (e.g. while the node is unreachable),
+- concurrent fetches for a network share one request,
+- ``invalidate`` drops a reference the node rejected (expired TaPoS), so the
+  next caller fetches a new one.
+
+The refresher stops after ``idle_timeout`` seconds without transactions and
+restarts on the next one.
+"""
+
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# TRON produces a block every 3 seconds
+DEFAULT_REFRESH_INTERVAL = 3.0
+DEFAULT_MAX_AGE = 30.0
+DEFAULT_IDLE_TIMEOUT = 60.0
+
+
+class RefBlockCache:
+    """
+    Per-network cache of the latest solid block id.
+
+    ``stats`` counts node ``fetches``, references served from the cache
+    (``hits``), failed background refreshes (``refresh_errors``) and
+    ``invalidations``.
+
+    Args:
+        refresh_interval: Seconds between background refreshes
+        max_age: Seconds after which a cached reference is no longer used
+        idle_timeout: Seconds without use after which the refresher stops
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        max_age: float = DEFAULT_MAX_AGE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ) -> None:
+        if refresh_interval <= 0:
+            raise ValueError("refresh_interval must be positive")
+        if max_age < refresh_interval:
+            raise ValueError("max_age must be at least refresh_interval")
+        self._refresh_interval = refresh_interval
+        self._max_age = max_age
+        self._idle_timeout = idle_timeout
+        # network -> (block id, monotonic time it was fetched)
+        self._blocks: dict[str, tuple[str, float]] = {}
+        self._fetches: dict[str, asyncio.Task[str]] = {}
+        self._refreshers: dict[str, asyncio.Task[None]] = {}
+        self._last_used: dict[str, float] = {}
+        self.stats: Counter[str] = Counter()
+
+    async def get(self, client: Any, network: str) -> str:
+        """
+        Return a recent block id for *network*.
+
+        Args:
+            client: AsyncTron client used to fetch references
+            network: Network identifier
+
+        Returns:
+            64-char hex block id
+        """
+        now = time.monotonic()
+        self._last_used[network] = now
+        self._ensure_refresher(client, network)
+        entry = self._blocks.get(network)
+        if entry is not None and now - entry[1] < self._max_age:
+            self.stats["hits"] += 1
+            return entry[0]
+        return await self.refresh(client, network)
+
+    async def refresh(self, client: Any, network: str) -> str:
+        """Fetch a new reference, joining a fetch already in flight."""
+        task = self._fetches.get(network)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(client, network))
+            self._fetches[network] = task
+            task.add_done_callback(lambda t: self._fetch_done(network, t))
+        return await asyncio.shield(task)
+
+    def invalidate(self, network: str) -> None:
+        """Drop the reference of *network*, e.g. after a TaPoS rejection."""
+        self.stats["invalidations"] += 1
+        self._blocks.pop(network, None)
+
+    def age(self, network: str) -> float | None:
+        """Seconds since the reference of *network* was fetched, None if there is none."""
+        entry = self._blocks.get(network)
+        return time.monotonic() - entry[1] if entry is not None else None
+
+    async def close(self) -> None:
+        """Stop all background refreshers."""
+        tasks = list(self._refreshers.values())
+        self._refreshers.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch(self, client: Any, network: str) -> str:
+        self.stats["fetches"] += 1
+        block_id: str = await client.get_latest_solid_block_id()
+        self._blocks[network] = (block_id, time.monotonic())
+        return block_id
+
+    def _fetch_done(self, network: str, task: asyncio.Task[str]) -> None:
+        if self._fetches.get(network) is task:
+            del self._fetches[network]
+        if not task.cancelled():
+            # Retrieved here so a failure nobody awaited is not reported as lost
+            task.exception()
+
+    def _ensure_refresher(self, client: Any, network: str) -> None:
+        loop = asyncio.get_running_loop()
+        task = self._refreshers.get(network)
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._refreshers[network] = loop.create_task(self._refresh_loop(client, network))
+
+    async def _refresh_loop(self, client: Any, network: str) -> None:
+        try:
+            while time.monotonic() - self._last_used[network] < self._idle_timeout:
+                await asyncio.sleep(self._refresh_interval)
+                try:
+                    await self.refresh(client, network)
+                except Exception as e:
+                    self.stats["refresh_errors"] += 1
+                    logger.warning(f"Reference block refresh failed on {network}: {e}")
+        finally:
+            if self._refreshers.get(network) is asyncio.current_task():
+                del self._refreshers[network]
@@ -0,0 +1,285 @@
+"""
+Offline construction of TRON TriggerSmartContract transactions
+
+tronpy builds a contract call with several node round trips: ``getcontract``
+for the ABI, ``getnodeinfo`` for the reference block and ``getsignweight``
+for the transaction id. This module does all of that locally:
+
+- calldata is ABI-encoded from a compiled (cached) ABI,
+- ``Transaction.raw`` is serialized to protobuf in-tree, and its SHA-256 is
+  the transaction id,
+
+so that a settlement only needs the broadcast request, given a recent
+reference block id (see RefBlockCache).
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from bankofai.x402.abi import get_function_input_types, get_function_signature, split_abi_types
+from bankofai.x402.utils.address import CHAIN_TRON, parse_address
+
+if TYPE_CHECKING:
+    from bankofai.x402.utils.tron_ref_block import RefBlockCache
+
+logger = logging.getLogger(__name__)
+
+TRIGGER_SMART_CONTRACT = "TriggerSmartContract"
+TRIGGER_SMART_CONTRACT_TYPE_URL = "type.googleapis.com/protocol.TriggerSmartContract"
+# Transaction.Contract.ContractType.TriggerSmartContract
+_TRIGGER_SMART_CONTRACT_TYPE = 31
+
+DEFAULT_FEE_LIMIT = 1_000_000_000
+DEFAULT_EXPIRATION_MS = 60_000
+
+ABI_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class CompiledFunction:
+    """A contract function ready for local calldata encoding"""
+
+    selector: bytes
+    signature: str
+    input_types: tuple[str, ...]
+
+    def encode(self, args: list[Any]) -> bytes:
+        """ABI-encode a call (selector + arguments); TRON addresses are accepted."""
+        from eth_abi.abi import encode
+
+        values = [_abi_value(t, a) for t, a in zip(self.input_types, args)]
+        return self.selector + encode(list(self.input_types), values)
+
+
+@lru_cache(maxsize=ABI_CACHE_SIZE)
+def _compile(abi_json: str, method: str) -> CompiledFunction:
+    from eth_utils.crypto import keccak
+
+    abi_list = json.loads(abi_json)
+    signature = get_function_signature(abi_list, method)
+    return CompiledFunction(
+        selector=keccak(text=signature)[:4],
+        signature=signature,
+        input_types=tuple(get_function_input_types(abi_list, method)),
+    )
+
+
+def compile_function(abi: str | list[dict[str, Any]], method: str) -> CompiledFunction:
+    """
+    Compile a contract function for local encoding (cached per ABI and method).
+
+    Args:
+        abi: Contract ABI as a JSON string or list
+        method: Function name
+
+    Raises:
+        ValueError: If the ABI has no such function
+    """
+    abi_json = abi if isinstance(abi, str) else json.dumps(abi, sort_keys=True)
+    return _compile(abi_json, method)
+
+
+def _abi_value(abi_type: str, value: Any) -> Any:
+    """Convert TRON-format addresses, at any depth, into what eth_abi expects."""
+    if abi_type.endswith("]"):
+        item_type = abi_type[: abi_type.rindex("[")]
+        return [_abi_value(item_type, item) for item in value]
+    if abi_type.startswith("("):
+        return tuple(_abi_value(t, v) for t, v in zip(split_abi_types(abi_type[1:-1]), value))
+    if abi_type == "address" and isinstance(value, str):
+        parsed = parse_address(value)
+        return parsed.to_evm() if parsed is not None else value
+    return value
+
+
+def _tron_hex(address: str) -> str:
+    parsed = parse_address(address, CHAIN_TRON)
+    if parsed is None:
+        raise ValueError(f"Invalid TRON address: {address}")
+    return parsed.to_tron_hex()
+
+
+# ----------------------------------------------------------------------
+# Minimal protobuf writer for Transaction.raw
+# ----------------------------------------------------------------------
+
+
+def _varint(value: int) -> bytes:
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _int_field(number: int, value: int) -> bytes:
+    # proto3 omits default values
+    return _varint(number << 3) + _varint(value) if value else b""
+
+
+def _bytes_field(number: int, value: bytes) -> bytes:
+    return _varint(number << 3 | 2) + _varint(len(value)) + value if value else b""
+
+
+def serialize_raw_data(raw_data: dict[str, Any]) -> bytes:
+    """
+    Serialize a TriggerSmartContract ``raw_data`` dict (tronpy JSON form) to protobuf.
+
+    Raises:
+        ValueError: If the transaction holds another contract type
+    """
+    contracts = b""
+    for contract in raw_data["contract"]:
+        if contract["type"] != TRIGGER_SMART_CONTRACT:
+            raise ValueError(f"Unsupported contract type: {contract['type']}")
+        value = contract["parameter"]["value"]
+        trigger = (
+            _bytes_field(1, bytes.fromhex(value["owner_address"]))
+            + _bytes_field(2, bytes.fromhex(value["contract_address"]))
+            + _int_field(3, value.get("call_value", 0))
+            + _bytes_field(4, bytes.fromhex(value.get("data", "")))
+            + _int_field(5, value.get("call_token_value", 0))
+            + _int_field(6, value.get("token_id", 0))
+        )
+        parameter = _bytes_field(1, contract["parameter"]["type_url"].encode()) + _bytes_field(
+            2, trigger
+        )
+        body = (
+            _int_field(1, _TRIGGER_SMART_CONTRACT_TYPE)
+            + _bytes_field(2, parameter)
+            + _int_field(5, contract.get("Permission_id", 0))
+        )
+        contracts += _bytes_field(11, body)
+
+    return (
+        _bytes_field(1, bytes.fromhex(raw_data["ref_block_bytes"]))
+        + _bytes_field(4, bytes.fromhex(raw_data["ref_block_hash"]))
+        + _int_field(8, raw_data["expiration"])
+        + _bytes_field(10, bytes.fromhex(raw_data.get("data", "")))
+        + contracts
+        + _int_field(14, raw_data["timestamp"])
+        + _int_field(18, raw_data.get("fee_limit", 0))
+    )
+
+
+def calculate_txid(raw_data: dict[str, Any]) -> str:
+    """Transaction id (SHA-256 of the serialized raw data) in hex."""
+    return hashlib.sha256(serialize_raw_data(raw_data)).hexdigest()
+
+
+def build_trigger_raw_data(
+    owner: str,
+    contract: str,
+    data: bytes,
+    ref_block_id: str,
+    timestamp: int,
+    fee_limit: int = DEFAULT_FEE_LIMIT,
+    expiration_ms: int = DEFAULT_EXPIRATION_MS,
+) -> tuple[dict[str, Any], str]:
+    """
+    Assemble an unsigned TriggerSmartContract transaction.
+
+    Args:
+        owner: Caller address (any TRON format)
+        contract: Contract address (any TRON format)
+        data: Calldata (see CompiledFunction.encode)
+        ref_block_id: 64-char hex id of a recent block
+        timestamp: Transaction timestamp in milliseconds
+        fee_limit: Fee limit in SUN
+        expiration_ms: Lifetime of the transaction after *timestamp*
+
+    Returns:
+        (raw_data in tronpy's JSON form, transaction id)
+    """
+    raw_data = {
+        "contract": [
+            {
+                "parameter": {
+                    "value": {
+                        "data": data.hex(),
+                        "owner_address": _tron_hex(owner),
+                        "contract_address": _tron_hex(contract),
+                    },
+                    "type_url": TRIGGER_SMART_CONTRACT_TYPE_URL,
+                },
+                "type": TRIGGER_SMART_CONTRACT,
+            }
+        ],
+        "timestamp": timestamp,
+        "expiration": timestamp + expiration_ms,
+        "ref_block_bytes": ref_block_id[12:16],
+        "ref_block_hash": ref_block_id[16:32],
+        "fee_limit": fee_limit,
+    }
+    return raw_data, calculate_txid(raw_data)
+
+
+def _is_expired_reference(error: Exception) -> bool:
+    """Whether a broadcast was rejected for its reference block or expiration"""
+    from tronpy.exceptions import TaposError, TransactionError
+
+    if isinstance(error, TaposError):
+        return True
+    return isinstance(error, TransactionError) and "expir" in str(error).lower()
+
+
+async def send_trigger_transaction(
+    client: Any,
+    ref_blocks: "RefBlockCache",
+    network: str,
+    private_key: Any,
+    owner: str,
+    contract: str,
+    data: bytes,
+    fee_limit: int = DEFAULT_FEE_LIMIT,
+) -> Any:
+    """
+    Build, sign and broadcast a TriggerSmartContract transaction.
+
+    If the node rejects the reference block (TaPoS) or the expiration, the
+    reference is invalidated and the transaction rebuilt and sent once more.
+
+    Args:
+        client: AsyncTron client
+        ref_blocks: Reference block cache
+        network: Network identifier
+        private_key: tronpy PrivateKey of *owner*
+        owner: Caller address
+        contract: Contract address
+        data: Calldata
+        fee_limit: Fee limit in SUN
+
+    Returns:
+        tronpy AsyncTransactionRet of the broadcast
+    """
+    from tronpy.async_tron import AsyncTransaction
+
+    from bankofai.x402.utils.crypto_executor import get_crypto_executor
+
+    for attempt in range(2):
+        raw_data, txid = build_trigger_raw_data(
+            owner,
+            contract,
+            data,
+            await ref_blocks.get(client, network),
+            int(time.time() * 1000),
+            fee_limit=fee_limit,
+        )
+        txn = AsyncTransaction(raw_data, client=client, txid=txid, permission=None)
+        txn = await get_crypto_executor().run_in_thread(txn.sign, private_key)
+        logger.info(f"Transaction built offline: txID={txid}, fee_limit={fee_limit}")
+        try:
+            return await txn.broadcast()
+        except Exception as e:
+            if attempt or not _is_expired_reference(e):
+                raise
+            logger.warning(f"Broadcast rejected on {network} ({e}), refreshing reference block")
+            ref_blocks.invalidate(network)
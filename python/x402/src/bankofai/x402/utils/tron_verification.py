@@ -6,40 +6,37 @@ Provides TRON-specific transaction verification functionality.
 
 from typing import Any
 
+from bankofai.x402.types import TransactionReceipt
+from bankofai.x402.utils.address import normalize_tron_address
 from bankofai.x402.utils.tx_verification import BaseTransactionVerifier, TransferEvent
 
 
 class TronTransactionVerifier(BaseTransactionVerifier):
     """TRON-specific transaction verification implementation"""
 
-    def __init__(self, network: str = "nile") -> None:
+    def __init__(self, network: str = "nile", rpc_url: str | None = None) -> None:
         super().__init__()
         self._network = network
+        self._rpc_url = rpc_url
         self._async_client: Any = None
 
     def _ensure_async_client(self) -> Any:
-        """Lazy initialize async tronpy client"""
+        """Lazy initialize async tronpy client (on *rpc_url* if given)"""
         if self._async_client is None:
-            from bankofai.x402.utils.tron_client import create_async_tron_client
+            if self._rpc_url:
+                from tronpy import AsyncTron
+                from tronpy.providers import AsyncHTTPProvider
 
-            self._async_client = create_async_tron_client(self._network)
+                self._async_client = AsyncTron(provider=AsyncHTTPProvider(self._rpc_url))
+            else:
+                from bankofai.x402.utils.tron_client import create_async_tron_client
+
+                self._async_client = create_async_tron_client(self._network)
         return self._async_client
 
     def normalize_address(self, address: str) -> str:
         """Normalize address to TRON Base58 format"""
-        try:
-            from tronpy.keys import to_base58check_address
-
-            if address.startswith("0x") and len(address) == 42:
-                hex_addr = "41" + address[2:].lower()
-                return to_base58check_address(hex_addr)
-
-            if address.startswith("T"):
-                return address
-
-            return address
-        except Exception:
-            return address
+        return normalize_tron_address(address)
 
     async def get_transaction_info(self, tx_hash: str) -> dict[str, Any]:
         """Get TRON transaction information"""
@@ -62,6 +59,26 @@ class TronTransactionVerifier(BaseTransactionVerifier):
             self._logger.error(f"Failed to get transaction info: {e}")
             raise
 
+    async def get_transaction_receipt(self, tx_hash: str) -> TransactionReceipt | None:
+        """Get TRON transaction info as a receipt (None while not yet in a block)"""
+        from tronpy.exceptions import TransactionNotFound
+
+        client = self._ensure_async_client()
+        try:
+            info = await client.get_transaction_info(tx_hash)
+        except TransactionNotFound:
+            return None
+        if not info or not info.get("blockNumber"):
+            return None
+        result = info.get("receipt", {}).get("result")
+        return TransactionReceipt.from_signer_result(
+            {
+                "blockNumber": info.get("blockNumber"),
+                "status": "confirmed" if result == "SUCCESS" else "failed",
+                "receipt": info,
+            }
+        )
+
     async def get_transaction_transfers(
         self,
         tx_hash: str,
@@ -72,91 +89,11 @@ class TronTransactionVerifier(BaseTransactionVerifier):
 
         Parses the transaction logs for Transfer(address,address,uint256) events.
         """
-        client = self._ensure_async_client()
-        transfers: list[TransferEvent] = []
-
         try:
-            info = await client.get_transaction_info(tx_hash)
-            if not info:
-                return transfers
-
-            logs = info.get("log", [])
-
-            # TRC20 Transfer event topic
-            # keccak256("Transfer(address,address,uint256)")
-            transfer_topic = "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
-
-            normalized_token = self._normalize_to_hex(token_address)
-
-            for log in logs:
-                log_address = log.get("address", "")
-                topics = log.get("topics", [])
-                data = log.get("data", "")
-
-                # Check if this is a Transfer event from the expected token
-                if not topics or topics[0] != transfer_topic:
-                    continue
-
-                # Normalize log address for comparison
-                normalized_log_address = self._normalize_to_hex(log_address)
-                if normalized_log_address.lower() != normalized_token.lower():
-                    continue
-
-                if len(topics) < 3:
-                    continue
-
-                # Parse Transfer event
-                # topics[1] = from address (padded to 32 bytes)
-                # topics[2] = to address (padded to 32 bytes)
-                # data = amount (uint256)
-                from_addr = self._parse_address_from_topic(topics[1])
-                to_addr = self._parse_address_from_topic(topics[2])
-                amount = int(data, 16) if data else 0
-
-                transfers.append(
-                    TransferEvent(
-                        token=self.normalize_address(log_address),
-                        from_addr=from_addr,
-                        to_addr=to_addr,
-                        amount=amount,
-                    )
-                )
-
-                self._logger.debug(f"Found transfer: {amount} from {from_addr} to {to_addr}")
-
-            return transfers
-
+            receipt = await self.get_transaction_receipt(tx_hash)
+            if receipt is None:
+                return []
+            return self.transfers_from_receipt(receipt, token_address)
         except Exception as e:
             self._logger.error(f"Failed to parse transfer events: {e}", exc_info=True)
-            return transfers
-
-    def _normalize_to_hex(self, address: str) -> str:
-        """Normalize address to hex format (without 0x prefix)"""
-        try:
-            from tronpy.keys import to_hex_address
-
-            if address.startswith("T"):
-                # Convert TRON base58 to hex
-                hex_addr = to_hex_address(address)
-                return hex_addr[2:] if hex_addr.startswith("41") else hex_addr
-
-            if address.startswith("0x"):
-                return address[2:].lower()
-
-            return address.lower()
-        except Exception:
-            return address
-
-    def _parse_address_from_topic(self, topic: str) -> str:
-        """Parse address from 32-byte padded topic"""
-        try:
-            from tronpy.keys import to_base58check_address
-
-            # Topic is 32 bytes hex, address is last 20 bytes
-            # For TRON, we need to add 41 prefix
-            if len(topic) >= 40:
-                addr_hex = "41" + topic[-40:]
-                return to_base58check_address(addr_hex)
-            return topic
-        except Exception:
-            return topic
+            return []
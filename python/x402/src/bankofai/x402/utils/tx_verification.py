@@ -5,12 +5,15 @@ Provides generic functionality to verify blockchain transaction results,
 ensuring contract transfers and deliveries match expected parameters.
 """
 
+import asyncio
 import logging
+import weakref
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, Protocol
 
-from bankofai.x402.types import PaymentPayload, PaymentRequirements
+from bankofai.x402.abi import ERC20_TRANSFER_TOPIC
+from bankofai.x402.types import PaymentPayload, PaymentRequirements, TransactionReceipt
 
 
 @dataclass
@@ -59,6 +62,7 @@ class TransactionVerifier(Protocol):
         tx_hash: str,
         payload: PaymentPayload,
         requirements: PaymentRequirements,
+        receipt: TransactionReceipt | None = None,
     ) -> TransactionVerificationResult:
         """Verify a transaction matches expected payment parameters"""
         ...
@@ -97,35 +101,84 @@ class BaseTransactionVerifier(ABC):
         """Normalize address to standard format for comparison"""
         pass
 
+    async def get_transaction_receipt(self, tx_hash: str) -> TransactionReceipt | None:
+        """
+        Fetch the receipt of a transaction.
+
+        The default implementation converts the result of ``get_transaction_info``;
+        returns None while the transaction is not yet included in a block.
+        """
+        info = await self.get_transaction_info(tx_hash)
+        if str(info.get("status", "")).lower() == "pending":
+            return None
+        return TransactionReceipt.from_signer_result(info)
+
+    def transfers_from_receipt(
+        self,
+        receipt: TransactionReceipt,
+        token_address: str,
+    ) -> list[TransferEvent]:
+        """
+        Parse Transfer(address,address,uint256) events of a token from a receipt.
+
+        Args:
+            receipt: Transaction receipt
+            token_address: Token contract whose transfers are returned
+
+        Returns:
+            Transfers with addresses in this verifier's normalized format
+        """
+        token = self.normalize_address(token_address)
+        transfers: list[TransferEvent] = []
+        for log in receipt.logs:
+            topics = log.topics
+            if len(topics) < 3 or topics[0][2:] != ERC20_TRANSFER_TOPIC:
+                continue
+            if self.normalize_address(log.address) != token:
+                continue
+
+            # topics[1] / topics[2] are the 32-byte padded from / to addresses
+            data = log.data[2:]
+            transfers.append(
+                TransferEvent(
+                    token=token,
+                    from_addr=self.normalize_address("0x" + topics[1][-40:]),
+                    to_addr=self.normalize_address("0x" + topics[2][-40:]),
+                    amount=int(data, 16) if data else 0,
+                )
+            )
+        return transfers
+
     async def verify_transaction(
         self,
         tx_hash: str,
         payload: PaymentPayload,
         requirements: PaymentRequirements,
+        receipt: TransactionReceipt | None = None,
     ) -> TransactionVerificationResult:
         """
         Verify a transaction matches expected payment parameters.
 
         This method checks:
         1. Transaction status (success/failed)
-        2. Payment transfer (correct amount to payTo address)
-        3. Fee transfer (correct fee amount to feeTo address)
+        2. Payment transfer (at least the required amount to payTo address)
+        3. Fee transfer (at least the fee amount to feeTo address)
 
         Args:
             tx_hash: Transaction hash to verify
             payload: Original payment payload
             requirements: Payment requirements
+            receipt: Receipt returned with the settlement; fetched from the chain
+                when not given
 
         Returns:
             TransactionVerificationResult with detailed verification status
         """
-        permit = payload.payload.payment_permit
-
         self._logger.info("=" * 60)
         self._logger.info(f"Verifying transaction: {tx_hash}")
 
         # Log expected transfers from payload and requirements
-        expected_from = self.normalize_address(permit.buyer)
+        expected_from = self.normalize_address(_payment_sender(payload))
         expected_pay_to = self.normalize_address(requirements.pay_to)
         expected_amount = int(requirements.amount)
         token_address = requirements.asset
@@ -155,29 +208,70 @@ class BaseTransactionVerifier(ABC):
             self._logger.info("[EXPECTED] Fee: None")
 
         try:
-            # Only verify transaction status
-            tx_info = await self.get_transaction_info(tx_hash)
+            if receipt is None:
+                receipt = await self.get_transaction_receipt(tx_hash)
+            else:
+                self._logger.info("Using receipt returned with the settlement")
+
+            if receipt is None:
+                # Not yet visible to this node; the facilitator already confirmed it
+                self._logger.warning(f"[PENDING] Transaction not found yet: {tx_hash}")
+                self._logger.info("=" * 60)
+                return TransactionVerificationResult(
+                    success=True,
+                    tx_hash=tx_hash,
+                    status_verified=True,
+                )
 
-            status = tx_info.get("status", "").lower()
-            if status == "failed" or status == "0" or status == 0:
+            if not receipt.succeeded:
                 self._logger.error(f"[FAILED] Transaction failed on-chain: {tx_hash}")
                 self._logger.info("=" * 60)
                 return TransactionVerificationResult(
                     success=False,
                     tx_hash=tx_hash,
-                    block_number=tx_info.get("blockNumber"),
+                    block_number=receipt.block_number,
                     error_reason="transaction_failed_on_chain",
                     status_verified=False,
                 )
+            self._logger.info(f"[OK] Transaction status: {receipt.result}")
+
+            transfers = self.transfers_from_receipt(receipt, token_address)
+            payment_verified = any(
+                t.from_addr == expected_from
+                and t.to_addr == expected_pay_to
+                and t.amount >= expected_amount
+                for t in transfers
+            )
+            fee_verified = (
+                fee_amount <= 0
+                or expected_fee_to is None
+                or any(
+                    t.from_addr == expected_from
+                    and t.to_addr == expected_fee_to
+                    and t.amount >= fee_amount
+                    for t in transfers
+                )
+            )
 
-            self._logger.info(f"[OK] Transaction status: {status}")
-            self._logger.info(f"[SUCCESS] Transaction verification passed: {tx_hash}")
+            error_reason = None
+            if not payment_verified:
+                error_reason = "payment_transfer_not_found"
+            elif not fee_verified:
+                error_reason = "fee_transfer_not_found"
+            if error_reason:
+                self._logger.error(f"[FAILED] {error_reason}: {tx_hash}, transfers={transfers}")
+            else:
+                self._logger.info(f"[SUCCESS] Transaction verification passed: {tx_hash}")
             self._logger.info("=" * 60)
             return TransactionVerificationResult(
-                success=True,
+                success=error_reason is None,
                 tx_hash=tx_hash,
-                block_number=tx_info.get("blockNumber"),
+                block_number=receipt.block_number,
+                error_reason=error_reason,
+                transfers=transfers,
                 status_verified=True,
+                payment_verified=payment_verified,
+                fee_verified=fee_verified,
             )
 
         except Exception as e:
@@ -189,15 +283,33 @@ class BaseTransactionVerifier(ABC):
             )
 
 
+def _payment_sender(payload: PaymentPayload) -> str:
+    """Address the payment is transferred from (permit buyer or authorization sender)"""
+    permit = payload.payload.payment_permit
+    if permit is not None:
+        return permit.buyer
+    auth = (payload.extensions or {}).get("transferAuthorization") or {}
+    return str(auth.get("from", ""))
+
+
+# Per event loop, since a verifier's RPC client is bound to the loop it first ran on
+_LoopVerifiers = dict[tuple[str, str | None], BaseTransactionVerifier]
+_verifiers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopVerifiers]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def get_verifier_for_network(network: str, rpc_url: str | None = None) -> BaseTransactionVerifier:
     """
     Factory function to get appropriate transaction verifier for a network.
 
-    Currently supports TRON networks only.
+    Currently supports TRON networks only. Within a running event loop,
+    verifiers are created once per (network, rpc_url) and shared, so their RPC
+    client and connection pool are reused.
 
     Args:
         network: Network identifier (e.g., "tron:nile")
-        rpc_url: Reserved for future use
+        rpc_url: Node to query instead of the network's default endpoint
 
     Returns:
         Transaction verifier instance
@@ -206,10 +318,20 @@ def get_verifier_for_network(network: str, rpc_url: str | None = None) -> BaseTr
         >>> verifier = get_verifier_for_network("tron:nile")
         >>> verifier = get_verifier_for_network("tron:mainnet")
     """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    cache = _verifiers.setdefault(loop, {}) if loop is not None else {}
+    verifier = cache.get((network, rpc_url))
+    if verifier is not None:
+        return verifier
+
     if network.startswith("tron:"):
         from bankofai.x402.utils.tron_verification import TronTransactionVerifier
 
         tron_network = network.split(":")[1] if ":" in network else "nile"
-        return TronTransactionVerifier(network=tron_network)
+        verifier = TronTransactionVerifier(network=tron_network, rpc_url=rpc_url)
+        return cache.setdefault((network, rpc_url), verifier)
 
     raise ValueError(f"No transaction verifier available for network: {network}")
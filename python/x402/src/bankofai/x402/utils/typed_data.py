@@ -0,0 +1,283 @@
+"""
+EIP-712 typed data hashing with precompiled struct encoders.
+
+``eth_account.messages.encode_typed_data`` parses the type definitions, rebuilds
+the type hashes and the domain separator on every call. Payment signing and
+verification always hash the same few structs (PaymentPermitDetails,
+TransferWithAuthorization) under the same few domains, so here the encoders are
+compiled once per type set and domain separators are cached.
+
+Values the compiled encoders do not handle in canonical form (e.g. Base58
+addresses or numeric strings) are hashed with ``encode_typed_data`` instead,
+so results are always byte-identical to it.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable
+
+from bankofai.x402.abi import PAYMENT_PERMIT_PRIMARY_TYPE
+from bankofai.x402.utils.crypto_backend import SigningKey, load_signing_key, recover_address
+
+# Canonical EIP-712 domain field order and types
+_EIP712_DOMAIN_FIELDS: dict[str, str] = {
+    "name": "string",
+    "version": "string",
+    "chainId": "uint256",
+    "verifyingContract": "address",
+    "salt": "bytes32",
+}
+
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+_StructEncoder = Callable[[dict[str, Any]], bytes]
+
+
+class _NotCanonical(Exception):
+    """Value is not in the form handled by the compiled encoders"""
+
+
+def _keccak(data: bytes) -> bytes:
+    from eth_utils.crypto import keccak
+
+    return keccak(data)
+
+
+def _hex_to_bytes(value: str, size: int) -> bytes:
+    if len(value) != 2 + 2 * size or value[:2] != "0x" or not _HEX_DIGITS.issuperset(value[2:]):
+        raise _NotCanonical(value)
+    return bytes.fromhex(value[2:])
+
+
+def _encode_uint(bits: int) -> Callable[[Any], bytes]:
+    limit = 1 << bits
+
+    def encode(value: Any) -> bytes:
+        if type(value) is not int or not 0 <= value < limit:
+            raise _NotCanonical(value)
+        return value.to_bytes(32, "big")
+
+    return encode
+
+
+def _encode_fixed_bytes(size: int) -> Callable[[Any], bytes]:
+    def encode(value: Any) -> bytes:
+        if isinstance(value, bytes):
+            if len(value) != size:
+                raise _NotCanonical(value)
+            return value.ljust(32, b"\x00")
+        if isinstance(value, str):
+            return _hex_to_bytes(value, size).ljust(32, b"\x00")
+        raise _NotCanonical(value)
+
+    return encode
+
+
+def _encode_address(value: Any) -> bytes:
+    if not isinstance(value, str):
+        raise _NotCanonical(value)
+    return _hex_to_bytes(value, 20).rjust(32, b"\x00")
+
+
+def _encode_string(value: Any) -> bytes:
+    if not isinstance(value, str):
+        raise _NotCanonical(value)
+    return _keccak(value.encode("utf-8"))
+
+
+def _atomic_encoder(type_name: str) -> Callable[[Any], bytes] | None:
+    if type_name == "address":
+        return _encode_address
+    if type_name == "string":
+        return _encode_string
+    if type_name.startswith("uint"):
+        bits = int(type_name[4:] or 256)
+        return _encode_uint(bits) if bits % 8 == 0 and 8 <= bits <= 256 else None
+    if type_name.startswith("bytes") and type_name[5:].isdigit():
+        size = int(type_name[5:])
+        return _encode_fixed_bytes(size) if 1 <= size <= 32 else None
+    return None
+
+
+def _encode_type(primary: str, types: dict[str, tuple[tuple[str, str], ...]]) -> str:
+    deps: set[str] = set()
+    pending = [primary]
+    while pending:
+        for _, field_type in types[pending.pop()]:
+            if field_type in types and field_type not in deps and field_type != primary:
+                deps.add(field_type)
+                pending.append(field_type)
+
+    def signature(name: str) -> str:
+        return f"{name}({','.join(f'{t} {n}' for n, t in types[name])})"
+
+    return "".join(signature(name) for name in [primary, *sorted(deps)])
+
+
+@lru_cache(maxsize=64)
+def _compile(
+    types_key: tuple[tuple[str, tuple[tuple[str, str], ...]], ...],
+    primary: str,
+) -> _StructEncoder | None:
+    """Compile a struct-hash function for *primary*, or None for unsupported types."""
+    types = dict(types_key)
+    encoders: dict[str, _StructEncoder] = {}
+
+    def build(name: str) -> _StructEncoder | None:
+        if name in encoders:
+            return encoders[name]
+        type_hash = _keccak(_encode_type(name, types).encode())
+        fields: list[tuple[str, Callable[[Any], bytes]]] = []
+        for field_name, field_type in types[name]:
+            encoder = build(field_type) if field_type in types else _atomic_encoder(field_type)
+            if encoder is None:
+                return None
+            fields.append((field_name, encoder))
+
+        def struct_hash(value: dict[str, Any]) -> bytes:
+            if not isinstance(value, dict):
+                raise _NotCanonical(value)
+            try:
+                return _keccak(type_hash + b"".join(enc(value[f]) for f, enc in fields))
+            except KeyError as e:
+                raise _NotCanonical(e)
+
+        encoders[name] = struct_hash
+        return struct_hash
+
+    if primary not in types:
+        return None
+    return build(primary)
+
+
+def _types_key(types: dict[str, Any]) -> tuple[tuple[str, tuple[tuple[str, str], ...]], ...]:
+    return tuple(
+        (name, tuple((field["name"], field["type"]) for field in fields))
+        for name, fields in types.items()
+        if name != "EIP712Domain"
+    )
+
+
+@lru_cache(maxsize=256)
+def _domain_separator(fields: tuple[str, ...], values: tuple[Any, ...]) -> bytes | None:
+    encoder = _compile(
+        (("EIP712Domain", tuple((f, _EIP712_DOMAIN_FIELDS[f]) for f in fields)),), "EIP712Domain"
+    )
+    if encoder is None:
+        return None
+    try:
+        return encoder(dict(zip(fields, values)))
+    except _NotCanonical:
+        return None
+
+
+def domain_separator(
+    domain: dict[str, Any],
+    domain_type: list[dict[str, str]] | None = None,
+) -> bytes | None:
+    """
+    Cached EIP-712 domain separator.
+
+    Args:
+        domain: Domain values (name, version, chainId, verifyingContract)
+        domain_type: EIP712Domain fields (default: the fields present in *domain*)
+
+    Returns:
+        32-byte separator, or None if the domain is not in canonical form
+    """
+    if domain_type is None:
+        fields = tuple(f for f in _EIP712_DOMAIN_FIELDS if f in domain)
+    else:
+        fields = tuple(field["name"] for field in domain_type)
+        if any(_EIP712_DOMAIN_FIELDS.get(f["name"]) != f["type"] for f in domain_type):
+            return None
+    try:
+        return _domain_separator(fields, tuple(domain[f] for f in fields))
+    except (KeyError, TypeError):
+        # Missing field or unhashable value
+        return None
+
+
+def hash_typed_data(
+    domain: dict[str, Any],
+    types: dict[str, Any],
+    message: dict[str, Any],
+    primary_type: str | None = None,
+    domain_type: list[dict[str, str]] | None = None,
+) -> bytes:
+    """
+    Compute the 32-byte EIP-712 digest of *message*.
+
+    Byte-identical to hashing ``encode_typed_data`` output, and accepts the
+    same arguments as the signers' ``sign_typed_data``/``verify_typed_data``.
+
+    Args:
+        domain: Domain values
+        types: Struct type definitions (without EIP712Domain)
+        message: Message values
+        primary_type: Primary type (default: PaymentPermitDetails if present,
+            else the last type in *types*)
+        domain_type: EIP712Domain fields (default: the fields present in *domain*)
+
+    Returns:
+        keccak256("\\x19\\x01" || domainSeparator || hashStruct(message))
+    """
+    if primary_type is None:
+        primary_type = (
+            PAYMENT_PERMIT_PRIMARY_TYPE
+            if PAYMENT_PERMIT_PRIMARY_TYPE in types
+            else list(types.keys())[-1]
+        )
+
+    separator = domain_separator(domain, domain_type)
+    encoder = _compile(_types_key(types), primary_type)
+    if separator is not None and encoder is not None:
+        try:
+            return _keccak(b"\x19\x01" + separator + encoder(message))
+        except _NotCanonical:
+            pass
+    return _hash_typed_data_generic(domain, types, message, primary_type, domain_type)
+
+
+def _hash_typed_data_generic(
+    domain: dict[str, Any],
+    types: dict[str, Any],
+    message: dict[str, Any],
+    primary_type: str,
+    domain_type: list[dict[str, str]] | None,
+) -> bytes:
+    from eth_account.messages import encode_typed_data
+
+    if domain_type is None:
+        domain_type = [
+            {"name": name, "type": typ}
+            for name, typ in _EIP712_DOMAIN_FIELDS.items()
+            if name in domain
+        ]
+    signable = encode_typed_data(
+        full_message={
+            "types": {"EIP712Domain": domain_type, **types},
+            "primaryType": primary_type,
+            "domain": domain,
+            "message": message,
+        }
+    )
+    return _keccak(b"\x19" + signable.version + signable.header + signable.body)
+
+
+def sign_typed_data_hash(digest: bytes, private_key: bytes | SigningKey) -> bytes:
+    """Sign an EIP-712 digest; returns the 65-byte r || s || v signature (v = 27/28)."""
+    if not isinstance(private_key, SigningKey):
+        private_key = load_signing_key(private_key)
+    return private_key.sign_hash(digest)
+
+
+def recover_typed_data_signer(digest: bytes, signature: str | bytes) -> str:
+    """
+    Recover the checksummed address that signed an EIP-712 digest.
+
+    Raises:
+        ValueError: If the signature is malformed
+    """
+    if isinstance(signature, str):
+        signature = bytes.fromhex(signature[2:] if signature.startswith("0x") else signature)
+    return recover_address(digest, signature)
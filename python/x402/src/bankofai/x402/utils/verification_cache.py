@@ -0,0 +1,163 @@
+"""
+VerificationCache - Bounded LRU/TTL cache of verified EIP-712 signatures
+
+A paid request can check the same signature several times: the resource
+server checks it before forwarding, the facilitator checks it on /verify and
+again on /settle. Recovery results are cached by (EIP-712 digest, signature)
+so that public-key recovery runs once per payment. The digest commits to the
+signer address, amounts, nonce and validity window, so a cache hit proves the
+signature is valid for exactly that message; callers still run their cheap
+validity checks (expiry, amounts, recipients) on every call.
+
+Only successful verifications are cached. A failed check may stem from a
+transient error and is never remembered.
+
+There is no process-wide cache: every mechanism owns one unless a cache is
+passed in explicitly, so a resource server's checks never vouch for a
+facilitator (or the other way round) by accident.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any
+
+from bankofai.x402.utils.crypto_executor import get_crypto_executor
+from bankofai.x402.utils.typed_data import hash_typed_data
+
+if TYPE_CHECKING:
+    from bankofai.x402.signers.facilitator import FacilitatorSigner
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL_SECONDS = 300.0
+
+
+def _signature_key(signature: str) -> str:
+    signature = signature.lower()
+    return signature[2:] if signature.startswith("0x") else signature
+
+
+class VerificationCache:
+    """
+    Thread-safe LRU cache of verified (digest, signature) pairs with a TTL.
+
+    Mechanisms may also keep the context of a successful verification under
+    their own keys (``get``/``put``), so that a later settle does not rebuild it.
+
+    Args:
+        max_entries: Maximum number of entries; the least recently used entry
+            is evicted first
+        ttl: Seconds an entry stays valid
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        """Return the value stored under *key*, or None if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store *value* under *key* for the cache's TTL."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def is_verified(self, digest: bytes, signature: str) -> bool:
+        """Return True if *signature* over *digest* was verified and has not expired."""
+        return self.get((digest, _signature_key(signature))) is not None
+
+    def mark_verified(self, digest: bytes, signature: str) -> None:
+        """Record that *signature* over *digest* is valid."""
+        self.put((digest, _signature_key(signature)), True)
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+async def typed_data_digest(
+    domain: dict[str, Any],
+    types: dict[str, Any],
+    message: dict[str, Any],
+) -> bytes:
+    """
+    EIP-712 digest that verified signatures are cached under.
+
+    Server and facilitator mechanisms both compute it here, so a cache passed
+    to both sees the same digest for the same message.
+    """
+    return await get_crypto_executor().run(hash_typed_data, domain, types, message)
+
+
+async def verify_typed_data_cached(
+    signer: "FacilitatorSigner",
+    cache: VerificationCache | None,
+    address: str,
+    domain: dict[str, Any],
+    types: dict[str, Any],
+    message: dict[str, Any],
+    signature: str,
+) -> bool:
+    """
+    ``signer.verify_typed_data`` with a *cache* lookup in front of it.
+
+    The digest is computed from *message*, which names *address* as signer,
+    so a cached result is only reused for the same signer. With ``cache=None``
+    or if the digest cannot be computed, the signer is called directly.
+    """
+    digest = None
+    if cache is not None:
+        try:
+            digest = await typed_data_digest(domain, types, message)
+        except Exception as e:
+            logger.debug(f"Cannot compute EIP-712 digest, skipping cache: {e}")
+        else:
+            if cache.is_verified(digest, signature):
+                return True
+
+    is_valid = await signer.verify_typed_data(
+        address=address,
+        domain=domain,
+        types=types,
+        message=message,
+        signature=signature,
+    )
+    if is_valid and cache is not None and digest is not None:
+        cache.mark_verified(digest, signature)
+    return is_valid
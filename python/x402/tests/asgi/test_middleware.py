@@ -0,0 +1,225 @@
+"""
+Tests for the pure ASGI X402 middleware
+"""
+
+import base64
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from bankofai.x402.asgi import PaymentRoute, X402ASGIMiddleware
+from bankofai.x402.clients import X402HttpClient
+from bankofai.x402.compact import CBOR_DEFLATE, decode_compact_header, is_compact_header
+from bankofai.x402.encoding import decode_payment_payload, encode_payment_payload
+from bankofai.x402.server import X402Server
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+CHUNKS = [b"chunk-1;", b"chunk-2;", b"chunk-3"]
+
+
+async def streaming_app(scope, receive, send):
+    """Raw ASGI app streaming its body in several messages"""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/octet-stream")],
+        }
+    )
+    for i, chunk in enumerate(CHUNKS):
+        await send({"type": "http.response.body", "body": chunk, "more_body": i < len(CHUNKS) - 1})
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(amount=10**18, maxTimeoutSeconds=3600)
+
+
+@pytest.fixture
+def payment_payload(make_permit_payload, make_payment_requirements):
+    def make(asset: str | None = None) -> PaymentPayload:
+        return make_permit_payload(
+            make_payment_requirements(amount=10**18, asset=asset, maxTimeoutSeconds=3600)
+        )
+
+    return make
+
+
+def _payment_header(payload: PaymentPayload) -> str:
+    return encode_payment_payload(payload.model_dump(by_alias=True))
+
+
+@pytest.fixture
+def server(requirements):
+    server = X402Server(auto_register_tron=False)
+    server.build_payment_requirements = AsyncMock(return_value=[requirements])
+    server.settle_payment = AsyncMock(
+        return_value=SettleResponse(success=True, transaction="", network=NETWORK)
+    )
+    return server
+
+
+def _client(server: X402Server, compact: bool = False, **route_kwargs) -> httpx.AsyncClient:
+    route = PaymentRoute.create(
+        route_kwargs.pop("path", "/downloads/{name}"),
+        prices=["1 USDT"],
+        schemes=["exact_permit"],
+        network=NETWORK,
+        pay_to=PAY_TO,
+        **route_kwargs,
+    )
+    app = X402ASGIMiddleware(streaming_app, server=server, routes=[route], compact=compact)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_unprotected_path_passes_through(server):
+    async with _client(server) as client:
+        response = await client.get("/public")
+
+    assert response.status_code == 200
+    assert "payment-response" not in response.headers
+    server.build_payment_requirements.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_missing_payment_returns_402(server):
+    async with _client(server) as client:
+        response = await client.get("/downloads/file.bin?x=1")
+
+    assert response.status_code == 402
+    assert base64.b64decode(response.headers["payment-required"]) == response.content
+    body = response.json()
+    assert body["resource"]["url"] == "http://test/downloads/file.bin?x=1"
+    assert body["accepts"][0]["network"] == NETWORK
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+@pytest.mark.asyncio
+async def test_paid_request_streams_body_with_payment_response(payment_payload, server):
+    async with _client(server) as client:
+        response = await client.get(
+            "/downloads/file.bin", headers={"PAYMENT-SIGNATURE": _payment_header(payment_payload())}
+        )
+
+    assert response.status_code == 200
+    assert response.content == b"".join(CHUNKS)
+    assert response.headers["content-type"] == "application/octet-stream"
+    settle = json.loads(base64.b64decode(response.headers["payment-response"]))
+    assert settle["success"] is True
+    server.settle_payment.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_asset_rejected(payment_payload, server):
+    async with _client(server) as client:
+        response = await client.get(
+            "/downloads/file.bin",
+            headers={"PAYMENT-SIGNATURE": _payment_header(payment_payload(asset="0x" + "00" * 20))},
+        )
+
+    assert response.status_code == 400
+    assert response.json() == {"error": "Unsupported payment token or network"}
+    server.settle_payment.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_failed_settlement_not_served(payment_payload, server):
+    server.settle_payment.return_value = SettleResponse(
+        success=False, errorReason="insufficient_balance", network=NETWORK
+    )
+    async with _client(server) as client:
+        response = await client.get(
+            "/downloads/file.bin", headers={"PAYMENT-SIGNATURE": _payment_header(payment_payload())}
+        )
+
+    assert response.status_code == 500
+    assert response.json()["error"] == "Settlement failed: insufficient_balance"
+
+
+@pytest.mark.asyncio
+async def test_method_table(server):
+    async with _client(server, methods=["GET"]) as client:
+        assert (await client.post("/downloads/a")).status_code == 200
+        assert (await client.head("/downloads/a")).status_code == 402
+        assert (await client.get("/downloads/a")).status_code == 402
+
+
+@pytest.mark.asyncio
+async def test_wildcard_and_path_patterns(server):
+    async with _client(server, path="/static/*") as client:
+        assert (await client.get("/static/a/b/c.js")).status_code == 402
+        assert (await client.get("/staticfile")).status_code == 200
+
+    async with _client(server, path="/files/{rest:path}") as client:
+        assert (await client.get("/files/a/b")).status_code == 402
+
+    async with _client(server, path="/items/{id}") as client:
+        assert (await client.get("/items/1")).status_code == 402
+        assert (await client.get("/items/1/more")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_compact_format_negotiated_per_request(payment_payload, server):
+    async with _client(server, compact=True) as client:
+        json_402 = await client.get("/downloads/a")
+        compact_402 = await client.get("/downloads/a", headers={"PAYMENT-ENCODING": "cbor+deflate"})
+        paid = await client.get(
+            "/downloads/a",
+            headers={
+                "PAYMENT-ENCODING": "cbor+deflate",
+                "PAYMENT-SIGNATURE": encode_payment_payload(
+                    payment_payload(), encoding=CBOR_DEFLATE
+                ),
+            },
+        )
+
+    assert json_402.headers["payment-encoding"] == "cbor+deflate, cbor"
+    assert not is_compact_header(json_402.headers["payment-required"])
+    header = compact_402.headers["payment-required"]
+    assert is_compact_header(header)
+    assert decode_compact_header(header) == compact_402.json()
+    assert len(header) < len(json_402.headers["payment-required"])
+
+    assert paid.status_code == 200
+    assert decode_payment_payload(paid.headers["payment-response"])["success"] is True
+    assert server.settle_payment.await_args.args[0] == payment_payload()
+
+
+@pytest.mark.asyncio
+async def test_compact_not_offered_unless_enabled(server):
+    async with _client(server) as client:
+        response = await client.get("/downloads/a", headers={"PAYMENT-ENCODING": "cbor"})
+
+    assert "payment-encoding" not in response.headers
+    assert not is_compact_header(response.headers["payment-required"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("server_compact", [True, False])
+async def test_http_client_uses_compact_only_when_offered(payment_payload, server, server_compact):
+    x402_client = MagicMock()
+    x402_client.handle_payment = AsyncMock(return_value=payment_payload())
+    sent: list[str] = []
+
+    async with _client(server, compact=server_compact) as http:
+
+        async def request(method, url, **kwargs):
+            sent.append(kwargs.get("headers", {}).get("PAYMENT-SIGNATURE", ""))
+            return await httpx.AsyncClient.request(http, method, url, **kwargs)
+
+        http.request = request
+        client = X402HttpClient(http, x402_client, compact=True)
+        response = await client.get("/downloads/a")
+
+    assert response.status_code == 200
+    assert is_compact_header(sent[-1]) == server_compact
+    assert x402_client.handle_payment.await_args.args[0][0].network == NETWORK
@@ -111,3 +111,27 @@ async def test_evm_signer_check_balance():
 
     balance = await signer.check_balance("0xTestToken", "eip155:1")
     assert balance == 0
+
+
+@pytest.mark.asyncio
+async def test_tron_signer_approval_uses_cached_reference_block():
+    """Test TRON approvals are built offline against the cached reference block"""
+    import asyncio
+    from unittest.mock import AsyncMock
+
+    pytest.importorskip("tronpy")
+    from bankofai.x402.testing.local_tron_node import LocalTronNode
+
+    node = LocalTronNode()
+    signer = TronClientSigner.from_private_key("01" * 32)
+    signer._async_tron_clients["tron:nile"] = node.client()
+    signer.check_allowance = AsyncMock(return_value=0)
+
+    for _ in range(2):
+        # Identical approvals signed in the same millisecond would share a txid
+        await asyncio.sleep(0.002)
+        assert await signer.ensure_allowance("TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf", 100, "tron:nile")
+
+    assert len(node.transactions) == 2
+    assert node.stats["wallet/getnodeinfo"] == 1
+    assert "wallet/getcontract" not in node.stats
@@ -0,0 +1,66 @@
+"""
+Tests for the cached TRON/EVM address codec
+"""
+
+import pytest
+
+from bankofai.x402.address import TronAddressConverter
+from bankofai.x402.utils import (
+    CompactAddress,
+    normalize_tron_address,
+    parse_address,
+    tron_address_to_evm,
+)
+from bankofai.x402.utils.address import CHAIN_EVM, CHAIN_TRON
+from bankofai.x402.utils.tron_verification import TronTransactionVerifier
+
+USDT_BASE58 = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+USDT_EVM = "0xa614f803b6fd780986a42c78ec9c7f77e6ded13c"
+ZERO_BASE58 = "T9yD14Nj9j7xAB4dbGeiX9h8unkKHxuWwb"
+
+
+@pytest.mark.parametrize(
+    "text", [USDT_BASE58, USDT_EVM, USDT_EVM.upper().replace("0X", "0x"), "41" + USDT_EVM[2:]]
+)
+def test_all_formats_parse_to_the_same_bytes(text):
+    parsed = parse_address(text, CHAIN_TRON)
+
+    assert parsed == CompactAddress(bytes.fromhex(USDT_EVM[2:]), CHAIN_TRON)
+    assert parsed.to_base58() == USDT_BASE58
+    assert parsed.to_evm() == USDT_EVM
+    assert parsed.to_tron_hex() == "41" + USDT_EVM[2:]
+    assert str(parsed) == USDT_BASE58
+
+
+def test_chain_tag_is_inferred():
+    assert parse_address(USDT_BASE58).chain == CHAIN_TRON
+    assert parse_address(USDT_EVM).chain == CHAIN_EVM
+    assert str(parse_address(USDT_EVM)) == USDT_EVM
+
+
+@pytest.mark.parametrize("text", ["", "0x1234", "0x" + "zz" * 20, "Tfoo", "not-an-address"])
+def test_unknown_formats(text):
+    assert parse_address(text) is None
+    assert normalize_tron_address(text) == text
+    assert tron_address_to_evm(text) == text
+
+
+def test_parser_is_cached():
+    parse_address.cache_clear()
+    first = parse_address(USDT_BASE58)
+
+    assert parse_address(USDT_BASE58) is first
+    assert parse_address.cache_info().hits == 1
+
+
+def test_helpers_route_through_codec():
+    assert normalize_tron_address(USDT_EVM) == USDT_BASE58
+    assert normalize_tron_address(USDT_BASE58) == USDT_BASE58
+    assert normalize_tron_address("T" + "0" * 33) == ZERO_BASE58
+    assert tron_address_to_evm(USDT_BASE58) == USDT_EVM
+    assert tron_address_to_evm("T" + "0" * 33) == "0x" + "00" * 20
+
+    converter = TronAddressConverter()
+    assert converter.normalize("41" + USDT_EVM[2:]) == USDT_BASE58
+    assert converter.to_evm_format(USDT_BASE58) == USDT_EVM
+    assert TronTransactionVerifier().normalize_address(USDT_EVM) == USDT_BASE58
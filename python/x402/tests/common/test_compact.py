@@ -0,0 +1,141 @@
+"""
+Tests for the compact binary wire format
+"""
+
+import base64
+import zlib
+
+import pytest
+
+from bankofai.x402.compact import (
+    CBOR,
+    CBOR_DEFLATE,
+    CompactPrefix,
+    decode_compact,
+    decode_compact_header,
+    encode_compact,
+    encode_compact_header,
+    is_compact_header,
+    negotiate_encoding,
+)
+from bankofai.x402.encoding import decode_payment_payload, encode_payment_payload
+from bankofai.x402.types import (
+    PaymentPayload,
+)
+
+TRON_TOKEN = "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+EVM_TOKEN = "0x55d398326f99059fF775485246999027B3197955"
+
+
+@pytest.fixture
+def make_payload(make_payment_requirements, make_permit_payload):
+    def make(asset: str = TRON_TOKEN, pay_to: str = "TLBaRhANhwgZyUk6Z1ynCn1Ld7BRH1jBjZ"):
+        requirements = make_payment_requirements(
+            "tron:mainnet",
+            amount=1000000,
+            asset=asset,
+            pay_to=pay_to,
+            maxTimeoutSeconds=3600,
+            extra={"fee": {"feeTo": pay_to, "feeAmount": "10000"}, "custom": [1, 2.5, None]},
+        )
+        return make_permit_payload(
+            requirements,
+            buyer="TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf",
+            nonce="93847561029384756",
+            caller="T0000000000000000000000000000000000",
+        )
+
+    return make
+
+
+@pytest.mark.parametrize("encoding", [CBOR, CBOR_DEFLATE])
+@pytest.mark.parametrize("asset", [TRON_TOKEN, EVM_TOKEN, EVM_TOKEN.lower()])
+def test_payload_round_trip_is_exact(make_payload, encoding, asset):
+    payload = make_payload(asset)
+    header = encode_payment_payload(payload, encoding=encoding)
+
+    assert is_compact_header(header)
+    assert decode_payment_payload(header, PaymentPayload) == payload
+    assert decode_payment_payload(header) == payload.model_dump(mode="json", by_alias=True)
+    assert len(header) < len(encode_payment_payload(payload)) * 0.6
+
+
+def test_plain_values_round_trip():
+    data = {
+        "big": 2**200,
+        "negative": -(2**70),
+        "float": 1.5,
+        "flags": [True, False, None],
+        "leadingZero": "007",
+        "mixedHex": "0xABcd",
+        "empty": "",
+        "bare": "0x",
+        "oddHex": "0xabc",
+        "unicode": "Tether ₮",
+        "1": {"nested": "0x" + "00" * 20},
+    }
+
+    assert decode_compact(encode_compact(data)) == data
+    assert decode_compact_header(encode_compact_header(data, CBOR_DEFLATE)) == data
+
+
+@pytest.mark.parametrize("encoding", [CBOR, CBOR_DEFLATE])
+def test_prefix_encoding_matches_whole_value(encoding):
+    prefix = CompactPrefix({"x402Version": 2, "accepts": [{"amount": "100"}]}, 3, encoding)
+
+    for error in ("first", "second"):
+        data = {"x402Version": 2, "accepts": [{"amount": "100"}], "error": error}
+        assert prefix.encode({"error": error}) == encode_compact(data, encoding)
+        assert decode_compact_header(prefix.encode_header({"error": error})) == data
+    with pytest.raises(ValueError):
+        prefix.encode({})
+
+
+def test_json_headers_are_not_compact():
+    assert not is_compact_header(encode_payment_payload({"a": 1}))
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"\x00",
+        b"\xc1",
+        b"\xc1\xa1",
+        b"\xc1\x18",
+        b"\xc1\x61\xff",
+        b"\xc1\xf6\xf6",
+        b"\xc1\xa1\x18\xff\xf6",
+        b"\xc2not deflate",
+        # Non-string map keys
+        b"\xc1\xa1\x80\x00",
+        b"\xc1\xa1\xf5\x00",
+        # Address tags must wrap exactly 20 bytes
+        b"\xc1\xd9\x9d\xd1\x41\x00",
+        b"\xc1\xd9\x9d\xd2\x55" + bytes(21),
+        # Nesting bomb
+        b"\xc1" + b"\x81" * 60_000 + b"\x00",
+    ],
+)
+def test_malformed_payloads_raise_value_error(data):
+    with pytest.raises(ValueError):
+        decode_compact(data)
+
+
+def test_decompression_is_bounded():
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -15)
+    bomb = compressor.compress(b"\x00" * (1 << 20)) + compressor.flush()
+
+    with pytest.raises(ValueError):
+        decode_compact(b"\xc2" + bomb)
+    with pytest.raises(ValueError):
+        decode_compact_header(base64.urlsafe_b64encode(b"\xc2" + bomb).decode())
+
+
+def test_negotiate_encoding():
+    assert negotiate_encoding("cbor+deflate, cbor") == CBOR_DEFLATE
+    assert negotiate_encoding("CBOR") == CBOR
+    assert negotiate_encoding("gzip, cbor") == CBOR
+    assert negotiate_encoding("json") is None
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("cbor+deflate", supported=[CBOR]) is None
@@ -0,0 +1,99 @@
+"""
+Tests for the pluggable secp256k1 backends
+"""
+
+import pickle
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_utils import keccak
+
+from bankofai.x402.signers.client import EvmClientSigner, TronClientSigner
+from bankofai.x402.utils import (
+    SigningKey,
+    available_backends,
+    get_crypto_backend,
+    load_signing_key,
+    set_crypto_backend,
+)
+from bankofai.x402.utils.crypto_backend import (
+    CoincurveBackend,
+    EthKeysBackend,
+    recover_address,
+)
+
+PRIVATE_KEY = bytes.fromhex("42" * 32)
+ADDRESS = Account.from_key(PRIVATE_KEY).address
+DIGEST = keccak(b"x402")
+
+
+@pytest.fixture
+def restore_backend():
+    previous = get_crypto_backend()
+    yield
+    set_crypto_backend(previous)
+
+
+@pytest.mark.parametrize("backend_cls", [CoincurveBackend, EthKeysBackend])
+def test_backend_matches_eth_account(backend_cls):
+    backend = backend_cls()
+    key = SigningKey(PRIVATE_KEY, backend)
+    expected = Account.unsafe_sign_hash(DIGEST, PRIVATE_KEY).signature
+
+    assert key.address == ADDRESS
+    assert key.sign_hash(DIGEST) == bytes(expected)
+
+    sig = bytes(expected)
+    recovered = backend.recover(DIGEST, sig[:64] + bytes([sig[64] - 27]))
+    assert recovered == key.public_key
+
+
+def test_recover_address_accepts_both_v_encodings():
+    signature = load_signing_key(PRIVATE_KEY).sign_hash(DIGEST)
+
+    assert recover_address(DIGEST, signature) == ADDRESS
+    assert recover_address(DIGEST, signature[:64] + bytes([signature[64] - 27])) == ADDRESS
+    with pytest.raises(ValueError):
+        recover_address(DIGEST, signature[:64] + b"\x05")
+    with pytest.raises(ValueError):
+        recover_address(DIGEST, signature[:64])
+
+
+def test_signing_key_pickles_as_secret():
+    key = load_signing_key("0x" + PRIVATE_KEY.hex())
+    restored = pickle.loads(pickle.dumps(key))
+
+    assert restored.address == key.address
+    assert restored.sign_hash(DIGEST) == key.sign_hash(DIGEST)
+
+
+def test_set_crypto_backend_by_name(restore_backend):
+    assert "eth-keys" in available_backends()
+    set_crypto_backend("eth-keys")
+    assert get_crypto_backend().name == "eth-keys"
+    assert load_signing_key(PRIVATE_KEY).backend.name == "eth-keys"
+
+    with pytest.raises(ValueError):
+        set_crypto_backend("openssl")
+
+
+@pytest.mark.asyncio
+async def test_evm_signer_reuses_parsed_key():
+    signer = EvmClientSigner.from_private_key(PRIVATE_KEY.hex())
+    key = signer._signing_key
+
+    signature = await signer.sign_message(b"hello")
+    expected = Account.sign_message(encode_defunct(primitive=b"hello"), PRIVATE_KEY).signature
+
+    assert bytes.fromhex(signature) == bytes(expected)
+    assert signer._signing_key is key
+    assert signer.get_address() == ADDRESS
+
+
+def test_tron_signer_parses_keys_once():
+    signer = TronClientSigner.from_private_key(PRIVATE_KEY.hex())
+
+    assert signer._get_signing_key() is signer._get_signing_key()
+    assert signer._get_signing_key().address == ADDRESS
+    assert signer._get_tron_key() is signer._get_tron_key()
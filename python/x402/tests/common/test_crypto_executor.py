@@ -0,0 +1,113 @@
+"""
+Tests for the off-event-loop crypto executor
+"""
+
+import asyncio
+import threading
+
+import pytest
+from eth_account import Account
+
+from bankofai.x402.abi import get_payment_permit_eip712_types
+from bankofai.x402.signers.client import EvmClientSigner
+from bankofai.x402.signers.facilitator import EvmFacilitatorSigner
+from bankofai.x402.utils import (
+    CryptoExecutor,
+    TypedDataCheck,
+    get_crypto_executor,
+    set_crypto_executor,
+)
+
+PRIVATE_KEY = bytes.fromhex("42" * 32)
+ADDRESS = Account.from_key(PRIVATE_KEY).address
+DOMAIN = {
+    "name": "PaymentPermit",
+    "chainId": 97,
+    "verifyingContract": "0x1825bB32db3443dEc2cc7508b2D818fc13EaD878",
+}
+TYPES = get_payment_permit_eip712_types()
+
+
+def _message(nonce: int) -> dict:
+    return {
+        "meta": {
+            "kind": 0,
+            "paymentId": b"\x01" * 16,
+            "nonce": nonce,
+            "validAfter": 0,
+            "validBefore": 2_000_000_000,
+        },
+        "buyer": ADDRESS,
+        "caller": "0x" + "11" * 20,
+        "payment": {"payToken": "0x" + "22" * 20, "payAmount": 100, "payTo": "0x" + "33" * 20},
+        "fee": {"feeTo": "0x" + "44" * 20, "feeAmount": 0},
+    }
+
+
+async def _checks(executor: CryptoExecutor, count: int) -> list[TypedDataCheck]:
+    checks = []
+    for nonce in range(count):
+        signature = await executor.sign_typed_data(PRIVATE_KEY, DOMAIN, TYPES, _message(nonce))
+        # Every third signature is checked against another message
+        message = _message(nonce + 1 if nonce % 3 == 0 else nonce)
+        checks.append(TypedDataCheck(ADDRESS, DOMAIN, TYPES, message, signature.hex()))
+    return checks
+
+
+@pytest.fixture
+def restore_executor():
+    previous = get_crypto_executor()
+    yield
+    set_crypto_executor(previous)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("factory", [CryptoExecutor.inline, CryptoExecutor.thread])
+async def test_verify_many_matches_single_checks(factory):
+    executor = factory()
+    try:
+        checks = await _checks(executor, 10)
+        batch = await executor.verify_many(checks)
+        single = [await executor.verify_typed_data(*check) for check in checks]
+    finally:
+        executor.shutdown()
+
+    assert batch == single == [i % 3 != 0 for i in range(10)]
+    assert await executor.verify_many([]) == []
+
+
+@pytest.mark.asyncio
+async def test_process_pool_executor():
+    executor = CryptoExecutor.process(max_workers=2)
+    try:
+        checks = await _checks(executor, 4)
+        results = await executor.verify_many(checks)
+    finally:
+        executor.shutdown()
+
+    assert results == [False, True, True, False]
+
+
+@pytest.mark.asyncio
+async def test_signers_dispatch_to_configured_executor(restore_executor):
+    threads: set[str] = set()
+
+    class RecordingExecutor(CryptoExecutor):
+        async def run(self, fn, *args):
+            def call():
+                threads.add(threading.current_thread().name)
+                return fn(*args)
+
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+
+    executor = RecordingExecutor.thread(max_workers=1)
+    set_crypto_executor(executor)
+    client = EvmClientSigner.from_private_key(PRIVATE_KEY.hex())
+    facilitator = EvmFacilitatorSigner.from_private_key("0x" + "01" * 32)
+
+    signature = await client.sign_typed_data(DOMAIN, TYPES, _message(1))
+    assert await facilitator.verify_typed_data(ADDRESS, DOMAIN, TYPES, _message(1), signature)
+    assert not await facilitator.verify_typed_data(ADDRESS, DOMAIN, TYPES, _message(2), signature)
+
+    executor.shutdown()
+    assert threads and all(name.startswith("x402-crypto") for name in threads)
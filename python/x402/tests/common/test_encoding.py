@@ -0,0 +1,79 @@
+"""
+Tests for the PAYMENT-* header codec
+"""
+
+import base64
+import json
+
+import pytest
+
+from bankofai.x402 import encoding
+from bankofai.x402.encoding import decode_payment_payload, encode_payment_payload
+from bankofai.x402.server.payment_gate import PaymentDecision
+from bankofai.x402.types import (
+    PaymentPayload,
+    SettleResponse,
+    TransactionReceipt,
+)
+
+ADDRESS = "0x" + "11" * 20
+
+
+@pytest.fixture
+def payload(make_payment_requirements, make_permit_payload) -> PaymentPayload:
+    requirements = make_payment_requirements(
+        amount=10**18, asset=ADDRESS, pay_to=ADDRESS, maxTimeoutSeconds=3600
+    )
+    return make_permit_payload(requirements, buyer=ADDRESS, caller=ADDRESS)
+
+
+def _legacy_encode(payload: PaymentPayload) -> str:
+    return base64.b64encode(json.dumps(payload.model_dump(by_alias=True)).encode()).decode()
+
+
+def test_model_round_trip(payload):
+    header = encode_payment_payload(payload)
+
+    assert decode_payment_payload(header, PaymentPayload) == payload
+    assert decode_payment_payload(header) == payload.model_dump(by_alias=True)
+
+
+def test_decodes_headers_from_legacy_encoder(payload):
+
+    assert decode_payment_payload(_legacy_encode(payload), PaymentPayload) == payload
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_plain_data(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(encoding, "orjson", None)
+    data = {"amount": 2**200, "name": "Tether USD ₮"}
+
+    assert decode_payment_payload(encode_payment_payload(data)) == data
+
+
+def test_invalid_header_raises():
+    with pytest.raises(Exception):
+        decode_payment_payload("not base64!", PaymentPayload)
+    with pytest.raises(Exception):
+        decode_payment_payload(base64.b64encode(b"{}").decode(), PaymentPayload)
+
+
+def test_payment_response_header_is_encoded_once(monkeypatch):
+    receipt = TransactionReceipt.from_signer_result({"blockNumber": 1, "status": "confirmed"})
+    decision = PaymentDecision(
+        settle_response=SettleResponse(
+            success=True, transaction="0xabc", network="eip155:97", receipt=receipt
+        )
+    )
+    header = decision.payment_response_header()
+
+    decoded = decode_payment_payload(header)
+    assert decoded["transaction"] == "0xabc"
+    assert "receipt" not in decoded
+
+    monkeypatch.setattr(
+        "bankofai.x402.server.payment_gate.encode_payment_payload",
+        lambda *args, **kwargs: pytest.fail("encoded twice"),
+    )
+    assert decision.payment_response_header() is header
@@ -0,0 +1,97 @@
+"""
+Tests for local EVM nonce allocation
+"""
+
+import asyncio
+
+import pytest
+
+from bankofai.x402.utils.evm_nonce import NonceManager, is_nonce_too_low
+
+NETWORK = "eip155:97"
+ADDRESS = "0x7E5F4552091A69125d5DfCb7b8C2659029395Bdf"
+
+
+class _Eth:
+    def __init__(self, pending: int) -> None:
+        self.pending = pending
+        self.calls = 0
+
+    async def get_transaction_count(self, address: str, block: str) -> int:
+        assert block == "pending"
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.pending
+
+
+class _Web3:
+    def __init__(self, pending: int) -> None:
+        self.eth = _Eth(pending)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_allocations_sync_once():
+    w3 = _Web3(7)
+    nonces = NonceManager()
+
+    allocated = await asyncio.gather(*(nonces.allocate(w3, NETWORK, ADDRESS) for _ in range(50)))
+
+    assert sorted(allocated) == list(range(7, 57))
+    assert w3.eth.calls == 1
+    # Addresses are case-insensitive
+    assert await nonces.allocate(w3, NETWORK, ADDRESS.lower()) == 57
+
+
+@pytest.mark.asyncio
+async def test_released_nonces_are_reused_first():
+    w3 = _Web3(0)
+    nonces = NonceManager()
+    for _ in range(4):
+        await nonces.allocate(w3, NETWORK, ADDRESS)
+
+    nonces.release(NETWORK, ADDRESS, 1)
+    nonces.release(NETWORK, ADDRESS, 3)
+    # Unknown nonces are ignored
+    nonces.release(NETWORK, ADDRESS, 9)
+
+    assert [await nonces.allocate(w3, NETWORK, ADDRESS) for _ in range(3)] == [1, 3, 4]
+    assert nonces.stats["released"] == 2
+
+
+@pytest.mark.asyncio
+async def test_resync_reads_pending_count_again():
+    w3 = _Web3(3)
+    nonces = NonceManager()
+    assert await nonces.allocate(w3, NETWORK, ADDRESS) == 3
+
+    w3.eth.pending = 10
+    nonces.resync(NETWORK, ADDRESS)
+
+    assert await nonces.allocate(w3, NETWORK, ADDRESS) == 10
+    assert nonces.stats["syncs"] == 2
+    assert nonces.stats["resyncs"] == 1
+    # Other networks keep their own state
+    assert await nonces.allocate(_Web3(0), "eip155:56", ADDRESS) == 0
+
+
+@pytest.mark.asyncio
+async def test_resync_keeps_nonces_being_sent():
+    w3 = _Web3(0)
+    nonces = NonceManager()
+    first, second, third = [await nonces.allocate(w3, NETWORK, ADDRESS) for _ in range(3)]
+    nonces.sent(NETWORK, ADDRESS, first)
+    nonces.sent(NETWORK, ADDRESS, third)
+
+    # The node only has the first transaction: the third was dropped, the
+    # second is still being sent and must not be handed out again
+    w3.eth.pending = 1
+    nonces.resync(NETWORK, ADDRESS)
+
+    assert [await nonces.allocate(w3, NETWORK, ADDRESS) for _ in range(2)] == [third, 3]
+    assert second not in (third, 3)
+
+
+def test_nonce_too_low_errors():
+    assert is_nonce_too_low(ValueError({"code": -32000, "message": "nonce too low"}))
+    assert is_nonce_too_low(ValueError("Nonce is too low for account"))
+    assert not is_nonce_too_low(ValueError("execution reverted"))
@@ -0,0 +1,151 @@
+"""
+Tests for the shared block-driven receipt watcher
+"""
+
+import asyncio
+
+import pytest
+
+from bankofai.x402.utils.receipt_watcher import EvmReceiptSource, ReceiptWatcher
+
+pytest.importorskip("web3")
+
+from bankofai.x402.testing.local_evm_node import LocalEvmNode  # noqa: E402
+
+
+def _tx(i: int) -> str:
+    return "0x" + f"{i:064x}"
+
+
+def _watcher(node: LocalEvmNode, confirmations: int = 1, **kwargs) -> ReceiptWatcher:
+    kwargs.setdefault("poll_interval", 0.01)
+    return ReceiptWatcher(EvmReceiptSource(node.web3(), confirmations), **kwargs)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        EvmReceiptSource(None, confirmations=0)
+    with pytest.raises(ValueError):
+        ReceiptWatcher(EvmReceiptSource(None), poll_interval=0)
+    with pytest.raises(ValueError):
+        ReceiptWatcher(EvmReceiptSource(None), poll_interval=1, max_blocks_per_poll=0)
+
+
+@pytest.mark.asyncio
+async def test_requests_scale_with_blocks_not_transactions():
+    node = LocalEvmNode(block_time=0.02)
+    # No safety-net lookups, which a slow test run could trigger
+    watcher = _watcher(node, lookup_after=60)
+
+    async def settle(i: int):
+        await asyncio.sleep(i * 0.0005)
+        node.include(_tx(i))
+        return await watcher.wait(_tx(i), timeout=5)
+
+    receipts = await asyncio.gather(*(settle(i) for i in range(200)))
+
+    assert [r["status"] for r in receipts] == [1] * 200
+    assert watcher.pending == 0
+    assert "eth_getTransactionReceipt" not in node.stats
+    assert node.stats["eth_getBlockReceipts"] < 20
+    assert node.rpc_count < 50
+
+
+@pytest.mark.asyncio
+async def test_transaction_mined_before_waiting_is_found():
+    node = LocalEvmNode()
+    watcher = _watcher(node)
+    node.include(_tx(1))
+    await watcher.wait(_tx(1), timeout=1)
+
+    node.include(_tx(2))
+    receipt = await watcher.wait("0x" + _tx(2)[2:].upper(), timeout=1)
+
+    assert receipt["blockNumber"] == 1002
+    assert watcher.stats["lookups"] == 0
+
+
+@pytest.mark.asyncio
+async def test_old_transaction_is_looked_up_once():
+    node = LocalEvmNode()
+    node.include(_tx(1))
+    node.advance(50)
+    watcher = _watcher(node, lookup_after=0)
+
+    receipt = await watcher.wait(_tx(1), timeout=1)
+
+    assert receipt["blockNumber"] == 1001
+    assert watcher.stats["lookups"] == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_lookups_without_block_receipts():
+    node = LocalEvmNode(block_receipts=False)
+    watcher = _watcher(node)
+
+    async def settle(i: int):
+        await asyncio.sleep(0.02)
+        node.include(_tx(i))
+
+    waits = [watcher.wait(_tx(i), timeout=1) for i in range(3)]
+    await asyncio.gather(*waits, *(settle(i) for i in range(3)))
+
+    assert watcher.stats["resolved"] == 3
+    assert node.stats["eth_getTransactionReceipt"] >= 3
+
+
+@pytest.mark.asyncio
+async def test_blocks_are_final_after_confirmations():
+    node = LocalEvmNode(block_time=0.02)
+    watcher = _watcher(node, confirmations=5)
+    node.include(_tx(1))
+    receipt = await watcher.wait(_tx(1), timeout=1)
+
+    waits = [watcher.wait_final(receipt["blockNumber"], timeout=1) for _ in range(50)]
+    await asyncio.gather(*waits)
+
+    assert node.block_number - receipt["blockNumber"] + 1 >= 5
+    assert watcher.stats["finalized"] == 50
+    # Confirmations are counted from the head, without requests of their own
+    assert node.rpc_count == node.stats["eth_blockNumber"] + node.stats["eth_getBlockReceipts"]
+
+    # Known final blocks answer at once
+    polls = watcher.stats["polls"]
+    await watcher.wait_final(receipt["blockNumber"], timeout=1)
+    assert watcher.stats["polls"] == polls
+
+
+@pytest.mark.asyncio
+async def test_final_wait_times_out():
+    node = LocalEvmNode()
+    watcher = _watcher(node, confirmations=3)
+
+    with pytest.raises(TimeoutError):
+        await watcher.wait_final(node.block_number, timeout=0.05)
+
+
+@pytest.mark.asyncio
+async def test_timeout_stops_watching():
+    node = LocalEvmNode()
+    watcher = _watcher(node)
+
+    with pytest.raises(TimeoutError):
+        await watcher.wait(_tx(1), timeout=0.05)
+
+    assert watcher.pending == 0
+    await asyncio.sleep(0.05)
+    polls = watcher.stats["polls"]
+    await asyncio.sleep(0.05)
+    assert watcher.stats["polls"] == polls
+
+
+@pytest.mark.asyncio
+async def test_backs_off_without_new_blocks():
+    node = LocalEvmNode()
+    watcher = _watcher(node, max_interval=1)
+
+    with pytest.raises(TimeoutError):
+        await watcher.wait(_tx(1), timeout=0.3)
+
+    # 0.01s polls would be ~30; backing off 1.5x per empty poll needs far fewer
+    assert watcher.stats["polls"] < 12
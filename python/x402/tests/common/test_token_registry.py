@@ -0,0 +1,113 @@
+"""
+Tests for the TokenRegistry address index and bulk loading
+"""
+
+import json
+
+import pytest
+
+from bankofai.x402.tokens import TokenInfo, TokenRegistry
+
+NETWORK = "eip155:31337"
+TRON_NETWORK = "tron:test-registry"
+
+
+@pytest.fixture(autouse=True)
+def _cleanup():
+    yield
+    for network in (NETWORK, TRON_NETWORK):
+        TokenRegistry._tokens.pop(network, None)
+        TokenRegistry._index.pop(network, None)
+
+
+def _evm_token(i: int) -> TokenInfo:
+    return TokenInfo(address=f"0x{i:040x}", decimals=6, name=f"Token {i}", symbol=f"T{i}")
+
+
+def test_builtin_tokens_found_in_any_format():
+    usdt = TokenRegistry.get_token("tron:mainnet", "USDT")
+
+    assert TokenRegistry.find_by_address("tron:mainnet", usdt.address) is usdt
+    hex_address = "0xa614f803b6fd780986a42c78ec9c7f77e6ded13c"
+    assert TokenRegistry.find_by_address("tron:mainnet", hex_address) is usdt
+    assert TokenRegistry.find_by_address("tron:mainnet", "41" + hex_address[2:]) is usdt
+
+    bsc = TokenRegistry.get_token("eip155:97", "USDT")
+    assert TokenRegistry.find_by_address("eip155:97", bsc.address.lower()) is bsc
+    assert TokenRegistry.find_by_address("eip155:97", "0x" + "00" * 20) is None
+    assert TokenRegistry.find_by_address("eip155:unknown", bsc.address) is None
+
+
+def test_register_token_keeps_index_in_sync():
+    first = _evm_token(1)
+    TokenRegistry.register_token(NETWORK, first)
+    assert TokenRegistry.find_by_address(NETWORK, first.address) is first
+
+    # Re-registering a symbol at a new address drops the old address
+    moved = TokenInfo(address=f"0x{2:040x}", decimals=6, name="Token 1", symbol="T1")
+    TokenRegistry.register_token(NETWORK, moved)
+    assert TokenRegistry.find_by_address(NETWORK, first.address) is None
+    assert TokenRegistry.find_by_address(NETWORK, moved.address.upper()[2:]) is moved
+
+
+def test_tokens_removed_directly_are_not_returned():
+    token = _evm_token(7)
+    TokenRegistry.register_token(NETWORK, token)
+    TokenRegistry._tokens[NETWORK].pop("T7")
+
+    assert TokenRegistry.find_by_address(NETWORK, token.address) is None
+
+    TokenRegistry._tokens[NETWORK]["T8"] = _evm_token(8)
+    assert TokenRegistry.find_by_address(NETWORK, f"0x{8:040x}").symbol == "T8"
+
+
+def test_load_tokens_from_json(tmp_path):
+    path = tmp_path / "tokens.json"
+    path.write_text(
+        json.dumps(
+            {
+                NETWORK: [
+                    {"address": f"0x{i:040x}", "decimals": 6, "name": "T", "symbol": f"T{i}"}
+                    for i in range(1, 101)
+                ],
+                TRON_NETWORK: [
+                    {
+                        "address": "0xa614f803b6fd780986a42c78ec9c7f77e6ded13c",
+                        "decimals": 6,
+                        "name": "Tether USD",
+                        "symbol": "usdt",
+                        "version": 2,
+                    }
+                ],
+            }
+        )
+    )
+
+    assert TokenRegistry.load_tokens(path) == 101
+    assert TokenRegistry.find_by_address(NETWORK, f"0x{50:040x}").symbol == "T50"
+    usdt = TokenRegistry.get_token(TRON_NETWORK, "USDT")
+    assert usdt.address == "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    assert usdt.version == "2"
+
+
+def test_load_tokens_from_toml(tmp_path):
+    pytest.importorskip("tomllib")
+    path = tmp_path / "tokens.toml"
+    path.write_text(
+        "[[tokens]]\n"
+        f'network = "{NETWORK}"\n'
+        f'address = "0x{3:040x}"\n'
+        "decimals = 18\n"
+        'name = "Three"\n'
+        'symbol = "THREE"\n'
+    )
+
+    assert TokenRegistry.load_tokens(path) == 1
+    assert TokenRegistry.get_token(NETWORK, "three").decimals == 18
+
+
+def test_load_tokens_rejects_incomplete_entries():
+    with pytest.raises(ValueError):
+        TokenRegistry.load_tokens({"tokens": [{"address": "0x" + "00" * 20}]})
+    with pytest.raises(ValueError):
+        TokenRegistry.load_tokens({NETWORK: [{"address": "0x" + "00" * 20, "decimals": 6}]})
@@ -0,0 +1,127 @@
+"""
+Tests for the TRON reference block cache
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from bankofai.x402.utils.tron_ref_block import RefBlockCache
+
+NETWORK = "tron:nile"
+
+
+class _Client:
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.height = 1000
+        self.calls = 0
+        self.fail = False
+
+    async def get_latest_solid_block_id(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.fail:
+            raise ConnectionError("node unreachable")
+        return f"{self.height:064x}"
+
+
+@pytest.fixture
+def cache():
+    return RefBlockCache(refresh_interval=10, max_age=10)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        RefBlockCache(refresh_interval=0)
+    with pytest.raises(ValueError):
+        RefBlockCache(refresh_interval=5, max_age=1)
+
+
+@pytest.mark.asyncio
+async def test_reference_is_reused(cache):
+    client = _Client()
+
+    assert await cache.get(client, NETWORK) == f"{1000:064x}"
+    client.height += 1
+    assert await cache.get(client, NETWORK) == f"{1000:064x}"
+    assert (client.calls, cache.stats["hits"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_fetch(cache):
+    client = _Client(latency=0.02)
+
+    results = await asyncio.gather(*(cache.get(client, NETWORK) for _ in range(10)))
+
+    assert len(set(results)) == 1
+    assert client.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_reference_is_not_used(cache):
+    client = _Client()
+    await cache.get(client, NETWORK)
+    cache._blocks[NETWORK] = (cache._blocks[NETWORK][0], time.monotonic() - 11)
+    client.height += 1
+
+    assert await cache.get(client, NETWORK) == f"{1001:064x}"
+    assert cache.age(NETWORK) < 1
+
+
+@pytest.mark.asyncio
+async def test_invalidate_forces_fetch(cache):
+    client = _Client()
+    await cache.get(client, NETWORK)
+    client.height += 1
+    cache.invalidate(NETWORK)
+
+    assert cache.age(NETWORK) is None
+    assert await cache.get(client, NETWORK) == f"{1001:064x}"
+    assert client.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_background_refresh():
+    cache = RefBlockCache(refresh_interval=0.01, max_age=1)
+    client = _Client()
+    try:
+        await cache.get(client, NETWORK)
+        client.height += 1
+        await asyncio.sleep(0.05)
+
+        # Refreshed without a caller waiting for it
+        calls = client.calls
+        assert await cache.get(client, NETWORK) == f"{1001:064x}"
+        assert client.calls == calls
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_errors_keep_last_reference():
+    cache = RefBlockCache(refresh_interval=0.01, max_age=1)
+    client = _Client()
+    try:
+        await cache.get(client, NETWORK)
+        client.fail = True
+        await asyncio.sleep(0.05)
+
+        assert cache.stats["refresh_errors"] > 0
+        assert await cache.get(client, NETWORK) == f"{1000:064x}"
+    finally:
+        await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_refresher_stops_when_idle():
+    cache = RefBlockCache(refresh_interval=0.01, max_age=1, idle_timeout=0.02)
+    client = _Client()
+    await cache.get(client, NETWORK)
+    await asyncio.sleep(0.1)
+
+    calls = client.calls
+    await asyncio.sleep(0.05)
+    assert client.calls == calls
+    assert not cache._refreshers
@@ -0,0 +1,206 @@
+"""
+Tests for verifying settlements from the receipt returned with SettleResponse
+"""
+
+import asyncio
+
+import pytest
+from tronpy.keys import to_base58check_address
+
+from bankofai.x402.abi import ERC20_TRANSFER_TOPIC
+from bankofai.x402.encoding import decode_payment_payload
+from bankofai.x402.facilitator import FacilitatorClient, LocalFacilitatorClient, X402Facilitator
+from bankofai.x402.server import X402Server
+from bankofai.x402.server.payment_gate import PaymentDecision
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+    TransactionReceipt,
+)
+from bankofai.x402.utils.tron_verification import TronTransactionVerifier
+from bankofai.x402.utils.tx_verification import get_verifier_for_network
+
+TOKEN_HEX = "a614f803b6fd780986a42c78ec9c7f77e6ded13c"
+BUYER_HEX = "11" * 20
+PAY_TO_HEX = "22" * 20
+
+
+def _tron(hex_address: str) -> str:
+    return to_base58check_address("41" + hex_address)
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(
+        network="tron:nile", asset=_tron(TOKEN_HEX), pay_to=_tron(PAY_TO_HEX)
+    )
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements) -> PaymentPayload:
+    return make_permit_payload(
+        requirements, buyer=_tron(BUYER_HEX), caller=_tron("33" * 20), fee_to=_tron("33" * 20)
+    )
+
+
+def _transaction_info(amount: int = 100, result: str = "SUCCESS") -> dict:
+    """TRON get_transaction_info response with one TRC20 Transfer log"""
+    return {
+        "blockNumber": 123,
+        "receipt": {"result": result},
+        "log": [
+            {
+                "address": TOKEN_HEX,
+                "topics": [ERC20_TRANSFER_TOPIC, "00" * 12 + BUYER_HEX, "00" * 12 + PAY_TO_HEX],
+                "data": format(amount, "064x"),
+            }
+        ],
+    }
+
+
+def _receipt(**kwargs) -> TransactionReceipt:
+    info = _transaction_info(**kwargs)
+    status = "confirmed" if info["receipt"]["result"] == "SUCCESS" else "failed"
+    return TransactionReceipt.from_signer_result(
+        {"blockNumber": "123", "status": status, "receipt": info}
+    )
+
+
+def test_receipt_from_evm_receipt():
+    receipt = TransactionReceipt.from_signer_result(
+        {
+            "blockNumber": "7",
+            "status": "confirmed",
+            "receipt": {
+                "logs": [
+                    {
+                        "address": "0x" + TOKEN_HEX.upper(),
+                        "topics": [bytes.fromhex(ERC20_TRANSFER_TOPIC)],
+                        "data": b"\x01",
+                    }
+                ]
+            },
+        }
+    )
+
+    assert receipt.succeeded
+    assert receipt.block_number == "7"
+    assert receipt.logs[0].address == "0x" + TOKEN_HEX
+    assert receipt.logs[0].topics == ["0x" + ERC20_TRANSFER_TOPIC]
+    assert receipt.logs[0].data == "0x01"
+
+
+def test_receipt_round_trips_through_settle_response():
+    response = SettleResponse(success=True, transaction="0xtx", receipt=_receipt())
+    restored = SettleResponse(**response.model_dump(by_alias=True))
+
+    assert restored.receipt == response.receipt
+
+
+def test_payment_response_header_omits_receipt():
+    decision = PaymentDecision(settle_response=SettleResponse(success=True, receipt=_receipt()))
+
+    assert "receipt" not in decode_payment_payload(decision.payment_response_header(), dict)
+
+
+def test_only_trusted_facilitators_supply_receipts():
+    response = SettleResponse(success=True, transaction="tx", receipt=_receipt())
+    local = LocalFacilitatorClient(X402Facilitator())
+    remote = FacilitatorClient("http://facilitator")
+    operated = FacilitatorClient("http://facilitator", trust_receipts=True)
+
+    def trusted(client):
+        return (
+            X402Server(auto_register_tron=False).set_facilitator(client).trusted_receipt(response)
+        )
+
+    assert trusted(local) == response.receipt
+    assert trusted(remote) is None
+    assert trusted(operated) == response.receipt
+
+
+@pytest.mark.asyncio
+async def test_verify_from_receipt_without_rpc(requirements, payload):
+    verifier = TronTransactionVerifier()
+
+    result = await verifier.verify_transaction("tx", payload, requirements, _receipt())
+
+    assert result.success
+    assert result.payment_verified
+    assert result.block_number == "123"
+    assert result.transfers[0].from_addr == _tron(BUYER_HEX)
+    assert verifier._async_client is None
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_missing_payment_transfer(requirements, payload):
+    verifier = TronTransactionVerifier()
+
+    result = await verifier.verify_transaction("tx", payload, requirements, _receipt(amount=99))
+
+    assert not result.success
+    assert result.error_reason == "payment_transfer_not_found"
+
+
+@pytest.mark.asyncio
+async def test_verify_rejects_failed_transaction(requirements, payload):
+    verifier = TronTransactionVerifier()
+
+    result = await verifier.verify_transaction(
+        "tx", payload, requirements, _receipt(result="REVERT")
+    )
+
+    assert not result.success
+    assert result.error_reason == "transaction_failed_on_chain"
+
+
+@pytest.mark.asyncio
+async def test_transfers_fetched_when_no_receipt_given(requirements, payload):
+    class FakeClient:
+        async def get_transaction_info(self, tx_hash):
+            return _transaction_info()
+
+    verifier = TronTransactionVerifier()
+    verifier._async_client = FakeClient()
+
+    transfers = await verifier.get_transaction_transfers("tx", _tron(TOKEN_HEX))
+    result = await verifier.verify_transaction("tx", payload, requirements)
+
+    assert [(t.to_addr, t.amount) for t in transfers] == [(_tron(PAY_TO_HEX), 100)]
+    assert result.success
+
+
+@pytest.mark.asyncio
+async def test_transaction_not_in_block_yet_is_pending(requirements, payload):
+    from tronpy.exceptions import TransactionNotFound
+
+    class FakeClient:
+        async def get_transaction_info(self, tx_hash):
+            raise TransactionNotFound("transaction info not found")
+
+    verifier = TronTransactionVerifier()
+    verifier._async_client = FakeClient()
+
+    assert await verifier.get_transaction_receipt("tx") is None
+    result = await verifier.verify_transaction("tx", payload, requirements)
+
+    assert result.success
+    assert result.status_verified
+    assert not result.payment_verified
+
+
+@pytest.mark.asyncio
+async def test_verifier_is_shared_per_network_and_rpc_url():
+    nile = get_verifier_for_network("tron:nile")
+    assert get_verifier_for_network("tron:nile") is nile
+    assert get_verifier_for_network("tron:shasta") is not nile
+    assert get_verifier_for_network("tron:nile", "http://node:8090") is not nile
+    assert get_verifier_for_network("tron:nile", "http://node:8090")._rpc_url == "http://node:8090"
+
+
+def test_verifier_is_not_shared_across_event_loops():
+    async def get():
+        return get_verifier_for_network("tron:nile")
+
+    assert asyncio.run(get()) is not asyncio.run(get())
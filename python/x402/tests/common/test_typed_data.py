@@ -0,0 +1,163 @@
+"""
+Tests for the precompiled EIP-712 hashing engine against eth_account
+"""
+
+import random
+
+import pytest
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from eth_utils import keccak
+
+from bankofai.x402.abi import (
+    EIP712_DOMAIN_TYPE,
+    PAYMENT_PERMIT_PRIMARY_TYPE,
+    get_payment_permit_eip712_types,
+)
+from bankofai.x402.mechanisms._exact_base.types import (
+    TRANSFER_AUTH_EIP712_DOMAIN_TYPE,
+    TRANSFER_AUTH_EIP712_TYPES,
+    TRANSFER_AUTH_PRIMARY_TYPE,
+)
+from bankofai.x402.utils.typed_data import (
+    domain_separator,
+    hash_typed_data,
+    recover_typed_data_signer,
+    sign_typed_data_hash,
+)
+
+PRIVATE_KEY = bytes.fromhex("42" * 32)
+
+
+def _reference(domain, domain_type, types, primary_type, message) -> bytes:
+    signable = encode_typed_data(
+        full_message={
+            "types": {"EIP712Domain": domain_type, **types},
+            "primaryType": primary_type,
+            "domain": domain,
+            "message": message,
+        }
+    )
+    return keccak(b"\x19" + signable.version + signable.header + signable.body)
+
+
+def _address(rng: random.Random) -> str:
+    value = "0x" + rng.randbytes(20).hex()
+    return value.upper().replace("0X", "0x") if rng.random() < 0.3 else value
+
+
+def _permit_message(rng: random.Random) -> dict:
+    return {
+        "meta": {
+            "kind": rng.randrange(2),
+            "paymentId": rng.randbytes(16),
+            "nonce": rng.randrange(2**256),
+            "validAfter": rng.randrange(2**40),
+            "validBefore": rng.randrange(2**40),
+        },
+        "buyer": _address(rng),
+        "caller": _address(rng),
+        "payment": {
+            "payToken": _address(rng),
+            "payAmount": rng.randrange(2**256),
+            "payTo": _address(rng),
+        },
+        "fee": {"feeTo": _address(rng), "feeAmount": rng.randrange(2**128)},
+    }
+
+
+def _permit_domain(rng: random.Random) -> dict:
+    return {
+        "name": "PaymentPermit",
+        "chainId": rng.choice([1, 56, 97, 728126428, 3448148188]),
+        "verifyingContract": _address(rng),
+    }
+
+
+def test_payment_permit_matches_eth_account():
+    rng = random.Random(1)
+    types = get_payment_permit_eip712_types()
+    for _ in range(50):
+        domain, message = _permit_domain(rng), _permit_message(rng)
+        expected = _reference(
+            domain, EIP712_DOMAIN_TYPE, types, PAYMENT_PERMIT_PRIMARY_TYPE, message
+        )
+        assert hash_typed_data(domain, types, message) == expected
+        assert hash_typed_data(domain, types, message, domain_type=EIP712_DOMAIN_TYPE) == expected
+
+
+def test_transfer_with_authorization_matches_eth_account():
+    rng = random.Random(2)
+    for _ in range(50):
+        domain = {
+            "name": rng.choice(["Tether USD", "USD Coin", "Ünïcode"]),
+            "version": rng.choice(["1", "2"]),
+            "chainId": rng.choice([1, 97]),
+            "verifyingContract": _address(rng),
+        }
+        message = {
+            "from": _address(rng),
+            "to": _address(rng),
+            "value": rng.randrange(2**256),
+            "validAfter": rng.randrange(2**40),
+            "validBefore": rng.randrange(2**40),
+            "nonce": rng.randbytes(32),
+        }
+        expected = _reference(
+            domain,
+            TRANSFER_AUTH_EIP712_DOMAIN_TYPE,
+            TRANSFER_AUTH_EIP712_TYPES,
+            TRANSFER_AUTH_PRIMARY_TYPE,
+            message,
+        )
+        assert hash_typed_data(domain, TRANSFER_AUTH_EIP712_TYPES, message) == expected
+
+
+@pytest.mark.parametrize(
+    "meta_update",
+    [
+        {"paymentId": "0x" + "ab" * 16},
+        {"paymentId": b"\xab" * 3},
+        {"nonce": "12345"},
+    ],
+)
+def test_non_canonical_values_fall_back(meta_update):
+    rng = random.Random(3)
+    types = get_payment_permit_eip712_types()
+    domain, message = _permit_domain(rng), _permit_message(rng)
+    message["meta"].update(meta_update)
+
+    expected = _reference(domain, EIP712_DOMAIN_TYPE, types, PAYMENT_PERMIT_PRIMARY_TYPE, message)
+
+    assert hash_typed_data(domain, types, message) == expected
+
+
+def test_domain_separator_is_cached():
+    domain = {"name": "PaymentPermit", "chainId": 97, "verifyingContract": "0x" + "11" * 20}
+
+    assert domain_separator(domain) is domain_separator(dict(domain))
+    assert domain_separator({**domain, "chainId": "97"}) is None
+
+
+def test_sign_and_recover_match_eth_account():
+    rng = random.Random(4)
+    types = get_payment_permit_eip712_types()
+    domain, message = _permit_domain(rng), _permit_message(rng)
+    signable = encode_typed_data(
+        full_message={
+            "types": {"EIP712Domain": EIP712_DOMAIN_TYPE, **types},
+            "primaryType": PAYMENT_PERMIT_PRIMARY_TYPE,
+            "domain": domain,
+            "message": message,
+        }
+    )
+    digest = hash_typed_data(domain, types, message)
+
+    signature = sign_typed_data_hash(digest, PRIVATE_KEY)
+
+    assert signature == bytes(Account.sign_message(signable, PRIVATE_KEY).signature)
+    assert recover_typed_data_signer(digest, "0x" + signature.hex()) == (
+        Account.from_key(PRIVATE_KEY).address
+    )
+    with pytest.raises(ValueError):
+        recover_typed_data_signer(digest, signature[:64])
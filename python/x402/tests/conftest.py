@@ -4,6 +4,11 @@ Pytest 配置和测试夹具
 
 import pytest
 
+TEST_NETWORK = "eip155:97"
+TEST_PAY_TO = "0x1111111111111111111111111111111111111111"
+TEST_BUYER = "0x2222222222222222222222222222222222222222"
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
 
 @pytest.fixture
 def mock_tron_private_key():
@@ -45,3 +50,84 @@ def mock_evm_payment_requirements():
         payTo="0xTestMerchantAddress",
         maxTimeoutSeconds=3600,
     )
+
+
+@pytest.fixture
+def make_payment_requirements():
+    """构造支付要求：默认 BSC 测试网上 100 个最小单位的 USDT"""
+    from bankofai.x402.tokens import TokenRegistry
+    from bankofai.x402.types import PaymentRequirements
+
+    def make(
+        network: str = TEST_NETWORK,
+        amount: int | str = 100,
+        asset: str | None = None,
+        pay_to: str = TEST_PAY_TO,
+        scheme: str = "exact_permit",
+        **fields,
+    ) -> PaymentRequirements:
+        return PaymentRequirements(
+            scheme=scheme,
+            network=network,
+            amount=str(amount),
+            asset=asset or TokenRegistry.get_token(network, "USDT").address,
+            payTo=pay_to,
+            **fields,
+        )
+
+    return make
+
+
+@pytest.fixture
+def make_permit_payload(make_payment_requirements):
+    """构造 exact_permit 支付载荷：默认按 requirements 全额支付、无手续费"""
+    from bankofai.x402.types import (
+        Fee,
+        Payment,
+        PaymentPayload,
+        PaymentPayloadData,
+        PaymentPermit,
+        PermitMeta,
+    )
+
+    def make(
+        requirements=None,
+        *,
+        buyer: str = TEST_BUYER,
+        nonce: int | str = 1,
+        amount: int | str | None = None,
+        pay_to: str | None = None,
+        token: str | None = None,
+        caller: str = ZERO_ADDRESS,
+        fee_to: str | None = None,
+        fee_amount: int | str = 0,
+        payment_id: str = "0x" + "12" * 16,
+        valid_after: int = 0,
+        valid_before: int = 2_000_000_000,
+        signature: str = "0x" + "ab" * 65,
+    ) -> PaymentPayload:
+        requirements = requirements or make_payment_requirements()
+        permit = PaymentPermit(
+            meta=PermitMeta(
+                kind="PAYMENT_ONLY",
+                paymentId=payment_id,
+                nonce=str(nonce),
+                validAfter=valid_after,
+                validBefore=valid_before,
+            ),
+            buyer=buyer,
+            caller=caller,
+            payment=Payment(
+                payToken=token or requirements.asset,
+                payAmount=str(amount if amount is not None else requirements.amount),
+                payTo=pay_to or requirements.pay_to,
+            ),
+            fee=Fee(feeTo=fee_to or requirements.pay_to, feeAmount=str(fee_amount)),
+        )
+        return PaymentPayload(
+            x402Version=2,
+            payload=PaymentPayloadData(paymentPermit=permit, signature=signature),
+            accepted=requirements,
+        )
+
+    return make
@@ -0,0 +1,303 @@
+"""
+Tests for the facilitator ASGI app, driven through FacilitatorClient
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+
+from bankofai.x402.facilitator import FacilitatorApp, FacilitatorClient, X402Facilitator
+from bankofai.x402.facilitator.__main__ import create_facilitator, parse_args
+from bankofai.x402.facilitator.app import PaymentRequest
+from bankofai.x402.types import (
+    FeeInfo,
+    FeeQuoteResponse,
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+    VerifyResponse,
+)
+
+NETWORK = "eip155:97"
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK)
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements) -> PaymentPayload:
+    return make_permit_payload(requirements)
+
+
+@pytest.fixture
+def mechanism(requirements):
+    mechanism = MagicMock()
+    mechanism.scheme.return_value = "exact_permit"
+    mechanism.verify = AsyncMock(return_value=VerifyResponse(isValid=True))
+    mechanism.settle = AsyncMock(
+        return_value=SettleResponse(success=True, transaction="0xtx", network=NETWORK)
+    )
+    mechanism.fee_quote = AsyncMock(
+        return_value=FeeQuoteResponse(
+            fee=FeeInfo(feeTo="0xfee", feeAmount="1"),
+            pricing="flat",
+            scheme="exact_permit",
+            network=NETWORK,
+            asset=requirements.asset,
+            expiresAt=1,
+        )
+    )
+    return mechanism
+
+
+@pytest.fixture
+def app(mechanism):
+    app = FacilitatorApp(
+        X402Facilitator(fee_to="0xfee").register([NETWORK, "eip155:56"], mechanism),
+        settle_concurrency=1,
+        queue_timeout=0.05,
+        max_body_size=4096,
+    )
+    app.start()
+    return app
+
+
+def _client(app: FacilitatorApp) -> FacilitatorClient:
+    client = FacilitatorClient("http://facilitator")
+    client._http_client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://facilitator"
+    )
+    return client
+
+
+def _http(app: FacilitatorApp) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://f")
+
+
+@pytest.mark.asyncio
+async def test_protocol_round_trip(requirements, payload, app, mechanism):
+    client = _client(app)
+
+    supported = await client.supported()
+    quotes = await client.fee_quote([requirements], {"meta": {}})
+    verify = await client.verify(payload, requirements)
+    settle = await client.settle(payload, requirements)
+
+    assert {(k.network, k.scheme) for k in supported.kinds} == {
+        (NETWORK, "exact_permit"),
+        ("eip155:56", "exact_permit"),
+    }
+    assert quotes[0].fee.fee_amount == "1"
+    assert mechanism.fee_quote.await_args.args[1] == {"meta": {}}
+    assert verify.is_valid
+    assert settle.transaction == "0xtx"
+
+
+@pytest.mark.asyncio
+async def test_rejects_bad_requests(app):
+    async with _http(app) as http:
+        invalid = await http.post("/verify", content=b'{"paymentPayload": {}}')
+        too_large = await http.post("/settle", content=b"x" * 5000)
+        wrong_method = await http.get("/settle")
+        missing = await http.get("/nope")
+
+    assert invalid.status_code == 400
+    assert too_large.status_code == 413
+    assert wrong_method.status_code == 405
+    assert missing.status_code == 404
+
+
+def _scope(path: str, headers: list[tuple[bytes, bytes]] | None = None) -> dict:
+    return {"type": "http", "method": "POST", "path": path, "headers": headers or []}
+
+
+@pytest.mark.asyncio
+async def test_rejects_malformed_content_length(app):
+    sent: list[dict] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(_scope("/verify", [(b"content-length", b"abc")]), receive, send)
+
+    assert sent[0]["status"] == 400
+    assert b"Invalid content-length" in sent[1]["body"]
+
+
+@pytest.mark.asyncio
+async def test_request_in_flight_until_response_is_sent(requirements, payload, app):
+    body = PaymentRequest(paymentPayload=payload, paymentRequirements=requirements).model_dump_json(
+        by_alias=True
+    )
+    writing = asyncio.Event()
+    release = asyncio.Event()
+
+    async def receive():
+        return {"type": "http.request", "body": body.encode()}
+
+    async def send(message):
+        writing.set()
+        await release.wait()
+
+    request = asyncio.create_task(app(_scope("/verify"), receive, send))
+    await writing.wait()
+
+    assert app.inflight == 1
+    drain = asyncio.create_task(app.drain(timeout=1))
+    await asyncio.sleep(0.01)
+    assert not drain.done()
+    release.set()
+    await request
+    assert await drain
+
+
+@pytest.mark.asyncio
+async def test_settlements_are_bounded_per_network(
+    requirements, payload, make_permit_payload, make_payment_requirements, app, mechanism
+):
+    release = asyncio.Event()
+
+    async def slow_settle(payload, requirements):
+        await release.wait()
+        return SettleResponse(success=True, transaction="0xtx", network=requirements.network)
+
+    mechanism.settle.side_effect = slow_settle
+    client = _client(app)
+
+    first = asyncio.create_task(client.settle(payload, requirements))
+    await asyncio.sleep(0.01)
+    with pytest.raises(httpx.HTTPStatusError) as busy:
+        await client.settle(payload, requirements)
+    # Another network has its own limit
+    bsc = make_payment_requirements("eip155:56")
+    other = asyncio.create_task(client.settle(make_permit_payload(bsc), bsc))
+    await asyncio.sleep(0.01)
+    release.set()
+
+    assert busy.value.response.status_code == 503
+    assert busy.value.response.headers["retry-after"] == "1"
+    assert (await first).success
+    assert (await other).success
+
+
+@pytest.mark.asyncio
+async def test_drain_waits_for_inflight_settlement(requirements, payload, app, mechanism):
+    release = asyncio.Event()
+
+    async def slow_settle(payload, requirements):
+        await release.wait()
+        return SettleResponse(success=True, transaction="0xtx", network=NETWORK)
+
+    mechanism.settle.side_effect = slow_settle
+    client = _client(app)
+
+    settle = asyncio.create_task(client.settle(payload, requirements))
+    await asyncio.sleep(0.01)
+    drain = asyncio.create_task(app.drain(timeout=1))
+    await asyncio.sleep(0.01)
+
+    async with _http(app) as http:
+        ready = await http.get("/ready")
+        health = await http.get("/health")
+        rejected = await http.post("/verify", content=b"{}")
+
+    assert not drain.done()
+    release.set()
+    assert await drain
+    assert (await settle).success
+    assert ready.status_code == 503
+    assert health.status_code == 200
+    assert rejected.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_mechanism_errors_become_500(requirements, payload, app, mechanism):
+    mechanism.verify.side_effect = RuntimeError("rpc down")
+
+    async with _http(app) as http:
+        response = await http.post(
+            "/verify",
+            content=(
+                '{"paymentPayload": %s, "paymentRequirements": %s}'
+                % (payload.model_dump_json(by_alias=True), requirements.model_dump_json())
+            ),
+        )
+
+    assert response.status_code == 500
+
+
+def test_cli_builds_facilitator_from_environment():
+    args = parse_args(["--networks", "eip155:97", "--base-fee", "USDT=100", "--workers", "4"])
+    facilitator = create_facilitator(
+        args.networks, args.base_fee, env={"BSC_PRIVATE_KEY": "0x" + "01" * 32}
+    )
+
+    assert args.workers == 4
+    assert {k.scheme for k in facilitator.supported().kinds} == {"exact", "exact_permit"}
+    with pytest.raises(ValueError, match="TRON_PRIVATE_KEY"):
+        create_facilitator(["tron:nile"], env={})
+
+
+@pytest.mark.asyncio
+async def test_compact_round_trip(requirements, payload, app, mechanism):
+    client = _client(app)
+    client._compact = True
+
+    quotes = await client.fee_quote([requirements])
+    verify = await client.verify(payload, requirements)
+    settle = await client.settle(payload, requirements)
+
+    assert client._compact
+    assert quotes[0].fee.fee_amount == "1"
+    assert verify.is_valid
+    assert settle.transaction == "0xtx"
+    assert mechanism.settle.await_args.args[0] == payload
+
+
+@pytest.mark.asyncio
+async def test_compact_falls_back_to_json(requirements, payload, app, mechanism):
+    inner = httpx.ASGITransport(app=app)
+    content_types: list[str] = []
+
+    class JsonOnly(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request):
+            content_types.append(request.headers["content-type"])
+            if request.headers["content-type"] != "application/json":
+                return httpx.Response(415, json={"error": "Unsupported media type"})
+            return await inner.handle_async_request(request)
+
+    client = FacilitatorClient("http://facilitator", compact=True)
+    client._http_client = httpx.AsyncClient(transport=JsonOnly(), base_url="http://facilitator")
+
+    assert (await client.settle(payload, requirements)).transaction == "0xtx"
+    assert (await client.verify(payload, requirements)).is_valid
+    assert content_types == ["application/x402-compact", "application/json", "application/json"]
+
+
+@pytest.mark.asyncio
+async def test_invalid_request_keeps_compact_format(app):
+    client = _client(app)
+    client._compact = True
+
+    with pytest.raises(httpx.HTTPStatusError) as e:
+        await client._post("/verify", {"paymentPayload": {}})
+
+    assert e.value.response.status_code == 400
+    assert client._compact
+
+
+@pytest.mark.asyncio
+async def test_rejects_malformed_compact_body(app):
+    async with _http(app) as http:
+        response = await http.post(
+            "/verify", content=b"\xc1\xff", headers={"content-type": "application/x402-compact"}
+        )
+
+    assert response.status_code == 415
@@ -0,0 +1,243 @@
+"""
+Tests for batched exact_permit settlement through Multicall3, against the local chain
+"""
+
+import asyncio
+
+import pytest
+
+from bankofai.x402.config import NetworkConfig
+from bankofai.x402.mechanisms._exact_permit_base.batcher import (
+    PermitSettlementBatcher,
+    extract_transfers,
+)
+from bankofai.x402.mechanisms.evm.exact_permit import ExactPermitEvmFacilitatorMechanism
+from bankofai.x402.testing import LocalChain, LocalChainSigner
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    TransactionReceipt,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+MULTICALL = NetworkConfig.get_multicall_address(NETWORK)
+
+
+def _token() -> str:
+    return TokenRegistry.get_token(NETWORK, "USDT").address
+
+
+def _buyer(i: int) -> str:
+    return "0x" + format(0xB000 + i, "040x")
+
+
+@pytest.fixture
+def chain():
+    chain = LocalChain(NETWORK)
+    for i in range(20):
+        chain.mint(_token(), _buyer(i), 10**6)
+    return chain
+
+
+def _mechanism(chain: LocalChain, **batcher_kwargs) -> ExactPermitEvmFacilitatorMechanism:
+    signer = LocalChainSigner(chain)
+    batcher = PermitSettlementBatcher(signer, [NETWORK], **batcher_kwargs)
+    return ExactPermitEvmFacilitatorMechanism(signer, base_fee={"USDT": 10}, batcher=batcher)
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK, pay_to=PAY_TO)
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements):
+    def make(
+        mechanism: ExactPermitEvmFacilitatorMechanism,
+        buyer: int,
+        nonce: int = 1,
+        amount: int = 100,
+        caller: str | None = None,
+    ) -> PaymentPayload:
+        return make_permit_payload(
+            requirements,
+            buyer=_buyer(buyer),
+            nonce=nonce,
+            amount=amount,
+            caller=caller or mechanism._get_caller(NETWORK),
+            fee_to=mechanism._fee_to,
+            fee_amount=10,
+        )
+
+    return make
+
+
+@pytest.mark.asyncio
+async def test_fee_quote_names_multicall_as_caller(requirements, chain):
+    mechanism = _mechanism(chain)
+    quote = await mechanism.fee_quote(requirements)
+    assert quote.fee.caller == MULTICALL
+
+
+@pytest.mark.asyncio
+async def test_concurrent_settlements_share_one_transaction(requirements, payload, chain):
+    mechanism = _mechanism(chain, max_wait=0.01)
+    payloads = [payload(mechanism, i) for i in range(10)]
+
+    results = await asyncio.gather(*(mechanism.settle(p, requirements) for p in payloads))
+
+    assert all(r.success for r in results)
+    assert len({r.transaction for r in results}) == 1
+    assert chain.stats["broadcasts"] == 1
+    assert chain.balance_of(_token(), PAY_TO) == 1000
+    assert chain.balance_of(_token(), _buyer(0)) == 10**6 - 110
+
+
+@pytest.mark.asyncio
+async def test_per_item_failures_are_reported(requirements, payload, chain):
+    mechanism = _mechanism(chain, max_wait=0.01)
+    payloads = [
+        payload(mechanism, 0),
+        payload(mechanism, 1, amount=10**7),  # insufficient balance
+        payload(mechanism, 2),
+        payload(mechanism, 2),  # same nonce as the previous permit
+    ]
+
+    results = await asyncio.gather(*(mechanism.settle(p, requirements) for p in payloads))
+
+    assert [r.success for r in results] == [True, False, True, False]
+    assert results[1].error_reason == "transaction_failed_on_chain"
+    assert results[1].transaction == results[0].transaction
+    assert chain.stats["broadcasts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_equal_permit_relayed_first_is_resolved_by_nonce(requirements, payload, chain):
+    """Only as many permits as the batch transferred get its transaction"""
+    mechanism = _mechanism(chain, max_wait=0.05)
+    first, second = payload(mechanism, 0, nonce=1), payload(mechanism, 0, nonce=2)
+    permit = first.payload.payment_permit
+
+    async def relay() -> None:
+        # Anyone can make the public Multicall3 the caller of a permit
+        await asyncio.sleep(0.01)
+        await chain.send_transaction(
+            MULTICALL,
+            NetworkConfig.get_payment_permit_address(NETWORK),
+            "permitTransferFrom",
+            [mechanism._build_permit_tuple(permit, evm_format=True), permit.buyer, b""],
+        )
+
+    results = await asyncio.gather(
+        mechanism.settle(first, requirements),
+        mechanism.settle(second, requirements),
+        relay(),
+    )
+
+    settled = [r for r in results[:2] if r.success]
+    relayed = [r for r in results[:2] if not r.success]
+    assert len(settled) == 1 and len(relayed) == 1
+    assert relayed[0].error_reason == "nonce_already_used"
+    assert relayed[0].transaction is None and relayed[0].receipt is None
+    assert chain.nonce_used(_buyer(0), 1) and chain.nonce_used(_buyer(0), 2)
+    assert chain.balance_of(_token(), PAY_TO) == 200
+
+
+@pytest.mark.asyncio
+async def test_receipt_timeout_keeps_transaction_hash(requirements, payload, chain):
+    mechanism = _mechanism(chain, max_wait=0.01)
+
+    async def timeout(tx_hash, timeout=120, network=""):
+        raise TimeoutError(f"Transaction {tx_hash} not confirmed")
+
+    mechanism._signer.wait_for_transaction_receipt = timeout
+    result = await mechanism.settle(payload(mechanism, 0), requirements)
+
+    assert not result.success
+    assert result.error_reason == "transaction_failed"
+    assert result.transaction is not None
+    assert chain.stats["broadcasts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_split_by_size(requirements, payload, chain):
+    mechanism = _mechanism(chain, max_batch_size=4, max_wait=0.01)
+    payloads = [payload(mechanism, i) for i in range(10)]
+
+    results = await asyncio.gather(*(mechanism.settle(p, requirements) for p in payloads))
+
+    assert all(r.success for r in results)
+    assert chain.stats["broadcasts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_permit_for_facilitator_caller_settles_singly(requirements, payload, chain):
+    mechanism = _mechanism(chain)
+    payload = payload(mechanism, 0, caller=mechanism._caller)
+
+    result = await mechanism.settle(payload, requirements)
+
+    assert result.success
+    assert chain.stats["permit_transfers"] == 1
+
+
+@pytest.mark.asyncio
+async def test_network_not_enabled_is_not_batched(requirements, payload, chain):
+    signer = LocalChainSigner(chain)
+    batcher = PermitSettlementBatcher(signer, ["eip155:56"])
+    mechanism = ExactPermitEvmFacilitatorMechanism(signer, base_fee={"USDT": 10}, batcher=batcher)
+
+    quote = await mechanism.fee_quote(requirements)
+    result = await mechanism.settle(payload(mechanism, 0), requirements)
+
+    assert quote.fee.caller == mechanism._caller
+    assert result.success
+    assert chain.stats["broadcasts"] == 1
+
+
+def test_network_without_multicall_cannot_be_enabled(chain, monkeypatch):
+    monkeypatch.delitem(NetworkConfig.MULTICALL_ADDRESSES, NETWORK)
+
+    with pytest.raises(ValueError, match="Multicall3"):
+        PermitSettlementBatcher(LocalChainSigner(chain), [NETWORK])
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_waiting_settlements(requirements, payload, chain):
+    mechanism = _mechanism(chain, max_wait=0.01)
+    batcher = mechanism._batcher
+    started = asyncio.Event()
+
+    async def hang(*args, **kwargs):
+        started.set()
+        await asyncio.Event().wait()
+
+    mechanism._signer.write_contract = hang
+    settle = asyncio.ensure_future(mechanism.settle(payload(mechanism, 0), requirements))
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(settle, 1)
+
+
+def test_extract_transfers_from_tron_transaction_info():
+    topic = "ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+    info = {
+        "log": [
+            {
+                "address": "a614f803b6fd780986a42c78ec9c7f77e6ded13c",
+                "topics": [topic, "00" * 12 + "11" * 20, "00" * 12 + "22" * 20],
+                "data": format(5, "064x"),
+            }
+        ]
+    }
+
+    transfers = extract_transfers(
+        TransactionReceipt.from_signer_result({"status": "confirmed", "receipt": info})
+    )
+
+    assert transfers[("a614f803b6fd780986a42c78ec9c7f77e6ded13c", "11" * 20, "22" * 20, 5)] == 1
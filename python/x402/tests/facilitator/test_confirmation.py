@@ -0,0 +1,164 @@
+"""
+Tests for progressive settlement confirmation (broadcast, included, final)
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bankofai.x402.mechanisms._base.confirmation import SettlementConfirmer
+from bankofai.x402.mechanisms.evm.exact_permit import ExactPermitEvmFacilitatorMechanism
+from bankofai.x402.testing import LocalChain, LocalChainSigner
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    PaymentRequirementsExtra,
+    SettleResponse,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+BUYER = "0x000000000000000000000000000000000000b001"
+
+
+def _token() -> str:
+    return TokenRegistry.get_token(NETWORK, "USDT").address
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK, pay_to=PAY_TO, extra=PaymentRequirementsExtra())
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements):
+    def make(mechanism: ExactPermitEvmFacilitatorMechanism, nonce: int) -> PaymentPayload:
+        return make_permit_payload(
+            requirements,
+            buyer=BUYER,
+            nonce=nonce,
+            caller=mechanism._get_caller(NETWORK),
+            fee_to=mechanism._fee_to,
+        )
+
+    return make
+
+
+class Reports:
+    """on_confirmation callback collecting reports"""
+
+    def __init__(self) -> None:
+        self.responses: list[SettleResponse] = []
+        self.changed = asyncio.Event()
+
+    async def __call__(self, response: SettleResponse) -> None:
+        self.responses.append(response)
+        self.changed.set()
+
+    async def wait(self, count: int) -> list[SettleResponse]:
+        while len(self.responses) < count:
+            self.changed.clear()
+            await asyncio.wait_for(self.changed.wait(), 2)
+        return self.responses
+
+
+def _mechanism(chain: LocalChain, level: str = "included", reports: Reports | None = None):
+    signer = LocalChainSigner(chain)
+    confirmer = SettlementConfirmer(signer, level, on_confirmation=reports)
+    mechanism = ExactPermitEvmFacilitatorMechanism(
+        signer, base_fee={"USDT": 0}, confirmer=confirmer
+    )
+    return mechanism, confirmer
+
+
+@pytest.fixture
+def chain():
+    chain = LocalChain(NETWORK, block_time=0.2, finality_time=0.2)
+    chain.mint(_token(), BUYER, 10**6)
+    return chain
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError):
+        SettlementConfirmer(AsyncMock(), "mined")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_answers_before_inclusion(requirements, payload, chain):
+    reports = Reports()
+    mechanism, confirmer = _mechanism(chain, "broadcast", reports)
+
+    start = time.perf_counter()
+    result = await mechanism.settle(payload(mechanism, 1), requirements)
+
+    assert time.perf_counter() - start < 0.1
+    assert (result.success, result.confirmation, result.receipt) == (True, "broadcast", None)
+
+    included, final = await reports.wait(2)
+    assert (included.confirmation, included.transaction) == ("included", result.transaction)
+    assert included.receipt.succeeded
+    assert final.confirmation == "final"
+    assert confirmer.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_reports_a_revert(requirements, payload, chain):
+    reports = Reports()
+    mechanism, _ = _mechanism(chain, "broadcast", reports)
+    requirements.amount = str(10**7)
+    reverting = payload(mechanism, 2)
+
+    result = await mechanism.settle(reverting, requirements)
+    assert (result.success, result.confirmation) == (True, "broadcast")
+
+    (failed,) = await reports.wait(1)
+    assert (failed.success, failed.error_reason) == (False, "transaction_failed_on_chain")
+    # The nonce is only marked used once the transaction succeeded
+    assert not await mechanism._nonce_used(reverting.payload.payment_permit, NETWORK)
+
+
+@pytest.mark.asyncio
+async def test_included_by_default_without_follow_up(requirements, payload, chain):
+    mechanism, confirmer = _mechanism(chain)
+
+    result = await mechanism.settle(payload(mechanism, 3), requirements)
+
+    assert (result.success, result.confirmation) == (True, "included")
+    assert result.receipt.succeeded
+    assert confirmer.pending == 0
+    assert chain.stats["finality_requests"] == 0
+
+
+@pytest.mark.asyncio
+async def test_route_level_overrides_default(requirements, payload, chain):
+    mechanism, confirmer = _mechanism(chain, "broadcast")
+
+    requirements.extra = PaymentRequirementsExtra(confirmation="final")
+
+    start = time.perf_counter()
+    result = await mechanism.settle(payload(mechanism, 4), requirements)
+
+    assert time.perf_counter() - start >= 0.35
+    assert (result.success, result.confirmation) == (True, "final")
+    assert confirmer.stats == {"final": 1}
+
+
+@pytest.mark.asyncio
+async def test_final_falls_back_to_included_without_finality(requirements):
+    signer = AsyncMock()
+    signer.wait_for_transaction_receipt.return_value = {
+        "hash": "0x01",
+        "blockNumber": "7",
+        "status": "confirmed",
+        "receipt": {},
+    }
+    signer.wait_for_finality.side_effect = NotImplementedError
+    confirmer = SettlementConfirmer(signer, "final")
+
+    result = await confirmer.confirm("0x01", requirements)
+
+    assert (result.success, result.confirmation) == (True, "included")
+    signer.wait_for_finality.assert_awaited_once_with(7, network=NETWORK)
@@ -191,6 +191,16 @@ class TestSettle:
         assert result.success is False
         assert result.error_reason == "transaction_failed"
 
+    @pytest.mark.anyio
+    async def test_settle_missing_permit(self, mock_signer, valid_payload, base_requirements):
+        valid_payload.payload.payment_permit = None
+        mechanism = ExactPermitEvmFacilitatorMechanism(mock_signer, base_fee={"USDC": 0})
+        result = await mechanism.settle(valid_payload, base_requirements)
+
+        assert result.success is False
+        assert result.error_reason == "missing_payment_permit"
+        mock_signer.write_contract.assert_not_called()
+
     @pytest.mark.anyio
     async def test_settle_fee_amount_mismatch(self, mock_signer, valid_payload, base_requirements):
         valid_payload.payload.payment_permit.fee.fee_amount = "0"
@@ -55,3 +55,151 @@ async def test_evm_verify_typed_data_invalid(mock_evm_private_key):
 
     valid = await signer.verify_typed_data(signer.get_address(), domain, types, message, signature)
     assert valid is False
+
+
+@pytest.mark.asyncio
+async def test_evm_receipts_share_one_watcher(mock_evm_private_key):
+    """Test concurrent receipt waits are served by the network's watcher"""
+    import asyncio
+
+    from bankofai.x402.testing.local_evm_node import LocalEvmNode
+    from bankofai.x402.utils.receipt_watcher import EvmReceiptSource, ReceiptWatcher
+
+    node = LocalEvmNode(block_time=0.02)
+    signer = EvmFacilitatorSigner.from_private_key(mock_evm_private_key)
+    signer._async_web3_clients["eip155:97"] = node.web3()
+    signer._receipt_watchers["eip155:97"] = ReceiptWatcher(
+        EvmReceiptSource(signer._async_web3_clients["eip155:97"]), poll_interval=0.01
+    )
+    tx_hashes = ["0x" + f"{i:064x}" for i in range(20)]
+    for tx_hash in tx_hashes:
+        node.include(tx_hash, status=0 if tx_hash == tx_hashes[0] else 1)
+
+    results = await asyncio.gather(
+        *(signer.wait_for_transaction_receipt(h, timeout=5, network="eip155:97") for h in tx_hashes)
+    )
+
+    assert [r["status"] for r in results] == ["failed"] + ["confirmed"] * 19
+    assert results[1]["blockNumber"] == str(node.transactions[tx_hashes[1]]["block"])
+    assert signer.receipt_watcher("eip155:97").stats["resolved"] == 20
+    assert "eth_getTransactionReceipt" not in node.stats
+
+
+def _local_signer(private_key: str, **node_kwargs):
+    from bankofai.x402.signers.facilitator.evm_signer import CACHED_REQUESTS
+    from bankofai.x402.testing.local_evm_node import LocalEvmNode
+    from bankofai.x402.utils.receipt_watcher import EvmReceiptSource, ReceiptWatcher
+
+    node = LocalEvmNode(**node_kwargs)
+    # Configured like the signer's own providers
+    for name, value in CACHED_REQUESTS.items():
+        setattr(node, name, value)
+    signer = EvmFacilitatorSigner.from_private_key(private_key)
+    signer._async_web3_clients["eip155:97"] = node.web3()
+    signer._receipt_watchers["eip155:97"] = ReceiptWatcher(
+        EvmReceiptSource(signer._async_web3_clients["eip155:97"]), poll_interval=0.01
+    )
+    return node, signer
+
+
+async def _approve(signer: EvmFacilitatorSigner, amount: int = 1) -> str | None:
+    from bankofai.x402.abi import ERC20_ABI
+
+    return await signer.write_contract(
+        "0x55d398326f99059fF775485246999027B3197955",
+        ERC20_ABI,
+        "approve",
+        ["0x1111111111111111111111111111111111111111", amount],
+        "eip155:97",
+    )
+
+
+@pytest.mark.asyncio
+async def test_evm_concurrent_settlements_pipeline_nonces(mock_evm_private_key):
+    """Test 100 concurrent transactions get distinct nonces without per-send lookups"""
+    import asyncio
+
+    node, signer = _local_signer(mock_evm_private_key, latency=0.001)
+    sender = signer.get_address().lower()
+    node.nonces[sender] = 40
+
+    async def settle(i: int) -> dict:
+        tx_hash = await _approve(signer, i)
+        return await signer.wait_for_transaction_receipt(tx_hash, timeout=5, network="eip155:97")
+
+    receipts = await asyncio.gather(*(settle(i) for i in range(100)))
+
+    assert {r["status"] for r in receipts} == {"confirmed"}
+    assert sorted(tx["nonce"] for tx in node.transactions.values()) == list(range(40, 140))
+    assert node.nonces[sender] == 140
+    assert node.stats["eth_getTransactionCount"] == 1
+    assert node.stats["eth_chainId"] == 1
+    # Fee fields are shared; gas is still estimated per transaction
+    assert node.stats["eth_maxPriorityFeePerGas"] == 1
+    assert node.stats["eth_estimateGas"] == 100
+
+
+@pytest.mark.asyncio
+async def test_evm_nonce_too_low_resyncs(mock_evm_private_key):
+    """Test a nonce used by another sender of the account is detected and skipped"""
+    node, signer = _local_signer(mock_evm_private_key)
+    assert await _approve(signer)
+
+    # Transactions sent by another process with the same key
+    node.nonces[signer.get_address().lower()] += 3
+
+    assert await _approve(signer)
+    assert signer.nonces.stats["resyncs"] == 1
+    assert sorted(tx["nonce"] for tx in node.transactions.values()) == [0, 4]
+
+
+@pytest.mark.asyncio
+async def test_evm_dropped_transaction_resyncs(mock_evm_private_key):
+    """Test the nonce of a transaction that never gets mined is used again"""
+    node, signer = _local_signer(mock_evm_private_key)
+    node.drop_transactions = True
+    dropped = await _approve(signer)
+
+    with pytest.raises(TimeoutError):
+        await signer.wait_for_transaction_receipt(dropped, timeout=0.05, network="eip155:97")
+
+    node.drop_transactions = False
+    tx_hash = await _approve(signer)
+    await signer.wait_for_transaction_receipt(tx_hash, timeout=1, network="eip155:97")
+    assert [tx["nonce"] for tx in node.transactions.values()] == [0]
+
+
+@pytest.mark.asyncio
+async def test_evm_ambiguous_send_failure_resyncs(mock_evm_private_key):
+    """Test a send that fails after the node accepted it does not reuse its nonce"""
+    node, signer = _local_signer(mock_evm_private_key)
+    eth = signer._async_web3_clients["eip155:97"].eth
+    send = eth.send_raw_transaction
+
+    async def accepted_then_timed_out(raw):
+        await send(raw)
+        raise TimeoutError("request timed out")
+
+    eth.send_raw_transaction = accepted_then_timed_out
+    assert await _approve(signer) is None
+    eth.send_raw_transaction = send
+
+    assert await _approve(signer)
+    assert sorted(tx["nonce"] for tx in node.transactions.values()) == [0, 1]
+    assert signer.nonces.stats["released"] == 0
+    assert signer.nonces.stats["resyncs"] == 1
+    assert node.stats["eth_sendRawTransaction"] == 2
+
+
+@pytest.mark.asyncio
+async def test_evm_unsent_nonce_is_reused(mock_evm_private_key):
+    """Test a transaction failing before it is sent leaves no nonce gap"""
+    node, signer = _local_signer(mock_evm_private_key)
+    node.revert_estimates = True
+    assert await _approve(signer) is None
+
+    node.revert_estimates = False
+    assert await _approve(signer)
+    assert await _approve(signer)
+    assert sorted(tx["nonce"] for tx in node.transactions.values()) == [0, 1]
+    assert node.stats["eth_getTransactionCount"] == 1
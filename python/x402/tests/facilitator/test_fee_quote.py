@@ -0,0 +1,106 @@
+"""
+Tests for concurrent, deduplicated and memoized fee quoting in X402Facilitator
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from bankofai.x402.facilitator import X402Facilitator
+from bankofai.x402.types import FeeInfo, FeeQuoteResponse, PaymentRequirements
+
+USDT = "0x55d398326f99059fF775485246999027B3197955"
+USDD = "0x6B175474E89094C44Da98b954EedeAC495271d0F"
+
+
+def _accept(network: str = "eip155:97", asset: str = USDT, amount: str = "100"):
+    return PaymentRequirements(
+        scheme="exact_permit", network=network, amount=amount, asset=asset, payTo="0xpay"
+    )
+
+
+class _Mechanism:
+    def __init__(self, expires_in: int = 300, delay: float = 0.0) -> None:
+        self.calls: list[tuple[str, str]] = []
+        self.expires_in = expires_in
+        self.delay = delay
+        self.scheme = MagicMock(return_value="exact_permit")
+
+    async def fee_quote(self, accept, context=None):
+        self.calls.append((accept.network, accept.asset))
+        await asyncio.sleep(self.delay)
+        return FeeQuoteResponse(
+            fee=FeeInfo(feeTo="0xfee", feeAmount="1"),
+            pricing="flat",
+            scheme=accept.scheme,
+            network=accept.network,
+            asset=accept.asset,
+            expiresAt=int(time.time()) + self.expires_in,
+        )
+
+
+@pytest.mark.asyncio
+async def test_identical_accepts_are_quoted_once():
+    mechanism = _Mechanism()
+    facilitator = X402Facilitator().register(["eip155:97", "eip155:56"], mechanism)
+
+    quotes = await facilitator.fee_quote(
+        [_accept(), _accept(amount="200"), _accept(asset=USDD), _accept("eip155:56")]
+    )
+
+    assert len(quotes) == 4
+    assert quotes[0] is quotes[1]
+    assert sorted(mechanism.calls) == sorted(
+        [("eip155:97", USDT), ("eip155:97", USDD), ("eip155:56", USDT)]
+    )
+
+
+@pytest.mark.asyncio
+async def test_distinct_accepts_are_quoted_concurrently():
+    mechanism = _Mechanism(delay=0.1)
+    facilitator = X402Facilitator().register(["eip155:97"], mechanism)
+
+    start = time.perf_counter()
+    await facilitator.fee_quote([_accept(asset=USDT), _accept(asset=USDD)])
+
+    assert time.perf_counter() - start < 0.19
+
+
+@pytest.mark.asyncio
+async def test_quotes_are_reused_until_expiry():
+    mechanism = _Mechanism()
+    facilitator = X402Facilitator().register(["eip155:97"], mechanism)
+
+    first = await facilitator.fee_quote([_accept()])
+    second = await facilitator.fee_quote([_accept()])
+    facilitator.clear_fee_quote_cache()
+    third = await facilitator.fee_quote([_accept()])
+
+    assert first[0] is second[0]
+    assert third[0] is not first[0]
+    assert len(mechanism.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_quotes_near_expiry_are_not_cached():
+    mechanism = _Mechanism(expires_in=10)
+    facilitator = X402Facilitator().register(["eip155:97"], mechanism)
+
+    await facilitator.fee_quote([_accept()])
+    await facilitator.fee_quote([_accept()])
+
+    assert len(mechanism.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_caching_can_be_disabled_and_unsupported_skipped():
+    mechanism = _Mechanism()
+    facilitator = X402Facilitator(cache_fee_quotes=False).register(["eip155:97"], mechanism)
+
+    await facilitator.fee_quote([_accept()])
+    quotes = await facilitator.fee_quote([_accept(), _accept("tron:nile")])
+
+    assert len(quotes) == 1
+    assert len(mechanism.calls) == 2
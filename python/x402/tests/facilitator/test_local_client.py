@@ -0,0 +1,103 @@
+"""
+Tests for the in-process and Unix-socket facilitator transports
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bankofai.x402.facilitator import FacilitatorClient, LocalFacilitatorClient, X402Facilitator
+from bankofai.x402.server import X402Server
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    SettleResponse,
+    VerifyResponse,
+)
+
+NETWORK = "eip155:97"
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK)
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements) -> PaymentPayload:
+    return make_permit_payload(requirements)
+
+
+@pytest.fixture
+def mechanism():
+    mechanism = MagicMock()
+    mechanism.scheme.return_value = "exact_permit"
+    mechanism.verify = AsyncMock(return_value=VerifyResponse(isValid=True))
+    mechanism.settle = AsyncMock(return_value=SettleResponse(success=True, transaction="0xtx"))
+    mechanism.fee_quote = AsyncMock(return_value=None)
+    return mechanism
+
+
+@pytest.mark.asyncio
+async def test_local_client_passes_models_by_reference(requirements, payload, mechanism):
+    client = LocalFacilitatorClient(X402Facilitator(fee_to="0xfee").register([NETWORK], mechanism))
+
+    settle = await client.settle(payload, requirements)
+    supported = await client.supported()
+
+    assert mechanism.settle.await_args.args[0] is payload
+    assert mechanism.settle.await_args.args[1] is requirements
+    assert settle is mechanism.settle.return_value
+    assert supported.fee.fee_to == "0xfee"
+    assert client.facilitator_id == "local"
+
+
+@pytest.mark.asyncio
+async def test_server_uses_local_client(requirements, payload, mechanism):
+    facilitator = X402Facilitator().register([NETWORK], mechanism)
+    server = X402Server(auto_register_tron=False).set_facilitator(
+        LocalFacilitatorClient(facilitator)
+    )
+
+    verify = await server.verify_payment(payload, requirements)
+    settle = await server.settle_payment(payload, requirements)
+
+    assert verify.is_valid
+    assert settle.transaction == "0xtx"
+
+
+@pytest.mark.asyncio
+async def test_client_over_unix_socket(tmp_path):
+    path = str(tmp_path / "facilitator.sock")
+    requests: list[bytes] = []
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        requests.append(await reader.readuntil(b"\r\n\r\n"))
+        body = json.dumps(
+            {
+                "kinds": [{"x402Version": 2, "scheme": "exact_permit", "network": NETWORK}],
+                "fee": {"feeTo": "0xfee", "pricing": "flat"},
+            }
+        ).encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+            + b"content-length: %d\r\nconnection: close\r\n\r\n" % len(body)
+            + body
+        )
+        await writer.drain()
+        writer.close()
+
+    unix_server = await asyncio.start_unix_server(handle, path=path)
+    client = FacilitatorClient("http://facilitator", uds=path)
+    try:
+        supported = await client.supported()
+    finally:
+        await client.close()
+        unix_server.close()
+        await unix_server.wait_closed()
+
+    assert supported.kinds[0].network == NETWORK
+    assert requests[0].startswith(b"GET /supported HTTP/1.1")
+    assert client.facilitator_id == f"unix:{path}"
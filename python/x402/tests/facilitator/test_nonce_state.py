@@ -0,0 +1,167 @@
+"""
+Tests for the on-chain nonce pre-check (nonceBitmap / authorizationState)
+"""
+
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bankofai.x402.mechanisms._base.nonce_state import NonceStateService
+from bankofai.x402.mechanisms.evm.exact import ExactEvmFacilitatorMechanism
+from bankofai.x402.mechanisms.evm.exact_permit import ExactPermitEvmFacilitatorMechanism
+from bankofai.x402.testing import LocalChain, LocalChainSigner
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentPayloadData,
+    PaymentRequirements,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+BUYER = "0x000000000000000000000000000000000000b001"
+PERMIT = "0x00000000000000000000000000000000000000aa"
+
+
+def _token() -> str:
+    return TokenRegistry.get_token(NETWORK, "USDT").address
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK, pay_to=PAY_TO)
+
+
+@pytest.fixture
+def permit_payload(make_permit_payload, requirements):
+    def make(mechanism: ExactPermitEvmFacilitatorMechanism, nonce: int) -> PaymentPayload:
+        return make_permit_payload(
+            requirements,
+            buyer=BUYER,
+            nonce=nonce,
+            caller=mechanism._get_caller(NETWORK),
+            fee_to=mechanism._fee_to,
+        )
+
+    return make
+
+
+@pytest.fixture
+def chain():
+    chain = LocalChain(NETWORK)
+    chain.mint(_token(), BUYER, 10**6)
+    return chain
+
+
+class TestNonceStateService:
+    @pytest.mark.asyncio
+    async def test_one_view_call_covers_a_word(self, chain):
+        state = NonceStateService(LocalChainSigner(chain))
+
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 1) is False
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 2) is False
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 256) is False
+
+        # Nonces 1 and 2 share word 0, nonce 256 is in word 1
+        assert state.stats["view_calls"] == 2
+        assert state.stats["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_marks_answer_without_view_calls(self, chain):
+        state = NonceStateService(LocalChainSigner(chain))
+        state.mark_permit_nonce_used(NETWORK, BUYER.upper().replace("0X", "0x"), 7)
+
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 7) is True
+        assert chain.stats["calls"] == 0
+
+    @pytest.mark.asyncio
+    async def test_marks_survive_refresh(self, chain):
+        state = NonceStateService(LocalChainSigner(chain), word_ttl=0)
+        state.mark_permit_nonce_used(NETWORK, BUYER, 7)
+
+        # Unset bit is stale: the word is read again, the local mark is kept
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 8) is False
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 7) is True
+
+    @pytest.mark.asyncio
+    async def test_unreadable_state_is_unknown(self):
+        signer = AsyncMock()
+        signer.read_contract.side_effect = NotImplementedError
+        state = NonceStateService(signer)
+
+        assert await state.permit_nonce_used(NETWORK, PERMIT, BUYER, 1) is None
+        assert await state.authorization_used(NETWORK, _token(), BUYER, b"\x01" * 32) is None
+        assert state.stats["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_used_authorizations_are_remembered(self):
+        signer = AsyncMock()
+        signer.read_contract.return_value = True
+        state = NonceStateService(signer)
+
+        assert await state.authorization_used(NETWORK, _token(), BUYER, b"\x01" * 32)
+        assert await state.authorization_used(NETWORK, _token(), BUYER, b"\x01" * 32)
+        assert signer.read_contract.await_count == 1
+
+    def test_invalid_max_entries(self):
+        with pytest.raises(ValueError):
+            NonceStateService(AsyncMock(), max_entries=0)
+
+
+@pytest.mark.asyncio
+async def test_consumed_permit_fails_before_broadcast(requirements, permit_payload, chain):
+    mechanism = ExactPermitEvmFacilitatorMechanism(LocalChainSigner(chain), base_fee={"USDT": 0})
+
+    first = await mechanism.settle(permit_payload(mechanism, 5), requirements)
+    replay = await mechanism.settle(permit_payload(mechanism, 5), requirements)
+
+    assert first.success
+    assert (replay.success, replay.error_reason) == (False, "nonce_already_used")
+    assert chain.stats["broadcasts"] == 1
+    # The replay was answered from the optimistic mark
+    assert chain.stats["calls"] == 1
+
+
+@pytest.mark.asyncio
+async def test_permit_consumed_elsewhere_fails_before_broadcast(
+    requirements, permit_payload, chain
+):
+    other = ExactPermitEvmFacilitatorMechanism(LocalChainSigner(chain), base_fee={"USDT": 0})
+    await other.settle(permit_payload(other, 9), requirements)
+
+    mechanism = ExactPermitEvmFacilitatorMechanism(LocalChainSigner(chain), base_fee={"USDT": 0})
+    result = await mechanism.settle(permit_payload(mechanism, 9), requirements)
+
+    assert result.error_reason == "nonce_already_used"
+    assert chain.stats["broadcasts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_used_authorization_fails_before_broadcast(make_payment_requirements):
+    signer = AsyncMock()
+    signer.get_address = lambda: PAY_TO
+    signer.read_contract.return_value = True
+    mechanism = ExactEvmFacilitatorMechanism(signer)
+    mechanism.verify = AsyncMock(return_value=AsyncMock(is_valid=True))
+    requirements = make_payment_requirements(NETWORK, pay_to=PAY_TO, scheme="exact")
+    payload = PaymentPayload(
+        x402Version=2,
+        payload=PaymentPayloadData(signature="0x" + "ab" * 65),
+        accepted=requirements,
+        extensions={
+            "transferAuthorization": {
+                "from": BUYER,
+                "to": PAY_TO,
+                "value": "100",
+                "validAfter": "0",
+                "validBefore": str(int(time.time()) + 3600),
+                "nonce": "0x" + "01" * 32,
+            }
+        },
+    )
+
+    result = await mechanism.settle(payload, requirements)
+
+    assert result.error_reason == "authorization_already_used"
+    signer.write_contract.assert_not_awaited()
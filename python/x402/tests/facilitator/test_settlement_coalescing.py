@@ -0,0 +1,160 @@
+"""
+Tests for single-flight settlement coalescing in X402Facilitator and X402Server
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bankofai.x402.facilitator import X402Facilitator
+from bankofai.x402.server import X402Server
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentPayloadData,
+    PaymentRequirements,
+    SettleResponse,
+)
+from bankofai.x402.utils import SettlementCoalescer, settlement_key
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK, pay_to=PAY_TO)
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements):
+    return lambda **overrides: make_permit_payload(requirements, **overrides)
+
+
+@pytest.fixture
+def exact_payload(requirements):
+    def make(nonce: str) -> PaymentPayload:
+        return PaymentPayload(
+            x402Version=2,
+            payload=PaymentPayloadData(signature="0xaa"),
+            accepted=requirements,
+            extensions={"transferAuthorization": {"nonce": nonce}},
+        )
+
+    return make
+
+
+class _Mechanism:
+    def __init__(self, success: bool = True, delay: float = 0.05) -> None:
+        self.calls = 0
+        self.success = success
+        self.delay = delay
+        self.scheme = MagicMock(return_value="exact_permit")
+
+    async def settle(self, payload, requirements):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SettleResponse(
+            success=self.success,
+            transaction=f"0xtx{self.calls}" if self.success else None,
+            network=NETWORK,
+        )
+
+
+def test_key_uses_payment_id_or_authorization_nonce(payload, exact_payload):
+    assert settlement_key(payload(signature="0xAA")) == settlement_key(payload(signature="0xaa"))
+    assert settlement_key(payload(payment_id="0x01")) != settlement_key(payload(payment_id="0x02"))
+    assert settlement_key(exact_payload("0x05")) != settlement_key(exact_payload("0x06"))
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        SettlementCoalescer(ttl=0)
+    with pytest.raises(ValueError):
+        SettlementCoalescer(max_entries=0)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_share_one_settlement(requirements, payload):
+    mechanism = _Mechanism()
+    facilitator = X402Facilitator().register([NETWORK], mechanism)
+
+    results = await asyncio.gather(*(facilitator.settle(payload(), requirements) for _ in range(5)))
+
+    assert mechanism.calls == 1
+    assert {r.transaction for r in results} == {"0xtx1"}
+    assert facilitator.settlements.coalesced == 4
+
+
+@pytest.mark.asyncio
+async def test_late_retry_gets_remembered_result(requirements, payload):
+    mechanism = _Mechanism()
+    facilitator = X402Facilitator().register([NETWORK], mechanism)
+
+    first = await facilitator.settle(payload(), requirements)
+    retry = await facilitator.settle(payload(), requirements)
+    other = await facilitator.settle(payload(signature="0xbb"), requirements)
+
+    assert retry is first
+    assert other.transaction == "0xtx2"
+    assert mechanism.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_remembered(requirements, payload):
+    mechanism = _Mechanism(success=False)
+    facilitator = X402Facilitator().register([NETWORK], mechanism)
+
+    await facilitator.settle(payload(), requirements)
+    await facilitator.settle(payload(), requirements)
+
+    assert mechanism.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exceptions_reach_every_waiter(payload):
+    coalescer = SettlementCoalescer()
+    settle = AsyncMock(side_effect=RuntimeError("rpc down"))
+
+    results = await asyncio.gather(
+        coalescer.settle(payload(), settle),
+        coalescer.settle(payload(), settle),
+        return_exceptions=True,
+    )
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert settle.await_count == 1
+    assert not coalescer.has(payload())
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_settlement(payload):
+    coalescer = SettlementCoalescer()
+    mechanism = _Mechanism(delay=0.05)
+
+    first = asyncio.ensure_future(coalescer.settle(payload(), lambda: mechanism.settle(None, None)))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    retry = await coalescer.settle(payload(), lambda: mechanism.settle(None, None))
+
+    assert retry.transaction == "0xtx1"
+    assert mechanism.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_server_coalesces_facilitator_calls(requirements, payload):
+    async def settle(payload, requirements):
+        await asyncio.sleep(0.02)
+        return SettleResponse(success=True, transaction="0xtx", network=NETWORK)
+
+    facilitator = MagicMock()
+    facilitator.settle = AsyncMock(side_effect=settle)
+    server = X402Server(auto_register_tron=False)
+    server._facilitator = facilitator
+
+    results = await asyncio.gather(
+        *(server.settle_payment(payload(), requirements) for _ in range(3))
+    )
+
+    assert facilitator.settle.await_count == 1
+    assert all(r.transaction == "0xtx" for r in results)
@@ -0,0 +1,217 @@
+"""
+Tests for offline TRON transaction building in TronFacilitatorSigner
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip("tronpy")
+
+from bankofai.x402.abi import PAYMENT_PERMIT_ABI, get_abi_json  # noqa: E402
+from bankofai.x402.signers.facilitator import TronFacilitatorSigner  # noqa: E402
+from bankofai.x402.testing.local_tron_node import LocalTronNode, block_id  # noqa: E402
+from bankofai.x402.utils.address import tron_address_to_evm  # noqa: E402
+from bankofai.x402.utils.receipt_watcher import ReceiptWatcher, TronReceiptSource  # noqa: E402
+from bankofai.x402.utils.tron_transaction import (  # noqa: E402
+    build_trigger_raw_data,
+    calculate_txid,
+    compile_function,
+)
+
+NETWORK = "tron:nile"
+PRIVATE_KEY = "0x" + "01" * 32
+BUYER = "TLa2f6VPqDgRE67v1736s7bJ8Ray5wYjU7"
+TOKEN = "TXYZopYRdj2D9XRtbG411XZZ3kM5VkAeBf"
+PERMIT = "TFxDcGvS7zfQrS1YzcCMp673ta2NHHzsiH"
+REF_BLOCK = "0000000003e8a1b2c3d4e5f60718293a4b5c6d7e8f9011223344556677889900"
+
+
+def _permit_args(nonce: int = 5) -> list:
+    permit = (
+        (0, bytes.fromhex("12" * 16), nonce, 0, int(time.time()) + 3600),
+        BUYER,
+        PERMIT,
+        (TOKEN, 100, BUYER),
+        (PERMIT, 0),
+    )
+    return [permit, BUYER, b"\xab" * 65]
+
+
+def _signer(node: LocalTronNode) -> TronFacilitatorSigner:
+    signer = TronFacilitatorSigner(PRIVATE_KEY)
+    signer._async_tron_clients[NETWORK] = node.client()
+    return signer
+
+
+class TestTransactionEncoding:
+    def test_txid_matches_protobuf_serialization(self):
+        function = compile_function(PAYMENT_PERMIT_ABI, "nonceUsed")
+        raw_data, txid = build_trigger_raw_data(
+            BUYER, TOKEN, function.encode([BUYER, 5]), REF_BLOCK, timestamp=1, fee_limit=0
+        )
+        # Reference value from the TRON protobuf definitions
+        assert txid == "8f8835e9b72eac4192f794f51beb739b93ca73d85d51253e95155edb4d71441c"
+        assert raw_data["ref_block_bytes"] == "a1b2"
+        assert raw_data["expiration"] == 60_001
+
+    def test_txid_matches_tronpy(self):
+        pytest.importorskip("google.protobuf")
+        from tronpy.proto.transaction import calculate_txid_from_raw_data
+
+        function = compile_function(get_abi_json(PAYMENT_PERMIT_ABI), "permitTransferFrom")
+        raw_data, txid = build_trigger_raw_data(
+            PERMIT, PERMIT, function.encode(_permit_args()), REF_BLOCK, int(time.time() * 1000)
+        )
+        assert txid == calculate_txid_from_raw_data(raw_data)
+
+    def test_tron_addresses_encode_like_evm_addresses(self):
+        function = compile_function(PAYMENT_PERMIT_ABI, "permitTransferFrom")
+        permit, buyer, signature = _permit_args()
+        evm_permit = (
+            permit[0],
+            tron_address_to_evm(BUYER),
+            tron_address_to_evm(PERMIT),
+            (tron_address_to_evm(TOKEN), 100, tron_address_to_evm(BUYER)),
+            (tron_address_to_evm(PERMIT), 0),
+        )
+        assert function.encode(_permit_args()) == function.encode(
+            [evm_permit, tron_address_to_evm(buyer), signature]
+        )
+
+    def test_compiled_functions_are_cached(self):
+        assert compile_function(get_abi_json(PAYMENT_PERMIT_ABI), "permitTransferFrom") is (
+            compile_function(get_abi_json(PAYMENT_PERMIT_ABI), "permitTransferFrom")
+        )
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            compile_function(PAYMENT_PERMIT_ABI, "missing")
+
+    def test_other_contract_types_rejected(self):
+        with pytest.raises(ValueError):
+            calculate_txid({"contract": [{"type": "TransferContract"}]})
+
+
+class TestWriteContract:
+    @pytest.mark.asyncio
+    async def test_settlement_needs_only_broadcast(self):
+        node = LocalTronNode()
+        signer = _signer(node)
+        abi = get_abi_json(PAYMENT_PERMIT_ABI)
+
+        first = await signer.write_contract(
+            PERMIT, abi, "permitTransferFrom", _permit_args(), NETWORK
+        )
+        second = await signer.write_contract(
+            PERMIT, abi, "permitTransferFrom", _permit_args(nonce=6), NETWORK
+        )
+
+        assert first and second and first != second
+        assert set(node.transactions) == {first, second}
+        # One reference block lookup, then broadcasts only
+        assert node.stats == {"wallet/getnodeinfo": 1, "wallet/broadcasttransaction": 2}
+
+    @pytest.mark.asyncio
+    async def test_transaction_is_signed_by_facilitator(self):
+        from tronpy.keys import Signature
+
+        node = LocalTronNode()
+        signer = _signer(node)
+        txid = await signer.write_contract(
+            PERMIT, PAYMENT_PERMIT_ABI, "permitTransferFrom", _permit_args(), NETWORK
+        )
+
+        sent = node.transactions[txid]
+        owner = sent["raw_data"]["contract"][0]["parameter"]["value"]["owner_address"]
+        signature = Signature(bytes.fromhex(sent["signature"][0]))
+        signer_key = signature.recover_public_key_from_msg_hash(bytes.fromhex(txid))
+
+        assert signer_key.to_base58check_address() == signer.get_address()
+        assert owner == signer_key.to_hex_address()
+        assert sent["raw_data"]["ref_block_hash"] == block_id(1000)[16:32]
+
+    @pytest.mark.asyncio
+    async def test_expired_reference_is_refreshed(self):
+        node = LocalTronNode(tapos_window=10)
+        signer = _signer(node)
+        await signer.write_contract(PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, 1], NETWORK)
+
+        # The cached reference falls out of the node's TaPoS window
+        node.advance(20)
+        txid = await signer.write_contract(
+            PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, 2], NETWORK
+        )
+
+        assert txid in node.transactions
+        assert signer.ref_blocks.stats["invalidations"] == 1
+        assert node.stats == {"wallet/getnodeinfo": 2, "wallet/broadcasttransaction": 3}
+
+    @pytest.mark.asyncio
+    async def test_rejected_broadcast_returns_none(self):
+        node = LocalTronNode(tapos_window=0)
+        signer = _signer(node)
+
+        assert (
+            await signer.write_contract(
+                PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, 2], NETWORK
+            )
+            is None
+        )
+        # Retried once with a fresh reference
+        assert node.stats["wallet/broadcasttransaction"] == 2
+
+
+class TestReceipts:
+    @pytest.mark.asyncio
+    async def test_concurrent_settlements_poll_per_block(self):
+        import asyncio
+
+        node = LocalTronNode(block_time=0.02)
+        signer = _signer(node)
+        signer._receipt_watchers[NETWORK] = ReceiptWatcher(
+            TronReceiptSource(signer._async_tron_clients[NETWORK]), poll_interval=0.01
+        )
+
+        async def settle(nonce: int) -> dict:
+            txid = await signer.write_contract(
+                PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, nonce], NETWORK
+            )
+            return await signer.wait_for_transaction_receipt(txid, timeout=5, network=NETWORK)
+
+        receipts = await asyncio.gather(*(settle(n) for n in range(100)))
+
+        assert {r["status"] for r in receipts} == {"confirmed"}
+        assert "wallet/gettransactioninfobyid" not in node.stats
+        assert node.stats["wallet/gettransactioninfobyblocknum"] < 20
+
+    @pytest.mark.asyncio
+    async def test_failed_transaction(self):
+        node = LocalTronNode()
+        signer = _signer(node)
+        txid = await signer.write_contract(
+            PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, 1], NETWORK
+        )
+        node.transactions[txid]["result"] = "REVERT"
+
+        receipt = await signer.wait_for_transaction_receipt(txid, timeout=1, network=NETWORK)
+
+        assert receipt["status"] == "failed"
+        assert receipt["blockNumber"] == str(node.block_number)
+
+    @pytest.mark.asyncio
+    async def test_finality_waits_for_solidification(self):
+        node = LocalTronNode(block_time=0.01, solid_lag=19)
+        signer = _signer(node)
+        signer._receipt_watchers[NETWORK] = ReceiptWatcher(
+            TronReceiptSource(signer._async_tron_clients[NETWORK]), poll_interval=0.01
+        )
+        txid = await signer.write_contract(
+            PERMIT, PAYMENT_PERMIT_ABI, "nonceUsed", [BUYER, 1], NETWORK
+        )
+        receipt = await signer.wait_for_transaction_receipt(txid, timeout=1, network=NETWORK)
+        block = int(receipt["blockNumber"])
+
+        await signer.wait_for_finality(block, timeout=2, network=NETWORK)
+
+        assert node.block_number - node.solid_lag >= block
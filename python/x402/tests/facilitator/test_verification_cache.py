@@ -0,0 +1,189 @@
+"""
+Tests for the signature verification cache shared by verify, settle and the server check
+"""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bankofai.x402.abi import get_payment_permit_eip712_types
+from bankofai.x402.config import NetworkConfig
+from bankofai.x402.mechanisms.evm.exact_permit import (
+    ExactPermitEvmFacilitatorMechanism,
+    ExactPermitEvmServerMechanism,
+)
+from bankofai.x402.signers.client import EvmClientSigner
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+)
+from bankofai.x402.utils import convert_permit_to_eip712_message
+from bankofai.x402.utils.verification_cache import VerificationCache
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+FEE_TO = "0x2222222222222222222222222222222222222222"
+BUYER_KEY = "0x" + "42" * 32
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(NETWORK, pay_to=PAY_TO)
+
+
+@pytest.fixture
+def signed_payload(make_permit_payload, requirements):
+    async def make() -> PaymentPayload:
+        signer = EvmClientSigner.from_private_key(BUYER_KEY)
+        payload = make_permit_payload(
+            requirements,
+            buyer=signer.get_address(),
+            nonce=7,
+            payment_id="0x" + "ab" * 16,
+            caller=FEE_TO,
+            fee_to=FEE_TO,
+        )
+        permit = payload.payload.payment_permit
+        payload.payload.signature = await signer.sign_typed_data(
+            domain={
+                "name": "PaymentPermit",
+                "chainId": NetworkConfig.get_chain_id(NETWORK),
+                "verifyingContract": NetworkConfig.get_payment_permit_address(NETWORK),
+            },
+            types=get_payment_permit_eip712_types(),
+            message=convert_permit_to_eip712_message(permit),
+        )
+        return payload
+
+    return make
+
+
+@pytest.fixture
+def facilitator_signer():
+    signer = MagicMock()
+    signer.get_address.return_value = FEE_TO
+    signer.verify_typed_data = AsyncMock(return_value=True)
+    signer.write_contract = AsyncMock(return_value="0xtx")
+    signer.wait_for_transaction_receipt = AsyncMock(return_value={"status": "1"})
+    return signer
+
+
+def test_cache_is_bounded_lru():
+    cache = VerificationCache(max_entries=2)
+    cache.mark_verified(b"a", "0xAA")
+    cache.mark_verified(b"b", "0xbb")
+    assert cache.is_verified(b"a", "aa")
+    cache.mark_verified(b"c", "0xcc")
+
+    assert len(cache) == 2
+    assert cache.is_verified(b"a", "0xaa")
+    assert not cache.is_verified(b"b", "0xbb")
+    assert not cache.is_verified(b"a", "0xcc")
+
+
+def test_cache_entries_expire():
+    cache = VerificationCache(ttl=0.01)
+    cache.mark_verified(b"a", "0xaa")
+    time.sleep(0.02)
+
+    assert not cache.is_verified(b"a", "0xaa")
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        VerificationCache(max_entries=0)
+
+
+@pytest.mark.asyncio
+async def test_settle_reuses_verification(requirements, signed_payload, facilitator_signer):
+    mechanism = ExactPermitEvmFacilitatorMechanism(facilitator_signer, base_fee={"USDT": 0})
+    payload = await signed_payload()
+
+    verify = await mechanism.verify(payload, requirements)
+    settle = await mechanism.settle(payload, requirements)
+
+    assert verify.is_valid
+    assert settle.success
+    assert facilitator_signer.verify_typed_data.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_settle_consumes_verified_permit(
+    requirements, signed_payload, facilitator_signer, monkeypatch
+):
+    mechanism = ExactPermitEvmFacilitatorMechanism(facilitator_signer, base_fee={"USDT": 0})
+    payload = await signed_payload()
+    assert (await mechanism.verify(payload, requirements)).is_valid
+
+    rebuilt = MagicMock(side_effect=mechanism._build_permit_tuple)
+    monkeypatch.setattr(mechanism, "_build_permit_tuple", rebuilt)
+    monkeypatch.setattr(mechanism, "_verify_signature", AsyncMock(return_value=False))
+    # A copy from another request is recognized as the same permit
+    result = await mechanism.settle(payload.model_copy(deep=True), requirements)
+
+    assert result.success
+    rebuilt.assert_not_called()
+    args = facilitator_signer.write_contract.await_args.kwargs["args"]
+    assert args[1] == payload.payload.payment_permit.buyer
+
+
+@pytest.mark.asyncio
+async def test_failed_verification_is_not_cached(requirements, signed_payload, facilitator_signer):
+    facilitator_signer.verify_typed_data.return_value = False
+    mechanism = ExactPermitEvmFacilitatorMechanism(facilitator_signer, base_fee={"USDT": 0})
+    payload = await signed_payload()
+
+    first = await mechanism.verify(payload, requirements)
+    second = await mechanism.verify(payload, requirements)
+
+    assert first.invalid_reason == second.invalid_reason == "invalid_signature"
+    assert facilitator_signer.verify_typed_data.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_server_check_is_reused_by_colocated_facilitator(
+    requirements, signed_payload, facilitator_signer
+):
+    payload = await signed_payload()
+    permit = payload.payload.payment_permit
+    cache = VerificationCache()
+
+    server = ExactPermitEvmServerMechanism(verification_cache=cache)
+    assert await server.verify_signature(permit, payload.payload.signature, NETWORK)
+    assert len(cache) == 1
+
+    mechanism = ExactPermitEvmFacilitatorMechanism(
+        facilitator_signer, base_fee={"USDT": 0}, verification_cache=cache
+    )
+    verify = await mechanism.verify(payload, requirements)
+
+    assert verify.is_valid
+    facilitator_signer.verify_typed_data.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_server_checks_are_not_shared_by_default(
+    requirements, signed_payload, facilitator_signer
+):
+    payload = await signed_payload()
+    server = ExactPermitEvmServerMechanism()
+    assert await server.verify_signature(
+        payload.payload.payment_permit, payload.payload.signature, NETWORK
+    )
+
+    mechanism = ExactPermitEvmFacilitatorMechanism(facilitator_signer, base_fee={"USDT": 0})
+    assert (await mechanism.verify(payload, requirements)).is_valid
+
+    facilitator_signer.verify_typed_data.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_still_checks_permit(requirements, signed_payload, facilitator_signer):
+    mechanism = ExactPermitEvmFacilitatorMechanism(facilitator_signer, base_fee={"USDT": 0})
+    payload = await signed_payload()
+    await mechanism.verify(payload, requirements)
+
+    higher = requirements.model_copy(update={"amount": "1000"})
+    result = await mechanism.settle(payload, higher)
+
+    assert result.error_reason == "amount_mismatch"
+    facilitator_signer.write_contract.assert_not_awaited()
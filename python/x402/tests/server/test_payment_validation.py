@@ -0,0 +1,249 @@
+"""
+Tests for the cheap-first payment validation pipeline
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bankofai.x402.encoding import encode_payment_payload
+from bankofai.x402.server import (
+    PaymentGate,
+    PaymentValidator,
+    ResourceConfig,
+    RoutePlan,
+    SeenPayments,
+    X402Server,
+)
+from bankofai.x402.server.payment_validation import (
+    STAGE_FACILITATOR,
+    STAGE_HEADER_SIZE,
+    STAGE_REPLAY,
+    STAGE_ROUTE,
+    STAGE_SIGNATURE,
+    STAGE_STRUCTURE,
+)
+from bankofai.x402.types import PaymentPayload, PaymentRequirements, SettleResponse
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+BUYER = "0x2222222222222222222222222222222222222222"
+ONE_USDT = 10**18
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(amount=ONE_USDT, maxTimeoutSeconds=3600)
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements):
+    return lambda **overrides: make_permit_payload(requirements, **overrides)
+
+
+def _header(payload: PaymentPayload) -> str:
+    return encode_payment_payload(payload.model_dump(by_alias=True))
+
+
+class _Mechanism:
+    def __init__(self, valid: bool = True) -> None:
+        self.verify_signature = AsyncMock(return_value=valid)
+
+    def scheme(self) -> str:
+        return "exact_permit"
+
+
+def _server(
+    requirements: PaymentRequirements, valid_signature: bool = True, settles: bool = True
+) -> X402Server:
+    server = X402Server(auto_register_tron=False)
+    server.register(NETWORK, _Mechanism(valid_signature))
+    server.build_payment_requirements = AsyncMock(return_value=[requirements])
+    server.settle_payment = AsyncMock(
+        return_value=SettleResponse(
+            success=settles,
+            transaction="0xtx" if settles else None,
+            network=NETWORK,
+            errorReason=None if settles else "reverted",
+        )
+    )
+    return server
+
+
+def _plan() -> RoutePlan:
+    return RoutePlan.compile(
+        [ResourceConfig(scheme="exact_permit", network=NETWORK, price="1 USDT", pay_to=PAY_TO)]
+    )
+
+
+def _gate(server: X402Server) -> PaymentGate:
+    gate = PaymentGate(server)
+    gate.verify_transaction_on_chain = AsyncMock(return_value=AsyncMock(success=True))
+    return gate
+
+
+def _mechanism(server: X402Server) -> _Mechanism:
+    return server._find_mechanism(NETWORK, "exact_permit")
+
+
+def test_plan_records_min_amounts(requirements):
+    plan = _plan()
+    assert plan.min_amount(NETWORK, requirements.asset.upper()) == ONE_USDT
+    assert plan.min_amount(NETWORK, "0xdead") is None
+
+
+class TestSeenPayments:
+    def test_add_rejects_live_duplicates(self):
+        seen = SeenPayments()
+        assert seen.add("a", time.time() + 60)
+        assert not seen.add("a", time.time() + 60)
+
+    def test_expired_entries_are_replaced(self):
+        seen = SeenPayments()
+        seen.add("a", time.time() - 1)
+        assert "a" not in seen
+        assert seen.add("a", time.time() + 60)
+
+    def test_bounded(self):
+        seen = SeenPayments(max_entries=2)
+        for key in ("a", "b", "c"):
+            seen.add(key, time.time() + 60)
+        assert len(seen) == 2
+        assert "a" not in seen
+
+
+class TestPaymentValidator:
+    def test_accepts_matching_payment(self, payload):
+        validator = PaymentValidator()
+        result = validator.screen(_header(payload()), _plan())
+        assert result.ok
+        assert result.config.pay_to == PAY_TO
+        assert validator.passed == 1
+
+    def test_pay_to_compared_as_address(self, payload):
+        result = PaymentValidator().screen(_header(payload(pay_to=PAY_TO.upper())), _plan())
+        assert result.ok
+
+    def test_oversized_header_rejected_before_decoding(self, payload):
+        validator = PaymentValidator(max_header_size=16)
+        result = validator.screen(_header(payload()), _plan())
+        assert result.stage == STAGE_HEADER_SIZE
+
+    def test_invalid_max_header_size(self):
+        with pytest.raises(ValueError):
+            PaymentValidator(max_header_size=0)
+
+    @pytest.mark.parametrize(
+        "overrides, reason",
+        [
+            ({"pay_to": BUYER}, "Payment recipient does not match"),
+            ({"amount": ONE_USDT - 1}, "Payment amount is below the price"),
+            ({"valid_before": 1000}, "Payment expired"),
+            ({"valid_after": int(time.time()) + 600}, "Payment not yet valid"),
+        ],
+    )
+    def test_route_mismatch(self, payload, overrides, reason):
+        validator = PaymentValidator()
+        result = validator.screen(_header(payload(**overrides)), _plan())
+        assert (result.stage, result.reason) == (STAGE_ROUTE, reason)
+        assert validator.rejections == {STAGE_ROUTE: 1}
+
+    def test_replay_until_released(self, payload):
+        validator = PaymentValidator()
+        payload = payload()
+        assert validator.screen(_header(payload), _plan()).ok
+        assert validator.screen(_header(payload), _plan()).stage == STAGE_REPLAY
+
+        validator.release(payload)
+        assert validator.screen(_header(payload), _plan()).ok
+
+
+class TestGatePipeline:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "header, stage, status",
+        [
+            ("not-base64!", STAGE_STRUCTURE, 400),
+            ("e" * 10_000, STAGE_HEADER_SIZE, 431),
+            ({"valid_before": 1000}, STAGE_ROUTE, 400),
+            ({"pay_to": BUYER}, STAGE_ROUTE, 400),
+            ({"amount": 1}, STAGE_ROUTE, 400),
+        ],
+    )
+    async def test_cheap_rejections_skip_crypto_and_facilitator(
+        self, requirements, payload, header, stage, status
+    ):
+        if isinstance(header, dict):
+            header = _header(payload(**header))
+        server = _server(requirements)
+        decision = await _gate(server).process(_plan(), header, "http://test/a")
+
+        assert decision.status_code == status
+        assert server.validator.rejections == {stage: 1}
+        _mechanism(server).verify_signature.assert_not_awaited()
+        server.settle_payment.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_replay_skips_crypto_and_facilitator(self, requirements, payload):
+        server = _server(requirements)
+        gate = _gate(server)
+        header = _header(payload())
+
+        assert (await gate.process(_plan(), header, "http://test/a")).allowed
+        replay = await gate.process(_plan(), header, "http://test/a")
+
+        assert replay.status_code == 402
+        assert server.validator.rejections == {STAGE_REPLAY: 1}
+        assert _mechanism(server).verify_signature.await_count == 1
+        assert server.settle_payment.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_skips_facilitator(self, requirements, payload):
+        server = _server(requirements, valid_signature=False)
+        decision = await _gate(server).process(_plan(), _header(payload()), "http://test/a")
+
+        assert decision.status_code == 402
+        assert server.validator.rejections == {STAGE_SIGNATURE: 1}
+        server.settle_payment.assert_not_awaited()
+        # Not reserved: a corrected retry is not mistaken for a replay
+        assert len(server.validator.seen) == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_settlement_releases_reservation(self, requirements, payload):
+        server = _server(requirements, settles=False)
+        gate = _gate(server)
+        header = _header(payload())
+
+        assert (await gate.process(_plan(), header, "http://test/a")).status_code == 500
+        assert (await gate.process(_plan(), header, "http://test/a")).status_code == 500
+        assert server.validator.rejections == {STAGE_FACILITATOR: 2}
+        assert server.settle_payment.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retry_during_settlement_joins_it(self, requirements, payload):
+        server = X402Server(auto_register_tron=False)
+        server.register(NETWORK, _Mechanism())
+        server.build_payment_requirements = AsyncMock(return_value=[requirements])
+        facilitator = AsyncMock()
+        facilitator.settle.side_effect = _slow_settle
+        server._facilitator = facilitator
+        gate = _gate(server)
+        header = _header(payload())
+
+        first, retry = await asyncio.gather(
+            gate.process(_plan(), header, "http://test/a"),
+            gate.process(_plan(), header, "http://test/a"),
+        )
+        late = await gate.process(_plan(), header, "http://test/a")
+
+        assert first.allowed and retry.allowed and late.allowed
+        assert late.settle_response is first.settle_response
+        assert facilitator.settle.await_count == 1
+        assert not server.validator.rejections
+
+
+async def _slow_settle(payload, requirements):
+    await asyncio.sleep(0.02)
+    return SettleResponse(success=True, transaction="0xtx", network=NETWORK)
@@ -0,0 +1,163 @@
+"""
+Tests for the fee-quote-aware PaymentRequirements cache in X402Server
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from bankofai.x402.server import RequirementsCache, ResourceConfig, X402Server
+from bankofai.x402.tokens import TokenInfo, TokenRegistry
+from bankofai.x402.types import FeeInfo, FeeQuoteResponse
+
+PAY_TO = "TTestPayToAddress1111111111111111"
+
+
+@pytest.fixture(autouse=True)
+def _register_test_token():
+    original = TokenRegistry.get_network_tokens("tron:nile").get("USDT")
+    TokenRegistry.register_token(
+        "tron:nile",
+        TokenInfo(address="TTestUSDTAddress", decimals=6, name="Tether USD", symbol="USDT"),
+    )
+    yield
+    if original is not None:
+        TokenRegistry.register_token("tron:nile", original)
+    else:
+        TokenRegistry._tokens.get("tron:nile", {}).pop("USDT", None)
+
+
+def _make_facilitator(expires_in: int = 300, delay: float = 0.0) -> MagicMock:
+    async def fee_quote(accepts, context=None):
+        if delay:
+            await asyncio.sleep(delay)
+        return [
+            FeeQuoteResponse(
+                fee=FeeInfo(feeTo="TFeeTo", feeAmount="100"),
+                pricing="flat",
+                scheme=a.scheme,
+                network=a.network,
+                asset=a.asset,
+                expiresAt=int(time.time()) + expires_in,
+            )
+            for a in accepts
+        ]
+
+    facilitator = MagicMock()
+    facilitator.facilitator_id = "test-facilitator"
+    facilitator.fee_quote = AsyncMock(side_effect=fee_quote)
+    return facilitator
+
+
+def _config(price: str = "1 USDT") -> ResourceConfig:
+    return ResourceConfig(scheme="exact_permit", network="tron:nile", price=price, pay_to=PAY_TO)
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_fee_quote():
+    facilitator = _make_facilitator()
+    server = X402Server().set_facilitator(facilitator)
+
+    first = await server.build_payment_requirements([_config()])
+    second = await server.build_payment_requirements([_config()])
+
+    assert facilitator.fee_quote.await_count == 1
+    assert second[0].extra.fee.fee_amount == "100"
+    assert second[0].extra.fee.facilitator_id == "test-facilitator"
+    # Callers get copies: changing one does not change what the cache serves
+    assert first[0] == second[0]
+    first[0].extra.fee.fee_amount = "999"
+    third = await server.build_payment_requirements([_config()])
+    assert third[0].extra.fee.fee_amount == "100"
+
+
+@pytest.mark.asyncio
+async def test_cold_burst_is_single_flight():
+    facilitator = _make_facilitator(delay=0.05)
+    server = X402Server().set_facilitator(facilitator)
+
+    results = await asyncio.gather(
+        *(server.build_payment_requirements([_config()]) for _ in range(200))
+    )
+
+    assert facilitator.fee_quote.await_count == 1
+    assert all(len(r) == 1 for r in results)
+
+
+@pytest.mark.asyncio
+async def test_distinct_configs_are_quoted_separately():
+    facilitator = _make_facilitator()
+    server = X402Server().set_facilitator(facilitator)
+
+    await server.build_payment_requirements([_config("1 USDT")])
+    await server.build_payment_requirements([_config("2 USDT")])
+    await server.build_payment_requirements([_config("1 USDT"), _config("2 USDT")])
+
+    assert facilitator.fee_quote.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_is_rebuilt():
+    facilitator = _make_facilitator(expires_in=-1)
+    server = X402Server().set_facilitator(facilitator)
+
+    await server.build_payment_requirements([_config()])
+    await server.build_payment_requirements([_config()])
+
+    assert facilitator.fee_quote.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_entry_near_expiry_is_refreshed_in_background():
+    facilitator = _make_facilitator(expires_in=10)
+    server = X402Server(requirements_cache=RequirementsCache(refresh_ahead=30))
+    server.set_facilitator(facilitator)
+
+    await server.build_payment_requirements([_config()])
+    # Served from cache, but schedules a refresh
+    result = await server.build_payment_requirements([_config()])
+    assert len(result) == 1
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert facilitator.fee_quote.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fee_quote_error_is_not_cached():
+    facilitator = _make_facilitator()
+    good_side_effect = facilitator.fee_quote.side_effect
+    facilitator.fee_quote.side_effect = RuntimeError("facilitator down")
+    server = X402Server().set_facilitator(facilitator)
+
+    with pytest.raises(RuntimeError):
+        await server.build_payment_requirements([_config()])
+
+    facilitator.fee_quote.side_effect = good_side_effect
+    result = await server.build_payment_requirements([_config()])
+    assert len(result) == 1
+
+
+@pytest.mark.asyncio
+async def test_set_facilitator_clears_cache():
+    server = X402Server().set_facilitator(_make_facilitator())
+    await server.build_payment_requirements([_config()])
+
+    other = _make_facilitator()
+    server.set_facilitator(other)
+    await server.build_payment_requirements([_config()])
+
+    assert other.fee_quote.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_disabled_quotes_every_time():
+    facilitator = _make_facilitator()
+    server = X402Server(cache_requirements=False).set_facilitator(facilitator)
+
+    await server.build_payment_requirements([_config()])
+    await server.build_payment_requirements([_config()])
+
+    assert facilitator.fee_quote.await_count == 2
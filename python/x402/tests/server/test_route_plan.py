@@ -0,0 +1,173 @@
+"""
+Tests for RoutePlan compilation and pre-encoded 402 templates
+"""
+
+import base64
+import json
+
+import pytest
+
+from bankofai.x402.compact import decode_compact_header, is_compact_header
+from bankofai.x402.exceptions import UnknownTokenError
+from bankofai.x402.server import ResourceConfig, RoutePlan, X402Server
+from bankofai.x402.server.route_plan import PaymentRequiredTemplate
+from bankofai.x402.tokens import TokenRegistry
+from bankofai.x402.types import (
+    FeeInfo,
+    PaymentRequired,
+    PaymentRequirements,
+    PaymentRequirementsExtra,
+)
+
+PAY_TO = "0x1111111111111111111111111111111111111111"
+
+
+def _configs() -> list[ResourceConfig]:
+    return [
+        ResourceConfig(scheme="exact_permit", network="eip155:97", price="1 USDT", pay_to=PAY_TO),
+        ResourceConfig(scheme="exact", network="eip155:97", price="2 DHLU", pay_to=PAY_TO),
+    ]
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> list[PaymentRequirements]:
+    return [make_payment_requirements(amount=10**18, pay_to=PAY_TO, maxTimeoutSeconds=3600)]
+
+
+class TestCompile:
+    def test_match_by_network_and_asset(self):
+        plan = RoutePlan.compile(_configs())
+        usdt = TokenRegistry.get_token("eip155:97", "USDT").address
+        dhlu = TokenRegistry.get_token("eip155:97", "DHLU").address
+
+        assert plan.match("eip155:97", usdt).price == "1 USDT"
+        assert plan.match("eip155:97", dhlu.lower()).scheme == "exact"
+
+    def test_tron_asset_is_case_sensitive(self):
+        plan = RoutePlan.from_prices(["1 USDT"], ["exact_permit"], "tron:mainnet", "T" + "1" * 33)
+        usdt = TokenRegistry.get_token("tron:mainnet", "USDT").address
+
+        assert plan.match("tron:mainnet", usdt) is not None
+        assert plan.match("tron:mainnet", usdt.lower()) is None
+
+    def test_no_match(self):
+        plan = RoutePlan.compile(_configs())
+        usdt = TokenRegistry.get_token("eip155:97", "USDT").address
+
+        assert plan.match("eip155:56", usdt) is None
+        assert plan.match("eip155:97", "0x" + "00" * 20) is None
+
+    def test_unknown_token_rejected_at_compile_time(self):
+        config = ResourceConfig(
+            scheme="exact_permit", network="eip155:97", price="1 NOPE", pay_to=PAY_TO
+        )
+        with pytest.raises(UnknownTokenError):
+            RoutePlan.compile([config])
+
+    def test_confirmation_level_per_route(self):
+        plan = RoutePlan.from_prices(
+            ["1 USDT"], ["exact_permit"], "eip155:97", PAY_TO, confirmation="broadcast"
+        )
+        assert plan.configs[0].confirmation == "broadcast"
+
+        with pytest.raises(ValueError):
+            ResourceConfig(
+                scheme="exact", network="eip155:97", price="1 USDT", pay_to=PAY_TO, confirmation="x"
+            )
+
+    def test_plan_is_immutable(self):
+        plan = RoutePlan.compile(_configs())
+        with pytest.raises(AttributeError):
+            plan.configs = ()
+        with pytest.raises(TypeError):
+            plan.config_index[("eip155:97", "x")] = plan.configs[0]
+
+
+class TestPaymentRequiredTemplate:
+    def test_render_matches_model(self, requirements):
+        server = X402Server(auto_register_tron=False)
+        plan = RoutePlan.compile(_configs())
+
+        template = plan.payment_required_template(server, requirements)
+        body, header = template.render(
+            'https://api.example.com/data?q="x"',
+            payment_id="0x" + "ab" * 16,
+            nonce="42",
+            valid_after=100,
+            valid_before=200,
+        )
+
+        expected = server.create_payment_required_response(
+            requirements=requirements,
+            resource_info={"url": 'https://api.example.com/data?q="x"'},
+            payment_id="0x" + "ab" * 16,
+            nonce="42",
+            valid_after=100,
+            valid_before=200,
+        ).model_dump(by_alias=True)
+
+        assert json.loads(body) == expected
+        assert base64.b64decode(header) == body
+        assert PaymentRequired(**json.loads(body)).accepts[0].asset == requirements[0].asset
+
+    def test_sample_is_not_modified(self, requirements):
+        server = X402Server(auto_register_tron=False)
+        sample = server.create_payment_required_response(
+            requirements=requirements, resource_info={"url": "https://api.example.com/data"}
+        ).model_dump(by_alias=True)
+        before = json.dumps(sample, sort_keys=True)
+
+        PaymentRequiredTemplate(requirements, sample)
+
+        assert json.dumps(sample, sort_keys=True) == before
+
+    @pytest.mark.parametrize("encoding", ["cbor", "cbor+deflate"])
+    def test_render_compact_header(self, requirements, encoding):
+        server = X402Server(auto_register_tron=False)
+        plan = RoutePlan.compile(_configs())
+        template = plan.payment_required_template(server, requirements)
+
+        for url in ("https://a", "https://b"):
+            body, header = template.render(url, encoding=encoding)
+
+            assert is_compact_header(header)
+            assert decode_compact_header(header) == json.loads(body)
+
+    def test_render_fills_defaults(self, requirements):
+        server = X402Server(auto_register_tron=False)
+        plan = RoutePlan.compile(_configs())
+        template = plan.payment_required_template(server, requirements)
+
+        first, _ = template.render("https://a", error="custom")
+        second, _ = template.render("https://a")
+        meta_first = json.loads(first)["extensions"]["paymentPermitContext"]["meta"]
+        meta_second = json.loads(second)["extensions"]["paymentPermitContext"]["meta"]
+
+        assert json.loads(first)["error"] == "custom"
+        assert json.loads(second)["error"] == "Payment required"
+        assert meta_first["paymentId"] != meta_second["paymentId"]
+        assert meta_first["validBefore"] - meta_first["validAfter"] == 3600
+
+    def test_template_reused_for_same_requirements(self, requirements):
+        server = X402Server(auto_register_tron=False)
+        plan = RoutePlan.compile(_configs())
+
+        first = plan.payment_required_template(server, requirements)
+        assert plan.payment_required_template(server, list(requirements)) is first
+
+        copies = [r.model_copy(deep=True) for r in requirements]
+        assert plan.payment_required_template(server, copies) is first
+
+        refreshed = [r.model_copy(update={"amount": "2"}) for r in requirements]
+        second = plan.payment_required_template(server, refreshed)
+        assert second is not first
+
+    def test_fee_info_is_serialized(self, requirements):
+        server = X402Server(auto_register_tron=False)
+        plan = RoutePlan.compile(_configs())
+        requirements[0].extra = PaymentRequirementsExtra(
+            fee=FeeInfo(feeTo=PAY_TO, feeAmount="7", facilitatorId="f")
+        )
+
+        body, _ = plan.payment_required_template(server, requirements).render("https://a")
+        assert json.loads(body)["accepts"][0]["extra"]["fee"]["feeAmount"] == "7"
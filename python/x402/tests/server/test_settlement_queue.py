@@ -0,0 +1,369 @@
+"""
+Tests for verify-then-serve settlement: outbox, worker queue and PaymentGate policy
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from bankofai.x402.encoding import encode_payment_payload
+from bankofai.x402.exceptions import UnknownTokenError
+from bankofai.x402.server import (
+    PaymentGate,
+    RoutePlan,
+    SettlementOutbox,
+    SettlementPolicy,
+    SettlementQueue,
+    X402Server,
+)
+from bankofai.x402.server.settlement_outbox import settlement_id
+from bankofai.x402.types import (
+    PaymentPayload,
+    PaymentRequirements,
+    PaymentRequirementsExtra,
+    SettleResponse,
+    VerifyResponse,
+)
+
+NETWORK = "eip155:97"
+PAY_TO = "0x1111111111111111111111111111111111111111"
+BUYER = "0x2222222222222222222222222222222222222222"
+ONE_USDT = 10**18
+
+
+@pytest.fixture
+def requirements(make_payment_requirements) -> PaymentRequirements:
+    return make_payment_requirements(amount=ONE_USDT, maxTimeoutSeconds=3600)
+
+
+@pytest.fixture
+def payload(make_permit_payload, requirements):
+    return lambda signature="0xsig1", **overrides: make_permit_payload(
+        requirements, signature=signature, **overrides
+    )
+
+
+def _header(payload: PaymentPayload) -> str:
+    return encode_payment_payload(payload.model_dump(by_alias=True))
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = SettlementOutbox(str(tmp_path / "outbox.db"))
+    yield outbox
+    outbox.close()
+
+
+@pytest.fixture
+def server(requirements):
+    server = X402Server(auto_register_tron=False)
+    server.build_payment_requirements = AsyncMock(return_value=[requirements])
+    server.verify_payment = AsyncMock(return_value=VerifyResponse(isValid=True))
+    server.settle_payment = AsyncMock(
+        return_value=SettleResponse(success=True, transaction="0xtx", network=NETWORK)
+    )
+    return server
+
+
+class TestOutbox:
+    @pytest.mark.asyncio
+    async def test_enqueue_is_idempotent(self, requirements, payload, outbox):
+        assert await outbox.enqueue(payload(), requirements) == "enqueued"
+        assert await outbox.enqueue(payload(), requirements) == "duplicate"
+        assert await outbox.unsettled_amount(NETWORK, requirements.asset, BUYER) == ONE_USDT
+
+    @pytest.mark.asyncio
+    async def test_unsettled_limit_per_buyer(self, requirements, payload, outbox):
+        limit = 2 * ONE_USDT
+        assert await outbox.enqueue(payload("0xa"), requirements, limit) == "enqueued"
+        assert await outbox.enqueue(payload("0xb"), requirements, limit) == "enqueued"
+        assert await outbox.enqueue(payload("0xc"), requirements, limit) == "limit_exceeded"
+
+        other = "0x3333333333333333333333333333333333333333"
+        assert await outbox.enqueue(payload("0xd", buyer=other), requirements, limit) == "enqueued"
+
+    @pytest.mark.asyncio
+    async def test_rows_survive_restart(self, requirements, payload, tmp_path):
+        path = str(tmp_path / "outbox.db")
+        first = SettlementOutbox(path)
+        await first.enqueue(payload(), requirements)
+        first.close()
+
+        second = SettlementOutbox(path)
+        entries = await second.claim_due(10)
+        second.close()
+
+        assert len(entries) == 1
+        assert entries[0].payload.payload.signature == "0xsig1"
+        assert entries[0].attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_claimed_rows_are_leased(self, requirements, payload, tmp_path):
+        outbox = SettlementOutbox(str(tmp_path / "outbox.db"), lease_seconds=0)
+        await outbox.enqueue(payload(), requirements)
+
+        assert not (await outbox.claim_due(10))[0].reclaimed
+        # Lease expired immediately: an abandoned claim is handed out again
+        assert (await outbox.claim_due(10))[0].reclaimed
+        outbox.close()
+
+    @pytest.mark.asyncio
+    async def test_tron_buyer_keeps_its_case(self, payload, outbox, mock_tron_payment_requirements):
+        requirements = mock_tron_payment_requirements
+        buyer = "TLBaRhANQoJFTqre9Nf1mjuwNWjCJeYqUL"
+        await outbox.enqueue(payload(buyer=buyer), requirements)
+
+        entry = (await outbox.claim_due(1))[0]
+        assert entry.buyer == buyer
+        assert entry.asset == requirements.asset
+        assert await outbox.unsettled_amount(requirements.network, requirements.asset, buyer) > 0
+
+
+class TestSettlementQueue:
+    @pytest.mark.asyncio
+    async def test_run_once_settles(self, requirements, payload, server, outbox):
+        queue = SettlementQueue(server, outbox, verify_on_chain=False)
+        await outbox.enqueue(payload(), requirements)
+
+        assert await queue.run_once() == 1
+        entry = await outbox.get(settlement_id(payload()))
+        assert entry.status == "settled"
+        assert entry.tx_hash == "0xtx"
+        assert await outbox.unsettled_amount(NETWORK, requirements.asset, BUYER) == 0
+
+    @pytest.mark.asyncio
+    async def test_failures_are_retried_then_marked_failed(
+        self, requirements, payload, server, outbox
+    ):
+        server.settle_payment.return_value = SettleResponse(success=False, errorReason="boom")
+        queue = SettlementQueue(server, outbox, max_attempts=2, retry_delay=0)
+        await outbox.enqueue(payload(), requirements)
+
+        await queue.run_once()
+        entry = await outbox.get(settlement_id(payload()))
+        assert entry.status == "pending"
+        assert entry.error == "boom"
+
+        await queue.run_once()
+        entry = await outbox.get(settlement_id(payload()))
+        assert entry.status == "failed"
+        assert entry.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_reclaimed_row_whose_nonce_is_used_is_settled(
+        self, requirements, payload, server, tmp_path
+    ):
+        """The worker that claimed it died after broadcasting"""
+        outbox = SettlementOutbox(str(tmp_path / "outbox.db"), lease_seconds=0)
+        server.settle_payment.return_value = SettleResponse(
+            success=False, errorReason="nonce_already_used"
+        )
+        queue = SettlementQueue(server, outbox, max_attempts=2, verify_on_chain=False)
+        await outbox.enqueue(payload(), requirements)
+        await outbox.claim_due(1)
+
+        await queue.run_once()
+        entry = await outbox.get(settlement_id(payload()))
+        outbox.close()
+
+        assert entry.status == "settled"
+
+    @pytest.mark.asyncio
+    async def test_used_nonce_without_earlier_broadcast_is_not_settled(
+        self, requirements, payload, server, outbox
+    ):
+        server.settle_payment.return_value = SettleResponse(
+            success=False, errorReason="nonce_already_used"
+        )
+        queue = SettlementQueue(server, outbox, max_attempts=2, retry_delay=0)
+        await outbox.enqueue(payload(), requirements)
+
+        await queue.run_once()
+        await queue.run_once()
+        entry = await outbox.get(settlement_id(payload()))
+
+        assert entry.status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_retry_after_unconfirmed_broadcast_keeps_transaction(
+        self, requirements, payload, server, outbox
+    ):
+        server.settle_payment.side_effect = [
+            SettleResponse(success=False, errorReason="transaction_failed", transaction="0xtx"),
+            SettleResponse(success=False, errorReason="nonce_already_used"),
+        ]
+        queue = SettlementQueue(server, outbox, retry_delay=0, verify_on_chain=False)
+        await outbox.enqueue(payload(), requirements)
+
+        await queue.run_once()
+        await queue.run_once()
+        entry = await outbox.get(settlement_id(payload()))
+
+        assert entry.status == "settled"
+        assert entry.tx_hash == "0xtx"
+
+    @pytest.mark.asyncio
+    async def test_workers_settle_in_background(self, requirements, payload, server, outbox):
+        queue = SettlementQueue(server, outbox, workers=2, verify_on_chain=False)
+        await queue.submit(payload("0xa"), requirements)
+        await queue.submit(payload("0xb"), requirements)
+
+        ids = [settlement_id(payload("0xa")), settlement_id(payload("0xb"))]
+        for _ in range(200):
+            statuses = [(await outbox.get(i)).status for i in ids]
+            if statuses == ["settled", "settled"]:
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+        assert statuses == ["settled", "settled"]
+        assert server.settle_payment.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_worker_survives_outbox_errors(self, requirements, payload, server, outbox):
+        mark_settled = outbox.mark_settled
+        outbox.mark_settled = AsyncMock(side_effect=[Exception("database is locked")])
+        queue = SettlementQueue(
+            server, outbox, workers=2, verify_on_chain=False, poll_interval=0.01
+        )
+        await queue.submit(payload("0xa"), requirements)
+        for _ in range(200):
+            if outbox.mark_settled.await_count:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+
+        # No worker was lost to the error
+        assert all(not task.done() for task in queue._tasks)
+        outbox.mark_settled = mark_settled
+        await queue.submit(payload("0xb"), requirements)
+        for _ in range(200):
+            entry = await outbox.get(settlement_id(payload("0xb")))
+            if entry.status == "settled":
+                break
+            await asyncio.sleep(0.01)
+        await queue.stop()
+
+        assert entry.status == "settled"
+
+    @pytest.mark.asyncio
+    async def test_broadcast_settlement_is_not_verified(
+        self, payload, server, outbox, monkeypatch, mock_tron_payment_requirements
+    ):
+        """A TRON transaction answered at broadcast is not in a block yet"""
+        from bankofai.x402.server import payment_gate
+
+        requirements = mock_tron_payment_requirements
+        requirements.extra = PaymentRequirementsExtra(confirmation="broadcast")
+        server.settle_payment.return_value = SettleResponse(
+            success=True, transaction="ab" * 32, network="tron:shasta", confirmation="broadcast"
+        )
+        verify = AsyncMock()
+        monkeypatch.setattr(payment_gate, "verify_transaction_on_chain", verify)
+        queue = SettlementQueue(server, outbox)
+        await outbox.enqueue(payload(), requirements)
+
+        await queue.run_once()
+
+        entry = await outbox.get(settlement_id(payload()))
+        assert entry.status == "settled"
+        assert entry.tx_hash == "ab" * 32
+        verify.assert_not_called()
+
+
+class TestPaymentGateAsync:
+    def _plan(self, **policy) -> RoutePlan:
+        return RoutePlan.from_prices(
+            ["1 USDT"],
+            ["exact_permit"],
+            NETWORK,
+            PAY_TO,
+            settlement=SettlementPolicy(mode="async", **policy),
+        )
+
+    @pytest.mark.asyncio
+    async def test_serves_after_verify_and_queues(self, payload, server, outbox):
+        queue = SettlementQueue(server, outbox)
+        gate = PaymentGate(server, queue)
+
+        decision = await gate.process(self._plan(), _header(payload()), "http://test/a")
+        await queue.stop()
+
+        assert decision.allowed
+        assert decision.settle_response.transaction is None
+        # The signature was checked while screening the header
+        assert server.verify_payment.await_args.kwargs == {"signature_verified": True}
+        assert (await outbox.get(settlement_id(payload()))) is not None
+
+    @pytest.mark.asyncio
+    async def test_retry_gets_queued_settlement(self, payload, server, outbox):
+        queue = SettlementQueue(server, outbox, verify_on_chain=False)
+        gate = PaymentGate(server, queue)
+        plan = self._plan()
+
+        await gate.process(plan, _header(payload()), "http://test/a")
+        retry = await gate.process(plan, _header(payload()), "http://test/a")
+        await queue.stop()
+        await outbox.mark_settled(settlement_id(payload()), "0xtx")
+        settled = await gate.process(plan, _header(payload()), "http://test/a")
+
+        assert retry.allowed
+        assert settled.settle_response.transaction == "0xtx"
+        server.verify_payment.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_retry_from_another_worker_gets_queued_settlement(self, payload, server, outbox):
+        """Another process has its own replay set; the outbox is shared"""
+        queue = SettlementQueue(server, outbox)
+        plan = self._plan()
+
+        await PaymentGate(server, queue).process(plan, _header(payload()), "http://test/a")
+        server.validator.seen.clear()
+        retry = await PaymentGate(server, queue).process(plan, _header(payload()), "http://test/a")
+        await queue.stop()
+
+        assert retry.allowed
+
+    @pytest.mark.asyncio
+    async def test_replayed_nonce_rejected(self, payload, server, outbox):
+        queue = SettlementQueue(server, outbox)
+        gate = PaymentGate(server, queue)
+        plan = self._plan()
+
+        await gate.process(plan, _header(payload()), "http://test/a")
+        decision = await gate.process(plan, _header(payload("0xsig2")), "http://test/a")
+        await queue.stop()
+
+        assert decision.status_code == 402
+        assert b"Payment already used" in decision.body
+
+    @pytest.mark.asyncio
+    async def test_invalid_payment_rejected(self, payload, server, outbox):
+        server.verify_payment.return_value = VerifyResponse(
+            isValid=False, invalidReason="invalid_signature"
+        )
+        gate = PaymentGate(server, SettlementQueue(server, outbox))
+
+        decision = await gate.process(self._plan(), _header(payload()), "http://test/a")
+
+        assert decision.status_code == 402
+        server.settle_payment.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_limit_exceeded_settles_synchronously(self, payload, server, outbox):
+        queue = SettlementQueue(server, outbox)
+        gate = PaymentGate(server, queue)
+        plan = self._plan(max_unsettled=("1 USDT",))
+        gate.verify_transaction_on_chain = AsyncMock()
+
+        first = await gate.process(plan, _header(payload("0xa")), "http://test/a")
+        second = await gate.process(plan, _header(payload("0xb", nonce="2")), "http://test/a")
+        await queue.stop()
+
+        assert first.settle_response.transaction is None
+        assert second.settle_response.transaction == "0xtx"
+
+    def test_unknown_limit_token_rejected(self):
+        with pytest.raises(UnknownTokenError):
+            self._plan(max_unsettled=("1 NOPE",))